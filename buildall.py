@@ -117,6 +117,8 @@ def main():
         "-pt", "--ptmark", help="enable anomaly detection support", action="store_true")
     parser.add_argument(
         "-ft", "--fortran", help="enable fortran support", action="store_true")
+    parser.add_argument(
+        "-t", "--test", help="build and run tests", action="store_true")
     parser.add_argument(
         "--force_bits", choices=["32", "64"], help="specify bit version for the target")
     if sys.platform == 'win32' and vs_versions:
@@ -177,7 +179,8 @@ def main():
             ("-DCMAKE_BUILD_TYPE=Debug" if args.debug else ""),
             ('-DCMAKE_VERBOSE_MAKEFILE:BOOL=ON' if args.verbose else ''),
             ("-DITT_API_IPT_SUPPORT=1" if args.ptmark else ""),
-            ("-DITT_API_FORTRAN_SUPPORT=1" if args.fortran else "")
+            ("-DITT_API_FORTRAN_SUPPORT=1" if args.fortran else ""),
+            ("-DITT_API_BUILD_TESTS=1" if args.test else "")
         ])))
 
         if sys.platform == 'win32':
@@ -188,6 +191,12 @@ def main():
             import glob
             run_shell('%s --build . --config %s' %
                       (cmake, ('Debug' if args.debug else 'Release')))
+        if args.test:
+            # The test target runs the ctest of the same cmake installation
+            os.environ['CTEST_OUTPUT_ON_FAILURE'] = '1'
+            test_project = 'RUN_TESTS' if sys.platform == 'win32' and not use_ninja else 'test'
+            run_shell('%s --build . --config %s --target %s' %
+                      (cmake, ('Debug' if args.debug else 'Release'), test_project))
 
 
 if __name__ == "__main__":
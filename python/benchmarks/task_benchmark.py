@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+task_benchmark.py - micro-benchmark for the per-call overhead of ittapi task markup
+"""
+from argparse import ArgumentParser
+from timeit import repeat
+
+import ittapi
+
+
+def report(title, timings, number):
+    """
+    Prints the best time per begin/end pair of the measurement.
+    :param title: a title of the measurement
+    :param timings: total times of the repeated measurements
+    :param number: a number of begin/end pairs in each measurement
+    """
+    print(f'{title:<42} {min(timings) / number * 1e9:8.1f} ns/pair')
+
+
+def run_benchmark(number, repeats):
+    """
+    Measures begin/end pairs of the native task and pt_region entry points.
+    :param number: a number of begin/end pairs in each measurement
+    :param repeats: a number of measurements
+    """
+    domain = ittapi.domain('benchmark')
+    name = ittapi.string_handle('benchmark task')
+    task_id = ittapi.id(domain)
+    pt_region = ittapi.native.PT_Region('benchmark region')
+
+    measurements = {
+        'native.task_begin + task_end': 'task_begin(domain, name); task_end(domain)',
+        'native.task_begin(id, parent) + task_end': 'task_begin(domain, name, task_id, None); task_end(domain)',
+        'native.task_begin/end_overlapped': 'task_begin_overlapped(domain, name, task_id);'
+                                            ' task_end_overlapped(domain, task_id)',
+        'native.pt_region_begin + pt_region_end': 'pt_region_begin(pt_region); pt_region_end(pt_region)',
+    }
+    namespace = {
+        'domain': domain,
+        'name': name,
+        'task_id': task_id,
+        'pt_region': pt_region,
+        'task_begin': ittapi.native.task_begin,
+        'task_end': ittapi.native.task_end,
+        'task_begin_overlapped': ittapi.native.task_begin_overlapped,
+        'task_end_overlapped': ittapi.native.task_end_overlapped,
+        'pt_region_begin': ittapi.native.pt_region_begin,
+        'pt_region_end': ittapi.native.pt_region_end,
+    }
+
+    for title, statement in measurements.items():
+        report(title, repeat(statement, number=number, repeat=repeats, globals=namespace), number)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Measures the per-call overhead of ittapi task markup.')
+    parser.add_argument('-n', '--number', type=int, default=1000000, help='a number of begin/end pairs per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='a number of measurements')
+    args = parser.parse_args()
+    run_benchmark(args.number, args.repeat)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+task_creation_benchmark.py - micro-benchmark for the throughput of short-lived ittapi tasks
+"""
+from argparse import ArgumentParser
+from timeit import repeat
+
+import ittapi
+
+
+def report(title, timings, number):
+    """
+    Prints the best throughput of the measurement.
+    :param title: a title of the measurement
+    :param timings: total times of the repeated measurements
+    :param number: a number of tasks in each measurement
+    """
+    best = min(timings)
+    print(f'{title:<42} {best / number * 1e9:8.1f} ns/task {number / best / 1e6:8.2f} Mtasks/s')
+
+
+def run_benchmark(number, repeats):
+    """
+    Measures creation, begin and end of tasks that are used once as a context manager.
+    :param number: a number of tasks in each measurement
+    :param repeats: a number of measurements
+    """
+    domain = ittapi.domain('benchmark')
+    name = ittapi.string_handle('benchmark task')
+
+    measurements = {
+        'native task, known name': 'with task("benchmark task"): pass',
+        'native task, known name, no id': 'with task("benchmark task", domain, NO_ID): pass',
+        'nested task, unique id': 'with task(name, domain): pass',
+        'nested task, pooled id': 'with task(name, domain, id=pool): pass',
+        'nested task, no id': 'with task(name, domain, id=NO_ID): pass',
+        'overlapped task, unique id': 'with task(name, domain, overlapped=True): pass',
+        'overlapped task, pooled id': 'with task(name, domain, id=pool, overlapped=True): pass',
+    }
+    namespace = {
+        'domain': domain,
+        'name': name,
+        'pool': ittapi.id_pool(domain),
+        'task': ittapi.task,
+        'NO_ID': ittapi.NO_ID,
+    }
+
+    for title, statement in measurements.items():
+        report(title, repeat(statement, number=number, repeat=repeats, globals=namespace), number)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Measures the throughput of short-lived ittapi tasks.')
+    parser.add_argument('-n', '--number', type=int, default=100000, help='a number of tasks per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='a number of measurements')
+    args = parser.parse_args()
+    run_benchmark(args.number, args.repeat)
@@ -0,0 +1,391 @@
+#include "activator.hpp"
+
+#include <chrono>
+#include <random>
+
+#include <structmember.h>
+
+
+namespace ittapi
+{
+
+template<typename T>
+T* sampling_activator_cast(SamplingActivator* self);
+
+template<>
+PyObject* sampling_activator_cast(SamplingActivator* self)
+{
+    return reinterpret_cast<PyObject*>(self);
+}
+
+static void sampling_activator_dealloc(PyObject* self);
+static PyObject* sampling_activator_repr(PyObject* self);
+
+static PyObject* sampling_activator_every_nth(PyObject* self, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+static PyObject* sampling_activator_rate(PyObject* self, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+static PyObject* sampling_activator_duty_cycle(PyObject* self, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+static PyObject* sampling_activator_first_k(PyObject* self, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+
+static PyMemberDef sampling_activator_attrs[] =
+{
+    {"calls",       T_ULONGLONG, offsetof(SamplingActivator, calls),       READONLY, "the number of calls of the activator"},
+    {"activations", T_ULONGLONG, offsetof(SamplingActivator, activations), READONLY, "the number of calls that have activated the region"},
+    {nullptr},
+};
+
+PyTypeObject SamplingActivatorType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.SamplingActivator",
+    .tp_basicsize         = sizeof(SamplingActivator),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = sampling_activator_dealloc,
+    .tp_vectorcall_offset = offsetof(SamplingActivator, vectorcall),
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = nullptr,
+    .tp_repr              = sampling_activator_repr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = PyVectorcall_Call,
+    .tp_str               = nullptr,
+    .tp_getattro          = nullptr,
+    .tp_setattro          = nullptr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_VECTORCALL,
+
+    /* Documentation string */
+    .tp_doc               = "A callable object that activates collection regions for a sample of calls.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = nullptr,
+
+    /* Delete references to contained objects */
+    .tp_clear             = nullptr,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = nullptr,
+    .tp_iternext          = nullptr,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = nullptr,
+    .tp_members           = sampling_activator_attrs,
+    .tp_getset            = nullptr,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = nullptr,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = 0,
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = nullptr,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
+
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = nullptr,
+};
+
+static int64_t sampling_activator_time()
+{
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+static SamplingActivator* sampling_activator_new(SamplingMode mode, vectorcallfunc vectorcall)
+{
+    SamplingActivator* self = sampling_activator_obj(SamplingActivatorType.tp_alloc(&SamplingActivatorType, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->vectorcall = vectorcall;
+    self->mode = mode;
+    return self;
+}
+
+static bool sampling_activator_parse_count(PyObject* obj, const char* arg_name, unsigned long long min_value,
+                                           unsigned long long* value)
+{
+    long long count = PyLong_AsLongLong(obj);
+    if (count == -1 && PyErr_Occurred())
+    {
+        return false;
+    }
+
+    if (count < 0 || static_cast<unsigned long long>(count) < min_value)
+    {
+        PyErr_Format(PyExc_ValueError, "The %s must be greater than or equal to %llu.", arg_name, min_value);
+        return false;
+    }
+
+    *value = static_cast<unsigned long long>(count);
+    return true;
+}
+
+static bool sampling_activator_parse_seconds(PyObject* obj, const char* arg_name, int64_t* value)
+{
+    double seconds = PyFloat_AsDouble(obj);
+    if (seconds == -1.0 && PyErr_Occurred())
+    {
+        return false;
+    }
+
+    /* The upper bound keeps the number of nanoseconds in the range of int64_t */
+    if (!(seconds >= 0.0 && seconds < 9.0e9))
+    {
+        PyErr_Format(PyExc_ValueError, "The %s must be a non-negative number of seconds.", arg_name);
+        return false;
+    }
+
+    *value = static_cast<int64_t>(seconds * 1.0e9);
+    return true;
+}
+
+PyObject* every_nth_activator(PyObject* Py_UNUSED(self), PyObject* const* args, Py_ssize_t nargs)
+{
+    unsigned long long n = 0;
+    if (!pyext::check_positional_args("every_nth_activator", nargs, 1, 1)
+        || !sampling_activator_parse_count(args[0], "n", 1, &n))
+    {
+        return nullptr;
+    }
+
+    SamplingActivator* activator = sampling_activator_new(SamplingMode::every_nth, sampling_activator_every_nth);
+    if (activator != nullptr)
+    {
+        activator->count = n;
+    }
+    return sampling_activator_cast<PyObject>(activator);
+}
+
+PyObject* rate_activator(PyObject* Py_UNUSED(self), PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("rate_activator", nargs, 1, 2))
+    {
+        return nullptr;
+    }
+
+    double rate = PyFloat_AsDouble(args[0]);
+    if (rate == -1.0 && PyErr_Occurred())
+    {
+        return nullptr;
+    }
+
+    if (!(rate >= 0.0 && rate <= 1.0))
+    {
+        PyErr_SetString(PyExc_ValueError, "The rate must be in the range [0, 1].");
+        return nullptr;
+    }
+
+    uint64_t seed = 0;
+    if (nargs > 1 && args[1] != Py_None)
+    {
+        seed = PyLong_AsUnsignedLongLongMask(args[1]);
+        if (seed == static_cast<uint64_t>(-1) && PyErr_Occurred())
+        {
+            return nullptr;
+        }
+    }
+    else
+    {
+        std::random_device random_device;
+        seed = (static_cast<uint64_t>(random_device()) << 32) | random_device();
+    }
+
+    SamplingActivator* activator = sampling_activator_new(SamplingMode::rate, sampling_activator_rate);
+    if (activator != nullptr)
+    {
+        activator->rate = rate;
+        /* The region is active if the next 53-bit random number is less than the threshold */
+        activator->rate_threshold = static_cast<uint64_t>(rate * static_cast<double>(1ULL << 53));
+        /* The state of xorshift generator must not be zero */
+        activator->random_state = seed != 0 ? seed : 0x9E3779B97F4A7C15ULL;
+    }
+    return sampling_activator_cast<PyObject>(activator);
+}
+
+PyObject* duty_cycle_activator(PyObject* Py_UNUSED(self), PyObject* const* args, Py_ssize_t nargs)
+{
+    int64_t budget = 0;
+    int64_t period = 0;
+    if (!pyext::check_positional_args("duty_cycle_activator", nargs, 2, 2)
+        || !sampling_activator_parse_seconds(args[0], "budget", &budget)
+        || !sampling_activator_parse_seconds(args[1], "period", &period))
+    {
+        return nullptr;
+    }
+
+    if (period == 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "The period must be greater than zero.");
+        return nullptr;
+    }
+
+    SamplingActivator* activator = sampling_activator_new(SamplingMode::duty_cycle, sampling_activator_duty_cycle);
+    if (activator != nullptr)
+    {
+        activator->budget = budget;
+        activator->period = period;
+        activator->start_time = sampling_activator_time();
+    }
+    return sampling_activator_cast<PyObject>(activator);
+}
+
+PyObject* first_k_activator(PyObject* Py_UNUSED(self), PyObject* const* args, Py_ssize_t nargs)
+{
+    unsigned long long k = 0;
+    if (!pyext::check_positional_args("first_k_activator", nargs, 1, 1)
+        || !sampling_activator_parse_count(args[0], "k", 0, &k))
+    {
+        return nullptr;
+    }
+
+    SamplingActivator* activator = sampling_activator_new(SamplingMode::first_k, sampling_activator_first_k);
+    if (activator != nullptr)
+    {
+        activator->count = k;
+    }
+    return sampling_activator_cast<PyObject>(activator);
+}
+
+static void sampling_activator_dealloc(PyObject* self)
+{
+    if (self == nullptr)
+    {
+        return;
+    }
+
+    Py_TYPE(self)->tp_free(self);
+}
+
+static PyObject* sampling_activator_repr_floats(const char* format, double first, double second)
+{
+    PyObject* first_obj = PyFloat_FromDouble(first);
+    PyObject* second_obj = PyFloat_FromDouble(second);
+    PyObject* args = first_obj != nullptr && second_obj != nullptr
+        ? PyUnicode_FromFormat(format, first_obj, second_obj) : nullptr;
+    Py_XDECREF(first_obj);
+    Py_XDECREF(second_obj);
+
+    PyObject* repr = args != nullptr ? PyUnicode_FromFormat("%s(%U)", SamplingActivatorType.tp_name, args) : nullptr;
+    Py_XDECREF(args);
+    return repr;
+}
+
+static PyObject* sampling_activator_repr(PyObject* self)
+{
+    SamplingActivator* obj = sampling_activator_obj(self);
+    switch (obj->mode)
+    {
+    case SamplingMode::every_nth:
+        return PyUnicode_FromFormat("%s(every_nth=%llu)", SamplingActivatorType.tp_name, obj->count);
+    case SamplingMode::rate:
+        return sampling_activator_repr_floats("rate=%R", obj->rate, 0.0);
+    case SamplingMode::duty_cycle:
+        return sampling_activator_repr_floats("budget=%R, period=%R", obj->budget / 1.0e9, obj->period / 1.0e9);
+    case SamplingMode::first_k:
+        return PyUnicode_FromFormat("%s(first_k=%llu)", SamplingActivatorType.tp_name, obj->count);
+    }
+
+    Py_UNREACHABLE();
+}
+
+template<typename IsActive>
+static PyObject* sampling_activator_result(PyObject* self, size_t nargsf, PyObject* kwnames, IsActive is_active)
+{
+    if (PyVectorcall_NARGS(nargsf) != 0 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) != 0))
+    {
+        PyErr_SetString(PyExc_TypeError, "SamplingActivator() takes no arguments.");
+        return nullptr;
+    }
+
+    SamplingActivator* obj = sampling_activator_obj(self);
+    obj->calls++;
+    if (is_active(obj))
+    {
+        obj->activations++;
+        Py_RETURN_TRUE;
+    }
+    Py_RETURN_FALSE;
+}
+
+static PyObject* sampling_activator_every_nth(PyObject* self, PyObject* const* Py_UNUSED(args), size_t nargsf,
+                                              PyObject* kwnames)
+{
+    /* The first call and every n-th call after it activate the region */
+    return sampling_activator_result(self, nargsf, kwnames,
+                                     [](SamplingActivator* obj) { return (obj->calls - 1) % obj->count == 0; });
+}
+
+static PyObject* sampling_activator_rate(PyObject* self, PyObject* const* Py_UNUSED(args), size_t nargsf,
+                                         PyObject* kwnames)
+{
+    return sampling_activator_result(self, nargsf, kwnames, [](SamplingActivator* obj) {
+        /* xorshift64* generator */
+        obj->random_state ^= obj->random_state >> 12;
+        obj->random_state ^= obj->random_state << 25;
+        obj->random_state ^= obj->random_state >> 27;
+        uint64_t random = obj->random_state * 0x2545F4914F6CDD1DULL;
+        return (random >> 11) < obj->rate_threshold;
+    });
+}
+
+static PyObject* sampling_activator_duty_cycle(PyObject* self, PyObject* const* Py_UNUSED(args), size_t nargsf,
+                                               PyObject* kwnames)
+{
+    /* The region is active during the first `budget` nanoseconds of each period since the creation */
+    return sampling_activator_result(self, nargsf, kwnames, [](SamplingActivator* obj) {
+        return (sampling_activator_time() - obj->start_time) % obj->period < obj->budget;
+    });
+}
+
+static PyObject* sampling_activator_first_k(PyObject* self, PyObject* const* Py_UNUSED(args), size_t nargsf,
+                                            PyObject* kwnames)
+{
+    return sampling_activator_result(self, nargsf, kwnames,
+                                     [](SamplingActivator* obj) { return obj->calls <= obj->count; });
+}
+
+int exec_activator(PyObject* module)
+{
+    return pyext::add_type(module, &SamplingActivatorType);
+}
+
+} // namespace ittapi
@@ -0,0 +1,55 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <cstdint>
+
+#include "extensions/python.hpp"
+
+
+namespace ittapi
+{
+
+enum class SamplingMode
+{
+	every_nth,
+	rate,
+	duty_cycle,
+	first_k,
+};
+
+struct SamplingActivator
+{
+	PyObject_HEAD
+	vectorcallfunc vectorcall;
+	SamplingMode mode;
+	unsigned long long calls;
+	unsigned long long activations;
+	/* The parameters of the sampling, the meaning depends on the mode */
+	unsigned long long count;
+	double rate;
+	uint64_t rate_threshold;
+	uint64_t random_state;
+	int64_t start_time;
+	int64_t budget;
+	int64_t period;
+};
+
+extern PyTypeObject SamplingActivatorType;
+
+inline SamplingActivator* sampling_activator_obj(PyObject* self);
+PyObject* every_nth_activator(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* rate_activator(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* duty_cycle_activator(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* first_k_activator(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+int exec_activator(PyObject* module);
+
+
+/* Implementation of inline functions */
+SamplingActivator* sampling_activator_obj(PyObject* self)
+{
+	return pyext::pyobject_cast<SamplingActivator>(self);
+}
+
+} // namespace ittapi
@@ -1,5 +1,7 @@
 #include "collection_control.hpp"
 
+#include <mutex>
+
 #include <ittnotify.h>
 
 
@@ -30,4 +32,116 @@ PyObject* detach(PyObject* self, PyObject* Py_UNUSED(args))
     Py_RETURN_NONE;
 }
 
-} // namespace ittapi
\ No newline at end of file
+/**
+ The collector is loaded during the initialization of ITT API, so the state does not change afterwards unless
+ the in-process collector is started or stopped.
+ */
+static int is_attached = -1;
+
+void reset_collector_attached()
+{
+    is_attached = -1;
+}
+
+PyObject* is_collector_attached(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    if (is_attached < 0)
+    {
+        __itt_collection_state state = __itt_get_collection_state();
+        if (state == __itt_collection_uninitialized || state == __itt_collection_collector_exists)
+        {
+            /* The initialization has not been completed yet */
+            return PyBool_FromLong(state == __itt_collection_collector_exists);
+        }
+
+        is_attached = state == __itt_collection_init_successful;
+    }
+
+    return PyBool_FromLong(is_attached);
+}
+
+/**
+ Collection regions are reference-counted across threads and nesting levels. The state of the collection is decided
+ from both counters together: it is paused while a paused region runs in any thread, it is resumed while an active
+ region runs and no paused region does, and outside of all regions it is restored by the last region that ends, i.e.
+ paused after an active region and resumed after a paused one. The counters and the calls of ITT API are changed
+ under one lock, so the calls cannot be reordered between threads.
+ */
+enum class CollectionState
+{
+    unknown,
+    paused,
+    resumed,
+};
+
+struct CollectionRegionCounters
+{
+    long active;
+    long paused;
+    /* The last state set by the regions. It is unknown outside of all regions, since pause() and resume() can be
+       called directly there. */
+    CollectionState state;
+};
+
+static std::mutex collection_region_mutex;
+static CollectionRegionCounters collection_region_counters = { 0, 0, CollectionState::unknown };
+
+/* The outside state is the state of the collection that is restored when the last region of this kind ends */
+static void collection_region_update(long CollectionRegionCounters::* counter, long delta, CollectionState outside_state)
+{
+    std::lock_guard<std::mutex> lock(collection_region_mutex);
+    CollectionRegionCounters& counters = collection_region_counters;
+    if (counters.*counter + delta < 0)
+    {
+        /* The end of a region that has not begun */
+        return;
+    }
+    counters.*counter += delta;
+
+    CollectionState state = counters.paused > 0 ? CollectionState::paused
+                          : counters.active > 0 ? CollectionState::resumed
+                          : outside_state;
+    if (state != counters.state)
+    {
+        state == CollectionState::resumed ? __itt_resume() : __itt_pause();
+    }
+    counters.state = counters.active > 0 || counters.paused > 0 ? state : CollectionState::unknown;
+}
+
+static PyObject* collection_region_begin(long CollectionRegionCounters::* counter, CollectionState outside_state)
+{
+    Py_BEGIN_ALLOW_THREADS;
+    collection_region_update(counter, 1, outside_state);
+    Py_END_ALLOW_THREADS;
+    Py_RETURN_NONE;
+}
+
+static PyObject* collection_region_end(long CollectionRegionCounters::* counter, CollectionState outside_state)
+{
+    Py_BEGIN_ALLOW_THREADS;
+    collection_region_update(counter, -1, outside_state);
+    Py_END_ALLOW_THREADS;
+    Py_RETURN_NONE;
+}
+
+PyObject* active_region_begin(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return collection_region_begin(&CollectionRegionCounters::active, CollectionState::paused);
+}
+
+PyObject* active_region_end(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return collection_region_end(&CollectionRegionCounters::active, CollectionState::paused);
+}
+
+PyObject* paused_region_begin(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return collection_region_begin(&CollectionRegionCounters::paused, CollectionState::resumed);
+}
+
+PyObject* paused_region_end(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return collection_region_end(&CollectionRegionCounters::paused, CollectionState::resumed);
+}
+
+} // namespace ittapi
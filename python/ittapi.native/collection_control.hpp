@@ -10,5 +10,12 @@ namespace ittapi
 PyObject* pause(PyObject* self, PyObject* args);
 PyObject* resume(PyObject* self, PyObject* args);
 PyObject* detach(PyObject* self, PyObject* args);
+PyObject* is_collector_attached(PyObject* self, PyObject* args);
+PyObject* active_region_begin(PyObject* self, PyObject* args);
+PyObject* active_region_end(PyObject* self, PyObject* args);
+PyObject* paused_region_begin(PyObject* self, PyObject* args);
+PyObject* paused_region_end(PyObject* self, PyObject* args);
+
+void reset_collector_attached();
 
 } // namespace ittapi
\ No newline at end of file
@@ -0,0 +1,865 @@
+#include "collector.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <cstring>
+#include <map>
+#include <mutex>
+#include <new>
+#include <string>
+#include <tuple>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include <ittnotify.h>
+#include <ittnotify_config.h>
+#include <itt_refcol_trace.h>
+
+#if ITT_PLATFORM != ITT_PLATFORM_WIN
+#include <pthread.h>
+#include <unistd.h>
+#endif
+#if defined(__linux__)
+#include <sys/syscall.h>
+#endif
+
+#include "collection_control.hpp"
+#include "domain.hpp"
+#include "string_handle.hpp"
+
+
+/* The global state of the static part of ITT API (ittnotify_static.c) */
+extern "C" __itt_global ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global);
+
+namespace ittapi
+{
+
+/**
+ The in-process collector implements the functions of the dynamic part of ITT API, like the reference collector
+ (src/ittnotify_refcol) does, but it is bound to the function pointers of the static part of this module instead of
+ being loaded from INTEL_LIBITTNOTIFY64. The calls are stored as records of the binary trace of the reference
+ collector (itt_refcol_trace.h) to buffers of the threads, and the records are taken from the buffers in batches
+ by collector_drain(), so no Python code runs on the calls.
+
+ Each thread has a ring buffer with a single writer (the thread) and a single reader (collector_drain() under
+ the mutex), so the records are stored without locking. When the buffer is full, new records are dropped and counted.
+ A restart of the collector makes the buffers of the previous start stale: collector_drain() discards their records
+ and releases their memory once their threads are not writing to them, and the threads allocate new buffers on
+ their next records.
+ Definitions of domains, string handles, counters, events and thread names are appended to a common list under
+ the mutex before the records that refer to them can be stored, so a drained batch always has the definitions of
+ its records.
+ */
+struct ThreadBuffer
+{
+    std::vector<itt_refcol_record> records;   /* the capacity is a power of two */
+    std::atomic<uint64_t> head{0};            /* the number of the stored records, written by the thread */
+    std::atomic<uint64_t> tail{0};            /* the number of the drained records, written by the reader */
+    std::atomic<bool> writing{false};         /* the thread is storing a record, written by the thread */
+    uint32_t tid = 0;
+    uint32_t generation = 0;                  /* the start of the collector the buffer has been allocated for */
+    bool retired = false;                     /* the thread has exited or replaced the buffer, guarded by the mutex */
+};
+
+struct CollectorState
+{
+    std::mutex mutex;
+    bool running = false;
+    size_t buffer_size = 0;
+    std::atomic<uint32_t> generation{0};
+    std::vector<ThreadBuffer*> buffers;
+    std::vector<itt_refcol_record> definitions;
+
+    /* The objects are never destroyed since the application may use them after the collector has been stopped */
+    std::unordered_map<std::string, __itt_domain*> domains;
+    std::unordered_map<std::string, __itt_string_handle*> strings;
+    std::map<std::tuple<std::string, std::string, int>, __itt_counter_info_t*> counters;
+    std::vector<std::pair<__itt_event, std::string>> events;
+    std::map<uint32_t, std::string> thread_names;
+
+    std::atomic<uint64_t> dropped{0};
+};
+
+/* Threads may call the hooks while the interpreter is finalized, so the state is never destroyed */
+static CollectorState& collector = *new CollectorState();
+
+static thread_local uint32_t current_tid = 0;
+
+static uint32_t current_thread_id()
+{
+    if (current_tid == 0)
+    {
+#if ITT_PLATFORM == ITT_PLATFORM_WIN
+        current_tid = static_cast<uint32_t>(GetCurrentThreadId());
+#elif defined(__linux__)
+        current_tid = static_cast<uint32_t>(syscall(SYS_gettid));
+#else
+        static std::atomic<uint32_t> next_tid{0};
+        current_tid = ++next_tid;
+#endif
+    }
+    return current_tid;
+}
+
+/* The same clock as the reference collector uses (CLOCK_MONOTONIC on Linux) */
+static uint64_t collector_timestamp()
+{
+    return static_cast<uint64_t>(std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+}
+
+/* Retires the buffer of the thread at the thread exit, the remaining records are taken by the next drain */
+struct ThreadBufferOwner
+{
+    ThreadBuffer* buffer = nullptr;
+
+    ~ThreadBufferOwner()
+    {
+        if (buffer != nullptr)
+        {
+            std::lock_guard<std::mutex> lock(collector.mutex);
+            buffer->retired = true;
+        }
+    }
+};
+
+static thread_local ThreadBufferOwner thread_buffer_owner;
+
+/* Replaces the buffer of the thread with a new one for the current start of the collector */
+static ThreadBuffer* thread_buffer_replace()
+{
+    std::lock_guard<std::mutex> lock(collector.mutex);
+    if (thread_buffer_owner.buffer != nullptr)
+    {
+        thread_buffer_owner.buffer->retired = true;
+        thread_buffer_owner.buffer = nullptr;
+    }
+
+    ThreadBuffer* buffer = nullptr;
+    try
+    {
+        buffer = new ThreadBuffer();
+        buffer->records.resize(collector.buffer_size);
+        collector.buffers.push_back(buffer);
+    }
+    catch (const std::bad_alloc&)
+    {
+        delete buffer;
+        return nullptr;
+    }
+    buffer->tid = current_thread_id();
+    buffer->generation = collector.generation.load(std::memory_order_relaxed);
+    thread_buffer_owner.buffer = buffer;
+    return buffer;
+}
+
+/**
+ Returns the buffer of the thread marked as being written, so collector_drain() does not release the records of the
+ buffer until collector_record() is done. The mark is stored before the generation is checked, so either the drain
+ sees the mark or the thread sees the new generation and moves to a new buffer.
+ */
+static ThreadBuffer* thread_buffer_acquire()
+{
+    ThreadBuffer* buffer = thread_buffer_owner.buffer;
+    while (true)
+    {
+        if (buffer != nullptr)
+        {
+            buffer->writing.store(true);
+            if (buffer->generation == collector.generation.load())
+            {
+                return buffer;
+            }
+            buffer->writing.store(false, std::memory_order_release);
+        }
+
+        buffer = thread_buffer_replace();
+        if (buffer == nullptr)
+        {
+            return nullptr;
+        }
+    }
+}
+
+static void collector_record(uint16_t type, const __itt_domain* domain, uint64_t name, uint64_t id, uint64_t value)
+{
+    ThreadBuffer* buffer = thread_buffer_acquire();
+    if (buffer == nullptr)
+    {
+        collector.dropped.fetch_add(1, std::memory_order_relaxed);
+        return;
+    }
+
+    uint64_t head = buffer->head.load(std::memory_order_relaxed);
+    size_t capacity = buffer->records.size();
+    if (head - buffer->tail.load(std::memory_order_acquire) == capacity)
+    {
+        buffer->writing.store(false, std::memory_order_release);
+        collector.dropped.fetch_add(1, std::memory_order_relaxed);
+        return;
+    }
+
+    itt_refcol_record& record = buffer->records[head & (capacity - 1)];
+    record.timestamp = collector_timestamp();
+    record.tid = buffer->tid;
+    record.type = type;
+    record.size = 0;
+    record.domain = reinterpret_cast<uintptr_t>(domain);
+    record.name = name;
+    record.id = id;
+    record.value = value;
+    buffer->head.store(head + 1, std::memory_order_release);
+    buffer->writing.store(false, std::memory_order_release);
+}
+
+/* Appends a definition record followed by the name, must be called under the mutex */
+static void collector_define(uint16_t type, uint32_t tid, uint64_t id, uint64_t value, const char* name,
+                             size_t name_size)
+{
+    name_size = name_size < UINT16_MAX ? name_size : UINT16_MAX;
+
+    itt_refcol_record record = {};
+    record.timestamp = collector_timestamp();
+    record.tid = tid;
+    record.type = type;
+    record.size = static_cast<uint16_t>(name_size);
+    record.id = id;
+    record.value = value;
+
+    std::vector<itt_refcol_record>& definitions = collector.definitions;
+    definitions.push_back(record);
+    size_t offset = definitions.size();
+    definitions.resize(offset + (name_size + sizeof(itt_refcol_record) - 1) / sizeof(itt_refcol_record));
+    std::memcpy(definitions.data() + offset, name, name_size);
+}
+
+static void collector_define_counter(const __itt_counter_info_t* counter)
+{
+    /* Counter definitions carry the domain and the name of the counter separated by '\0' */
+    std::string name = counter->domainA;
+    name.push_back('\0');
+    name += counter->nameA;
+    collector_define(ITT_REFCOL_RECORD_COUNTER, current_thread_id(), reinterpret_cast<uintptr_t>(counter),
+                     static_cast<uint64_t>(counter->type), name.data(), name.size());
+}
+
+/* Defines all objects again, so a new reader of the collector knows the objects created before */
+static void collector_define_all()
+{
+    for (const auto& [name, domain] : collector.domains)
+    {
+        collector_define(ITT_REFCOL_RECORD_DOMAIN, current_thread_id(), reinterpret_cast<uintptr_t>(domain), 0,
+                         name.data(), name.size());
+    }
+    for (const auto& [name, handle] : collector.strings)
+    {
+        collector_define(ITT_REFCOL_RECORD_STRING_HANDLE, current_thread_id(), reinterpret_cast<uintptr_t>(handle), 0,
+                         name.data(), name.size());
+    }
+    for (const auto& [key, counter] : collector.counters)
+    {
+        collector_define_counter(counter);
+    }
+    for (const auto& [event, name] : collector.events)
+    {
+        collector_define(ITT_REFCOL_RECORD_EVENT, current_thread_id(), static_cast<uint64_t>(event), 0,
+                         name.data(), name.size());
+    }
+    for (const auto& [tid, name] : collector.thread_names)
+    {
+        collector_define(ITT_REFCOL_RECORD_THREAD_NAME, tid, 0, 0, name.data(), name.size());
+    }
+}
+
+/* Implementation of ITT API */
+static __itt_domain* ITTAPI collector_domain_create(const char* name)
+{
+    if (name == nullptr)
+    {
+        return nullptr;
+    }
+
+    std::lock_guard<std::mutex> lock(collector.mutex);
+    auto [it, inserted] = collector.domains.try_emplace(name, nullptr);
+    if (inserted)
+    {
+        __itt_domain* domain = new __itt_domain();
+        domain->flags = 1;
+        domain->nameA = it->first.c_str();
+        it->second = domain;
+        collector_define(ITT_REFCOL_RECORD_DOMAIN, current_thread_id(), reinterpret_cast<uintptr_t>(domain), 0,
+                         it->first.data(), it->first.size());
+    }
+    return it->second;
+}
+
+static __itt_string_handle* ITTAPI collector_string_handle_create(const char* name)
+{
+    if (name == nullptr)
+    {
+        return nullptr;
+    }
+
+    std::lock_guard<std::mutex> lock(collector.mutex);
+    auto [it, inserted] = collector.strings.try_emplace(name, nullptr);
+    if (inserted)
+    {
+        __itt_string_handle* handle = new __itt_string_handle();
+        handle->strA = it->first.c_str();
+        it->second = handle;
+        collector_define(ITT_REFCOL_RECORD_STRING_HANDLE, current_thread_id(), reinterpret_cast<uintptr_t>(handle), 0,
+                         it->first.data(), it->first.size());
+    }
+    return it->second;
+}
+
+static __itt_counter ITTAPI collector_counter_create_typed(const char* name, const char* domain,
+                                                           __itt_metadata_type type)
+{
+    if (name == nullptr)
+    {
+        return nullptr;
+    }
+
+    std::lock_guard<std::mutex> lock(collector.mutex);
+    auto [it, inserted] = collector.counters.try_emplace(
+        std::make_tuple(std::string(domain != nullptr ? domain : ""), std::string(name), static_cast<int>(type)),
+        nullptr);
+    if (inserted)
+    {
+        __itt_counter_info_t* counter = new __itt_counter_info_t();
+        counter->domainA = std::get<0>(it->first).c_str();
+        counter->nameA = std::get<1>(it->first).c_str();
+        counter->type = static_cast<int>(type);
+        it->second = counter;
+        collector_define_counter(counter);
+    }
+    return reinterpret_cast<__itt_counter>(it->second);
+}
+
+static __itt_event LIBITTAPI collector_event_create(const char* name, int namelen)
+{
+    if (name == nullptr || namelen < 0)
+    {
+        return 0;
+    }
+
+    std::lock_guard<std::mutex> lock(collector.mutex);
+    __itt_event event = static_cast<__itt_event>(collector.events.size() + 1);
+    collector.events.emplace_back(event, std::string(name, static_cast<size_t>(namelen)));
+    collector_define(ITT_REFCOL_RECORD_EVENT, current_thread_id(), static_cast<uint64_t>(event), 0,
+                     name, static_cast<size_t>(namelen));
+    return event;
+}
+
+static void ITTAPI collector_thread_set_name(const char* name)
+{
+    if (name == nullptr)
+    {
+        return;
+    }
+
+    std::lock_guard<std::mutex> lock(collector.mutex);
+    uint32_t tid = current_thread_id();
+    collector.thread_names[tid] = name;
+    collector_define(ITT_REFCOL_RECORD_THREAD_NAME, tid, 0, 0, name, std::strlen(name));
+}
+
+#if ITT_PLATFORM == ITT_PLATFORM_WIN
+/* Converts a string of the given length (or a null-terminated string if the length is negative) to UTF-8 */
+static std::string collector_narrow(const wchar_t* str, int length)
+{
+    int size = WideCharToMultiByte(CP_UTF8, 0, str, length, nullptr, 0, nullptr, nullptr);
+    std::string result(size > 0 ? size : 0, '\0');
+    if (size > 0)
+    {
+        WideCharToMultiByte(CP_UTF8, 0, str, length, result.data(), size, nullptr, nullptr);
+    }
+    if (length < 0 && !result.empty())
+    {
+        result.pop_back();
+    }
+    return result;
+}
+
+static __itt_domain* ITTAPI collector_domain_createW(const wchar_t* name)
+{
+    return name != nullptr ? collector_domain_create(collector_narrow(name, -1).c_str()) : nullptr;
+}
+
+static __itt_string_handle* ITTAPI collector_string_handle_createW(const wchar_t* name)
+{
+    return name != nullptr ? collector_string_handle_create(collector_narrow(name, -1).c_str()) : nullptr;
+}
+
+static __itt_counter ITTAPI collector_counter_create_typedW(const wchar_t* name, const wchar_t* domain,
+                                                            __itt_metadata_type type)
+{
+    if (name == nullptr)
+    {
+        return nullptr;
+    }
+    std::string domain_str = domain != nullptr ? collector_narrow(domain, -1) : std::string();
+    return collector_counter_create_typed(collector_narrow(name, -1).c_str(), domain_str.c_str(), type);
+}
+
+static __itt_event LIBITTAPI collector_event_createW(const wchar_t* name, int namelen)
+{
+    if (name == nullptr || namelen < 0)
+    {
+        return 0;
+    }
+    std::string name_str = collector_narrow(name, namelen);
+    return collector_event_create(name_str.data(), static_cast<int>(name_str.size()));
+}
+
+static void ITTAPI collector_thread_set_nameW(const wchar_t* name)
+{
+    if (name != nullptr)
+    {
+        collector_thread_set_name(collector_narrow(name, -1).c_str());
+    }
+}
+#endif
+
+static void ITTAPI collector_task_begin(const __itt_domain* domain, __itt_id taskid, __itt_id parentid,
+                                        __itt_string_handle* name)
+{
+    if (domain != nullptr && name != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_TASK_BEGIN, domain, reinterpret_cast<uintptr_t>(name),
+                         taskid.d1, parentid.d1);
+    }
+}
+
+static void ITTAPI collector_task_end(const __itt_domain* domain)
+{
+    if (domain != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_TASK_END, domain, 0, 0, 0);
+    }
+}
+
+static void ITTAPI collector_task_begin_overlapped(const __itt_domain* domain, __itt_id taskid, __itt_id parentid,
+                                                   __itt_string_handle* name)
+{
+    if (domain != nullptr && name != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_TASK_BEGIN_OVERLAPPED, domain, reinterpret_cast<uintptr_t>(name),
+                         taskid.d1, parentid.d1);
+    }
+}
+
+static void ITTAPI collector_task_end_overlapped(const __itt_domain* domain, __itt_id taskid)
+{
+    if (domain != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_TASK_END_OVERLAPPED, domain, 0, taskid.d1, 0);
+    }
+}
+
+static void ITTAPI collector_frame_begin_v3(const __itt_domain* domain, __itt_id* id)
+{
+    if (domain != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_FRAME_BEGIN, domain, 0, id != nullptr ? id->d1 : 0, 0);
+    }
+}
+
+static void ITTAPI collector_frame_end_v3(const __itt_domain* domain, __itt_id* id)
+{
+    if (domain != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_FRAME_END, domain, 0, id != nullptr ? id->d1 : 0, 0);
+    }
+}
+
+static void ITTAPI collector_frame_submit_v3(const __itt_domain* domain, __itt_id* id,
+                                             __itt_timestamp begin, __itt_timestamp end)
+{
+    if (domain != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_FRAME_SUBMIT, domain, begin, id != nullptr ? id->d1 : 0, end);
+    }
+}
+
+static __itt_timestamp ITTAPI collector_get_timestamp()
+{
+    return collector_timestamp();
+}
+
+static int LIBITTAPI collector_event_start(__itt_event event)
+{
+    collector_record(ITT_REFCOL_RECORD_EVENT_START, nullptr, 0, static_cast<uint64_t>(event), 0);
+    return 0;
+}
+
+static int LIBITTAPI collector_event_end(__itt_event event)
+{
+    collector_record(ITT_REFCOL_RECORD_EVENT_END, nullptr, 0, static_cast<uint64_t>(event), 0);
+    return 0;
+}
+
+static double collector_counter_value(int type, const void* value_ptr)
+{
+    switch (type)
+    {
+    case __itt_metadata_s64:    return static_cast<double>(*static_cast<const int64_t*>(value_ptr));
+    case __itt_metadata_u32:    return static_cast<double>(*static_cast<const uint32_t*>(value_ptr));
+    case __itt_metadata_s32:    return static_cast<double>(*static_cast<const int32_t*>(value_ptr));
+    case __itt_metadata_u16:    return static_cast<double>(*static_cast<const uint16_t*>(value_ptr));
+    case __itt_metadata_s16:    return static_cast<double>(*static_cast<const int16_t*>(value_ptr));
+    case __itt_metadata_float:  return static_cast<double>(*static_cast<const float*>(value_ptr));
+    case __itt_metadata_double: return *static_cast<const double*>(value_ptr);
+    default:                    return static_cast<double>(*static_cast<const uint64_t*>(value_ptr));
+    }
+}
+
+static void ITTAPI collector_counter_set_value(__itt_counter counter, void* value_ptr)
+{
+    if (counter != nullptr && value_ptr != nullptr)
+    {
+        const __itt_counter_info_t* counter_info = reinterpret_cast<const __itt_counter_info_t*>(counter);
+        double value = collector_counter_value(counter_info->type, value_ptr);
+        uint64_t bits;
+        std::memcpy(&bits, &value, sizeof(bits));
+        collector_record(ITT_REFCOL_RECORD_COUNTER_VALUE, nullptr, 0, reinterpret_cast<uintptr_t>(counter), bits);
+    }
+}
+
+static void ITTAPI collector_counter_inc_delta(__itt_counter counter, unsigned long long value)
+{
+    if (counter != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_COUNTER_INC, nullptr, 0, reinterpret_cast<uintptr_t>(counter), value);
+    }
+}
+
+static void ITTAPI collector_counter_dec_delta(__itt_counter counter, unsigned long long value)
+{
+    if (counter != nullptr)
+    {
+        collector_record(ITT_REFCOL_RECORD_COUNTER_DEC, nullptr, 0, reinterpret_cast<uintptr_t>(counter), value);
+    }
+}
+
+static void ITTAPI collector_pause()
+{
+    collector_record(ITT_REFCOL_RECORD_PAUSE, nullptr, 0, 0, 0);
+}
+
+static void ITTAPI collector_resume()
+{
+    collector_record(ITT_REFCOL_RECORD_RESUME, nullptr, 0, 0, 0);
+}
+
+static void ITTAPI collector_detach()
+{
+    collector_record(ITT_REFCOL_RECORD_DETACH, nullptr, 0, 0, 0);
+}
+
+/**
+ The function pointers of the static part that are replaced while the collector runs. The pointers are assigned
+ directly instead of being looked up by name, as __itt_api_init() and fill_func_ptr_per_lib() of a collector library
+ do, so the types of the implementations are checked by the compiler.
+ */
+struct CollectorHook
+{
+    void** pointer;
+    void* hook;
+    void* saved;
+};
+
+#define COLLECTOR_HOOK(name, hook) \
+    { reinterpret_cast<void**>(&name##_ptr), reinterpret_cast<void*>(static_cast<decltype(name##_ptr)>(hook)), nullptr }
+
+static CollectorHook collector_hooks[] =
+{
+#if ITT_PLATFORM == ITT_PLATFORM_WIN
+    COLLECTOR_HOOK(__itt_domain_createA, collector_domain_create),
+    COLLECTOR_HOOK(__itt_domain_createW, collector_domain_createW),
+    COLLECTOR_HOOK(__itt_string_handle_createA, collector_string_handle_create),
+    COLLECTOR_HOOK(__itt_string_handle_createW, collector_string_handle_createW),
+    COLLECTOR_HOOK(__itt_counter_create_typedA, collector_counter_create_typed),
+    COLLECTOR_HOOK(__itt_counter_create_typedW, collector_counter_create_typedW),
+    COLLECTOR_HOOK(__itt_event_createA, collector_event_create),
+    COLLECTOR_HOOK(__itt_event_createW, collector_event_createW),
+    COLLECTOR_HOOK(__itt_thread_set_nameA, collector_thread_set_name),
+    COLLECTOR_HOOK(__itt_thread_set_nameW, collector_thread_set_nameW),
+#else
+    COLLECTOR_HOOK(__itt_domain_create, collector_domain_create),
+    COLLECTOR_HOOK(__itt_string_handle_create, collector_string_handle_create),
+    COLLECTOR_HOOK(__itt_counter_create_typed, collector_counter_create_typed),
+    COLLECTOR_HOOK(__itt_event_create, collector_event_create),
+    COLLECTOR_HOOK(__itt_thread_set_name, collector_thread_set_name),
+#endif
+    COLLECTOR_HOOK(__itt_task_begin, collector_task_begin),
+    COLLECTOR_HOOK(__itt_task_end, collector_task_end),
+    COLLECTOR_HOOK(__itt_task_begin_overlapped, collector_task_begin_overlapped),
+    COLLECTOR_HOOK(__itt_task_end_overlapped, collector_task_end_overlapped),
+    COLLECTOR_HOOK(__itt_frame_begin_v3, collector_frame_begin_v3),
+    COLLECTOR_HOOK(__itt_frame_end_v3, collector_frame_end_v3),
+    COLLECTOR_HOOK(__itt_frame_submit_v3, collector_frame_submit_v3),
+    COLLECTOR_HOOK(__itt_get_timestamp, collector_get_timestamp),
+    COLLECTOR_HOOK(__itt_event_start, collector_event_start),
+    COLLECTOR_HOOK(__itt_event_end, collector_event_end),
+    COLLECTOR_HOOK(__itt_counter_set_value, collector_counter_set_value),
+    COLLECTOR_HOOK(__itt_counter_inc_delta, collector_counter_inc_delta),
+    COLLECTOR_HOOK(__itt_counter_dec_delta, collector_counter_dec_delta),
+    COLLECTOR_HOOK(__itt_pause, collector_pause),
+    COLLECTOR_HOOK(__itt_resume, collector_resume),
+    COLLECTOR_HOOK(__itt_detach, collector_detach),
+};
+
+#undef COLLECTOR_HOOK
+
+static __itt_collection_state saved_collection_state = __itt_collection_uninitialized;
+
+PyObject* collector_start(PyObject* self, PyObject* buffer_size)
+{
+    Py_ssize_t size = PyLong_AsSsize_t(buffer_size);
+    if (size == -1 && PyErr_Occurred())
+    {
+        return nullptr;
+    }
+    if (size <= 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "The buffer size must be a positive number of records.");
+        return nullptr;
+    }
+
+    if (collector.running)
+    {
+        PyErr_SetString(PyExc_RuntimeError, "The in-process collector is already running.");
+        return nullptr;
+    }
+
+    /* The static part looks for a collector library on the first call */
+    __itt_collection_state state = __itt_get_collection_state();
+    if (state == __itt_collection_init_successful || state == __itt_collection_collector_exists)
+    {
+        PyErr_SetString(PyExc_RuntimeError, "Another collector is attached to the process.");
+        return nullptr;
+    }
+
+    {
+        std::lock_guard<std::mutex> lock(collector.mutex);
+        size_t capacity = 1;
+        while (capacity < static_cast<size_t>(size))
+        {
+            capacity <<= 1;
+        }
+        collector.buffer_size = capacity;
+        collector.dropped = 0;
+
+        /* The records that have not been drained after the previous run are discarded by collector_drain(), and
+           the threads allocate new buffers of the given size */
+        collector.generation.fetch_add(1);
+        collector.definitions.clear();
+        collector_define_all();
+        collector.running = true;
+    }
+
+    __itt_global& itt_global = ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global);
+    __itt_mutex_lock(&itt_global.mutex);
+    for (CollectorHook& hook : collector_hooks)
+    {
+        hook.saved = *hook.pointer;
+        *hook.pointer = hook.hook;
+    }
+    saved_collection_state = itt_global.state;
+    itt_global.state = __itt_collection_init_successful;
+    __itt_mutex_unlock(&itt_global.mutex);
+
+    /* The handles that have been created without a collector are dummies */
+    PyObject* result = string_handle_cache_clear(self, nullptr);
+    Py_XDECREF(result);
+    release_default_domain();
+    reset_collector_attached();
+
+    Py_RETURN_NONE;
+}
+
+PyObject* collector_stop(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    if (!collector.running)
+    {
+        Py_RETURN_NONE;
+    }
+
+    __itt_global& itt_global = ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global);
+    __itt_mutex_lock(&itt_global.mutex);
+    for (CollectorHook& hook : collector_hooks)
+    {
+        *hook.pointer = hook.saved;
+    }
+    itt_global.state = saved_collection_state;
+    __itt_mutex_unlock(&itt_global.mutex);
+
+    {
+        std::lock_guard<std::mutex> lock(collector.mutex);
+        collector.running = false;
+    }
+    reset_collector_attached();
+
+    Py_RETURN_NONE;
+}
+
+PyObject* collector_drain(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    std::vector<itt_refcol_record> records;
+    bool is_allocated = true;
+
+    Py_BEGIN_ALLOW_THREADS;
+    {
+        std::lock_guard<std::mutex> lock(collector.mutex);
+        uint32_t generation = collector.generation.load(std::memory_order_relaxed);
+        /* The threads keep storing records, so the records up to the heads taken here are drained */
+        std::vector<uint64_t> heads;
+        try
+        {
+            size_t count = collector.definitions.size();
+            heads.reserve(collector.buffers.size());
+            for (ThreadBuffer* buffer : collector.buffers)
+            {
+                heads.push_back(buffer->head.load(std::memory_order_acquire));
+                if (buffer->generation == generation)
+                {
+                    count += heads.back() - buffer->tail.load(std::memory_order_relaxed);
+                }
+            }
+            records.reserve(count);
+        }
+        catch (const std::bad_alloc&)
+        {
+            is_allocated = false;
+        }
+
+        if (is_allocated)
+        {
+            records.insert(records.end(), collector.definitions.begin(), collector.definitions.end());
+            collector.definitions.clear();
+
+            size_t index = 0;
+            for (auto it = collector.buffers.begin(); it != collector.buffers.end(); ++index)
+            {
+                ThreadBuffer* buffer = *it;
+                if (buffer->generation != generation)
+                {
+                    /* The records of the previous start are discarded when the thread is not writing them */
+                    if (!buffer->writing.load())
+                    {
+                        std::vector<itt_refcol_record>().swap(buffer->records);
+                        buffer->tail.store(buffer->head.load(std::memory_order_relaxed), std::memory_order_relaxed);
+                        if (buffer->retired)
+                        {
+                            delete buffer;
+                            it = collector.buffers.erase(it);
+                            continue;
+                        }
+                    }
+                    ++it;
+                    continue;
+                }
+
+                uint64_t head = heads[index];
+                uint64_t tail = buffer->tail.load(std::memory_order_relaxed);
+                size_t capacity = buffer->records.size();
+                /* The records may wrap around the end of the ring */
+                while (tail != head)
+                {
+                    size_t begin = static_cast<size_t>(tail & (capacity - 1));
+                    size_t count = static_cast<size_t>(std::min<uint64_t>(head - tail, capacity - begin));
+                    records.insert(records.end(), buffer->records.begin() + begin,
+                                   buffer->records.begin() + begin + count);
+                    tail += count;
+                }
+                buffer->tail.store(tail, std::memory_order_release);
+
+                if (buffer->retired && buffer->head.load(std::memory_order_relaxed) == tail)
+                {
+                    delete buffer;
+                    it = collector.buffers.erase(it);
+                }
+                else
+                {
+                    ++it;
+                }
+            }
+        }
+    }
+    Py_END_ALLOW_THREADS;
+
+    if (!is_allocated)
+    {
+        return PyErr_NoMemory();
+    }
+
+    return PyBytes_FromStringAndSize(reinterpret_cast<const char*>(records.data()),
+                                     static_cast<Py_ssize_t>(records.size() * sizeof(itt_refcol_record)));
+}
+
+PyObject* collector_dropped(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return PyLong_FromUnsignedLongLong(collector.dropped.load(std::memory_order_relaxed));
+}
+
+#if ITT_PLATFORM != ITT_PLATFORM_WIN
+/**
+ The mutex is held across fork(), so the child gets it in a consistent state. The threads of the parent do not exist
+ in the child, so their buffers are retired, and the records of the parent are discarded since the parent drains them
+ itself. The definitions are kept, since the records of the child may refer to them.
+ */
+static void collector_fork_prepare()
+{
+    collector.mutex.lock();
+}
+
+static void collector_fork_parent()
+{
+    collector.mutex.unlock();
+}
+
+static void collector_fork_child()
+{
+    current_tid = 0;
+    ThreadBuffer* own_buffer = thread_buffer_owner.buffer;
+    for (ThreadBuffer* buffer : collector.buffers)
+    {
+        buffer->tail.store(buffer->head.load(std::memory_order_relaxed), std::memory_order_relaxed);
+        if (buffer == own_buffer)
+        {
+            buffer->tid = current_thread_id();
+        }
+        else
+        {
+            buffer->retired = true;
+        }
+    }
+    collector.dropped = 0;
+    collector.mutex.unlock();
+}
+#endif
+
+int exec_collector(PyObject* module)
+{
+#if ITT_PLATFORM != ITT_PLATFORM_WIN
+    /* The handlers cannot be unregistered, so they are registered once per process */
+    static bool fork_handlers_registered = false;
+    if (!fork_handlers_registered)
+    {
+        if (pthread_atfork(collector_fork_prepare, collector_fork_parent, collector_fork_child) != 0)
+        {
+            PyErr_SetString(PyExc_RuntimeError, "Cannot register fork handlers.");
+            return -1;
+        }
+        fork_handlers_registered = true;
+    }
+#endif
+    return 0;
+}
+
+} // namespace ittapi
@@ -0,0 +1,17 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+
+namespace ittapi
+{
+
+PyObject* collector_start(PyObject* self, PyObject* buffer_size);
+PyObject* collector_stop(PyObject* self, PyObject* args);
+PyObject* collector_drain(PyObject* self, PyObject* args);
+PyObject* collector_dropped(PyObject* self, PyObject* args);
+
+int exec_collector(PyObject* module);
+
+} // namespace ittapi
@@ -0,0 +1,681 @@
+#include "counter.hpp"
+
+#include <climits>
+#include <cstdint>
+#include <new>
+#include <unordered_map>
+
+#include <structmember.h>
+
+#include "domain.hpp"
+#include "metadata.hpp"
+#include "string_handle.hpp"
+#include "extensions/string.hpp"
+
+
+namespace ittapi
+{
+
+template<typename T>
+T* counter_cast(Counter* self);
+
+template<>
+PyObject* counter_cast(Counter* self)
+{
+    return reinterpret_cast<PyObject*>(self);
+}
+
+/* Value ranges of the counters that are accumulated by the module */
+struct CounterTypeInfo
+{
+    __itt_metadata_type type;
+    long long min_value;
+    long long max_value;
+};
+
+static const CounterTypeInfo counter_types[] =
+{
+    {__itt_metadata_s64, LLONG_MIN, LLONG_MAX},
+    {__itt_metadata_u32, 0,         UINT32_MAX},
+    {__itt_metadata_s32, INT32_MIN, INT32_MAX},
+    {__itt_metadata_u16, 0,         UINT16_MAX},
+    {__itt_metadata_s16, INT16_MIN, INT16_MAX},
+};
+
+/**
+ The values of the counters by their handles, so the objects that are created for the same counter accumulate one
+ value. All accesses are done under the GIL. The map is never destroyed since the objects may be deallocated after
+ the static objects are destroyed.
+ */
+static std::unordered_map<__itt_counter, CounterValue>& counter_values =
+    *new std::unordered_map<__itt_counter, CounterValue>();
+
+static PyObject* counter_new(PyTypeObject* type, PyObject* args, PyObject* kwargs);
+static void counter_dealloc(PyObject* self);
+
+static PyObject* counter_repr(PyObject* self);
+static PyObject* counter_str(PyObject* self);
+
+static PyObject* counter_method_inc(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+static PyObject* counter_method_dec(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+static PyObject* counter_method_add(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+static PyObject* counter_method_set(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+
+static PyObject* counter_get_type(PyObject* self, void* closure);
+
+static const CounterTypeInfo* counter_type_info(__itt_metadata_type type);
+static bool counter_add_value(Counter* self, PyObject* delta, bool negate);
+static bool counter_set_value(Counter* self, PyObject* value);
+static void counter_submit(Counter* self);
+
+static PyMemberDef counter_attrs[] =
+{
+    {"name",    T_OBJECT_EX, offsetof(Counter, name),   READONLY, "a name of the counter"},
+    {"domain",  T_OBJECT_EX, offsetof(Counter, domain), READONLY, "a domain of the counter"},
+    {nullptr},
+};
+
+static PyGetSetDef counter_getset[] =
+{
+    {"type", counter_get_type, nullptr, "a type of the counter value", nullptr},
+    {nullptr},
+};
+
+static PyMethodDef counter_methods[] =
+{
+    {"inc", pyext::pycfunction_cast(counter_method_inc), METH_FASTCALL, "Increments the counter by the given delta (1 by default)."},
+    {"dec", pyext::pycfunction_cast(counter_method_dec), METH_FASTCALL, "Decrements the counter by the given delta (1 by default)."},
+    {"add", pyext::pycfunction_cast(counter_method_add), METH_FASTCALL, "Adds the given signed delta to the counter."},
+    {"set", pyext::pycfunction_cast(counter_method_set), METH_FASTCALL, "Sets the counter value."},
+    {nullptr},
+};
+
+PyTypeObject CounterType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.Counter",
+    .tp_basicsize         = sizeof(Counter),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = counter_dealloc,
+    .tp_vectorcall_offset = 0,
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = nullptr,
+    .tp_repr              = counter_repr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = nullptr,
+    .tp_str               = counter_str,
+    .tp_getattro          = nullptr,
+    .tp_setattro          = nullptr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT,
+
+    /* Documentation string */
+    .tp_doc               = "A class that represents a ITT counter.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = nullptr,
+
+    /* Delete references to contained objects */
+    .tp_clear             = nullptr,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = nullptr,
+    .tp_iternext          = nullptr,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = counter_methods,
+    .tp_members           = counter_attrs,
+    .tp_getset            = counter_getset,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = nullptr,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = 0,
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = counter_new,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
+
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = nullptr,
+};
+
+static PyObject* counter_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
+{
+    char name_key[] = { "name" };
+    char domain_key[] = { "domain" };
+    char type_key[] = { "type" };
+    char* kwlist[] = { name_key, domain_key, type_key, nullptr };
+
+    PyObject* name = nullptr;
+    PyObject* domain = nullptr;
+    PyObject* value_type = nullptr;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OO", kwlist, &name, &domain, &value_type))
+    {
+        return nullptr;
+    }
+
+    __itt_metadata_type counter_type = __itt_metadata_u64;
+    if (value_type != nullptr && value_type != Py_None && !metadata_type_from_object(value_type, &counter_type))
+    {
+        return nullptr;
+    }
+
+    Counter* self = counter_obj(type->tp_alloc(type, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->type = counter_type;
+
+    if (PyUnicode_Check(name))
+    {
+        self->name = pyext::new_ref(name);
+    }
+    else if (Py_TYPE(name) == &StringHandleType)
+    {
+        self->name = pyext::new_ref(string_handle_obj(name)->str);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed counter name is not a valid instance of str or StringHandle.");
+    }
+
+    if (self->name == nullptr)
+    {
+        Py_DecRef(counter_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    if (domain == nullptr || domain == Py_None)
+    {
+        self->domain = domain_default();
+    }
+    else if (PyUnicode_Check(domain))
+    {
+        self->domain = PyObject_CallFunctionObjArgs(reinterpret_cast<PyObject*>(&DomainType), domain, nullptr);
+    }
+    else if (Py_TYPE(domain) == &DomainType)
+    {
+        self->domain = pyext::new_ref(domain);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed domain is not a valid instance of str or Domain.");
+    }
+
+    if (self->domain == nullptr)
+    {
+        Py_DecRef(counter_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    pyext::string name_str = pyext::string::from_unicode(self->name);
+    if (name_str.c_str() == nullptr)
+    {
+        Py_DecRef(counter_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    pyext::string domain_str = pyext::string::from_unicode(domain_obj(self->domain)->name);
+    if (domain_str.c_str() == nullptr)
+    {
+        Py_DecRef(counter_cast<PyObject>(self));
+        return nullptr;
+    }
+
+#if defined(_WIN32)
+    self->handle = __itt_counter_create_typedW(name_str.c_str(), domain_str.c_str(), self->type);
+#else
+    self->handle = __itt_counter_create_typed(name_str.c_str(), domain_str.c_str(), self->type);
+#endif
+
+    if (self->handle != nullptr)
+    {
+        try
+        {
+            self->value = &counter_values[self->handle];
+        }
+        catch (const std::bad_alloc&)
+        {
+            Py_DecRef(counter_cast<PyObject>(self));
+            return PyErr_NoMemory();
+        }
+        self->value->owners++;
+    }
+
+    return counter_cast<PyObject>(self);
+}
+
+static void counter_dealloc(PyObject* self)
+{
+    if (self == nullptr)
+    {
+        return;
+    }
+
+    Counter* obj = counter_obj(self);
+    if (obj->value != nullptr && --obj->value->owners == 0)
+    {
+        /* The handle is destroyed with the last object of the counter */
+        counter_values.erase(obj->handle);
+        __itt_counter_destroy(obj->handle);
+    }
+
+    Py_XDECREF(obj->name);
+    Py_XDECREF(obj->domain);
+
+    Py_TYPE(self)->tp_free(self);
+}
+
+static PyObject* counter_repr(PyObject* self)
+{
+    Counter* obj = counter_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    return PyUnicode_FromFormat("%s('%U', '%S', '%s')", CounterType.tp_name, obj->name, obj->domain,
+                                metadata_type_name(obj->type));
+}
+
+static PyObject* counter_str(PyObject* self)
+{
+    Counter* obj = counter_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    return pyext::new_ref(obj->name);
+}
+
+static PyObject* counter_method_inc(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("inc", nargs, 0, 1))
+    {
+        return nullptr;
+    }
+
+    Counter* obj = counter_obj(self);
+    if (obj->handle == nullptr)
+    {
+        Py_RETURN_NONE;
+    }
+
+    if (!counter_add_value(obj, nargs ? args[0] : nullptr, false))
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* counter_method_dec(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("dec", nargs, 0, 1))
+    {
+        return nullptr;
+    }
+
+    Counter* obj = counter_obj(self);
+    if (obj->handle == nullptr)
+    {
+        Py_RETURN_NONE;
+    }
+
+    if (!counter_add_value(obj, nargs ? args[0] : nullptr, true))
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* counter_method_add(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("add", nargs, 1, 1))
+    {
+        return nullptr;
+    }
+
+    Counter* obj = counter_obj(self);
+    if (obj->handle == nullptr)
+    {
+        Py_RETURN_NONE;
+    }
+
+    if (!counter_add_value(obj, args[0], false))
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* counter_method_set(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("set", nargs, 1, 1))
+    {
+        return nullptr;
+    }
+
+    Counter* obj = counter_obj(self);
+    if (obj->handle == nullptr)
+    {
+        Py_RETURN_NONE;
+    }
+
+    if (!counter_set_value(obj, args[0]))
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* counter_get_type(PyObject* self, void* Py_UNUSED(closure))
+{
+    return PyUnicode_FromString(metadata_type_name(counter_obj(self)->type));
+}
+
+static const CounterTypeInfo* counter_type_info(__itt_metadata_type type)
+{
+    for (const CounterTypeInfo& info : counter_types)
+    {
+        if (info.type == type)
+        {
+            return &info;
+        }
+    }
+
+    return nullptr;
+}
+
+static bool counter_add_value(Counter* self, PyObject* delta, bool negate)
+{
+    if (self->type == __itt_metadata_u64)
+    {
+        /* Unsigned 64-bit counters are accumulated by the collector. */
+        int overflow = 0;
+        long long value = delta ? PyLong_AsLongLongAndOverflow(delta, &overflow) : 1;
+        if (value == -1 && PyErr_Occurred())
+        {
+            return false;
+        }
+
+        unsigned long long magnitude = 0;
+        if (overflow > 0)
+        {
+            magnitude = PyLong_AsUnsignedLongLong(delta);
+            if (magnitude == static_cast<unsigned long long>(-1) && PyErr_Occurred())
+            {
+                return false;
+            }
+        }
+        else if (overflow < 0)
+        {
+            PyErr_SetString(PyExc_OverflowError, "The passed delta is out of range of the counter type.");
+            return false;
+        }
+        else
+        {
+            magnitude = value < 0 ? 0ULL - static_cast<unsigned long long>(value) : static_cast<unsigned long long>(value);
+            negate = negate != (value < 0);
+        }
+
+        if (negate)
+        {
+            __itt_counter_dec_delta(self->handle, magnitude);
+        }
+        else
+        {
+            __itt_counter_inc_delta(self->handle, magnitude);
+        }
+
+        return true;
+    }
+
+    if (self->type == __itt_metadata_float || self->type == __itt_metadata_double)
+    {
+        double value = delta ? PyFloat_AsDouble(delta) : 1.0;
+        if (value == -1.0 && PyErr_Occurred())
+        {
+            return false;
+        }
+
+        self->value->real += negate ? -value : value;
+        counter_submit(self);
+        return true;
+    }
+
+    long long value = delta ? PyLong_AsLongLong(delta) : 1;
+    if (value == -1 && PyErr_Occurred())
+    {
+        return false;
+    }
+
+    const CounterTypeInfo* info = counter_type_info(self->type);
+    if ((negate && value == LLONG_MIN) ||
+        (value > 0 && (negate ? self->value->integer < info->min_value + value
+                              : self->value->integer > info->max_value - value)) ||
+        (value < 0 && (negate ? self->value->integer > info->max_value + value
+                              : self->value->integer < info->min_value - value)))
+    {
+        PyErr_SetString(PyExc_OverflowError, "The counter value is out of range of the counter type.");
+        return false;
+    }
+
+    self->value->integer += negate ? -value : value;
+    counter_submit(self);
+    return true;
+}
+
+static bool counter_set_value(Counter* self, PyObject* value)
+{
+    if (self->type == __itt_metadata_u64)
+    {
+        unsigned long long new_value = PyLong_AsUnsignedLongLong(value);
+        if (new_value == static_cast<unsigned long long>(-1) && PyErr_Occurred())
+        {
+            return false;
+        }
+
+        __itt_counter_set_value(self->handle, &new_value);
+        return true;
+    }
+
+    if (self->type == __itt_metadata_float || self->type == __itt_metadata_double)
+    {
+        double new_value = PyFloat_AsDouble(value);
+        if (new_value == -1.0 && PyErr_Occurred())
+        {
+            return false;
+        }
+
+        self->value->real = new_value;
+        counter_submit(self);
+        return true;
+    }
+
+    long long new_value = PyLong_AsLongLong(value);
+    if (new_value == -1 && PyErr_Occurred())
+    {
+        return false;
+    }
+
+    const CounterTypeInfo* info = counter_type_info(self->type);
+    if (new_value < info->min_value || new_value > info->max_value)
+    {
+        PyErr_SetString(PyExc_OverflowError, "The counter value is out of range of the counter type.");
+        return false;
+    }
+
+    self->value->integer = new_value;
+    counter_submit(self);
+    return true;
+}
+
+static void counter_submit(Counter* self)
+{
+    switch (self->type)
+    {
+    case __itt_metadata_s64:
+    {
+        int64_t value = self->value->integer;
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    case __itt_metadata_u32:
+    {
+        uint32_t value = static_cast<uint32_t>(self->value->integer);
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    case __itt_metadata_s32:
+    {
+        int32_t value = static_cast<int32_t>(self->value->integer);
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    case __itt_metadata_u16:
+    {
+        uint16_t value = static_cast<uint16_t>(self->value->integer);
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    case __itt_metadata_s16:
+    {
+        int16_t value = static_cast<int16_t>(self->value->integer);
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    case __itt_metadata_float:
+    {
+        float value = static_cast<float>(self->value->real);
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    case __itt_metadata_double:
+    {
+        double value = self->value->real;
+        __itt_counter_set_value(self->handle, &value);
+        break;
+    }
+    default:
+        break;
+    }
+}
+
+Counter* counter_check(PyObject* self)
+{
+    if (self == nullptr || Py_TYPE(self) != &CounterType)
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed counter is not a valid instance of Counter type.");
+        return nullptr;
+    }
+
+    return counter_obj(self);
+}
+
+PyObject* counter_set_many(PyObject* self, PyObject* values)
+{
+    if (PyDict_Check(values))
+    {
+        Py_ssize_t pos = 0;
+        PyObject* counter = nullptr;
+        PyObject* value = nullptr;
+        while (PyDict_Next(values, &pos, &counter, &value))
+        {
+            Counter* counter_obj = counter_check(counter);
+            if (counter_obj == nullptr)
+            {
+                return nullptr;
+            }
+
+            if (counter_obj->handle && !counter_set_value(counter_obj, value))
+            {
+                return nullptr;
+            }
+        }
+
+        Py_RETURN_NONE;
+    }
+
+    PyObject* items = PySequence_Fast(values, "The passed values are not a dict or an iterable of (counter, value) pairs.");
+    if (items == nullptr)
+    {
+        return nullptr;
+    }
+
+    Py_ssize_t size = PySequence_Fast_GET_SIZE(items);
+    PyObject** item_array = PySequence_Fast_ITEMS(items);
+    for (Py_ssize_t i = 0; i < size; ++i)
+    {
+        PyObject* item = item_array[i];
+        if (!PyTuple_Check(item) || PyTuple_GET_SIZE(item) != 2)
+        {
+            Py_DecRef(items);
+            PyErr_SetString(PyExc_TypeError, "The passed values are not a dict or an iterable of (counter, value) pairs.");
+            return nullptr;
+        }
+
+        Counter* counter_obj = counter_check(PyTuple_GET_ITEM(item, 0));
+        if (counter_obj == nullptr || (counter_obj->handle && !counter_set_value(counter_obj, PyTuple_GET_ITEM(item, 1))))
+        {
+            Py_DecRef(items);
+            return nullptr;
+        }
+    }
+
+    Py_DecRef(items);
+    Py_RETURN_NONE;
+}
+
+int exec_counter(PyObject* module)
+{
+    return pyext::add_type(module, &CounterType);
+}
+
+} // namespace ittapi
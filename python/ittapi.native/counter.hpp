@@ -0,0 +1,51 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <ittnotify.h>
+
+#include "extensions/python.hpp"
+
+
+namespace ittapi
+{
+
+/* The current value of the counters that are updated with __itt_counter_set_value() */
+struct CounterValue
+{
+    union
+    {
+        long long integer;
+        double real;
+    };
+    Py_ssize_t owners;
+};
+
+struct Counter
+{
+    PyObject_HEAD
+    PyObject* name;
+    PyObject* domain;
+    __itt_counter handle;
+    __itt_metadata_type type;
+    /* The value is shared by the objects with the same handle, it is nullptr if the handle is nullptr */
+    CounterValue* value;
+};
+
+extern PyTypeObject CounterType;
+
+inline Counter* counter_obj(PyObject* self);
+Counter* counter_check(PyObject* self);
+int exec_counter(PyObject* module);
+
+PyObject* counter_set_many(PyObject* self, PyObject* values);
+
+
+/* Implementation of inline functions */
+Counter* counter_obj(PyObject* self)
+{
+    return pyext::pyobject_cast<Counter>(self);
+}
+
+} // namespace ittapi
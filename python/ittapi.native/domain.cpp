@@ -227,6 +227,23 @@ Domain* domain_check(PyObject* self)
     return domain_obj(self);
 }
 
+static PyObject* default_domain = nullptr;
+
+PyObject* domain_default()
+{
+    if (default_domain == nullptr)
+    {
+        default_domain = PyObject_CallFunctionObjArgs(reinterpret_cast<PyObject*>(&DomainType), nullptr);
+    }
+
+    return pyext::xnew_ref(default_domain);
+}
+
+void release_default_domain()
+{
+    Py_CLEAR(default_domain);
+}
+
 int exec_domain(PyObject* module)
 {
     return pyext::add_type(module, &DomainType);
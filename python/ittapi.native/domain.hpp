@@ -22,6 +22,8 @@ extern PyTypeObject DomainType;
 
 inline Domain* domain_obj(PyObject* self);
 Domain* domain_check(PyObject* self);
+PyObject* domain_default();
+void release_default_domain();
 int exec_domain(PyObject* module);
 
 
@@ -19,5 +19,67 @@ int add_type(PyObject* module, PyTypeObject* type)
 	return PyModule_AddObject(module, name, _PyObject_CAST(type));
 }
 
+bool check_positional_args(const char* name, Py_ssize_t nargs, Py_ssize_t min_args, Py_ssize_t max_args)
+{
+	if (nargs < min_args)
+	{
+		PyErr_Format(PyExc_TypeError, "%s expected %s%zd argument%s, got %zd", name,
+			min_args == max_args ? "" : "at least ", min_args, min_args == 1 ? "" : "s", nargs);
+		return false;
+	}
+
+	if (nargs > max_args)
+	{
+		PyErr_Format(PyExc_TypeError, "%s expected %s%zd argument%s, got %zd", name,
+			min_args == max_args ? "" : "at most ", max_args, max_args == 1 ? "" : "s", nargs);
+		return false;
+	}
+
+	return true;
+}
+
+PyObject* vectorcall_new(PyTypeObject* type, PyObject* const* args, size_t nargsf, PyObject* kwnames)
+{
+	Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+	PyObject* args_tuple = PyTuple_New(nargs);
+	if (args_tuple == nullptr)
+	{
+		return nullptr;
+	}
+
+	for (Py_ssize_t i = 0; i < nargs; ++i)
+	{
+		PyTuple_SET_ITEM(args_tuple, i, new_ref(args[i]));
+	}
+
+	PyObject* kwargs = nullptr;
+	if (kwnames != nullptr)
+	{
+		kwargs = PyDict_New();
+		if (kwargs == nullptr)
+		{
+			Py_DecRef(args_tuple);
+			return nullptr;
+		}
+
+		for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(kwnames); ++i)
+		{
+			if (PyDict_SetItem(kwargs, PyTuple_GET_ITEM(kwnames, i), args[nargs + i]) < 0)
+			{
+				Py_DecRef(args_tuple);
+				Py_DecRef(kwargs);
+				return nullptr;
+			}
+		}
+	}
+
+	PyObject* result = type->tp_new(type, args_tuple, kwargs);
+
+	Py_DecRef(args_tuple);
+	Py_XDECREF(kwargs);
+
+	return result;
+}
+
 } // namespace pyext
 } // namespace ittapi
\ No newline at end of file
@@ -3,6 +3,11 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 
+#if PY_VERSION_HEX < 0x03090000
+#define PyObject_Vectorcall _PyObject_Vectorcall
+#define Py_TPFLAGS_HAVE_VECTORCALL _Py_TPFLAGS_HAVE_VECTORCALL
+#endif
+
 
 namespace ittapi
 {
@@ -15,10 +20,18 @@ T* pyobject_cast(PyObject* self)
 	return reinterpret_cast<T*>(self);
 }
 
+template<typename T>
+PyCFunction pycfunction_cast(T* func)
+{
+	return reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(func));
+}
+
 inline PyObject* new_ref(PyObject* obj);
 inline PyObject* xnew_ref(PyObject* obj);
 
 int add_type(PyObject* module, PyTypeObject* type);
+bool check_positional_args(const char* name, Py_ssize_t nargs, Py_ssize_t min_args, Py_ssize_t max_args);
+PyObject* vectorcall_new(PyTypeObject* type, PyObject* const* args, size_t nargsf, PyObject* kwnames);
 
 
 /* Implementation of inline functions */
@@ -0,0 +1,78 @@
+#include "fork.hpp"
+
+#include <ittnotify.h>
+#include <ittnotify_config.h>
+
+#if ITT_PLATFORM != ITT_PLATFORM_WIN
+#include <pthread.h>
+#endif
+
+
+/* The global state of the static part of ITT API (ittnotify_static.c) */
+extern "C" __itt_global ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global);
+
+namespace ittapi
+{
+
+#if ITT_PLATFORM != ITT_PLATFORM_WIN
+/**
+ The mutex of ITT API guards the lazy initialization of the collector, domains and string handles. If another thread
+ holds it while the process is forked, the mutex remains locked forever in the child. The mutex is held across fork()
+ so the child always gets it in a consistent state.
+ */
+static bool fork_mutex_locked = false;
+
+static void fork_prepare()
+{
+    __itt_global& itt_global = ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global);
+    fork_mutex_locked = itt_global.mutex_initialized;
+    if (fork_mutex_locked)
+    {
+        __itt_mutex_lock(&itt_global.mutex);
+    }
+}
+
+static void fork_release_in_parent()
+{
+    if (fork_mutex_locked)
+    {
+        fork_mutex_locked = false;
+        __itt_mutex_unlock(&ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global).mutex);
+    }
+}
+
+static void fork_release_in_child()
+{
+    if (fork_mutex_locked)
+    {
+        fork_mutex_locked = false;
+        /* The mutex is recursive, so it cannot be unlocked by the thread of the child that has got a new id.
+           It is initialized again the same way as the static part of ITT API does. */
+        pthread_mutexattr_t mutex_attr;
+        pthread_mutexattr_init(&mutex_attr);
+        pthread_mutexattr_settype(&mutex_attr, PTHREAD_MUTEX_RECURSIVE);
+        pthread_mutex_init(&ITT_JOIN(INTEL_ITTNOTIFY_PREFIX, _ittapi_global).mutex, &mutex_attr);
+        pthread_mutexattr_destroy(&mutex_attr);
+    }
+}
+#endif
+
+int exec_fork(PyObject* module)
+{
+#if ITT_PLATFORM != ITT_PLATFORM_WIN
+    /* The handlers cannot be unregistered, so they are registered once per process */
+    static bool fork_handlers_registered = false;
+    if (!fork_handlers_registered)
+    {
+        if (pthread_atfork(fork_prepare, fork_release_in_parent, fork_release_in_child) != 0)
+        {
+            PyErr_SetString(PyExc_RuntimeError, "Cannot register fork handlers.");
+            return -1;
+        }
+        fork_handlers_registered = true;
+    }
+#endif
+    return 0;
+}
+
+} // namespace ittapi
@@ -0,0 +1,12 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+
+namespace ittapi
+{
+
+int exec_fork(PyObject* module);
+
+} // namespace ittapi
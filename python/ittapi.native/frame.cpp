@@ -0,0 +1,126 @@
+#include "frame.hpp"
+
+#include <ittnotify.h>
+
+#include "domain.hpp"
+#include "id.hpp"
+
+
+namespace ittapi
+{
+
+static bool frame_parse_id(PyObject* id, __itt_id** frame_id)
+{
+    *frame_id = nullptr;
+    if (id == nullptr || id == Py_None)
+    {
+        return true;
+    }
+
+    Id* id_obj = id_check(id);
+    if (id_obj == nullptr)
+    {
+        return false;
+    }
+
+    *frame_id = &id_obj->id;
+    return true;
+}
+
+static bool frame_parse_timestamp(PyObject* timestamp, __itt_timestamp* value)
+{
+    if (timestamp == Py_None)
+    {
+        *value = __itt_timestamp_none;
+        return true;
+    }
+
+    *value = PyLong_AsUnsignedLongLong(timestamp);
+    return !(*value == static_cast<__itt_timestamp>(-1) && PyErr_Occurred());
+}
+
+PyObject* frame_begin(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("frame_begin", nargs, 1, 2))
+    {
+        return nullptr;
+    }
+
+    Domain* domain_obj = domain_check(args[0]);
+    if (domain_obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    __itt_id* id = nullptr;
+    if (!frame_parse_id(nargs > 1 ? args[1] : nullptr, &id))
+    {
+        return nullptr;
+    }
+
+    __itt_frame_begin_v3(domain_obj->handle, id);
+
+    Py_RETURN_NONE;
+}
+
+PyObject* frame_end(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("frame_end", nargs, 1, 2))
+    {
+        return nullptr;
+    }
+
+    Domain* domain_obj = domain_check(args[0]);
+    if (domain_obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    __itt_id* id = nullptr;
+    if (!frame_parse_id(nargs > 1 ? args[1] : nullptr, &id))
+    {
+        return nullptr;
+    }
+
+    __itt_frame_end_v3(domain_obj->handle, id);
+
+    Py_RETURN_NONE;
+}
+
+PyObject* frame_submit(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("frame_submit", nargs, 3, 4))
+    {
+        return nullptr;
+    }
+
+    Domain* domain_obj = domain_check(args[0]);
+    if (domain_obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    __itt_timestamp begin = 0;
+    __itt_timestamp end = 0;
+    if (!frame_parse_timestamp(args[1], &begin) || !frame_parse_timestamp(args[2], &end))
+    {
+        return nullptr;
+    }
+
+    __itt_id* id = nullptr;
+    if (!frame_parse_id(nargs > 3 ? args[3] : nullptr, &id))
+    {
+        return nullptr;
+    }
+
+    __itt_frame_submit_v3(domain_obj->handle, id, begin, end);
+
+    Py_RETURN_NONE;
+}
+
+PyObject* get_timestamp(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return PyLong_FromUnsignedLongLong(__itt_get_timestamp());
+}
+
+} // namespace ittapi
@@ -0,0 +1,15 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+
+namespace ittapi
+{
+
+PyObject* frame_begin(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* frame_end(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* frame_submit(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* get_timestamp(PyObject* self, PyObject* args);
+
+} // namespace ittapi
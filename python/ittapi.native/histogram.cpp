@@ -0,0 +1,397 @@
+#include "histogram.hpp"
+
+#include <structmember.h>
+
+#include "domain.hpp"
+#include "metadata.hpp"
+#include "string_handle.hpp"
+#include "extensions/string.hpp"
+
+
+namespace ittapi
+{
+
+template<typename T>
+T* histogram_cast(Histogram* self);
+
+template<>
+PyObject* histogram_cast(Histogram* self)
+{
+    return reinterpret_cast<PyObject*>(self);
+}
+
+static PyObject* histogram_new(PyTypeObject* type, PyObject* args, PyObject* kwargs);
+static void histogram_dealloc(PyObject* self);
+
+static PyObject* histogram_repr(PyObject* self);
+static PyObject* histogram_str(PyObject* self);
+
+static PyObject* histogram_method_submit(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+
+static PyObject* histogram_get_x_type(PyObject* self, void* closure);
+static PyObject* histogram_get_y_type(PyObject* self, void* closure);
+
+static bool histogram_get_buffer(PyObject* data, __itt_metadata_type type, const char* axis, Py_buffer* view);
+
+static PyMemberDef histogram_attrs[] =
+{
+    {"domain",  T_OBJECT_EX, offsetof(Histogram, domain), READONLY, "a domain of the histogram"},
+    {"name",    T_OBJECT_EX, offsetof(Histogram, name),   READONLY, "a name of the histogram"},
+    {nullptr},
+};
+
+static PyGetSetDef histogram_getset[] =
+{
+    {"x_type", histogram_get_x_type, nullptr, "a type of the X axis values or None for batch statistics", nullptr},
+    {"y_type", histogram_get_y_type, nullptr, "a type of the Y axis values", nullptr},
+    {nullptr},
+};
+
+static PyMethodDef histogram_methods[] =
+{
+    {"submit", pyext::pycfunction_cast(histogram_method_submit), METH_FASTCALL, "Submits X and Y axis data of the histogram."},
+    {nullptr},
+};
+
+PyTypeObject HistogramType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.Histogram",
+    .tp_basicsize         = sizeof(Histogram),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = histogram_dealloc,
+    .tp_vectorcall_offset = 0,
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = nullptr,
+    .tp_repr              = histogram_repr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = nullptr,
+    .tp_str               = histogram_str,
+    .tp_getattro          = nullptr,
+    .tp_setattro          = nullptr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT,
+
+    /* Documentation string */
+    .tp_doc               = "A class that represents a ITT histogram.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = nullptr,
+
+    /* Delete references to contained objects */
+    .tp_clear             = nullptr,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = nullptr,
+    .tp_iternext          = nullptr,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = histogram_methods,
+    .tp_members           = histogram_attrs,
+    .tp_getset            = histogram_getset,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = nullptr,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = 0,
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = histogram_new,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
+
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = nullptr,
+};
+
+static PyObject* histogram_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
+{
+    char domain_key[] = { "domain" };
+    char name_key[] = { "name" };
+    char x_type_key[] = { "x_type" };
+    char y_type_key[] = { "y_type" };
+    char* kwlist[] = { domain_key, name_key, x_type_key, y_type_key, nullptr };
+
+    PyObject* domain = nullptr;
+    PyObject* name = nullptr;
+    PyObject* x_type = nullptr;
+    PyObject* y_type = nullptr;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|OO", kwlist, &domain, &name, &x_type, &y_type))
+    {
+        return nullptr;
+    }
+
+    /* The histogram without X axis data is used to calculate batch statistics */
+    __itt_metadata_type x_metadata_type = __itt_metadata_unknown;
+    if (x_type != nullptr && x_type != Py_None && !metadata_type_from_object(x_type, &x_metadata_type))
+    {
+        return nullptr;
+    }
+
+    __itt_metadata_type y_metadata_type = __itt_metadata_u64;
+    if (y_type != nullptr && y_type != Py_None && !metadata_type_from_object(y_type, &y_metadata_type))
+    {
+        return nullptr;
+    }
+
+    Histogram* self = histogram_obj(type->tp_alloc(type, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->x_type = x_metadata_type;
+    self->y_type = y_metadata_type;
+
+    if (domain == Py_None)
+    {
+        self->domain = domain_default();
+    }
+    else if (PyUnicode_Check(domain))
+    {
+        self->domain = PyObject_CallFunctionObjArgs(reinterpret_cast<PyObject*>(&DomainType), domain, nullptr);
+    }
+    else if (Py_TYPE(domain) == &DomainType)
+    {
+        self->domain = pyext::new_ref(domain);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed domain is not a valid instance of str or Domain.");
+    }
+
+    if (self->domain == nullptr)
+    {
+        Py_DecRef(histogram_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    if (PyUnicode_Check(name))
+    {
+        self->name = pyext::new_ref(name);
+    }
+    else if (Py_TYPE(name) == &StringHandleType)
+    {
+        self->name = pyext::new_ref(string_handle_obj(name)->str);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed histogram name is not a valid instance of str or StringHandle.");
+    }
+
+    if (self->name == nullptr)
+    {
+        Py_DecRef(histogram_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    pyext::string name_str = pyext::string::from_unicode(self->name);
+    if (name_str.c_str() == nullptr)
+    {
+        Py_DecRef(histogram_cast<PyObject>(self));
+        return nullptr;
+    }
+
+#if defined(_WIN32)
+    self->handle = __itt_histogram_createW(domain_obj(self->domain)->handle, name_str.c_str(), self->x_type, self->y_type);
+#else
+    self->handle = __itt_histogram_create(domain_obj(self->domain)->handle, name_str.c_str(), self->x_type, self->y_type);
+#endif
+
+    return histogram_cast<PyObject>(self);
+}
+
+static void histogram_dealloc(PyObject* self)
+{
+    if (self == nullptr)
+    {
+        return;
+    }
+
+    Histogram* obj = histogram_obj(self);
+    Py_XDECREF(obj->domain);
+    Py_XDECREF(obj->name);
+
+    Py_TYPE(self)->tp_free(self);
+}
+
+static PyObject* histogram_repr(PyObject* self)
+{
+    Histogram* obj = histogram_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    const char* x_type = metadata_type_name(obj->x_type);
+    if (x_type == nullptr)
+    {
+        return PyUnicode_FromFormat("%s('%S', '%U', None, '%s')", HistogramType.tp_name, obj->domain, obj->name,
+                                    metadata_type_name(obj->y_type));
+    }
+
+    return PyUnicode_FromFormat("%s('%S', '%U', '%s', '%s')", HistogramType.tp_name, obj->domain, obj->name,
+                                x_type, metadata_type_name(obj->y_type));
+}
+
+static PyObject* histogram_str(PyObject* self)
+{
+    Histogram* obj = histogram_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    return pyext::new_ref(obj->name);
+}
+
+static PyObject* histogram_method_submit(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("submit", nargs, 2, 2))
+    {
+        return nullptr;
+    }
+
+    Histogram* obj = histogram_obj(self);
+    if (obj->handle == nullptr)
+    {
+        Py_RETURN_NONE;
+    }
+
+    bool has_x_data = args[0] != Py_None;
+    if (has_x_data == (obj->x_type == __itt_metadata_unknown))
+    {
+        PyErr_SetString(PyExc_ValueError, has_x_data ? "The histogram has no X axis, X axis data must be None."
+                                                     : "X axis data is required for the histogram.");
+        return nullptr;
+    }
+
+    Py_buffer x_view = {};
+    if (has_x_data && !histogram_get_buffer(args[0], obj->x_type, "X", &x_view))
+    {
+        return nullptr;
+    }
+
+    Py_buffer y_view = {};
+    if (!histogram_get_buffer(args[1], obj->y_type, "Y", &y_view))
+    {
+        if (has_x_data)
+        {
+            PyBuffer_Release(&x_view);
+        }
+        return nullptr;
+    }
+
+    Py_ssize_t length = y_view.len / y_view.itemsize;
+    bool is_valid_length = !has_x_data || x_view.len / x_view.itemsize == length;
+    if (is_valid_length && length != 0)
+    {
+        __itt_histogram_submit(obj->handle, static_cast<size_t>(length), has_x_data ? x_view.buf : nullptr,
+                               y_view.buf);
+    }
+
+    if (has_x_data)
+    {
+        PyBuffer_Release(&x_view);
+    }
+    PyBuffer_Release(&y_view);
+
+    if (!is_valid_length)
+    {
+        PyErr_SetString(PyExc_ValueError, "X and Y axis data must have the same length.");
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* histogram_get_x_type(PyObject* self, void* Py_UNUSED(closure))
+{
+    const char* name = metadata_type_name(histogram_obj(self)->x_type);
+    if (name == nullptr)
+    {
+        Py_RETURN_NONE;
+    }
+
+    return PyUnicode_FromString(name);
+}
+
+static PyObject* histogram_get_y_type(PyObject* self, void* Py_UNUSED(closure))
+{
+    return PyUnicode_FromString(metadata_type_name(histogram_obj(self)->y_type));
+}
+
+static bool histogram_get_buffer(PyObject* data, __itt_metadata_type type, const char* axis, Py_buffer* view)
+{
+    if (PyObject_GetBuffer(data, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+    {
+        return false;
+    }
+
+    __itt_metadata_type data_type = __itt_metadata_unknown;
+    if (!metadata_type_from_format(view->format, view->itemsize, &data_type) || data_type != type)
+    {
+        PyErr_Format(PyExc_TypeError, "%s axis data must be a contiguous buffer of '%s' values, got format '%s'.",
+                     axis, metadata_type_name(type), view->format ? view->format : "B");
+        PyBuffer_Release(view);
+        return false;
+    }
+
+    return true;
+}
+
+Histogram* histogram_check(PyObject* self)
+{
+    if (self == nullptr || Py_TYPE(self) != &HistogramType)
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed histogram is not a valid instance of Histogram type.");
+        return nullptr;
+    }
+
+    return histogram_obj(self);
+}
+
+int exec_histogram(PyObject* module)
+{
+    return pyext::add_type(module, &HistogramType);
+}
+
+} // namespace ittapi
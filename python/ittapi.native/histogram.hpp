@@ -0,0 +1,37 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <ittnotify.h>
+
+#include "extensions/python.hpp"
+
+
+namespace ittapi
+{
+
+struct Histogram
+{
+    PyObject_HEAD
+    PyObject* domain;
+    PyObject* name;
+    __itt_histogram* handle;
+    __itt_metadata_type x_type;
+    __itt_metadata_type y_type;
+};
+
+extern PyTypeObject HistogramType;
+
+inline Histogram* histogram_obj(PyObject* self);
+Histogram* histogram_check(PyObject* self);
+int exec_histogram(PyObject* module);
+
+
+/* Implementation of inline functions */
+Histogram* histogram_obj(PyObject* self)
+{
+    return pyext::pyobject_cast<Histogram>(self);
+}
+
+} // namespace ittapi
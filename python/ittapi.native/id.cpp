@@ -1,5 +1,7 @@
 #include "id.hpp"
 
+#include <atomic>
+
 #include <structmember.h>
 
 #include "domain.hpp"
@@ -144,7 +146,7 @@ static PyObject* id_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
     }
 
     self->domain = pyext::new_ref(domain);
-    self->id = __itt_id_make(self, 0);
+    self->id = id_make();
 
     __itt_id_create(domain_obj->handle, self->id);
 
@@ -200,6 +202,30 @@ Id* id_check(PyObject* self)
     return id_obj(self);
 }
 
+__itt_id id_make()
+{
+    /* The ids are counted instead of being made from the object addresses that are reused after deallocation. */
+    static std::atomic<unsigned long long> next_id{0};
+
+    __itt_id id = __itt_null;
+    id.d1 = ++next_id;
+    return id;
+}
+
+PyObject* id_from_handle(PyObject* domain, __itt_id id)
+{
+    Id* self = id_obj(IdType.tp_alloc(&IdType, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->domain = pyext::new_ref(domain);
+    self->id = id;
+
+    return id_cast<PyObject>(self);
+}
+
 int exec_id(PyObject* module)
 {
     return pyext::add_type(module, &IdType);
@@ -22,6 +22,8 @@ extern PyTypeObject IdType;
 
 inline Id* id_obj(PyObject* self);
 Id* id_check(PyObject* self);
+__itt_id id_make();
+PyObject* id_from_handle(PyObject* domain, __itt_id id);
 int exec_id(PyObject* module);
 
 
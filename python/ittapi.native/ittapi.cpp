@@ -1,11 +1,20 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 
+#include "activator.hpp"
 #include "collection_control.hpp"
+#include "collector.hpp"
+#include "counter.hpp"
 #include "domain.hpp"
 #include "event.hpp"
+#include "fork.hpp"
+#include "frame.hpp"
+#include "histogram.hpp"
 #include "id.hpp"
+#include "jit.hpp"
+#include "metadata.hpp"
 #include "string_handle.hpp"
+#include "sync.hpp"
 #include "task.hpp"
 #include "thread_naming.hpp"
 #include "pt_region.hpp"
@@ -26,15 +35,46 @@ static int exec_ittapi_module(PyObject* module)
         {"pause",                 pause,                 METH_NOARGS,  "Pause data collection."},
         {"resume",                resume,                METH_NOARGS,  "Resume data collection."},
         {"detach",                detach,                METH_NOARGS,  "Detach data collection."},
+        {"is_collector_attached", is_collector_attached, METH_NOARGS,  "Returns True if a collector is attached to the process."},
+        {"active_region_begin",   active_region_begin,   METH_NOARGS,  "Resumes data collection unless another active region has resumed it."},
+        {"active_region_end",     active_region_end,     METH_NOARGS,  "Pauses data collection if no other active region remains."},
+        {"paused_region_begin",   paused_region_begin,   METH_NOARGS,  "Pauses data collection unless another paused region has paused it."},
+        {"paused_region_end",     paused_region_end,     METH_NOARGS,  "Resumes data collection if no other paused region remains."},
+        {"every_nth_activator",   pyext::pycfunction_cast(every_nth_activator),   METH_FASTCALL, "Creates an activator that activates the region for every n-th call."},
+        {"rate_activator",        pyext::pycfunction_cast(rate_activator),        METH_FASTCALL, "Creates an activator that activates the region for the given fraction of calls."},
+        {"duty_cycle_activator",  pyext::pycfunction_cast(duty_cycle_activator),  METH_FASTCALL, "Creates an activator that activates the region during a part of each period."},
+        {"first_k_activator",     pyext::pycfunction_cast(first_k_activator),     METH_FASTCALL, "Creates an activator that activates the region for the first k calls."},
+        /* In-process Collector */
+        {"collector_start",       collector_start,       METH_O,       "Starts the in-process collector with buffers of the given number of records."},
+        {"collector_stop",        collector_stop,        METH_NOARGS,  "Stops the in-process collector."},
+        {"collector_drain",       collector_drain,       METH_NOARGS,  "Returns the records stored by the in-process collector as bytes."},
+        {"collector_dropped",     collector_dropped,     METH_NOARGS,  "Returns the number of records dropped by the in-process collector."},
+        /* Counter API */
+        {"counter_set_many",      counter_set_many,      METH_O,       "Sets values of several counters."},
+        /* Frame API */
+        {"frame_begin",           pyext::pycfunction_cast(frame_begin),           METH_FASTCALL, "Marks the beginning of a frame."},
+        {"frame_end",             pyext::pycfunction_cast(frame_end),             METH_FASTCALL, "Marks the end of a frame."},
+        {"frame_submit",          pyext::pycfunction_cast(frame_submit),          METH_FASTCALL, "Submits a frame with the given begin and end timestamps."},
+        {"get_timestamp",         get_timestamp,         METH_NOARGS,  "Returns the current timestamp."},
+        /* JIT Profiling API */
+        {"jit_is_profiling_active", jit_is_profiling_active, METH_NOARGS, "Returns True if a JIT profiling agent is attached to the process."},
+        {"jit_load_method",       pyext::pycfunction_cast(jit_load_method),       METH_FASTCALL, "Reports a code region of a dynamically generated method and returns the method id."},
+        {"jit_shutdown",          jit_shutdown,          METH_NOARGS,  "Notifies the JIT profiling agent that profiling is being shut down."},
+        /* Metadata API */
+        {"metadata_add",          pyext::pycfunction_cast(metadata_add),          METH_FASTCALL, "Adds metadata to an instance of a named entity."},
+        /* String Handle API */
+        {"string_handle_cache_info",  string_handle_cache_info,  METH_NOARGS, "Returns hits, misses, maximum size and current size of the string handle cache."},
+        {"string_handle_cache_clear", string_handle_cache_clear, METH_NOARGS, "Clears the string handle cache."},
+        {"string_handle_cache_limit", string_handle_cache_limit, METH_O,      "Sets the maximum size of the string handle cache (None or 0 for unbounded)."},
         /* Thread Naming API */
         {"thread_set_name",       thread_set_name,       METH_O,       "Sets a name for current thread."},
         /* Task API */
-        {"task_begin",            task_begin,            METH_VARARGS, "Marks the beginning of a task."},
-        {"task_end",              task_end,              METH_VARARGS, "Marks the end of a task."},
-        {"task_begin_overlapped", task_begin_overlapped, METH_VARARGS, "Marks the beginning of an overlapped task."},
-        {"task_end_overlapped",   task_end_overlapped,   METH_VARARGS, "Marks the end of an overlapped task."},
-        {"pt_region_begin",       pt_region_begin,       METH_VARARGS, "Marks the begining of a processor trace control region"},
-        {"pt_region_end",         pt_region_end,         METH_VARARGS, "Marks the end of a processor trace control region"},
+        {"task_begin",            pyext::pycfunction_cast(task_begin),            METH_FASTCALL, "Marks the beginning of a task."},
+        {"task_end",              pyext::pycfunction_cast(task_end),              METH_FASTCALL, "Marks the end of a task."},
+        {"task_begin_overlapped", pyext::pycfunction_cast(task_begin_overlapped), METH_FASTCALL, "Marks the beginning of an overlapped task."},
+        {"task_end_overlapped",   pyext::pycfunction_cast(task_end_overlapped),   METH_FASTCALL, "Marks the end of an overlapped task."},
+        {"pt_region_begin",       pyext::pycfunction_cast(pt_region_begin),       METH_FASTCALL, "Marks the begining of a processor trace control region"},
+        {"pt_region_end",         pyext::pycfunction_cast(pt_region_end),         METH_FASTCALL, "Marks the end of a processor trace control region"},
         /* marks end of array */
         { nullptr },
     };
@@ -50,6 +90,8 @@ static int exec_ittapi_module(PyObject* module)
 
 static void destroy_ittapi_module(void*)
 {
+    release_string_handle_cache();
+    release_default_domain();
     __itt_release_resources();
 }
 
@@ -60,11 +102,18 @@ PyMODINIT_FUNC PyInit_native()
     static PyModuleDef_Slot ittapi_slots[] =
     {
         { Py_mod_exec, reinterpret_cast<void*>(exec_ittapi_module) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_activator) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_collector) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_counter) },
         { Py_mod_exec, reinterpret_cast<void*>(exec_domain) },
         { Py_mod_exec, reinterpret_cast<void*>(exec_event) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_fork) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_histogram) },
         { Py_mod_exec, reinterpret_cast<void*>(exec_id) },
         { Py_mod_exec, reinterpret_cast<void*>(exec_string_handle) },
         { Py_mod_exec, reinterpret_cast<void*>(exec_pt_region) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_sync) },
+        { Py_mod_exec, reinterpret_cast<void*>(exec_task) },
         { 0, nullptr }
     };
 
@@ -0,0 +1,103 @@
+#include "jit.hpp"
+
+#include <limits>
+
+#include <jitprofiling.h>
+
+#include "extensions/python.hpp"
+
+
+namespace ittapi
+{
+
+static bool jit_parse_str(PyObject* str, const char* arg_name, const char** value)
+{
+    *value = nullptr;
+    if (str == nullptr || str == Py_None)
+    {
+        return true;
+    }
+
+    if (!PyUnicode_Check(str))
+    {
+        PyErr_Format(PyExc_TypeError, "The passed %s is not a valid instance of str.", arg_name);
+        return false;
+    }
+
+    *value = PyUnicode_AsUTF8(str);
+    return *value != nullptr;
+}
+
+PyObject* jit_is_profiling_active(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return PyBool_FromLong(iJIT_IsProfilingActive() == iJIT_SAMPLING_ON);
+}
+
+PyObject* jit_load_method(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("jit_load_method", nargs, 3, 4))
+    {
+        return nullptr;
+    }
+
+    const char* name = nullptr;
+    if (!jit_parse_str(args[0], "method name", &name))
+    {
+        return nullptr;
+    }
+
+    if (name == nullptr)
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed method name is not a valid instance of str.");
+        return nullptr;
+    }
+
+    void* address = PyLong_AsVoidPtr(args[1]);
+    if (address == nullptr)
+    {
+        if (!PyErr_Occurred())
+        {
+            PyErr_SetString(PyExc_ValueError, "The method address cannot be zero.");
+        }
+        return nullptr;
+    }
+
+    /* unsigned long is 32-bit on Windows, so the size is parsed as a wider type and then checked for the API type */
+    unsigned long long size = PyLong_AsUnsignedLongLong(args[2]);
+    if (size == static_cast<unsigned long long>(-1) && PyErr_Occurred())
+    {
+        return nullptr;
+    }
+
+    if (size == 0 || size > std::numeric_limits<decltype(iJIT_Method_Load::method_size)>::max())
+    {
+        PyErr_SetString(PyExc_ValueError, "The method size must be in the range [1, 2**32 - 1].");
+        return nullptr;
+    }
+
+    const char* source_file = nullptr;
+    if (!jit_parse_str(nargs > 3 ? args[3] : nullptr, "source file name", &source_file))
+    {
+        return nullptr;
+    }
+
+    iJIT_Method_Load method = {};
+    method.method_id = iJIT_GetNewMethodID();
+    method.method_name = const_cast<char*>(name);
+    method.method_load_address = address;
+    method.method_size = static_cast<decltype(method.method_size)>(size);
+    method.source_file_name = const_cast<char*>(source_file);
+
+    /* The collector copies the method data, so the strings are not used after the call */
+    iJIT_NotifyEvent(iJVM_EVENT_TYPE_METHOD_LOAD_FINISHED, &method);
+
+    return PyLong_FromUnsignedLong(method.method_id);
+}
+
+PyObject* jit_shutdown(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    iJIT_NotifyEvent(iJVM_EVENT_TYPE_SHUTDOWN, nullptr);
+    Py_RETURN_NONE;
+}
+
+} // namespace ittapi
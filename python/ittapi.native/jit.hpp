@@ -0,0 +1,14 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+
+namespace ittapi
+{
+
+PyObject* jit_is_profiling_active(PyObject* self, PyObject* args);
+PyObject* jit_load_method(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* jit_shutdown(PyObject* self, PyObject* args);
+
+} // namespace ittapi
@@ -0,0 +1,285 @@
+#include "metadata.hpp"
+
+#include <cstring>
+
+#include "domain.hpp"
+#include "id.hpp"
+#include "string_handle.hpp"
+
+
+namespace ittapi
+{
+
+struct MetadataTypeName
+{
+    const char* name;
+    __itt_metadata_type type;
+};
+
+static const MetadataTypeName metadata_type_names[] =
+{
+    {"u64",    __itt_metadata_u64},
+    {"s64",    __itt_metadata_s64},
+    {"u32",    __itt_metadata_u32},
+    {"s32",    __itt_metadata_s32},
+    {"u16",    __itt_metadata_u16},
+    {"s16",    __itt_metadata_s16},
+    {"float",  __itt_metadata_float},
+    {"double", __itt_metadata_double},
+};
+
+static bool metadata_is_native_byte_order(char prefix)
+{
+#if PY_LITTLE_ENDIAN
+    return prefix == '@' || prefix == '=' || prefix == '<';
+#else
+    return prefix == '@' || prefix == '=' || prefix == '>' || prefix == '!';
+#endif
+}
+
+/**
+ Maps a type name ('u64', 's64', 'u32', 's32', 'u16', 's16', 'float' or 'double'), int or float to the metadata type.
+ */
+bool metadata_type_from_object(PyObject* type, __itt_metadata_type* result)
+{
+    if (type == reinterpret_cast<PyObject*>(&PyLong_Type))
+    {
+        *result = __itt_metadata_s64;
+        return true;
+    }
+
+    if (type == reinterpret_cast<PyObject*>(&PyFloat_Type))
+    {
+        *result = __itt_metadata_double;
+        return true;
+    }
+
+    const char* type_name = PyUnicode_Check(type) ? PyUnicode_AsUTF8(type) : nullptr;
+    if (type_name == nullptr && PyErr_Occurred())
+    {
+        return false;
+    }
+
+    for (const MetadataTypeName& info : metadata_type_names)
+    {
+        if (type_name != nullptr && strcmp(info.name, type_name) == 0)
+        {
+            *result = info.type;
+            return true;
+        }
+    }
+
+    PyErr_Format(PyExc_ValueError, "The passed type %R is not one of 'u64', 's64', 'u32', 's32', 'u16', 's16', "
+                                   "'float', 'double', int or float.", type);
+    return false;
+}
+
+const char* metadata_type_name(__itt_metadata_type type)
+{
+    for (const MetadataTypeName& info : metadata_type_names)
+    {
+        if (info.type == type)
+        {
+            return info.name;
+        }
+    }
+
+    return nullptr;
+}
+
+/**
+ Maps a struct module format of buffer items to the metadata type.
+ Returns __itt_metadata_unknown for the byte formats that are passed as string metadata.
+ */
+bool metadata_type_from_format(const char* format, Py_ssize_t itemsize, __itt_metadata_type* type)
+{
+    if (format == nullptr)
+    {
+        format = "B";
+    }
+    else if (metadata_is_native_byte_order(format[0]))
+    {
+        format++;
+    }
+
+    if (format[0] == '\0' || format[1] != '\0')
+    {
+        return false;
+    }
+
+    switch (format[0])
+    {
+    case 'b': case 'B': case 'c':
+        *type = __itt_metadata_unknown;
+        return true;
+    case 'f':
+        *type = __itt_metadata_float;
+        return true;
+    case 'd':
+        *type = __itt_metadata_double;
+        return true;
+    case 'h': case 'i': case 'l': case 'q': case 'n':
+        *type = itemsize == 8 ? __itt_metadata_s64 :
+                itemsize == 4 ? __itt_metadata_s32 :
+                itemsize == 2 ? __itt_metadata_s16 : __itt_metadata_unknown;
+        return *type != __itt_metadata_unknown;
+    case 'H': case 'I': case 'L': case 'Q': case 'N':
+        *type = itemsize == 8 ? __itt_metadata_u64 :
+                itemsize == 4 ? __itt_metadata_u32 :
+                itemsize == 2 ? __itt_metadata_u16 : __itt_metadata_unknown;
+        return *type != __itt_metadata_unknown;
+    default:
+        return false;
+    }
+}
+
+static void metadata_add_string(const __itt_domain* domain, __itt_id id, __itt_string_handle* key,
+                                const char* data, size_t length)
+{
+#if defined(_WIN32)
+    __itt_metadata_str_addA(domain, id, key, data, length);
+#else
+    __itt_metadata_str_add(domain, id, key, data, length);
+#endif
+}
+
+static bool metadata_add_buffer(const __itt_domain* domain, __itt_id id, __itt_string_handle* key, PyObject* value)
+{
+    Py_buffer view;
+    if (PyObject_GetBuffer(value, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+    {
+        PyErr_Format(PyExc_TypeError, "The passed metadata value is not an int, float, str or a contiguous buffer, "
+                                      "got %s.", Py_TYPE(value)->tp_name);
+        return false;
+    }
+
+    __itt_metadata_type type = __itt_metadata_unknown;
+    if (!metadata_type_from_format(view.format, view.itemsize, &type))
+    {
+        PyErr_Format(PyExc_ValueError, "The buffer format '%s' is not supported for metadata.", view.format);
+        PyBuffer_Release(&view);
+        return false;
+    }
+
+    if (type == __itt_metadata_unknown)
+    {
+        metadata_add_string(domain, id, key, static_cast<const char*>(view.buf), static_cast<size_t>(view.len));
+    }
+    else
+    {
+        __itt_metadata_add(domain, id, key, type, static_cast<size_t>(view.len / view.itemsize), view.buf);
+    }
+
+    PyBuffer_Release(&view);
+    return true;
+}
+
+bool metadata_add_value(const __itt_domain* domain, __itt_id id, PyObject* key, PyObject* value)
+{
+    PyObject* key_handle = nullptr;
+    if (PyUnicode_Check(key))
+    {
+        key_handle = string_handle_from_str(key);
+        if (key_handle == nullptr)
+        {
+            return false;
+        }
+    }
+    else if (Py_TYPE(key) == &StringHandleType)
+    {
+        key_handle = pyext::new_ref(key);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed metadata key is not a valid instance of str or StringHandle.");
+        return false;
+    }
+
+    __itt_string_handle* key_obj = string_handle_obj(key_handle)->handle;
+    bool result = true;
+
+    if (PyLong_Check(value))
+    {
+        int overflow = 0;
+        long long signed_value = PyLong_AsLongLongAndOverflow(value, &overflow);
+        if (overflow > 0)
+        {
+            unsigned long long unsigned_value = PyLong_AsUnsignedLongLong(value);
+            result = !(unsigned_value == static_cast<unsigned long long>(-1) && PyErr_Occurred());
+            if (result)
+            {
+                __itt_metadata_add(domain, id, key_obj, __itt_metadata_u64, 1, &unsigned_value);
+            }
+        }
+        else if (overflow < 0)
+        {
+            PyErr_SetString(PyExc_OverflowError, "The passed metadata value is out of range of a 64-bit integer.");
+            result = false;
+        }
+        else
+        {
+            result = !(signed_value == -1 && PyErr_Occurred());
+            if (result)
+            {
+                __itt_metadata_add(domain, id, key_obj, __itt_metadata_s64, 1, &signed_value);
+            }
+        }
+    }
+    else if (PyFloat_Check(value))
+    {
+        double double_value = PyFloat_AS_DOUBLE(value);
+        __itt_metadata_add(domain, id, key_obj, __itt_metadata_double, 1, &double_value);
+    }
+    else if (PyUnicode_Check(value))
+    {
+        Py_ssize_t length = 0;
+        const char* data = PyUnicode_AsUTF8AndSize(value, &length);
+        result = data != nullptr;
+        if (result)
+        {
+            metadata_add_string(domain, id, key_obj, data, static_cast<size_t>(length));
+        }
+    }
+    else
+    {
+        result = metadata_add_buffer(domain, id, key_obj, value);
+    }
+
+    Py_DecRef(key_handle);
+    return result;
+}
+
+PyObject* metadata_add(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("metadata_add", nargs, 4, 4))
+    {
+        return nullptr;
+    }
+
+    Domain* domain_obj = domain_check(args[0]);
+    if (domain_obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    __itt_id id = __itt_null;
+    if (args[1] != Py_None)
+    {
+        Id* id_obj = id_check(args[1]);
+        if (id_obj == nullptr)
+        {
+            return nullptr;
+        }
+
+        id = id_obj->id;
+    }
+
+    if (!metadata_add_value(domain_obj->handle, id, args[2], args[3]))
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+} // namespace ittapi
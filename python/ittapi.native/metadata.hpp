@@ -0,0 +1,19 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <ittnotify.h>
+
+
+namespace ittapi
+{
+
+bool metadata_type_from_object(PyObject* type, __itt_metadata_type* result);
+bool metadata_type_from_format(const char* format, Py_ssize_t itemsize, __itt_metadata_type* result);
+const char* metadata_type_name(__itt_metadata_type type);
+bool metadata_add_value(const __itt_domain* domain, __itt_id id, PyObject* key, PyObject* value);
+
+PyObject* metadata_add(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+
+} // namespace ittapi
@@ -228,15 +228,14 @@ int exec_pt_region(PyObject* module)
     return pyext::add_type(module, &PT_RegionType);
 }
 
-PyObject* pt_region_begin(PyObject* self, PyObject* args)
+PyObject* pt_region_begin(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
 {
-    PyObject* pt_region = nullptr;
-    if (!PyArg_ParseTuple(args, "O", &pt_region))
+    if (!pyext::check_positional_args("pt_region_begin", nargs, 1, 1))
     {
         return nullptr;
     }
 
-    PT_Region *pt_region_obj = pt_region_check(pt_region);
+    PT_Region *pt_region_obj = pt_region_check(args[0]);
     if (pt_region_obj == nullptr)
     {
         return nullptr;
@@ -247,15 +246,14 @@ PyObject* pt_region_begin(PyObject* self, PyObject* args)
     Py_RETURN_NONE;
 }
 
-PyObject* pt_region_end(PyObject* self, PyObject* args)
+PyObject* pt_region_end(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
 {
-    PyObject* pt_region = nullptr;
-    if (!PyArg_ParseTuple(args, "O", &pt_region))
+    if (!pyext::check_positional_args("pt_region_end", nargs, 1, 1))
     {
         return nullptr;
     }
 
-    PT_Region *pt_region_obj = pt_region_check(pt_region);
+    PT_Region *pt_region_obj = pt_region_check(args[0]);
     if (pt_region_obj == nullptr)
     {
         return nullptr;
@@ -29,7 +29,7 @@ PT_Region* pt_region_obj(PyObject* self)
 	return pyext::pyobject_cast<PT_Region>(self);
 }
 
-PyObject* pt_region_begin(PyObject* self, PyObject* args);
-PyObject* pt_region_end(PyObject* self, PyObject* args);
+PyObject* pt_region_begin(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* pt_region_end(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
 
 } // namespace ittapi
@@ -1,5 +1,7 @@
 #include "string_handle.hpp"
 
+#include <deque>
+
 #include <structmember.h>
 
 #include "extensions/string.hpp"
@@ -18,6 +20,8 @@ PyObject* string_handle_cast(StringHandle* self)
 }
 
 static PyObject* string_handle_new(PyTypeObject* type, PyObject* args, PyObject* kwargs);
+static PyObject* string_handle_vectorcall(PyObject* type, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+static PyObject* string_handle_intern(PyTypeObject* type, PyObject* str);
 static void string_handle_dealloc(PyObject* self);
 
 static PyObject* string_handle_repr(PyObject* self);
@@ -114,18 +118,26 @@ PyTypeObject StringHandleType =
     .tp_version_tag       = 0,
 
     .tp_finalize          = nullptr,
-    .tp_vectorcall        = nullptr,
+    .tp_vectorcall        = string_handle_vectorcall,
 };
 
-static PyObject* string_handle_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
+/**
+ A process-wide intern table of string handles keyed by str objects.
+ All accesses are done under the GIL, therefore the table does not need any additional locking.
+ */
+struct StringHandleCache
 {
-    StringHandle* self = string_handle_obj(type->tp_alloc(type, 0));
+    PyObject* handles;
+    std::deque<PyObject*> keys;     /* the keys of the handles in the insertion order, owned references */
+    Py_ssize_t maxsize;
+    unsigned long long hits;
+    unsigned long long misses;
+};
 
-    if (self == nullptr)
-    {
-        return nullptr;
-    }
+static StringHandleCache string_handle_cache = { nullptr, {}, 0, 0, 0 };
 
+static PyObject* string_handle_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
+{
     char str_key[] = { "str" };
     char* kwlist[] = { str_key, nullptr };
 
@@ -136,18 +148,84 @@ static PyObject* string_handle_new(PyTypeObject* type, PyObject* args, PyObject*
         return nullptr;
     }
 
-    if (str && PyUnicode_Check(str))
+    return string_handle_intern(type, str);
+}
+
+static PyObject* string_handle_vectorcall(PyObject* type, PyObject* const* args, size_t nargsf, PyObject* kwnames)
+{
+    Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+    if (nargs == 1 && kwnames == nullptr)
     {
-        self->str = pyext::new_ref(str);
+        return string_handle_intern(reinterpret_cast<PyTypeObject*>(type), args[0]);
     }
-    else
+
+    return pyext::vectorcall_new(reinterpret_cast<PyTypeObject*>(type), args, nargsf, kwnames);
+}
+
+static int string_handle_cache_evict(Py_ssize_t maxsize)
+{
+    /* The oldest handles are evicted first, the queue of the keys avoids rescanning the deleted dictionary slots. */
+    while (maxsize > 0 && PyDict_GET_SIZE(string_handle_cache.handles) >= maxsize
+           && !string_handle_cache.keys.empty())
     {
-        Py_DecRef(string_handle_cast<PyObject>(self));
+        PyObject* key = string_handle_cache.keys.front();
+        string_handle_cache.keys.pop_front();
+
+        int result = PyDict_DelItem(string_handle_cache.handles, key);
+        Py_DecRef(key);
+        if (result < 0)
+        {
+            return -1;
+        }
+    }
+
+    return 0;
+}
 
+static void string_handle_cache_clear_keys()
+{
+    while (!string_handle_cache.keys.empty())
+    {
+        PyObject* key = string_handle_cache.keys.front();
+        string_handle_cache.keys.pop_front();
+        Py_DecRef(key);
+    }
+}
+
+static PyObject* string_handle_intern(PyTypeObject* type, PyObject* str)
+{
+    if (!PyUnicode_Check(str))
+    {
         PyErr_SetString(PyExc_TypeError, "The passed string to create string handle is not a valid instance of str.");
         return nullptr;
     }
 
+    /* Only exact str instances are interned since str subclasses may redefine hashing and comparison. */
+    bool is_cacheable = string_handle_cache.handles != nullptr && PyUnicode_CheckExact(str);
+    if (is_cacheable)
+    {
+        PyObject* handle = PyDict_GetItemWithError(string_handle_cache.handles, str);
+        if (handle != nullptr)
+        {
+            string_handle_cache.hits++;
+            return pyext::new_ref(handle);
+        }
+        else if (PyErr_Occurred())
+        {
+            return nullptr;
+        }
+
+        string_handle_cache.misses++;
+    }
+
+    StringHandle* self = string_handle_obj(type->tp_alloc(type, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->str = pyext::new_ref(str);
+
     pyext::string str_wrapper = pyext::string::from_unicode(self->str);
     if (str_wrapper.c_str() == nullptr)
     {
@@ -161,6 +239,18 @@ static PyObject* string_handle_new(PyTypeObject* type, PyObject* args, PyObject*
     self->handle = __itt_string_handle_create(str_wrapper.c_str());
 #endif
 
+    if (is_cacheable)
+    {
+        if (string_handle_cache_evict(string_handle_cache.maxsize) < 0
+            || PyDict_SetItem(string_handle_cache.handles, str, string_handle_cast<PyObject>(self)) < 0)
+        {
+            Py_DecRef(string_handle_cast<PyObject>(self));
+            return nullptr;
+        }
+
+        string_handle_cache.keys.push_back(pyext::new_ref(str));
+    }
+
     return string_handle_cast<PyObject>(self);
 }
 
@@ -222,7 +312,79 @@ StringHandle* string_handle_check(PyObject* self)
 
 int exec_string_handle(PyObject* module)
 {
+    if (string_handle_cache.handles == nullptr)
+    {
+        string_handle_cache.handles = PyDict_New();
+        if (string_handle_cache.handles == nullptr)
+        {
+            return -1;
+        }
+    }
+
     return pyext::add_type(module, &StringHandleType);
 }
 
+PyObject* string_handle_from_str(PyObject* str)
+{
+    return string_handle_intern(&StringHandleType, str);
+}
+
+void release_string_handle_cache()
+{
+    string_handle_cache_clear_keys();
+    Py_CLEAR(string_handle_cache.handles);
+}
+
+PyObject* string_handle_cache_info(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    Py_ssize_t size = string_handle_cache.handles ? PyDict_GET_SIZE(string_handle_cache.handles) : 0;
+
+    return Py_BuildValue("(KKnn)", string_handle_cache.hits, string_handle_cache.misses,
+                         string_handle_cache.maxsize, size);
+}
+
+PyObject* string_handle_cache_clear(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    if (string_handle_cache.handles)
+    {
+        PyDict_Clear(string_handle_cache.handles);
+    }
+    string_handle_cache_clear_keys();
+
+    string_handle_cache.hits = 0;
+    string_handle_cache.misses = 0;
+
+    Py_RETURN_NONE;
+}
+
+PyObject* string_handle_cache_limit(PyObject* self, PyObject* maxsize)
+{
+    Py_ssize_t new_maxsize = 0;
+    if (maxsize != Py_None)
+    {
+        new_maxsize = PyLong_AsSsize_t(maxsize);
+        if (new_maxsize == -1 && PyErr_Occurred())
+        {
+            return nullptr;
+        }
+
+        if (new_maxsize < 0)
+        {
+            PyErr_SetString(PyExc_ValueError, "The maximum size of the string handle cache must not be negative.");
+            return nullptr;
+        }
+    }
+
+    string_handle_cache.maxsize = new_maxsize;
+
+    /* Shrink the cache so that the next insertion still keeps it within the limit. */
+    if (string_handle_cache.handles && new_maxsize > 0
+        && string_handle_cache_evict(new_maxsize + 1) < 0)
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
 } // namespace ittapi
@@ -23,6 +23,12 @@ extern PyTypeObject StringHandleType;
 inline StringHandle* string_handle_obj(PyObject* self);
 StringHandle* string_handle_check(PyObject* self);
 int exec_string_handle(PyObject* module);
+PyObject* string_handle_from_str(PyObject* str);
+void release_string_handle_cache();
+
+PyObject* string_handle_cache_info(PyObject* self, PyObject* args);
+PyObject* string_handle_cache_clear(PyObject* self, PyObject* args);
+PyObject* string_handle_cache_limit(PyObject* self, PyObject* maxsize);
 
 
 /* Implementation of inline functions */
@@ -0,0 +1,304 @@
+#include "sync.hpp"
+
+#include <ittnotify.h>
+#include <structmember.h>
+
+#include "string_handle.hpp"
+#include "extensions/string.hpp"
+
+
+namespace ittapi
+{
+
+template<typename T>
+T* sync_cast(Sync* self);
+
+template<>
+PyObject* sync_cast(Sync* self)
+{
+    return reinterpret_cast<PyObject*>(self);
+}
+
+static PyObject* sync_new(PyTypeObject* type, PyObject* args, PyObject* kwargs);
+static void sync_dealloc(PyObject* self);
+
+static PyObject* sync_repr(PyObject* self);
+static PyObject* sync_str(PyObject* self);
+
+static PyObject* sync_prepare(PyObject* self, PyObject* args);
+static PyObject* sync_cancel(PyObject* self, PyObject* args);
+static PyObject* sync_acquired(PyObject* self, PyObject* args);
+static PyObject* sync_releasing(PyObject* self, PyObject* args);
+
+static PyObject* sync_get_str(PyObject* str, const char* kind);
+
+static PyMemberDef sync_attrs[] =
+{
+    {"name",      T_OBJECT_EX, offsetof(Sync, name),     READONLY, "a name of the synchronization object"},
+    {"obj_type",  T_OBJECT_EX, offsetof(Sync, obj_type), READONLY, "a type of the synchronization object"},
+    {nullptr},
+};
+
+static PyMethodDef sync_methods[] =
+{
+    {"prepare",   sync_prepare,   METH_NOARGS, "Marks the beginning of an attempt to acquire the synchronization object."},
+    {"cancel",    sync_cancel,    METH_NOARGS, "Marks that the synchronization object has not been acquired."},
+    {"acquired",  sync_acquired,  METH_NOARGS, "Marks that the synchronization object has been acquired."},
+    {"releasing", sync_releasing, METH_NOARGS, "Marks the beginning of the release of the synchronization object."},
+    {nullptr},
+};
+
+PyTypeObject SyncType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.Sync",
+    .tp_basicsize         = sizeof(Sync),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = sync_dealloc,
+    .tp_vectorcall_offset = 0,
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = nullptr,
+    .tp_repr              = sync_repr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = nullptr,
+    .tp_str               = sync_str,
+    .tp_getattro          = nullptr,
+    .tp_setattro          = nullptr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT,
+
+    /* Documentation string */
+    .tp_doc               = "A class that represents a ITT synchronization object.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = nullptr,
+
+    /* Delete references to contained objects */
+    .tp_clear             = nullptr,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = nullptr,
+    .tp_iternext          = nullptr,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = sync_methods,
+    .tp_members           = sync_attrs,
+    .tp_getset            = nullptr,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = nullptr,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = 0,
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = sync_new,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
+
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = nullptr,
+};
+
+static PyObject* sync_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
+{
+    char name_key[] = { "name" };
+    char obj_type_key[] = { "obj_type" };
+    char barrier_key[] = { "barrier" };
+    char* kwlist[] = { name_key, obj_type_key, barrier_key, nullptr };
+
+    PyObject* name = nullptr;
+    PyObject* obj_type = nullptr;
+    int barrier = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOp", kwlist, &name, &obj_type, &barrier))
+    {
+        return nullptr;
+    }
+
+    Sync* self = sync_obj(type->tp_alloc(type, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->name = name == nullptr || name == Py_None ? PyUnicode_FromString("") : sync_get_str(name, "name");
+    if (self->name == nullptr)
+    {
+        Py_DecRef(sync_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    self->obj_type = obj_type == nullptr || obj_type == Py_None ? PyUnicode_FromString("Sync")
+                                                                : sync_get_str(obj_type, "type");
+    if (self->obj_type == nullptr)
+    {
+        Py_DecRef(sync_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    pyext::string name_str = pyext::string::from_unicode(self->name);
+    if (name_str.c_str() == nullptr)
+    {
+        Py_DecRef(sync_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    pyext::string obj_type_str = pyext::string::from_unicode(self->obj_type);
+    if (obj_type_str.c_str() == nullptr)
+    {
+        Py_DecRef(sync_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    /* The address of the object identifies the synchronization object for the collector */
+    int attribute = barrier ? __itt_attr_barrier : __itt_attr_mutex;
+#if defined(_WIN32)
+    __itt_sync_createW(self, obj_type_str.c_str(), name_str.c_str(), attribute);
+#else
+    __itt_sync_create(self, obj_type_str.c_str(), name_str.c_str(), attribute);
+#endif
+    self->created = true;
+
+    return sync_cast<PyObject>(self);
+}
+
+static void sync_dealloc(PyObject* self)
+{
+    if (self == nullptr)
+    {
+        return;
+    }
+
+    Sync* obj = sync_obj(self);
+    if (obj->created)
+    {
+        __itt_sync_destroy(self);
+    }
+
+    Py_XDECREF(obj->name);
+    Py_XDECREF(obj->obj_type);
+
+    Py_TYPE(self)->tp_free(self);
+}
+
+static PyObject* sync_repr(PyObject* self)
+{
+    Sync* obj = sync_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    return PyUnicode_FromFormat("%s('%U', '%U')", SyncType.tp_name, obj->name, obj->obj_type);
+}
+
+static PyObject* sync_str(PyObject* self)
+{
+    Sync* obj = sync_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    return pyext::new_ref(obj->name);
+}
+
+static PyObject* sync_prepare(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    __itt_sync_prepare(self);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* sync_cancel(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    __itt_sync_cancel(self);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* sync_acquired(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    __itt_sync_acquired(self);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* sync_releasing(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    __itt_sync_releasing(self);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* sync_get_str(PyObject* str, const char* kind)
+{
+    if (PyUnicode_Check(str))
+    {
+        return pyext::new_ref(str);
+    }
+
+    if (Py_TYPE(str) == &StringHandleType)
+    {
+        return pyext::new_ref(string_handle_obj(str)->str);
+    }
+
+    PyErr_Format(PyExc_TypeError, "The passed synchronization object %s is not a valid instance of str or StringHandle.",
+                 kind);
+    return nullptr;
+}
+
+Sync* sync_check(PyObject* self)
+{
+    if (self == nullptr || Py_TYPE(self) != &SyncType)
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed synchronization object is not a valid instance of Sync type.");
+        return nullptr;
+    }
+
+    return sync_obj(self);
+}
+
+int exec_sync(PyObject* module)
+{
+    return pyext::add_type(module, &SyncType);
+}
+
+} // namespace ittapi
@@ -0,0 +1,33 @@
+#pragma once
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "extensions/python.hpp"
+
+
+namespace ittapi
+{
+
+struct Sync
+{
+    PyObject_HEAD
+    PyObject* name;
+    PyObject* obj_type;
+    bool created;       /* the object has been reported to the collector with __itt_sync_create() */
+};
+
+extern PyTypeObject SyncType;
+
+inline Sync* sync_obj(PyObject* self);
+Sync* sync_check(PyObject* self);
+int exec_sync(PyObject* module);
+
+
+/* Implementation of inline functions */
+Sync* sync_obj(PyObject* self)
+{
+    return pyext::pyobject_cast<Sync>(self);
+}
+
+} // namespace ittapi
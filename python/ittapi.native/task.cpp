@@ -1,26 +1,382 @@
 #include "task.hpp"
 
+#include <stddef.h>
+#include <vector>
+
 #include <ittnotify.h>
 
 #include "domain.hpp"
 #include "id.hpp"
+#include "metadata.hpp"
 #include "string_handle.hpp"
 
 namespace ittapi
 {
 
-PyObject* task_begin(PyObject* self, PyObject* args)
+template<typename T>
+T* task_cast(Task* self);
+
+template<>
+PyObject* task_cast(Task* self)
 {
-    PyObject* domain = nullptr;
-    PyObject* name_string_handle = nullptr;
-    PyObject* task_id = nullptr;
-    PyObject* parent_id = nullptr;
+    return reinterpret_cast<PyObject*>(self);
+}
+
+template<typename T>
+T* task_wrapper_cast(TaskWrapper* self);
+
+template<>
+PyObject* task_wrapper_cast(TaskWrapper* self)
+{
+    return reinterpret_cast<PyObject*>(self);
+}
+
+static PyObject* task_new(PyTypeObject* type, PyObject* args, PyObject* kwargs);
+static PyObject* task_vectorcall(PyObject* type, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+static PyObject* task_create(PyTypeObject* type, PyObject* name, PyObject* domain, PyObject* id, PyObject* parent,
+                             int overlapped);
+static void task_dealloc(PyObject* self);
+static PyObject* task_call(PyObject* self, PyObject* args, PyObject* kwargs);
+
+static PyObject* task_repr(PyObject* self);
+static PyObject* task_str(PyObject* self);
+
+static void task_mark_begin(Task* obj);
+static void task_mark_end(Task* obj);
+
+static PyObject* task_method_begin(PyObject* self, PyObject* args);
+static PyObject* task_method_end(PyObject* self, PyObject* args);
+static PyObject* task_method_exit(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+static PyObject* task_method_aenter(PyObject* self, PyObject* args);
+static PyObject* task_method_aexit(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+static PyObject* task_method_name(PyObject* self, PyObject* args);
+static PyObject* task_method_domain(PyObject* self, PyObject* args);
+static PyObject* task_method_id(PyObject* self, PyObject* args);
+static PyObject* task_method_parent_id(PyObject* self, PyObject* args);
+static PyObject* task_method_add_metadata(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+
+static PyObject* task_wrapper_vectorcall(PyObject* self, PyObject* const* args, size_t nargsf, PyObject* kwnames);
+static PyObject* task_wrapper_descr_get(PyObject* self, PyObject* obj, PyObject* type);
+static int task_wrapper_traverse(PyObject* self, visitproc visit, void* arg);
+static int task_wrapper_clear(PyObject* self);
+static void task_wrapper_dealloc(PyObject* self);
+static PyObject* task_wrapper_repr(PyObject* self);
+
+static PyObject* ready_awaitable_await(PyObject* self);
+static PyObject* ready_awaitable_iternext(PyObject* self);
+
+/* The asynchronous tasks that are active in the current context as a linked list of (task, id, previous) */
+static PyObject* async_task_ids = nullptr;
+/* The awaitable that is returned by Task.__aenter__() and Task.__aexit__() */
+static PyObject* ready_awaitable = nullptr;
+/* The marker to create tasks without an id, exported as NO_ID */
+static PyObject* no_id = nullptr;
+
+static PyMethodDef task_methods[] =
+{
+    {"begin",        task_method_begin,                                 METH_NOARGS,   "Marks the beginning of a task."},
+    {"end",          task_method_end,                                   METH_NOARGS,   "Marks the end of a task."},
+    {"__enter__",    task_method_begin,                                 METH_NOARGS,   "Marks the beginning of a task."},
+    {"__exit__",     pyext::pycfunction_cast(task_method_exit),         METH_FASTCALL, "Marks the end of a task."},
+    {"__aenter__",   task_method_aenter,                                METH_NOARGS,   "Marks the beginning of a task that may be suspended."},
+    {"__aexit__",    pyext::pycfunction_cast(task_method_aexit),        METH_FASTCALL, "Marks the end of a task that may be suspended."},
+    {"name",         task_method_name,                                  METH_NOARGS,   "Returns the name of the task."},
+    {"domain",       task_method_domain,                                METH_NOARGS,   "Returns the domain of the task."},
+    {"id",           task_method_id,                                    METH_NOARGS,   "Returns the id of the task."},
+    {"parent_id",    task_method_parent_id,                             METH_NOARGS,   "Returns the parent id for the task."},
+    {"add_metadata", pyext::pycfunction_cast(task_method_add_metadata), METH_FASTCALL, "Adds metadata to the task."},
+    {nullptr},
+};
+
+PyTypeObject TaskType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.Task",
+    .tp_basicsize         = sizeof(Task),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = task_dealloc,
+    .tp_vectorcall_offset = 0,
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = nullptr,
+    .tp_repr              = task_repr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = task_call,
+    .tp_str               = task_str,
+    .tp_getattro          = nullptr,
+    .tp_setattro          = nullptr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT,
+
+    /* Documentation string */
+    .tp_doc               = "A class that represents a ITT task with a known name.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = nullptr,
+
+    /* Delete references to contained objects */
+    .tp_clear             = nullptr,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = nullptr,
+    .tp_iternext          = nullptr,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = task_methods,
+    .tp_members           = nullptr,
+    .tp_getset            = nullptr,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = nullptr,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = 0,
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = task_new,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
+
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = task_vectorcall,
+};
+
+static PyGetSetDef task_wrapper_getset[] =
+{
+    {"__dict__", PyObject_GenericGetDict, PyObject_GenericSetDict, nullptr, nullptr},
+    {nullptr},
+};
+
+PyTypeObject TaskWrapperType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.TaskWrapper",
+    .tp_basicsize         = sizeof(TaskWrapper),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = task_wrapper_dealloc,
+    .tp_vectorcall_offset = offsetof(TaskWrapper, vectorcall),
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = nullptr,
+    .tp_repr              = task_wrapper_repr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = PyVectorcall_Call,
+    .tp_str               = nullptr,
+    .tp_getattro          = PyObject_GenericGetAttr,
+    .tp_setattro          = PyObject_GenericSetAttr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_VECTORCALL,
+
+    /* Documentation string */
+    .tp_doc               = "A wrapper that traces the execution of a callable object with a ITT task.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = task_wrapper_traverse,
+
+    /* Delete references to contained objects */
+    .tp_clear             = task_wrapper_clear,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = nullptr,
+    .tp_iternext          = nullptr,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = nullptr,
+    .tp_members           = nullptr,
+    .tp_getset            = task_wrapper_getset,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = task_wrapper_descr_get,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = offsetof(TaskWrapper, dict),
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = nullptr,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
 
-    if (!PyArg_ParseTuple(args, "OO|OO", &domain, &name_string_handle, &task_id, &parent_id))
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = nullptr,
+};
+
+static PyAsyncMethods ready_awaitable_as_async =
+{
+    .am_await             = ready_awaitable_await,
+    .am_aiter             = nullptr,
+    .am_anext             = nullptr,
+};
+
+static PyTypeObject ReadyAwaitableType =
+{
+    .ob_base              = PyVarObject_HEAD_INIT(nullptr, 0)
+    .tp_name              = "ittapi.native.ReadyAwaitable",
+    .tp_basicsize         = sizeof(PyObject),
+    .tp_itemsize          = 0,
+
+    /* Methods to implement standard operations */
+    .tp_dealloc           = nullptr,
+    .tp_vectorcall_offset = 0,
+    .tp_getattr           = nullptr,
+    .tp_setattr           = nullptr,
+    .tp_as_async          = &ready_awaitable_as_async,
+    .tp_repr              = nullptr,
+
+    /* Method suites for standard classes */
+    .tp_as_number         = nullptr,
+    .tp_as_sequence       = nullptr,
+    .tp_as_mapping        = nullptr,
+
+    /* More standard operations (here for binary compatibility) */
+    .tp_hash              = nullptr,
+    .tp_call              = nullptr,
+    .tp_str               = nullptr,
+    .tp_getattro          = nullptr,
+    .tp_setattro          = nullptr,
+
+    /* Functions to access object as input/output buffer */
+    .tp_as_buffer         = nullptr,
+
+    /* Flags to define presence of optional/expanded features */
+    .tp_flags             = Py_TPFLAGS_DEFAULT,
+
+    /* Documentation string */
+    .tp_doc               = "An awaitable object that completes immediately with None.",
+
+    /* Assigned meaning in release 2.0 call function for all accessible objects */
+    .tp_traverse          = nullptr,
+
+    /* Delete references to contained objects */
+    .tp_clear             = nullptr,
+
+    /* Assigned meaning in release 2.1 rich comparisons */
+    .tp_richcompare       = nullptr,
+
+    /* weak reference enabler */
+    .tp_weaklistoffset    = 0,
+
+    /* Iterators */
+    .tp_iter              = PyObject_SelfIter,
+    .tp_iternext          = ready_awaitable_iternext,
+
+    /* Attribute descriptor and subclassing stuff */
+    .tp_methods           = nullptr,
+    .tp_members           = nullptr,
+    .tp_getset            = nullptr,
+
+    /* Strong reference on a heap type, borrowed reference on a static type */
+    .tp_base              = nullptr,
+    .tp_dict              = nullptr,
+    .tp_descr_get         = nullptr,
+    .tp_descr_set         = nullptr,
+    .tp_dictoffset        = 0,
+    .tp_init              = nullptr,
+    .tp_alloc             = nullptr,
+    .tp_new               = nullptr,
+
+    /* Low-level free-memory routine */
+    .tp_free              = nullptr,
+
+    /* For PyObject_IS_GC */
+    .tp_is_gc             = nullptr,
+    .tp_bases             = nullptr,
+
+    /* method resolution order */
+    .tp_mro               = nullptr,
+    .tp_cache             = nullptr,
+    .tp_subclasses        = nullptr,
+    .tp_weaklist          = nullptr,
+    .tp_del               = nullptr,
+
+    /* Type attribute cache version tag. Added in version 2.6 */
+    .tp_version_tag       = 0,
+
+    .tp_finalize          = nullptr,
+    .tp_vectorcall        = nullptr,
+};
+
+PyObject* task_begin(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("task_begin", nargs, 2, 4))
     {
         return nullptr;
     }
 
+    PyObject* domain = args[0];
+    PyObject* name_string_handle = args[1];
+    PyObject* task_id = nargs > 2 ? args[2] : nullptr;
+    PyObject* parent_id = nargs > 3 ? args[3] : nullptr;
+
     Domain* domain_obj = domain_check(domain);
     if (domain_obj == nullptr)
     {
@@ -62,17 +418,14 @@ PyObject* task_begin(PyObject* self, PyObject* args)
     Py_RETURN_NONE;
 }
 
-PyObject* task_end(PyObject* self, PyObject* args)
+PyObject* task_end(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
 {
-
-    PyObject* domain = nullptr;
-
-    if (!PyArg_ParseTuple(args, "O", &domain))
+    if (!pyext::check_positional_args("task_end", nargs, 1, 1))
     {
         return nullptr;
     }
 
-    Domain* domain_obj = domain_check(domain);
+    Domain* domain_obj = domain_check(args[0]);
     if (domain_obj == nullptr)
     {
         return nullptr;
@@ -83,18 +436,18 @@ PyObject* task_end(PyObject* self, PyObject* args)
     Py_RETURN_NONE;
 }
 
-PyObject* task_begin_overlapped(PyObject* self, PyObject* args)
+PyObject* task_begin_overlapped(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
 {
-    PyObject* domain = nullptr;
-    PyObject* name_string_handle = nullptr;
-    PyObject* task_id = nullptr;
-    PyObject* parent_id = nullptr;
-
-    if (!PyArg_ParseTuple(args, "OOO|O", &domain, &name_string_handle, &task_id, &parent_id))
+    if (!pyext::check_positional_args("task_begin_overlapped", nargs, 3, 4))
     {
         return nullptr;
     }
 
+    PyObject* domain = args[0];
+    PyObject* name_string_handle = args[1];
+    PyObject* task_id = args[2];
+    PyObject* parent_id = nargs > 3 ? args[3] : nullptr;
+
     Domain* domain_obj = domain_check(domain);
     if (domain_obj == nullptr)
     {
@@ -133,24 +486,20 @@ PyObject* task_begin_overlapped(PyObject* self, PyObject* args)
     Py_RETURN_NONE;
 }
 
-PyObject* task_end_overlapped(PyObject* self, PyObject* args)
+PyObject* task_end_overlapped(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
 {
-
-    PyObject* domain = nullptr;
-    PyObject* task_id = nullptr;
-
-    if (!PyArg_ParseTuple(args, "OO", &domain, &task_id))
+    if (!pyext::check_positional_args("task_end_overlapped", nargs, 2, 2))
     {
         return nullptr;
     }
 
-    Domain* domain_obj = domain_check(domain);
+    Domain* domain_obj = domain_check(args[0]);
     if (domain_obj == nullptr)
     {
         return nullptr;
     }
 
-    Id* task_id_obj = id_check(task_id);
+    Id* task_id_obj = id_check(args[1]);
     if (task_id_obj == nullptr)
     {
         return nullptr;
@@ -161,4 +510,683 @@ PyObject* task_end_overlapped(PyObject* self, PyObject* args)
     Py_RETURN_NONE;
 }
 
-} // namespace ittapi
\ No newline at end of file
+static PyObject* task_new(PyTypeObject* type, PyObject* args, PyObject* kwargs)
+{
+    char name_key[] = { "name" };
+    char domain_key[] = { "domain" };
+    char id_key[] = { "id" };
+    char parent_key[] = { "parent" };
+    char overlapped_key[] = { "overlapped" };
+    char* kwlist[] = { name_key, domain_key, id_key, parent_key, overlapped_key, nullptr };
+
+    PyObject* name = nullptr;
+    PyObject* domain = nullptr;
+    PyObject* id = nullptr;
+    PyObject* parent = nullptr;
+    int overlapped = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OOOp", kwlist, &name, &domain, &id, &parent, &overlapped))
+    {
+        return nullptr;
+    }
+
+    return task_create(type, name, domain, id, parent, overlapped);
+}
+
+static PyObject* task_vectorcall(PyObject* type, PyObject* const* args, size_t nargsf, PyObject* kwnames)
+{
+    Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+    if (kwnames != nullptr || nargs < 1 || nargs > 5)
+    {
+        return pyext::vectorcall_new(reinterpret_cast<PyTypeObject*>(type), args, nargsf, kwnames);
+    }
+
+    int overlapped = nargs > 4 ? PyObject_IsTrue(args[4]) : 0;
+    if (overlapped < 0)
+    {
+        return nullptr;
+    }
+
+    return task_create(reinterpret_cast<PyTypeObject*>(type),
+                       args[0],
+                       nargs > 1 ? args[1] : nullptr,
+                       nargs > 2 ? args[2] : nullptr,
+                       nargs > 3 ? args[3] : nullptr,
+                       overlapped);
+}
+
+static PyObject* task_create(PyTypeObject* type, PyObject* name, PyObject* domain, PyObject* id, PyObject* parent,
+                             int overlapped)
+{
+    Task* self = task_obj(type->tp_alloc(type, 0));
+    if (self == nullptr)
+    {
+        return nullptr;
+    }
+
+    self->overlapped = overlapped;
+
+    if (PyUnicode_Check(name))
+    {
+        self->name = string_handle_from_str(name);
+    }
+    else if (Py_TYPE(name) == &StringHandleType)
+    {
+        self->name = pyext::new_ref(name);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed task name is not a valid instance of str or StringHandle.");
+    }
+
+    if (self->name == nullptr)
+    {
+        Py_DecRef(task_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    if (domain == nullptr || domain == Py_None)
+    {
+        self->domain = domain_default();
+    }
+    else if (PyUnicode_Check(domain))
+    {
+        self->domain = PyObject_CallFunctionObjArgs(reinterpret_cast<PyObject*>(&DomainType), domain, nullptr);
+    }
+    else if (Py_TYPE(domain) == &DomainType)
+    {
+        self->domain = pyext::new_ref(domain);
+    }
+    else
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed domain is not a valid instance of str or Domain.");
+    }
+
+    if (self->domain == nullptr)
+    {
+        Py_DecRef(task_cast<PyObject>(self));
+        return nullptr;
+    }
+
+    self->domain_handle = domain_obj(self->domain)->handle;
+    self->name_handle = string_handle_obj(self->name)->handle;
+
+    if (id == nullptr || id == Py_None)
+    {
+        /* The Id object is created only if it is requested, see task_method_id(). */
+        self->id_handle = id_make();
+        self->owns_id = true;
+        __itt_id_create(self->domain_handle, self->id_handle);
+    }
+    else if (id == no_id)
+    {
+        if (self->overlapped)
+        {
+            Py_DecRef(task_cast<PyObject>(self));
+            PyErr_SetString(PyExc_ValueError, "Overlapped tasks cannot be created without an id.");
+            return nullptr;
+        }
+
+        self->id_handle = __itt_null;
+    }
+    else
+    {
+        Id* id_obj = id_check(id);
+        if (id_obj == nullptr)
+        {
+            Py_DecRef(task_cast<PyObject>(self));
+            return nullptr;
+        }
+
+        self->id = pyext::new_ref(id);
+        self->id_handle = id_obj->id;
+    }
+
+    self->parent_id_handle = __itt_null;
+    if (parent != nullptr && parent != Py_None)
+    {
+        PyObject* parent_id = Py_TYPE(parent) == &TaskType ? task_method_id(parent, nullptr) : pyext::new_ref(parent);
+        if (parent_id == nullptr)
+        {
+            Py_DecRef(task_cast<PyObject>(self));
+            return nullptr;
+        }
+
+        if (parent_id != Py_None)
+        {
+            Id* parent_id_obj = id_check(parent_id);
+            if (parent_id_obj == nullptr)
+            {
+                Py_DecRef(parent_id);
+                Py_DecRef(task_cast<PyObject>(self));
+                return nullptr;
+            }
+
+            self->parent_id = parent_id;
+            self->parent_id_handle = parent_id_obj->id;
+        }
+        else
+        {
+            Py_DecRef(parent_id);
+        }
+    }
+
+    return task_cast<PyObject>(self);
+}
+
+static void task_dealloc(PyObject* self)
+{
+    if (self == nullptr)
+    {
+        return;
+    }
+
+    Task* obj = task_obj(self);
+    if (obj->owns_id)
+    {
+        __itt_id_destroy(obj->domain_handle, obj->id_handle);
+    }
+
+    Py_XDECREF(obj->domain);
+    Py_XDECREF(obj->name);
+    Py_XDECREF(obj->id);
+    Py_XDECREF(obj->parent_id);
+
+    Py_TYPE(self)->tp_free(self);
+}
+
+static PyObject* task_call_module_function(const char* module_name, const char* function_name, PyObject* arg1,
+                                           PyObject* arg2)
+{
+    PyObject* module = PyImport_ImportModule(module_name);
+    if (module == nullptr)
+    {
+        return nullptr;
+    }
+
+    PyObject* function = PyObject_GetAttrString(module, function_name);
+    Py_DecRef(module);
+    if (function == nullptr)
+    {
+        return nullptr;
+    }
+
+    PyObject* result = PyObject_CallFunctionObjArgs(function, arg1, arg2, nullptr);
+    Py_DecRef(function);
+
+    return result;
+}
+
+static int task_is_coroutine_function(PyObject* func)
+{
+    PyObject* result = task_call_module_function("inspect", "iscoroutinefunction", func, nullptr);
+    if (result == nullptr)
+    {
+        return -1;
+    }
+
+    int is_coroutine_function = PyObject_IsTrue(result);
+    Py_DecRef(result);
+
+    return is_coroutine_function;
+}
+
+static PyObject* task_call(PyObject* self, PyObject* args, PyObject* kwargs)
+{
+    if (kwargs != nullptr && PyDict_GET_SIZE(kwargs) != 0)
+    {
+        PyErr_SetString(PyExc_TypeError, "Task.__call__() takes no keyword arguments");
+        return nullptr;
+    }
+
+    PyObject* func = nullptr;
+    if (!PyArg_UnpackTuple(args, "Task.__call__", 1, 1, &func))
+    {
+        return nullptr;
+    }
+
+    if (!PyCallable_Check(func))
+    {
+        PyErr_SetString(PyExc_TypeError, "Callable object is expected as a first argument.");
+        return nullptr;
+    }
+
+    int is_coroutine_function = task_is_coroutine_function(func);
+    if (is_coroutine_function < 0)
+    {
+        return nullptr;
+    }
+
+    if (is_coroutine_function)
+    {
+        /* Coroutines are traced with the asynchronous context manager protocol on the Python side */
+        return task_call_module_function("ittapi.region", "_wrap_coroutine_function", self, func);
+    }
+
+    TaskWrapper* wrapper = task_wrapper_obj(TaskWrapperType.tp_alloc(&TaskWrapperType, 0));
+    if (wrapper == nullptr)
+    {
+        return nullptr;
+    }
+
+    wrapper->task = pyext::new_ref(self);
+    wrapper->func = pyext::new_ref(func);
+    wrapper->vectorcall = task_wrapper_vectorcall;
+
+    PyObject* wrapper_obj = task_wrapper_cast<PyObject>(wrapper);
+
+    /* Update the wrapper in the same way as functools.wraps() does */
+    static const char* assigned[] = { "__module__", "__name__", "__qualname__", "__doc__" };
+    for (const char* attr_name : assigned)
+    {
+        PyObject* value = PyObject_GetAttrString(func, attr_name);
+        if (value == nullptr)
+        {
+            if (!PyErr_ExceptionMatches(PyExc_AttributeError))
+            {
+                Py_DecRef(wrapper_obj);
+                return nullptr;
+            }
+
+            PyErr_Clear();
+            continue;
+        }
+
+        int result = PyObject_SetAttrString(wrapper_obj, attr_name, value);
+        Py_DecRef(value);
+        if (result < 0)
+        {
+            Py_DecRef(wrapper_obj);
+            return nullptr;
+        }
+    }
+
+    PyObject* func_dict = PyObject_GetAttrString(func, "__dict__");
+    if (func_dict == nullptr)
+    {
+        if (!PyErr_ExceptionMatches(PyExc_AttributeError))
+        {
+            Py_DecRef(wrapper_obj);
+            return nullptr;
+        }
+
+        PyErr_Clear();
+    }
+    else
+    {
+        PyObject* wrapper_dict = PyObject_GenericGetDict(wrapper_obj, nullptr);
+        int result = wrapper_dict != nullptr ? PyDict_Update(wrapper_dict, func_dict) : -1;
+        Py_XDECREF(wrapper_dict);
+        Py_DecRef(func_dict);
+        if (result < 0)
+        {
+            Py_DecRef(wrapper_obj);
+            return nullptr;
+        }
+    }
+
+    if (PyObject_SetAttrString(wrapper_obj, "__wrapped__", func) < 0)
+    {
+        Py_DecRef(wrapper_obj);
+        return nullptr;
+    }
+
+    return wrapper_obj;
+}
+
+static PyObject* task_repr(PyObject* self)
+{
+    Task* obj = task_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    PyObject* id = task_method_id(self, nullptr);
+    if (id == nullptr)
+    {
+        return nullptr;
+    }
+
+    PyObject* parent_id = obj->parent_id != nullptr ? obj->parent_id : Py_None;
+    PyObject* result = PyUnicode_FromFormat("%s(%R, %R, %R, %R, overlapped=%s)", TaskType.tp_name, obj->name,
+                                            obj->domain, id, parent_id, obj->overlapped ? "True" : "False");
+    Py_DecRef(id);
+
+    return result;
+}
+
+static PyObject* task_str(PyObject* self)
+{
+    Task* obj = task_check(self);
+    if (obj == nullptr)
+    {
+        return nullptr;
+    }
+
+    PyObject* id = task_method_id(self, nullptr);
+    if (id == nullptr)
+    {
+        return nullptr;
+    }
+
+    PyObject* parent_id = obj->parent_id != nullptr ? obj->parent_id : Py_None;
+    PyObject* result = PyUnicode_FromFormat("{ name: '%S', domain: '%S', id: %S, parent_id: %S }", obj->name,
+                                            obj->domain, id, parent_id);
+    Py_DecRef(id);
+
+    return result;
+}
+
+static void task_mark_begin(Task* obj)
+{
+    if (obj->overlapped)
+    {
+        __itt_task_begin_overlapped(obj->domain_handle, obj->id_handle, obj->parent_id_handle, obj->name_handle);
+    }
+    else
+    {
+        __itt_task_begin(obj->domain_handle, obj->id_handle, obj->parent_id_handle, obj->name_handle);
+    }
+}
+
+static void task_mark_end(Task* obj)
+{
+    if (obj->overlapped)
+    {
+        __itt_task_end_overlapped(obj->domain_handle, obj->id_handle);
+    }
+    else
+    {
+        __itt_task_end(obj->domain_handle);
+    }
+}
+
+static PyObject* task_method_begin(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    task_mark_begin(task_obj(self));
+    Py_RETURN_NONE;
+}
+
+static PyObject* task_method_end(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    task_mark_end(task_obj(self));
+    Py_RETURN_NONE;
+}
+
+static PyObject* task_method_exit(PyObject* self, PyObject* const* Py_UNUSED(args), Py_ssize_t Py_UNUSED(nargs))
+{
+    return task_method_end(self, nullptr);
+}
+
+static PyObject* task_method_aenter(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    Task* obj = task_obj(self);
+
+    PyObject* active_ids = nullptr;
+    if (PyContextVar_Get(async_task_ids, Py_None, &active_ids) < 0)
+    {
+        return nullptr;
+    }
+
+    /* Each activation gets its own id, so the task does not depend on the task stack of the thread */
+    PyObject* id = PyObject_CallFunctionObjArgs(reinterpret_cast<PyObject*>(&IdType), obj->domain, nullptr);
+    if (id == nullptr)
+    {
+        Py_DecRef(active_ids);
+        return nullptr;
+    }
+
+    /* The enclosing asynchronous task of the current context is the parent unless the parent is specified */
+    __itt_id parent_id_handle = obj->parent_id_handle;
+    if (obj->parent_id == nullptr && active_ids != Py_None)
+    {
+        parent_id_handle = id_obj(PyTuple_GET_ITEM(active_ids, 1))->id;
+    }
+
+    PyObject* new_active_ids = PyTuple_Pack(3, self, id, active_ids);
+    Py_DecRef(active_ids);
+    PyObject* token = new_active_ids != nullptr ? PyContextVar_Set(async_task_ids, new_active_ids) : nullptr;
+    Py_XDECREF(new_active_ids);
+    if (token == nullptr)
+    {
+        Py_DecRef(id);
+        return nullptr;
+    }
+
+    Py_DecRef(token);
+
+    __itt_task_begin_overlapped(obj->domain_handle, id_obj(id)->id, parent_id_handle, obj->name_handle);
+    Py_DecRef(id);
+
+    return pyext::new_ref(ready_awaitable);
+}
+
+static PyObject* task_method_aexit(PyObject* self, PyObject* const* Py_UNUSED(args), Py_ssize_t Py_UNUSED(nargs))
+{
+    Task* obj = task_obj(self);
+
+    PyObject* active_ids = nullptr;
+    if (PyContextVar_Get(async_task_ids, Py_None, &active_ids) < 0)
+    {
+        return nullptr;
+    }
+
+    /* The innermost activation of the task is ended even if other tasks have been entered after it */
+    std::vector<PyObject*> inner_tasks;
+    PyObject* task_node = active_ids;
+    while (task_node != Py_None && PyTuple_GET_ITEM(task_node, 0) != self)
+    {
+        inner_tasks.push_back(task_node);
+        task_node = PyTuple_GET_ITEM(task_node, 2);
+    }
+
+    if (task_node == Py_None)
+    {
+        Py_DecRef(active_ids);
+        PyErr_SetString(PyExc_RuntimeError, "The task has not been entered with async with in the current context.");
+        return nullptr;
+    }
+
+    __itt_task_end_overlapped(obj->domain_handle, id_obj(PyTuple_GET_ITEM(task_node, 1))->id);
+
+    /* The nodes of the inner tasks are immutable, so they are linked to the rest of the list again */
+    PyObject* new_active_ids = pyext::new_ref(PyTuple_GET_ITEM(task_node, 2));
+    for (auto it = inner_tasks.rbegin(); it != inner_tasks.rend() && new_active_ids != nullptr; ++it)
+    {
+        PyObject* inner_task_node = PyTuple_Pack(3, PyTuple_GET_ITEM(*it, 0), PyTuple_GET_ITEM(*it, 1),
+                                                 new_active_ids);
+        Py_DecRef(new_active_ids);
+        new_active_ids = inner_task_node;
+    }
+    Py_DecRef(active_ids);
+
+    PyObject* token = new_active_ids != nullptr ? PyContextVar_Set(async_task_ids, new_active_ids) : nullptr;
+    Py_XDECREF(new_active_ids);
+    if (token == nullptr)
+    {
+        return nullptr;
+    }
+
+    Py_DecRef(token);
+
+    return pyext::new_ref(ready_awaitable);
+}
+
+static PyObject* ready_awaitable_await(PyObject* self)
+{
+    return pyext::new_ref(self);
+}
+
+static PyObject* ready_awaitable_iternext(PyObject* Py_UNUSED(self))
+{
+    /* The iteration stops immediately without an exception, so the result of await is None */
+    return nullptr;
+}
+
+static PyObject* task_method_name(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return pyext::new_ref(task_obj(self)->name);
+}
+
+static PyObject* task_method_domain(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    return pyext::new_ref(task_obj(self)->domain);
+}
+
+static PyObject* task_method_id(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    Task* obj = task_obj(self);
+    if (obj->id == nullptr && obj->owns_id)
+    {
+        /* Hand the id over to the Id object that destroys it when it is deallocated. */
+        obj->id = id_from_handle(obj->domain, obj->id_handle);
+        if (obj->id == nullptr)
+        {
+            return nullptr;
+        }
+
+        obj->owns_id = false;
+    }
+
+    return pyext::new_ref(obj->id != nullptr ? obj->id : Py_None);
+}
+
+static PyObject* task_method_parent_id(PyObject* self, PyObject* Py_UNUSED(args))
+{
+    Task* obj = task_obj(self);
+    return pyext::new_ref(obj->parent_id != nullptr ? obj->parent_id : Py_None);
+}
+
+static PyObject* task_wrapper_vectorcall(PyObject* self, PyObject* const* args, size_t nargsf, PyObject* kwnames)
+{
+    TaskWrapper* obj = task_wrapper_obj(self);
+
+    task_mark_begin(task_obj(obj->task));
+    PyObject* result = PyObject_Vectorcall(obj->func, args, nargsf, kwnames);
+    task_mark_end(task_obj(obj->task));
+
+    return result;
+}
+
+static PyObject* task_wrapper_descr_get(PyObject* self, PyObject* obj, PyObject* Py_UNUSED(type))
+{
+    /* Bind the wrapper in the same way as a plain function is bound to the instance */
+    if (obj == nullptr || obj == Py_None || PyObject_TypeCheck(task_wrapper_obj(self)->func, &PyStaticMethod_Type))
+    {
+        return pyext::new_ref(self);
+    }
+
+    return PyMethod_New(self, obj);
+}
+
+static int task_wrapper_traverse(PyObject* self, visitproc visit, void* arg)
+{
+    TaskWrapper* obj = task_wrapper_obj(self);
+    Py_VISIT(obj->task);
+    Py_VISIT(obj->func);
+    Py_VISIT(obj->dict);
+    return 0;
+}
+
+static int task_wrapper_clear(PyObject* self)
+{
+    TaskWrapper* obj = task_wrapper_obj(self);
+    Py_CLEAR(obj->task);
+    Py_CLEAR(obj->func);
+    Py_CLEAR(obj->dict);
+    return 0;
+}
+
+static void task_wrapper_dealloc(PyObject* self)
+{
+    PyObject_GC_UnTrack(self);
+    task_wrapper_clear(self);
+    Py_TYPE(self)->tp_free(self);
+}
+
+static PyObject* task_wrapper_repr(PyObject* self)
+{
+    TaskWrapper* obj = task_wrapper_obj(self);
+    return PyUnicode_FromFormat("<%s %R of %R>", TaskWrapperType.tp_name, obj->func, obj->task);
+}
+
+static PyObject* task_method_add_metadata(PyObject* self, PyObject* const* args, Py_ssize_t nargs)
+{
+    if (!pyext::check_positional_args("add_metadata", nargs, 2, 2))
+    {
+        return nullptr;
+    }
+
+    Task* obj = task_obj(self);
+    if (!metadata_add_value(obj->domain_handle, obj->id_handle, args[0], args[1]))
+    {
+        return nullptr;
+    }
+
+    Py_RETURN_NONE;
+}
+
+Task* task_check(PyObject* self)
+{
+    if (self == nullptr || Py_TYPE(self) != &TaskType)
+    {
+        PyErr_SetString(PyExc_TypeError, "The passed task is not a valid instance of Task type.");
+        return nullptr;
+    }
+
+    return task_obj(self);
+}
+
+int exec_task(PyObject* module)
+{
+    if (PyType_Ready(&TaskWrapperType) < 0 || PyType_Ready(&ReadyAwaitableType) < 0)
+    {
+        return -1;
+    }
+
+    if (ready_awaitable == nullptr)
+    {
+        ready_awaitable = ReadyAwaitableType.tp_alloc(&ReadyAwaitableType, 0);
+        if (ready_awaitable == nullptr)
+        {
+            return -1;
+        }
+    }
+
+    if (async_task_ids == nullptr)
+    {
+        async_task_ids = PyContextVar_New("ittapi.async_task_ids", nullptr);
+        if (async_task_ids == nullptr)
+        {
+            return -1;
+        }
+    }
+
+    Py_INCREF(async_task_ids);
+    if (PyModule_AddObject(module, "async_task_ids", async_task_ids) < 0)
+    {
+        Py_DecRef(async_task_ids);
+        return -1;
+    }
+
+    if (no_id == nullptr)
+    {
+        no_id = PyObject_CallObject(reinterpret_cast<PyObject*>(&PyBaseObject_Type), nullptr);
+        if (no_id == nullptr)
+        {
+            return -1;
+        }
+    }
+
+    Py_INCREF(no_id);
+    if (PyModule_AddObject(module, "NO_ID", no_id) < 0)
+    {
+        Py_DecRef(no_id);
+        return -1;
+    }
+
+    return pyext::add_type(module, &TaskType);
+}
+
+} // namespace ittapi
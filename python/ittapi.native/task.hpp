@@ -3,13 +3,61 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 
+#include <ittnotify.h>
+
+#include "extensions/python.hpp"
+
 
 namespace ittapi
 {
 
-PyObject* task_begin(PyObject* self, PyObject* args);
-PyObject* task_end(PyObject* self, PyObject* args);
-PyObject* task_begin_overlapped(PyObject* self, PyObject* args);
-PyObject* task_end_overlapped(PyObject* self, PyObject* args);
+struct Task
+{
+    PyObject_HEAD
+    PyObject* domain;
+    PyObject* name;
+    PyObject* id;
+    PyObject* parent_id;
+    __itt_domain* domain_handle;
+    __itt_string_handle* name_handle;
+    __itt_id id_handle;
+    __itt_id parent_id_handle;
+    bool owns_id;
+    bool overlapped;
+};
+
+struct TaskWrapper
+{
+    PyObject_HEAD
+    PyObject* task;
+    PyObject* func;
+    PyObject* dict;
+    vectorcallfunc vectorcall;
+};
+
+extern PyTypeObject TaskType;
+extern PyTypeObject TaskWrapperType;
+
+inline Task* task_obj(PyObject* self);
+inline TaskWrapper* task_wrapper_obj(PyObject* self);
+Task* task_check(PyObject* self);
+int exec_task(PyObject* module);
+
+PyObject* task_begin(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* task_end(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* task_begin_overlapped(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+PyObject* task_end_overlapped(PyObject* self, PyObject* const* args, Py_ssize_t nargs);
+
+
+/* Implementation of inline functions */
+Task* task_obj(PyObject* self)
+{
+    return pyext::pyobject_cast<Task>(self);
+}
+
+TaskWrapper* task_wrapper_obj(PyObject* self)
+{
+    return pyext::pyobject_cast<TaskWrapper>(self);
+}
 
 } // namespace ittapi
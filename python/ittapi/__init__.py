@@ -5,13 +5,21 @@ This module provides a convenient way to mark up the Python code for further per
 analyzers from Intel like Intel VTune or others.
 """
 
-from ittapi.native import Domain, Id, StringHandle
+from ittapi.native import Counter, Domain, Id, StringHandle
 from ittapi.native import task_begin, task_end, task_begin_overlapped, task_end_overlapped
 from .collection_control import detach, pause, resume, active_region, paused_region, ActiveRegion, PausedRegion
+from .collection_control import is_collector_attached
+from .counter import counter, counter_set_many
 from .event import event, Event
 from .domain import domain
-from .id import id
-from .string_handle import string_handle
+from .frame import frame, frame_submit, get_timestamp, Frame
+from .histogram import histogram, Histogram
+from .id import id, id_pool, IdPool, NO_ID
+from .metadata import metadata_add
+from .multiprocessing import process_naming_initializer
+from .string_handle import string_handle, string_handle_cache_clear, string_handle_cache_info, string_handle_cache_limit
+from .sync import sync
 from .task import NestedTask, OverlappedTask, task, nested_task, overlapped_task
-from .thread_naming import thread_set_name
+from .thread_naming import auto_thread_naming, thread_naming_initializer, thread_set_name
 from .pt_region import pt_region
+from . import autotrace, jit, multiprocessing, threading
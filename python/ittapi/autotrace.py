@@ -0,0 +1,308 @@
+"""
+autotrace.py - Automatic tracing of Python functions as ITT tasks
+
+Selected Python functions are reported as nested ITT tasks without changing their code. On CPython 3.12+ the module
+uses sys.monitoring (PEP 669): the events of the code objects that are not selected are disabled after the first call,
+so unselected code runs at full speed. On older versions sys.setprofile is used as a fallback.
+"""
+import os as _os
+import re as _re
+import sys as _sys
+import threading as _threading
+from fnmatch import translate as _translate
+from weakref import ref as _ref
+
+from ittapi.native import StringHandle as _StringHandle, task_begin as _task_begin, task_end as _task_end
+from ittapi.native import is_collector_attached as _is_collector_attached
+
+from .domain import domain as _domain
+
+
+_ALWAYS_EXCLUDED = ('ittapi',)
+
+
+class _Selector:
+    """
+    A class that selects code objects for tracing and caches the string handles of the selected ones.
+
+    Patterns are matched against qualified names of functions in the form 'module.qualname'. A pattern matches
+    the names that match the glob and all names under them, e.g. 'myapp' matches 'myapp.main' and
+    'myapp.handlers.Handler.process'.
+
+    The cache does not keep the code objects alive: the results are keyed by the ids of the code objects and are
+    removed when the code objects are destroyed.
+    """
+    def __init__(self, include=None, exclude=None) -> None:
+        self._include = self.__compile(include) if include is not None else None
+        self._exclude = self.__compile(_ALWAYS_EXCLUDED + tuple(self.__patterns(exclude or ())))
+        self._handles = {}
+        self._codes = {}
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def select(self, code, module_name):
+        """
+        Selects the code object and caches the result.
+        :param code: a code object
+        :param module_name: a name of the module of the code object
+        :return: the string handle for the name of the code object or None if the code object is not selected
+        """
+        name = getattr(code, 'co_qualname', code.co_name)
+        name = f'{module_name}.{name}' if module_name else name
+        is_selected = ((self._include is None or self._include.match(name) is not None)
+                       and self._exclude.match(name) is None)
+        handle = _StringHandle(name) if is_selected else None
+
+        key = id(code)
+        handles = self._handles
+        codes = self._codes
+
+        def forget(_, key=key) -> None:
+            handles.pop(key, None)
+            codes.pop(key, None)
+
+        # The callback is called while the code object is destroyed, before its id can be reused
+        codes[key] = _ref(code, forget)
+        handles[key] = handle
+        return handle
+
+    def handle(self, code, default=None):
+        """Returns the string handle of the code object, None if it is not selected or default if it is unknown."""
+        return self._handles.get(id(code), default)
+
+    def unselected(self):
+        """Returns a list of the code objects that are alive and are not selected."""
+        codes = (code_ref() for key, code_ref in list(self._codes.items()) if self._handles.get(key, self) is None)
+        return [code for code in codes if code is not None]
+
+    @staticmethod
+    def __patterns(patterns):
+        return (patterns,) if isinstance(patterns, str) else patterns
+
+    @classmethod
+    def __compile(cls, patterns):
+        """Compiles the patterns into a regular expression that also matches the names under the patterns."""
+        regexes = [_translate(name) for pattern in cls.__patterns(patterns) for name in (pattern, pattern + '.*')]
+        return _re.compile('|'.join(regexes) if regexes else '(?!)')
+
+
+class _TaskDepth(_threading.local):
+    """The number of tasks that are begun by the tracer in the current thread."""
+    value = 0
+
+
+class _MonitoringTracer:
+    """
+    A tracer that uses sys.monitoring (CPython 3.12+).
+    """
+    TOOL_NAME = 'ittapi'
+    # The events that are disabled with DISABLE for the code objects that are not selected
+    LOCAL_EVENTS = (_sys.monitoring.events.PY_START | _sys.monitoring.events.PY_RESUME
+                    | _sys.monitoring.events.PY_RETURN | _sys.monitoring.events.PY_YIELD
+                    ) if hasattr(_sys, 'monitoring') else 0
+    EVENTS = (LOCAL_EVENTS | _sys.monitoring.events.PY_UNWIND
+              | _sys.monitoring.events.PY_THROW) if hasattr(_sys, 'monitoring') else 0
+
+    def __init__(self, selector, domain) -> None:
+        self._selector = selector
+        self._domain = domain
+        self._depth = _TaskDepth()
+        self._tool_id = None
+
+    @property
+    def selector(self):
+        """Returns the selector of the code objects."""
+        return self._selector
+
+    def start(self, previous_selector) -> None:
+        """
+        Registers the callbacks and enables the events.
+        :param previous_selector: a selector of the previous tracer or None
+        """
+        monitoring = _sys.monitoring
+        tool_id = monitoring.PROFILER_ID
+        if monitoring.get_tool(tool_id) is not None:
+            raise RuntimeError(f'sys.monitoring tool id {tool_id} is already in use by'
+                               f' {monitoring.get_tool(tool_id)!r}.')
+
+        monitoring.use_tool_id(tool_id, self.TOOL_NAME)
+        self._tool_id = tool_id
+
+        events = monitoring.events
+        monitoring.register_callback(tool_id, events.PY_START, self._on_start)
+        monitoring.register_callback(tool_id, events.PY_RESUME, self._on_start)
+        monitoring.register_callback(tool_id, events.PY_RETURN, self._on_return)
+        monitoring.register_callback(tool_id, events.PY_YIELD, self._on_return)
+        monitoring.register_callback(tool_id, events.PY_UNWIND, self._on_unwind)
+        monitoring.register_callback(tool_id, events.PY_THROW, self._on_throw)
+        if previous_selector is not None:
+            # The events that have been disabled for the previous selection must be enabled again. Changing the local
+            # events of a code object re-instruments it for this tool only, unlike restart_events() that enables
+            # the events that have been disabled by the other tools as well.
+            for code in previous_selector.unselected():
+                monitoring.set_local_events(tool_id, code, self.LOCAL_EVENTS)
+                monitoring.set_local_events(tool_id, code, 0)
+        monitoring.set_events(tool_id, self.EVENTS)
+
+    def stop(self) -> None:
+        """Disables the events and unregisters the callbacks."""
+        monitoring = _sys.monitoring
+        monitoring.set_events(self._tool_id, 0)
+        for event in (monitoring.events.PY_START, monitoring.events.PY_RESUME, monitoring.events.PY_RETURN,
+                      monitoring.events.PY_YIELD, monitoring.events.PY_UNWIND, monitoring.events.PY_THROW):
+            monitoring.register_callback(self._tool_id, event, None)
+        monitoring.free_tool_id(self._tool_id)
+
+    def reset_depth(self) -> None:
+        """Forgets the tasks that have been begun, e.g. in the parent process before fork."""
+        self._depth = _TaskDepth()
+
+    def _on_start(self, code, instruction_offset):
+        handle = self._selector.handle(code, self)
+        if handle is self:
+            # The callback is called from the frame of the started function
+            handle = self._selector.select(code, _sys._getframe(1).f_globals.get('__name__'))  # pylint: disable=W0212
+        if handle is None:
+            return _sys.monitoring.DISABLE
+
+        _task_begin(self._domain, handle)
+        self._depth.value += 1
+        return None
+
+    def _on_return(self, code, instruction_offset, retval):
+        handle = self._selector.handle(code, self)
+        if handle is None:
+            return _sys.monitoring.DISABLE
+
+        # Functions that have been started before the tracer are not selected yet and are not reported
+        if handle is not self and self._depth.value > 0:
+            self._depth.value -= 1
+            _task_end(self._domain)
+        return None
+
+    # PY_UNWIND and PY_THROW cannot be disabled locally, so the checks must be cheap for unselected code objects
+    def _on_unwind(self, code, instruction_offset, exception) -> None:
+        if self._selector.handle(code) is not None and self._depth.value > 0:
+            self._depth.value -= 1
+            _task_end(self._domain)
+
+    def _on_throw(self, code, instruction_offset, exception) -> None:
+        # A generator or a coroutine is resumed with an exception, this is reported as PY_THROW instead of PY_RESUME
+        handle = self._selector.handle(code)
+        if handle is not None:
+            _task_begin(self._domain, handle)
+            self._depth.value += 1
+
+
+class _ProfileTracer:
+    """
+    A tracer that uses sys.setprofile for the versions of Python without sys.monitoring. Threads that are already
+    running are not traced, except the thread that starts the tracer.
+    """
+    def __init__(self, selector, domain) -> None:
+        self._selector = selector
+        self._domain = domain
+        self._depth = _TaskDepth()
+        self._is_active = False
+
+    @property
+    def selector(self):
+        """Returns the selector of the code objects."""
+        return self._selector
+
+    def start(self, previous_selector) -> None:  # pylint: disable=W0613
+        """
+        Installs the profile function for the current and new threads.
+        :param previous_selector: a selector of the previous tracer or None
+        """
+        self._is_active = True
+        _threading.setprofile(self._profile)
+        _sys.setprofile(self._profile)
+
+    def stop(self) -> None:
+        """Removes the profile function. Other threads remove it on the next event."""
+        self._is_active = False
+        _threading.setprofile(None)
+        _sys.setprofile(None)
+
+    def reset_depth(self) -> None:
+        """Forgets the tasks that have been begun, e.g. in the parent process before fork."""
+        self._depth = _TaskDepth()
+
+    def _profile(self, frame, event, arg) -> None:
+        if not self._is_active:
+            _sys.setprofile(None)
+        elif event == 'call':
+            handle = self._selector.handle(frame.f_code, self)
+            if handle is self:
+                handle = self._selector.select(frame.f_code, frame.f_globals.get('__name__'))
+            if handle is not None:
+                _task_begin(self._domain, handle)
+                self._depth.value += 1
+        elif event == 'return':
+            if self._selector.handle(frame.f_code) is not None and self._depth.value > 0:
+                self._depth.value -= 1
+                _task_end(self._domain)
+
+
+_tracer = None
+_tracer_lock = _threading.Lock()
+# The selector of the last disabled tracer, its code objects may have disabled events
+_previous_selector = None
+
+
+def enable(include=None, exclude=None, domain=None) -> bool:
+    """
+    Starts reporting calls of Python functions as nested ITT tasks.
+
+    Functions are selected by their qualified names in the form 'module.qualname' with glob patterns. A pattern
+    selects the names that match it and all names under them, e.g. 'myapp' selects all functions of the myapp package,
+    'myapp.db.Connection' selects all methods of the class.
+    :param include: a pattern or a list of patterns of the functions to trace. If it is None, all functions are traced.
+    :param exclude: a pattern or a list of patterns of the functions to skip
+    :param domain: a domain of the tasks
+    :return: True if the tracing has been started, False if no collector is attached
+    """
+    global _tracer  # pylint: disable=W0603
+    with _tracer_lock:
+        if _tracer is not None:
+            raise RuntimeError('Automatic tracing is already enabled.')
+
+        if not _is_collector_attached():
+            return False
+
+        domain = _domain(domain) if domain is None or isinstance(domain, str) else domain
+        tracer_type = _MonitoringTracer if hasattr(_sys, 'monitoring') else _ProfileTracer
+        tracer = tracer_type(_Selector(include, exclude), domain)
+        tracer.start(_previous_selector)
+        _tracer = tracer
+        return True
+
+
+def disable() -> None:
+    """Stops reporting calls of Python functions."""
+    global _tracer, _previous_selector  # pylint: disable=W0603
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.stop()
+            _previous_selector = _tracer.selector
+            _tracer = None
+
+
+def is_enabled() -> bool:
+    """Returns True if calls of Python functions are reported."""
+    return _tracer is not None
+
+
+def _after_fork_in_child() -> None:
+    global _tracer_lock  # pylint: disable=W0603
+    # The lock may have been held by another thread of the parent process at the moment of fork
+    _tracer_lock = _threading.Lock()
+    if _tracer is not None:
+        # The tasks of the parent process must not be ended in the child process
+        _tracer.reset_depth()
+
+
+if hasattr(_os, 'register_at_fork'):
+    _os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,15 +1,32 @@
 """
 collection_control.py - Python module wrapper for ITT Collection Control API
 """
+from contextvars import ContextVar as _ContextVar
+
+from ittapi.native import active_region_begin as _active_region_begin, active_region_end as _active_region_end
+from ittapi.native import paused_region_begin as _paused_region_begin, paused_region_end as _paused_region_end
 from ittapi.native import detach as _detach, pause as _pause, resume as _resume
+from ittapi.native import is_collector_attached as _is_collector_attached
+from ittapi.native import every_nth_activator as _every_nth_activator, rate_activator as _rate_activator
+from ittapi.native import duty_cycle_activator as _duty_cycle_activator, first_k_activator as _first_k_activator
+
+from .region import _NoOpRegion, _Region
+
 
-from .region import _Region
+# The collection regions that have begun in the current thread or asyncio task, as a linked list of
+# (region, is_active, previous) tuples
+_collection_regions = _ContextVar('ittapi.collection_regions', default=None)
 
 
 class _CollectionRegion(_Region):
     """
     An abstract base class that provides common functionality for subclasses that represent paused/resumed collection
     regions.
+
+    The same region can be entered by several threads or asyncio tasks at the same time and can be nested: each
+    begin() is paired with the matching end() of the same thread or task, even if the regions end out of order.
+    The collection state is decided by the native counters of all active and paused regions together: the collection
+    is paused while any paused region runs and is resumed while an active region runs and no paused region does.
     """
     def __init__(self, func=None, activator=None):
         """
@@ -22,7 +39,6 @@ class _CollectionRegion(_Region):
         """
         super().__init__(func)
         self.activator = activator
-        self.__is_paired_call_needed = False
 
     def _begin(self):
         raise NotImplementedError()
@@ -32,22 +48,39 @@ class _CollectionRegion(_Region):
 
     def begin(self):
         """Marks the beginning of a collection region."""
-        if callable(self.activator):
-            activator_state = self.activator()
-            self.__is_paired_call_needed = activator_state
-
-            if activator_state:
-                self._begin()
-        else:
-            self.__is_paired_call_needed = True
+        is_active = bool(self.activator()) if callable(self.activator) else True
+        _collection_regions.set((self, is_active, _collection_regions.get()))
+        if is_active:
             self._begin()
 
     def end(self):
         """Marks the end of a collection region."""
-        if self.__is_paired_call_needed:
+        # The innermost entry of the region is removed even if other regions have begun after it and not ended yet
+        inner_regions = []
+        regions = _collection_regions.get()
+        while regions is not None and regions[0] is not self:
+            inner_regions.append(regions)
+            regions = regions[2]
+        if regions is None:
+            return
+
+        is_active = regions[1]
+        regions = regions[2]
+        for region, is_inner_active, _ in reversed(inner_regions):
+            regions = (region, is_inner_active, regions)
+        _collection_regions.set(regions)
+        if is_active:
             self._end()
 
 
+def is_collector_attached() -> bool:
+    """
+    Checks if a collector (e.g. Intel VTune Profiler) is attached to the process.
+    :return: True if a collector is attached, otherwise False
+    """
+    return _is_collector_attached()
+
+
 def detach() -> None:
     """Detach collection of profiling data."""
     _detach()
@@ -89,12 +122,72 @@ class ManualCollectionRegionActivator:
         self._state = self.INACTIVE
 
 
+# The sampling activators are implemented in the native module, so checking them does not execute Python code.
+# Each activator counts its calls and activations in the `calls` and `activations` attributes.
+def every_nth_activator(n):
+    """
+    Creates an activator that activates the region for the first call and then for every n-th call.
+    :param n: a sampling period in calls
+    :return: the activator
+    """
+    return _every_nth_activator(n)
+
+
+def rate_activator(rate, seed=None):
+    """
+    Creates an activator that activates the region randomly for the given fraction of calls, e.g. rate=0.01 collects
+    the profiling data for about 1% of requests.
+    :param rate: a probability of the activation in the range [0, 1]
+    :param seed: a seed of the pseudo-random number generator. If it is None, a random seed is used.
+    :return: the activator
+    """
+    return _rate_activator(rate, seed)
+
+
+def duty_cycle_activator(budget, period):
+    """
+    Creates an activator that activates the region during the first `budget` seconds of each `period` seconds
+    counted from the creation of the activator, e.g. budget=1 and period=60 activates the region for the calls that are
+    made within the first second of each minute.
+    :param budget: a duration of the active part of each period in seconds
+    :param period: a duration of the period in seconds
+    :return: the activator
+    """
+    return _duty_cycle_activator(budget, period)
+
+
+def first_k_activator(k):
+    """
+    Creates an activator that activates the region for the first k calls only.
+    :param k: the number of calls to activate the region for
+    :return: the activator
+    """
+    return _first_k_activator(k)
+
+
+class _NoOpCollectionRegion(_NoOpRegion):
+    """
+    A collection region that does nothing. It is returned by active_region() and paused_region() if no collector
+    is attached.
+    """
+    __slots__ = ()
+
+    @property
+    def activator(self):
+        """Returns None, since the region has no activator."""
+        return None
+
+
+_NO_OP_COLLECTION_REGION = _NoOpCollectionRegion()
+
+
 class ActiveRegion(_CollectionRegion):
     """
     A class that represents resumed collection region.
 
     It allows to collect profiling only for this region. The collection of profiling data have to be run in
-    Start Paused mode.
+    Start Paused mode. Active regions of all threads share one reference counter: the collection is paused again only
+    when the last active region ends.
     """
     def __init__(self, func=None, activator=ManualCollectionRegionActivator()):
         """
@@ -109,10 +202,10 @@ class ActiveRegion(_CollectionRegion):
         super().__init__(func, activator)
 
     def _begin(self):
-        resume()
+        _active_region_begin()
 
     def _end(self):
-        pause()
+        _active_region_end()
 
 
 def active_region(func=None, activator=ManualCollectionRegionActivator()):
@@ -124,8 +217,12 @@ def active_region(func=None, activator=ManualCollectionRegionActivator()):
                       False. If the region is active, a call of begin() method of the instance will resume
                       the collection of profiling data and a call of end() method will pause the collection again.
                       Otherwise, these calls do nothing.
-    :return: an instance of ActiveRegion.
+    :return: an instance of ActiveRegion. If no collector is attached, a shared no-op region is returned instead or,
+             if a callable object is passed, the callable object itself.
     """
+    if not _is_collector_attached():
+        return func if callable(func) else _NO_OP_COLLECTION_REGION
+
     return ActiveRegion(func, activator)
 
 
@@ -134,7 +231,8 @@ class PausedRegion(_CollectionRegion):
     A class that represents paused collection region.
 
     An instance of this class allows to disable the collection of profiling data for the code region that is not
-    interested.
+    interested. Paused regions of all threads share one reference counter: the collection is resumed again only when
+    the last paused region ends.
     """
     def __init__(self, func=None, activator=ManualCollectionRegionActivator()):
         """
@@ -149,10 +247,10 @@ class PausedRegion(_CollectionRegion):
         super().__init__(func, activator)
 
     def _begin(self):
-        pause()
+        _paused_region_begin()
 
     def _end(self):
-        resume()
+        _paused_region_end()
 
 
 def paused_region(func=None, activator=ManualCollectionRegionActivator()):
@@ -164,6 +262,10 @@ def paused_region(func=None, activator=ManualCollectionRegionActivator()):
                       False. If the region is active, a call of begin() method for the instance will pause
                       the collection of profiling data and a call of end() method will resume the collection again.
                       Otherwise, these calls do nothing.
-    :return: an instance of PausedRegion.
+    :return: an instance of PausedRegion. If no collector is attached, a shared no-op region is returned instead or,
+             if a callable object is passed, the callable object itself.
     """
+    if not _is_collector_attached():
+        return func if callable(func) else _NO_OP_COLLECTION_REGION
+
     return PausedRegion(func, activator)
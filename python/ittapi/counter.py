@@ -0,0 +1,31 @@
+"""
+counter.py - Python module wrapper for ITT Counter API
+"""
+from ittapi.native import Counter as _Counter
+from ittapi.native import counter_set_many as _counter_set_many
+
+
+def counter(name, domain=None, type='u64'):  # pylint: disable=W0622
+    """
+    Creates a counter with the given name, domain and type.
+
+    Unsigned 64-bit counters are incremented and decremented by the collector, values of other counters are
+    accumulated by the module and are submitted to the collector on each update. The objects that are created for
+    the same counter share its value.
+    :param name: a name of the counter
+    :param domain: a domain of the counter
+    :param type: a type of the counter value: 'u64', 's64', 'u32', 's32', 'u16', 's16', 'float', 'double',
+                 int (the same as 's64') or float (the same as 'double')
+    :return: an instance of Counter that provides `inc(delta=1)`, `dec(delta=1)`, `add(delta)` and `set(value)`
+    """
+    return _Counter(name, domain, type)
+
+
+def counter_set_many(values) -> None:
+    """
+    Sets values of several counters in one call.
+
+    The counters are updated in order, so if the update of a counter fails, the previous counters keep their new values.
+    :param values: a dict that maps counters to their new values or an iterable of (counter, value) pairs
+    """
+    _counter_set_many(values)
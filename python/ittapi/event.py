@@ -3,9 +3,9 @@ event.py - Python module wrapper for ITT Event API
 """
 from functools import partial as _partial
 
-from ittapi.native import Event as _Event
+from ittapi.native import Event as _Event, is_collector_attached as _is_collector_attached
 
-from .region import _CallSite, _NamedRegion
+from .region import _CallSite, _NamedRegion, _NoOpRegion
 
 
 class Event(_NamedRegion):
@@ -35,12 +35,19 @@ class Event(_NamedRegion):
         self._event.end()
 
 
+_NO_OP_EVENT = _NoOpRegion()
+
+
 def event(region=None) -> Event:
     """
     Creates an Event instance.
     :param region: a name of the event or a callable object (e.g. function) to wrap. If the callable object is
                    passed the name of this object is used as a name for the event.
-    :return: an Event instance
+    :return: an Event instance. If no collector is attached, a shared no-op region is returned instead or,
+             if a callable object is passed, the callable object itself.
     """
+    if not _is_collector_attached():
+        return region if callable(region) else _NO_OP_EVENT
+
     region = _CallSite(_CallSite.CallerFrame) if region is None else region
     return Event(region)
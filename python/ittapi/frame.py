@@ -0,0 +1,88 @@
+"""
+frame.py - Python module wrapper for ITT Frame API
+"""
+from ittapi.native import frame_begin as _frame_begin, frame_end as _frame_end, frame_submit as _frame_submit
+from ittapi.native import get_timestamp as _get_timestamp, is_collector_attached as _is_collector_attached
+
+from .domain import domain as _domain
+from .region import _NoOpRegion, _Region
+
+
+class Frame(_Region):
+    """
+    A class that represents ITT Frame.
+
+    Frames represent periods of elapsed time, e.g. processing of a request, a batch or a training step, and are used
+    for frame rate and slow frame analysis. Frames of the same domain are not nested.
+    """
+    def __init__(self, func=None, domain=None, id=None) -> None:
+        """
+        Creates the instance of the class that represents ITT frame.
+        :param func: a callable object (e.g. function) to wrap
+        :param domain: a frame domain
+        :param id: a frame id to distinguish frames that run concurrently in the same domain
+        """
+        super().__init__(func)
+
+        self._domain = _domain(domain) if domain is None or isinstance(domain, str) else domain
+        self._id = id
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({repr(self._domain)}, {repr(self._id)})'
+
+    def domain(self):
+        """Returns the domain of the frame."""
+        return self._domain
+
+    def id(self):
+        """Returns the id of the frame."""
+        return self._id
+
+    def begin(self) -> None:
+        """Marks the beginning of a frame."""
+        _frame_begin(self._domain, self._id)
+
+    def end(self) -> None:
+        """Marks the end of a frame."""
+        _frame_end(self._domain, self._id)
+
+
+_NO_OP_FRAME = _NoOpRegion()
+
+
+def frame(domain=None, id=None):
+    """
+    Creates a Frame instance.
+    :param domain: a frame domain or a callable object (e.g. function) to wrap. If the callable object is passed
+                   the frame is attributed to the default domain.
+    :param id: a frame id to distinguish frames that run concurrently in the same domain
+    :return: a Frame instance. If no collector is attached, a shared no-op region is returned instead or,
+             if a callable object is passed, the callable object itself.
+    """
+    if not _is_collector_attached():
+        return domain if callable(domain) else _NO_OP_FRAME
+
+    if callable(domain):
+        return Frame(domain, None, id)
+
+    return Frame(None, domain, id)
+
+
+def frame_submit(domain, begin, end=None, id=None) -> None:
+    """
+    Submits a frame with the given timestamps, e.g. for frames that are reported after the fact.
+    :param domain: a frame domain
+    :param begin: a timestamp of the beginning of the frame, see get_timestamp()
+    :param end: a timestamp of the end of the frame or None to use the current timestamp
+    :param id: a frame id to distinguish frames that run concurrently in the same domain
+    """
+    domain = _domain(domain) if domain is None or isinstance(domain, str) else domain
+    _frame_submit(domain, begin, end, id)
+
+
+def get_timestamp() -> int:
+    """
+    Returns the current timestamp in the units that are used by the collector.
+    :return: the timestamp or 0 if no collector is attached or the collector does not provide timestamps
+    """
+    return _get_timestamp()
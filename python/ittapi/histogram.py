@@ -0,0 +1,127 @@
+"""
+histogram.py - Python module wrapper for ITT Histogram API
+"""
+from array import array as _array
+from bisect import bisect_left as _bisect_left
+import threading as _threading
+
+from ittapi.native import Histogram as _Histogram
+
+from .domain import domain as _domain
+
+
+# Typecodes of array.array that match the histogram axis types
+_TYPECODES = {
+    'u64': 'Q', 's64': 'q', 'u32': 'I', 's32': 'i', 'u16': 'H', 's16': 'h', 'float': 'f', 'double': 'd',
+    int: 'q', float: 'd',
+}
+
+
+class Histogram:
+    """
+    A class that represents ITT Histogram.
+
+    The data of the histogram can be submitted directly as X and Y axis buffers (e.g. `array.array` or NumPy arrays)
+    that are passed to the collector without copying, or can be collected as scalar observations with `observe()` that
+    are binned on the Python side and are submitted in bulk with `flush()`.
+    """
+    def __init__(self, domain, name, x_type='u64', y_type='u64', bins=None) -> None:
+        """
+        Creates the instance of the class that represents ITT histogram.
+        :param domain: a histogram domain
+        :param name: a histogram name
+        :param x_type: a type of the X axis values: 'u64', 's64', 'u32', 's32', 'u16', 's16', 'float', 'double',
+                       int or float. If it is None, the histogram has no X axis and the collector calculates batch
+                       statistics for the Y axis values.
+        :param y_type: a type of the Y axis values
+        :param bins: sorted upper bounds of the bins for the observations. The observations that are greater than
+                     the last bound are counted in the last bin. If it is None, each distinct observed value has its
+                     own bin.
+        """
+        domain = _domain(domain) if domain is None or isinstance(domain, str) else domain
+        self._histogram = _Histogram(domain, name, x_type, y_type)
+        self._x_type = x_type
+        self._y_type = y_type
+        self._bins = list(bins) if bins is not None else None
+        if self._bins is not None and (x_type is None or not self._bins):
+            raise ValueError('bins require a histogram with X axis and at least one bound.')
+        self._counts = [0] * len(self._bins) if self._bins is not None else {}
+        self._values = []
+        self._lock = _threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({repr(self._histogram)})'
+
+    def __str__(self) -> str:
+        return str(self._histogram)
+
+    def domain(self):
+        """Returns the domain of the histogram."""
+        return self._histogram.domain
+
+    def name(self):
+        """Returns the name of the histogram."""
+        return self._histogram.name
+
+    def submit(self, x, y) -> None:
+        """
+        Submits X and Y axis data of the histogram.
+        :param x: a contiguous buffer of X axis values or None if the histogram has no X axis
+        :param y: a contiguous buffer of Y axis values of the same length
+        """
+        self._histogram.submit(x, y)
+
+    def observe(self, value, count=1) -> None:
+        """
+        Adds an observation to the histogram. The observations are submitted with flush(). It can be called from
+        several threads.
+        :param value: an observed value. If the histogram has no X axis, the value is collected as is.
+        :param count: a number of the observations of the value
+        """
+        with self._lock:
+            if self._x_type is None:
+                self._values.extend([value] * count)
+            elif self._bins is not None:
+                self._counts[min(_bisect_left(self._bins, value), len(self._bins) - 1)] += count
+            else:
+                self._counts[value] = self._counts.get(value, 0) + count
+
+    def flush(self) -> None:
+        """
+        Submits the collected observations and resets them. If the observations cannot be converted to the axis
+        types, the exception is raised and the observations are kept.
+        """
+        with self._lock:
+            if self._x_type is None:
+                if not self._values:
+                    return
+                x = None
+                y = _array(_TYPECODES[self._y_type], self._values)
+                self._values = []
+            elif self._bins is not None:
+                if not any(self._counts):
+                    return
+                x = _array(_TYPECODES[self._x_type], self._bins)
+                y = _array(_TYPECODES[self._y_type], self._counts)
+                self._counts = [0] * len(self._bins)
+            else:
+                if not self._counts:
+                    return
+                values = sorted(self._counts)
+                x = _array(_TYPECODES[self._x_type], values)
+                y = _array(_TYPECODES[self._y_type], [self._counts[value] for value in values])
+                self._counts = {}
+        self._histogram.submit(x, y)
+
+
+def histogram(domain, name, x_type='u64', y_type='u64', bins=None) -> Histogram:
+    """
+    Creates a Histogram instance.
+    :param domain: a histogram domain
+    :param name: a histogram name
+    :param x_type: a type of the X axis values or None to calculate batch statistics for the Y axis values
+    :param y_type: a type of the Y axis values
+    :param bins: sorted upper bounds of the bins for the observations or None to give each distinct value its own bin
+    :return: a Histogram instance
+    """
+    return Histogram(domain, name, x_type, y_type, bins)
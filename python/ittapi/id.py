@@ -1,7 +1,13 @@
 """
 id.py - Python module wrapper for ITT ID API
 """
-from ittapi.native import Id as _Id
+from ittapi.native import Id as _Id, NO_ID as _NO_ID
+
+from .domain import domain as _domain
+
+
+NO_ID = _NO_ID
+"""A marker to create tasks without an identifier, e.g. nested tasks that do not need a parent/child relation."""
 
 
 def id(domain):
@@ -11,3 +17,68 @@ def id(domain):
     :return: an instance of the identifier
     """
     return _Id(domain)
+
+
+class IdPool:
+    """
+    A class that represents a pool of reusable identifiers.
+
+    Creation and destruction of an identifier are ITT calls, so short-lived tasks that take their identifiers from
+    a pool avoid both calls together with the allocation of the identifier object. An identifier is taken from
+    the pool when the task begins and is returned to the pool when the task ends, therefore the identifiers are unique
+    among the running tasks.
+    """
+    def __init__(self, domain=None, capacity=64) -> None:
+        """
+        Creates a pool of identifiers.
+        :param domain: a domain that controls the creation of the identifiers
+        :param capacity: a maximum number of free identifiers kept by the pool
+        """
+        if capacity < 0:
+            raise ValueError('capacity must be a non-negative integer.')
+
+        self._domain = _domain(domain) if domain is None or isinstance(domain, str) else domain
+        self._capacity = capacity
+        self._free = []
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({repr(self._domain)}, {self._capacity})'
+
+    def domain(self):
+        """Returns the domain of the identifiers."""
+        return self._domain
+
+    def capacity(self) -> int:
+        """Returns the maximum number of free identifiers kept by the pool."""
+        return self._capacity
+
+    def acquire(self):
+        """
+        Takes a free identifier from the pool or creates a new one if the pool is empty.
+        :return: an instance of the identifier
+        """
+        try:
+            return self._free.pop()
+        except IndexError:
+            return _Id(self._domain)
+
+    def release(self, id) -> None:
+        """
+        Returns the identifier to the pool. The identifier is destroyed if the pool is full.
+        :param id: an identifier that was taken from the pool
+        """
+        if len(self._free) < self._capacity:
+            self._free.append(id)
+
+
+def id_pool(domain=None, capacity=64):
+    """
+    Creates a pool of reusable identifiers.
+    :param domain: a domain that controls the creation of the identifiers
+    :param capacity: a maximum number of free identifiers kept by the pool
+    :return: an instance of IdPool
+    """
+    return IdPool(domain, capacity)
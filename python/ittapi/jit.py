@@ -0,0 +1,220 @@
+"""
+jit.py - Python module wrapper for ITT JIT Profiling API
+
+Besides the bindings for reporting dynamically generated code, the module can report Python functions to the JIT
+profiling agent. On CPython 3.12+ the perf trampoline (sys.activate_stack_trampoline) gives each Python code object
+its own native code region and writes the regions to the perf map file of the process. The entries of this file are
+reported as JIT methods, so native stacks collected by the profiler show the names of Python functions instead of
+the frames of the interpreter loop.
+"""
+import atexit as _atexit
+import os as _os
+import sys as _sys
+import threading as _threading
+
+from ittapi.native import jit_is_profiling_active as _jit_is_profiling_active
+from ittapi.native import jit_load_method as _jit_load_method, jit_shutdown as _jit_shutdown
+
+
+def is_profiling_active() -> bool:
+    """Returns True if a JIT profiling agent (e.g. Intel VTune Profiler) is attached to the process."""
+    return _jit_is_profiling_active()
+
+
+def load_method(name, address, size, source_file=None) -> int:
+    """
+    Reports a code region of a dynamically generated method.
+    :param name: a name of the method
+    :param address: the start address of the code region
+    :param size: the size of the code region in bytes
+    :param source_file: a name of the source file of the method
+    :return: the id of the reported method
+    """
+    return _jit_load_method(name, address, size, source_file)
+
+
+def shutdown() -> None:
+    """Notifies the JIT profiling agent that profiling is being shut down."""
+    _jit_shutdown()
+
+
+class _PerfMapReporter:
+    """
+    A class that reports the entries of a perf map file as JIT methods.
+
+    Each line of the file has the form '<address> <size> <name>', where the address and the size are hexadecimal
+    numbers. The names of the entries that are written for Python functions have the form
+    'py::<qualified name>:<file name>', other entries are reported as is.
+    """
+    PYTHON_ENTRY_PREFIX = 'py::'
+
+    def __init__(self, path) -> None:
+        self._path = path
+        self._offset = 0
+        self._lock = _threading.Lock()
+
+    def path(self):
+        """Returns the path of the perf map file."""
+        return self._path
+
+    def poll(self) -> int:
+        """
+        Reports the entries that have been written to the file since the previous call.
+        :return: the number of the reported entries
+        """
+        with self._lock:
+            try:
+                with open(self._path, 'rb') as perf_map:
+                    perf_map.seek(self._offset)
+                    data = perf_map.read()
+            except FileNotFoundError:
+                return 0
+
+            # The last line may be incomplete, it is read again by the next call
+            complete_size = data.rfind(b'\n') + 1
+            self._offset += complete_size
+
+            reported = 0
+            for line in data[:complete_size].decode('utf-8', errors='replace').splitlines():
+                if self._report_entry(line):
+                    reported += 1
+            return reported
+
+    @classmethod
+    def _report_entry(cls, line) -> bool:
+        """Reports a single entry of the perf map file."""
+        fields = line.split(' ', 2)
+        if len(fields) != 3:
+            return False
+
+        try:
+            address = int(fields[0], 16)
+            size = int(fields[1], 16)
+        except ValueError:
+            return False
+
+        if address == 0 or size == 0:
+            return False
+
+        name, source_file = fields[2], None
+        if name.startswith(cls.PYTHON_ENTRY_PREFIX):
+            name, _, source_file = name[len(cls.PYTHON_ENTRY_PREFIX):].partition(':')
+
+        _jit_load_method(name, address, size, source_file or None)
+        return True
+
+
+class _PythonSymbols:
+    """
+    A class that activates the perf trampoline and periodically reports new Python functions.
+    """
+    def __init__(self, interval) -> None:
+        self._reporter = _PerfMapReporter(f'/tmp/perf-{_os.getpid()}.map')
+        self._interval = interval
+        self._stop_event = _threading.Event()
+        self._thread = None
+        self._is_trampoline_owner = False
+
+    def start(self) -> None:
+        """Activates the perf trampoline and starts the thread that reports new Python functions."""
+        if not _sys.is_stack_trampoline_active():
+            _sys.activate_stack_trampoline('perf')
+            self._is_trampoline_owner = True
+
+        self._reporter.poll()
+        self._stop_event = _threading.Event()
+        self._thread = _threading.Thread(target=self._run, name='ittapi.jit', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the reporting thread, reports remaining Python functions and deactivates the perf trampoline."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not _threading.current_thread():
+            self._thread.join()
+
+        if self._is_trampoline_owner:
+            _sys.deactivate_stack_trampoline()
+        self._reporter.poll()
+
+    def restart_in_child(self) -> None:
+        """
+        Restarts the reporting in a forked child process. The perf trampoline remains active in the child, but it
+        writes to the perf map file of the child process, and the reporting thread of the parent does not exist.
+        """
+        self._reporter = _PerfMapReporter(f'/tmp/perf-{_os.getpid()}.map')
+        self.start()
+
+    def flush(self) -> int:
+        """Reports new Python functions immediately."""
+        return self._reporter.poll()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            self._reporter.poll()
+
+
+_python_symbols = None
+_python_symbols_lock = _threading.Lock()
+
+
+def enable(interval=0.1) -> bool:
+    """
+    Starts reporting Python functions to the JIT profiling agent, so native stacks collected by the profiler show
+    the names of Python functions. Functions are reported when they are executed for the first time, the reporting
+    thread checks for new functions every `interval` seconds.
+    Requires CPython 3.12+ with the perf trampoline support (Linux).
+    :param interval: a period of checks for new Python functions in seconds
+    :return: True if the reporting has been started, False if no JIT profiling agent is attached
+    """
+    global _python_symbols  # pylint: disable=W0603
+    with _python_symbols_lock:
+        if _python_symbols is not None:
+            return True
+
+        if not _jit_is_profiling_active():
+            return False
+
+        if not hasattr(_sys, 'activate_stack_trampoline'):
+            raise RuntimeError('Reporting of Python functions requires CPython 3.12 or later'
+                               ' with the perf trampoline support.')
+
+        python_symbols = _PythonSymbols(interval)
+        python_symbols.start()
+        _python_symbols = python_symbols
+        return True
+
+
+def disable() -> None:
+    """Stops reporting Python functions to the JIT profiling agent."""
+    global _python_symbols  # pylint: disable=W0603
+    with _python_symbols_lock:
+        if _python_symbols is not None:
+            _python_symbols.stop()
+            _python_symbols = None
+
+
+def is_enabled() -> bool:
+    """Returns True if Python functions are reported to the JIT profiling agent."""
+    return _python_symbols is not None
+
+
+def flush() -> int:
+    """
+    Reports Python functions that have been executed for the first time since the last check immediately.
+    :return: the number of the reported functions
+    """
+    python_symbols = _python_symbols
+    return python_symbols.flush() if python_symbols is not None else 0
+
+
+def _after_fork_in_child() -> None:
+    global _python_symbols_lock  # pylint: disable=W0603
+    # The lock may have been held by another thread of the parent process at the moment of fork
+    _python_symbols_lock = _threading.Lock()
+    if _python_symbols is not None:
+        _python_symbols.restart_in_child()
+
+
+_atexit.register(disable)
+if hasattr(_os, 'register_at_fork'):
+    _os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,22 @@
+"""
+metadata.py - Python module wrapper for ITT Metadata API
+"""
+from ittapi.native import metadata_add as _metadata_add
+
+from .domain import domain as _domain
+
+
+def metadata_add(domain, id, key, values) -> None:  # pylint: disable=W0622
+    """
+    Adds metadata to an instance of a named entity (e.g. a task).
+
+    Objects that support the buffer protocol (e.g. `array.array`, `memoryview` or NumPy arrays) are passed to
+    the collector without copying, the metadata type is derived from the format of the buffer items. Byte buffers
+    and strings are added as string metadata.
+    :param domain: a domain of the entity
+    :param id: an id of the entity or None for the current task
+    :param key: a metadata key (a string or a string handle)
+    :param values: an int, a float, a str or a contiguous buffer of 16, 32 or 64-bit integers, floats or doubles
+    """
+    domain = _domain(domain) if domain is None or isinstance(domain, str) else domain
+    _metadata_add(domain, id, key, values)
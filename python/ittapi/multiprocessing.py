@@ -0,0 +1,41 @@
+"""
+multiprocessing.py - Initializers for process pools
+
+ITT API has no API for naming processes: analyzers identify processes by their PIDs and command lines. The initializer
+of this module names the main thread of each worker process after the process (multiprocessing.current_process().name),
+so the workers of a pool can be told apart in the analyzer.
+"""
+import multiprocessing as _multiprocessing
+
+from ittapi.native import thread_set_name as _thread_set_name
+
+from .thread_naming import auto_thread_naming as _auto_thread_naming
+
+
+class _ProcessNamingInitializer:
+    """
+    A picklable initializer of a process pool. It is passed to the worker processes that are started with the 'spawn'
+    or 'forkserver' start methods, so it cannot be a closure.
+    """
+    def __init__(self, initializer, auto_thread_naming) -> None:
+        self._initializer = initializer
+        self._auto_thread_naming = auto_thread_naming
+
+    def __call__(self, *args) -> None:
+        if self._auto_thread_naming:
+            _auto_thread_naming()
+        _thread_set_name(_multiprocessing.current_process().name)
+        if self._initializer is not None:
+            self._initializer(*args)
+
+
+def process_naming_initializer(initializer=None, auto_thread_naming=True):
+    """
+    Creates an initializer for process pools (e.g. concurrent.futures.ProcessPoolExecutor or multiprocessing.Pool)
+    that sets the name of the main thread of each worker process to the name of the process, e.g.
+    ProcessPoolExecutor(initializer=ittapi.process_naming_initializer()).
+    :param initializer: an initializer of the pool to call after the process is named. It must be picklable.
+    :param auto_thread_naming: determines if the automatic naming of threads should be enabled in the worker processes
+    :return: the initializer that accepts the same arguments as the given one
+    """
+    return _ProcessNamingInitializer(initializer, auto_thread_naming)
@@ -3,8 +3,9 @@ pt_region.py - Python module wrapper for process trace control region(PT_Region)
 """
 
 from ittapi.native import PT_Region as _PT_Region, pt_region_begin as _pt_region_begin, pt_region_end as _pt_region_end
+from ittapi.native import is_collector_attached as _is_collector_attached
 
-from .region import _CallSite, _NamedRegion
+from .region import _CallSite, _NamedRegion, _NoOpRegion
 
 class PT_Region(_NamedRegion):
     """
@@ -37,11 +38,28 @@ class PT_Region(_NamedRegion):
     def get_pt_region(self):
         return self._region
 
+class _NoOpPT_Region(_NoOpRegion):
+    """
+    A pt_region that does nothing. It is returned by pt_region() if no collector is attached.
+    """
+    __slots__ = ()
+
+    def get_pt_region(self):
+        return None
+
+
+_NO_OP_PT_REGION = _NoOpPT_Region()
+
+
 def pt_region(pt_region=None):
     """
     Creates a PT_Region instance with the given arguments.
     :param pt_region: a name of the pt_region or a callable object
-    :return: a PT_Region instance
+    :return: a PT_Region instance. If no collector is attached, a shared no-op region is returned instead or,
+             if a callable object is passed, the callable object itself.
     """
+    if not _is_collector_attached():
+        return pt_region if callable(pt_region) else _NO_OP_PT_REGION
+
     region = _CallSite(_CallSite.CallerFrame) if pt_region is None else pt_region
     return PT_Region(region)
@@ -1,9 +1,11 @@
 """
 region.py - Python module wrapper for code region
 """
-from functools import partial as _partial, wraps as _wraps
-from inspect import stack as _stack
+from functools import lru_cache as _lru_cache, partial as _partial, wraps as _wraps
+import inspect as _inspect
 from os.path import basename as _basename
+from sys import _getframe
+from types import MethodType as _MethodType
 
 from .string_handle import string_handle as _string_handle
 
@@ -24,17 +26,28 @@ class _Region:
         """
         self.__function = func
         self.__deferred_wrap_callback_function = deferred_wrap_callback
+        self.__descriptor_wrapper = None
 
         if self.__function is None:
             self.__call_target = self.__wrap
         elif callable(self.__function):
             self.__call_target = self.__get_wrapper(self.__function)
             _wraps(self.__function, updated=())(self)
+            if _inspect.iscoroutinefunction(self.__function):
+                _mark_coroutine_function(self)
         else:
             raise TypeError('func must be a callable object or None.')
 
     def __get__(self, obj, objtype):
-        return _wraps(self)(self.__get_wrapper(self.__function, obj))
+        if self.__descriptor_wrapper is None:
+            wrapper = self.__get_wrapper(self.__function)
+            self.__descriptor_wrapper = _wraps(self.__function)(wrapper)
+
+        if obj is None or isinstance(self.__function, staticmethod):
+            return self.__descriptor_wrapper
+
+        # Bind the wrapper in the same way as a plain function is bound to the instance
+        return _MethodType(self.__descriptor_wrapper, obj)
 
     def __enter__(self) -> None:
         self.begin()
@@ -42,6 +55,12 @@ class _Region:
     def __exit__(self, *args) -> None:
         self.end()
 
+    async def __aenter__(self) -> None:
+        self._begin_async()
+
+    async def __aexit__(self, *args) -> None:
+        self._end_async()
+
     def __call__(self, *args, **kwargs):
         return self.__call_target(*args, **kwargs)
 
@@ -53,6 +72,14 @@ class _Region:
         """Marks the end of a code region."""
         raise NotImplementedError()
 
+    def _begin_async(self) -> None:
+        """Marks the beginning of a code region that may be suspended, e.g. the body of `async with`."""
+        self.begin()
+
+    def _end_async(self) -> None:
+        """Marks the end of a code region that may be suspended."""
+        self.end()
+
     def __wrap(self, func):
         """
         Wraps a callable object.
@@ -75,16 +102,18 @@ class _Region:
         if callable(self.__deferred_wrap_callback_function):
             self.__deferred_wrap_callback_function(self.__function)
 
-    def __get_wrapper(self, func, obj=None):
+    def __get_wrapper(self, func):
         """
         Returns a pure wrapper for a callable object.
         :param func: the callable object to wrap
-        :param obj: an object to which the callable object is bound
         :return: the wrapper to trace the execution of the callable object
         """
         if not callable(func):
             raise TypeError('Callable object is expected to be passed.')
 
+        if _inspect.iscoroutinefunction(func):
+            return _wrap_coroutine_function(self, func)
+
         def _function_wrapper(*args, **kwargs):
             """
             A wrapper to trace the execution of a callable object
@@ -101,23 +130,62 @@ class _Region:
 
             return func_result
 
-        def _method_wrapper(*args, **kwargs):
-            """
-            A wrapper to trace the execution of a class method
-            :param args: positional arguments of the class method
-            :param kwargs: keyword arguments of the class method
-            :return: result of a call of the class method
-            """
-            self.begin()
+        return _function_wrapper
 
-            try:
-                func_result = func(obj, *args, **kwargs)
-            finally:
-                self.end()
 
-            return func_result
+def _wrap_coroutine_function(region, func):
+    """
+    Returns a wrapper for a coroutine function that traces the execution of the coroutine including its suspensions.
+    :param region: a code region that supports the asynchronous context manager protocol
+    :param func: the coroutine function to wrap
+    :return: the coroutine function that awaits the wrapped one inside the code region
+    """
+    async def _coroutine_wrapper(*args, **kwargs):
+        async with region:
+            return await func(*args, **kwargs)
 
-        return _function_wrapper if obj is None or isinstance(func, staticmethod) else _method_wrapper
+    return _wraps(func)(_coroutine_wrapper)
+
+
+def _mark_coroutine_function(obj) -> None:
+    """Marks a callable object that returns coroutines, so inspect.iscoroutinefunction() returns True for it."""
+    if hasattr(_inspect, 'markcoroutinefunction'):
+        _inspect.markcoroutinefunction(obj)
+
+
+class _NoOpRegion:
+    """
+    A code region that does nothing.
+
+    The high-level constructors return shared instances of the subclasses instead of real regions when no collector
+    is attached to the process, so the markup costs only the constructor call. When the instance is used as
+    a decorator, the original callable object is returned unchanged.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    async def __aenter__(self) -> None:
+        pass
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    def __call__(self, func):
+        return func
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}()'
+
+    def begin(self) -> None:
+        """Does nothing."""
+
+    def end(self) -> None:
+        """Does nothing."""
 
 
 class _CallSite:
@@ -126,23 +194,38 @@ class _CallSite:
     """
     CallerFrame = 1
 
+    # The maximum number of cached string handles for call site names
+    NameCacheSize = 1024
+
     def __init__(self, frame_number: int) -> None:
         """
         Creates a call site.
         :param frame_number: relative frame number that should be used to extract the information about the call site
         """
-        caller = _stack()[frame_number+1]
-        self._filename = _basename(caller.filename)
-        self._lineno = caller.lineno
+        caller = _getframe(frame_number + 1)
+        self._code = caller.f_code
+        self._lineno = caller.f_lineno
 
     def filename(self):
         """Returns filename for the call site."""
-        return self._filename
+        return _basename(self._code.co_filename)
 
     def lineno(self):
         """Returns line number for the call site."""
         return self._lineno
 
+    def name(self):
+        """
+        Returns a string handle for the name of the call site. The handles are kept in a bounded LRU cache keyed by
+        (file name, line number), so the handle is created once per recently used call site.
+        """
+        return _CallSite.__name(self._code.co_filename, self._lineno)
+
+    @staticmethod
+    @_lru_cache(maxsize=NameCacheSize)
+    def __name(filename, lineno):
+        return _string_handle(f'{_basename(filename)}:{lineno}')
+
 
 class _NamedRegion(_Region):
     """
@@ -226,7 +309,7 @@ class _NamedRegion(_Region):
             return _string_handle(func)
 
         if isinstance(func, _CallSite):
-            return _string_handle(f'{func.filename()}:{func.lineno()}')
+            return func.name()
 
         if hasattr(func, '__qualname__'):
             return _string_handle(func.__qualname__)
@@ -1,13 +1,46 @@
 """
 string_handle.py - Python module wrapper for ITT String Handle API
 """
+from collections import namedtuple as _namedtuple
+
 from ittapi.native import StringHandle as _StringHandle
+from ittapi.native import string_handle_cache_clear as _string_handle_cache_clear
+from ittapi.native import string_handle_cache_info as _string_handle_cache_info
+from ittapi.native import string_handle_cache_limit as _string_handle_cache_limit
+
+
+StringHandleCacheInfo = _namedtuple('StringHandleCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
 
 
 def string_handle(string: str):
     """
     Creates a handle for a string.
+
+    Handles are interned in a process-wide cache, therefore repeated calls with equal strings return the same handle.
     :param string: a string
     :return: the handle to the given string
     """
     return _StringHandle(string)
+
+
+def string_handle_cache_info() -> StringHandleCacheInfo:
+    """
+    Returns statistics of the string handle cache.
+    :return: a named tuple with the number of hits and misses, the maximum size (0 means unbounded) and the current
+             size of the cache
+    """
+    return StringHandleCacheInfo(*_string_handle_cache_info())
+
+
+def string_handle_cache_clear() -> None:
+    """Clears the string handle cache and its statistics."""
+    _string_handle_cache_clear()
+
+
+def string_handle_cache_limit(maxsize) -> None:
+    """
+    Sets the maximum number of cached string handles. When the limit is reached, the oldest handles are evicted.
+    Evicted handles stay valid, a new request for the same string creates a new handle object.
+    :param maxsize: the maximum size of the cache or None (or 0) for unbounded cache
+    """
+    _string_handle_cache_limit(maxsize)
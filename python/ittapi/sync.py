@@ -0,0 +1,17 @@
+"""
+sync.py - Python module wrapper for ITT Synchronization API
+"""
+from ittapi.native import Sync as _Sync
+
+
+def sync(name=None, obj_type=None, barrier=False):
+    """
+    Creates a synchronization object to report the acquisition and the release of a user-defined synchronization
+    primitive. Call prepare() before an attempt to acquire the primitive, acquired() or cancel() after the attempt
+    succeeds or fails, and releasing() before the primitive is released.
+    :param name: a name of the synchronization object
+    :param obj_type: a type of the synchronization object, e.g. 'Lock'
+    :param barrier: determines if the synchronization object is a barrier rather than a mutex
+    :return: an instance of Sync
+    """
+    return _Sync(name, obj_type, barrier)
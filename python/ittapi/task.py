@@ -3,10 +3,12 @@ task.py - Python module wrapper for ITT Task API
 """
 from ittapi.native import task_begin as _task_begin, task_end as _task_end
 from ittapi.native import task_begin_overlapped as _task_begin_overlapped, task_end_overlapped as _task_end_overlapped
+from ittapi.native import Task as _NativeTask, is_collector_attached as _is_collector_attached
+from ittapi.native import metadata_add as _metadata_add, async_task_ids as _async_task_ids
 
 from .domain import domain as _domain
-from .id import id as _id
-from .region import _CallSite, _NamedRegion
+from .id import id as _id, IdPool as _IdPool, NO_ID as _NO_ID
+from .region import _CallSite, _NamedRegion, _NoOpRegion
 
 
 class _Task(_NamedRegion):
@@ -19,14 +21,17 @@ class _Task(_NamedRegion):
         :param task: a name of the task or a callable object (e.g. function) to wrap. If the callable object is passed
                      the name of this object is used as a name for the task.
         :param domain: a task domain
-        :param id: a task id
+        :param id: a task id, an IdPool to take the id from when the task begins or NO_ID to create the task
+                   without an id
         :param parent: a parent task or an id of the parent
         """
         super().__init__(task)
 
         self._domain = self.__get_task_domain(domain)
-        self._id = self.__get_task_id(id, self._domain)
+        self._id_pool = id if isinstance(id, _IdPool) else None
+        self._id = None if self._id_pool is not None else self.__get_task_id(id, self._domain)
         self._parent_id = self.__get_parent_id(parent)
+        self._activations = 0
 
     def __str__(self) -> str:
         return (f"{{ name: '{str(self._name)}', domain: '{str(self._domain)}',"
@@ -48,6 +53,14 @@ class _Task(_NamedRegion):
         """Returns the parent id for the task."""
         return self._parent_id
 
+    def add_metadata(self, key, value) -> None:
+        """
+        Adds metadata to the task.
+        :param key: a metadata key (a string or a string handle)
+        :param value: an int, a float, a str or a contiguous buffer of numbers, see ittapi.metadata_add()
+        """
+        _metadata_add(self._domain, self._id, key, value)
+
     def begin(self) -> None:
         """Marks the beginning of a task."""
         raise NotImplementedError()
@@ -56,6 +69,51 @@ class _Task(_NamedRegion):
         """Marks the end of a task."""
         raise NotImplementedError()
 
+    def _begin_async(self) -> None:
+        """
+        Marks the beginning of a task that may be suspended. The task is reported as an overlapped task with its own
+        id, so other tasks that run on the thread while it is suspended do not break it. The enclosing asynchronous
+        task of the current context becomes the parent if the parent is not specified.
+        """
+        active_tasks = _async_task_ids.get(None)
+        task_id = _id(self._domain)
+        parent_id = self._parent_id if self._parent_id is not None or active_tasks is None else active_tasks[1]
+        _async_task_ids.set((self, task_id, active_tasks))
+        _task_begin_overlapped(self._domain, self._name, task_id, parent_id)
+
+    def _end_async(self) -> None:
+        """
+        Marks the end of a task that may be suspended. The innermost activation of this task in the current context
+        is ended even if other tasks have been entered after it and are still active.
+        """
+        active_tasks = _async_task_ids.get(None)
+        inner_tasks = []
+        while active_tasks is not None and active_tasks[0] is not self:
+            inner_tasks.append(active_tasks)
+            active_tasks = active_tasks[2]
+
+        if active_tasks is None:
+            raise RuntimeError('The task has not been entered with async with in the current context.')
+
+        _task_end_overlapped(self._domain, active_tasks[1])
+        active_tasks = active_tasks[2]
+        for inner_task, inner_task_id, _ in reversed(inner_tasks):
+            active_tasks = (inner_task, inner_task_id, active_tasks)
+        _async_task_ids.set(active_tasks)
+
+    def _acquire_id(self) -> None:
+        """Takes the task id from the pool for the outermost activation of the task."""
+        if self._activations == 0:
+            self._id = self._id_pool.acquire()
+        self._activations += 1
+
+    def _release_id(self) -> None:
+        """Returns the task id to the pool when the outermost activation of the task ends."""
+        self._activations -= 1
+        if self._activations == 0:
+            self._id_pool.release(self._id)
+            self._id = None
+
     @staticmethod
     def __get_task_domain(original_domain):
         """Returns task domain"""
@@ -67,6 +125,9 @@ class _Task(_NamedRegion):
     @staticmethod
     def __get_task_id(original_id, domain):
         """Returns task id for specified domain"""
+        if original_id is _NO_ID:
+            return None
+
         return _id(domain) if original_id is None else original_id
 
     @staticmethod
@@ -75,6 +136,35 @@ class _Task(_NamedRegion):
         return original_parent.id() if isinstance(original_parent, task.__class__) else original_parent
 
 
+class _NoOpTask(_NoOpRegion):
+    """
+    A task that does nothing. It is returned by the task constructors if no collector is attached.
+    """
+    __slots__ = ()
+
+    def name(self):
+        """Returns the name of the task."""
+        return None
+
+    def domain(self):
+        """Returns the domain of the task."""
+        return None
+
+    def id(self):
+        """Returns the id of the task."""
+        return None
+
+    def parent_id(self):
+        """Returns the parent id for the task."""
+        return None
+
+    def add_metadata(self, key, value) -> None:
+        """Does nothing."""
+
+
+_NO_OP_TASK = _NoOpTask()
+
+
 class NestedTask(_Task):
     """
     A class that represents nested tasks.
@@ -84,11 +174,15 @@ class NestedTask(_Task):
     """
     def begin(self) -> None:
         """Marks the beginning of a task."""
+        if self._id_pool is not None:
+            self._acquire_id()
         _task_begin(self._domain, self._name, self._id, self._parent_id)
 
     def end(self) -> None:
         """Marks the end of a task."""
         _task_end(self._domain)
+        if self._id_pool is not None:
+            self._release_id()
 
 
 def nested_task(task=None, domain=None, id=None, parent=None):
@@ -96,10 +190,14 @@ def nested_task(task=None, domain=None, id=None, parent=None):
     Creates a nested task instance with the given arguments.
     :param task: a name of the task or a callable object
     :param domain: a task domain
-    :param id: a task id
+    :param id: a task id, an IdPool or NO_ID
     :param parent: a parent task or an id of the parent
-    :return: an instance of NestedTask
+    :return: an instance of NestedTask. If no collector is attached, a shared no-op task is returned instead or,
+             if a callable object is passed, the callable object itself.
     """
+    if not _is_collector_attached():
+        return task if callable(task) else _NO_OP_TASK
+
     task = _CallSite(_CallSite.CallerFrame) if task is None else task
     return NestedTask(task, domain, id, parent)
 
@@ -110,13 +208,23 @@ class OverlappedTask(_Task):
 
     Execution regions of overlapped tasks may intersect.
     """
+    def __init__(self, task=None, domain=None, id=None, parent=None) -> None:
+        if id is _NO_ID:
+            raise ValueError('Overlapped tasks cannot be created without an id.')
+
+        super().__init__(task, domain, id, parent)
+
     def begin(self) -> None:
         """Marks the beginning of a task."""
+        if self._id_pool is not None:
+            self._acquire_id()
         _task_begin_overlapped(self._domain, self._name, self._id, self._parent_id)
 
     def end(self) -> None:
         """Marks the end of a task."""
         _task_end_overlapped(self._domain, self._id)
+        if self._id_pool is not None:
+            self._release_id()
 
 
 def overlapped_task(task=None, domain=None, id=None, parent=None):
@@ -124,10 +232,14 @@ def overlapped_task(task=None, domain=None, id=None, parent=None):
     Creates an overlapped task instance with the given arguments.
     :param task: a name of the task or a callable object
     :param domain: a task domain
-    :param id: a task id
+    :param id: a task id, an IdPool or NO_ID
     :param parent: a parent task or an id of the parent
-    :return: an instance of OverlappedTask
+    :return: an instance of OverlappedTask. If no collector is attached, a shared no-op task is returned instead or,
+             if a callable object is passed, the callable object itself.
     """
+    if not _is_collector_attached():
+        return task if callable(task) else _NO_OP_TASK
+
     task = _CallSite(_CallSite.CallerFrame) if task is None else task
     return OverlappedTask(task, domain, id, parent)
 
@@ -137,11 +249,25 @@ def task(task=None, domain=None, id=None, parent=None, overlapped=False):
     Creates a task instance with the given arguments.
     :param task: a name of the task or a callable object
     :param domain: a task domain
-    :param id: a task id
+    :param id: a task id, an IdPool or NO_ID
     :param parent: a parent task or an id of the parent
     :param overlapped: determines if the created task should be an instance of OverlappedTask class
                        or NestedTask class
-    :return: a task instance
+    :return: a task instance. If the name of the task is passed as a string, the task is an instance of
+             ittapi.native.Task that implements begin()/end() and the context manager protocol natively, it is not
+             an instance of NestedTask or OverlappedTask.
+             If no collector is attached, a shared no-op task is returned instead or, if a callable object is passed,
+             the callable object itself.
     """
+    if not _is_collector_attached():
+        return task if callable(task) else _NO_OP_TASK
+
+    if type(task) is str:  # pylint: disable=C0123
+        if id is None and parent is None:
+            return _NativeTask(task, domain, None, None, overlapped)
+        if not isinstance(id, _IdPool):
+            parent = parent.id() if isinstance(parent, _Task) else parent
+            return _NativeTask(task, domain, id, parent, overlapped)
+
     task = _CallSite(_CallSite.CallerFrame) if task is None else task
     return OverlappedTask(task, domain, id, parent) if overlapped else NestedTask(task, domain, id, parent)
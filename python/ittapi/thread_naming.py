@@ -1,7 +1,10 @@
 """
 thread_naming.py - Python module wrapper for ITT Thread Naming API
 """
-from ittapi.native import thread_set_name as _thread_set_name
+import os as _os
+import threading as _threading
+
+from ittapi.native import thread_set_name as _thread_set_name, is_collector_attached as _is_collector_attached
 
 
 def thread_set_name(name: str):
@@ -10,3 +13,71 @@ def thread_set_name(name: str):
     :param name: the thread name
     """
     _thread_set_name(name)
+
+
+_original_bootstrap_inner = None
+_auto_thread_naming_lock = _threading.Lock()
+
+
+def auto_thread_naming(enable=True) -> bool:
+    """
+    Enables or disables automatic naming of threads. When it is enabled, each thread that is started with
+    threading.Thread (including the workers of concurrent.futures.ThreadPoolExecutor) sets its name to Thread.name
+    before it runs, and the calling thread is named immediately. Threads that are already running are not renamed.
+    :param enable: determines if the automatic naming should be enabled or disabled
+    :return: True if the automatic naming is enabled, False otherwise (e.g. no collector is attached)
+    """
+    global _original_bootstrap_inner  # pylint: disable=W0603
+    with _auto_thread_naming_lock:
+        if not enable:
+            if _original_bootstrap_inner is not None:
+                _threading.Thread._bootstrap_inner = _original_bootstrap_inner  # pylint: disable=W0212
+                _original_bootstrap_inner = None
+            return False
+
+        if _original_bootstrap_inner is not None:
+            return True
+
+        if not _is_collector_attached():
+            return False
+
+        original_bootstrap_inner = _threading.Thread._bootstrap_inner  # pylint: disable=W0212
+
+        def _bootstrap_inner(thread):
+            # Thread._bootstrap_inner() is called in the new thread before Thread.run()
+            _thread_set_name(thread.name)
+            original_bootstrap_inner(thread)
+
+        _threading.Thread._bootstrap_inner = _bootstrap_inner  # pylint: disable=W0212
+        _original_bootstrap_inner = original_bootstrap_inner
+        _thread_set_name(_threading.current_thread().name)
+        return True
+
+
+def thread_naming_initializer(initializer=None):
+    """
+    Creates an initializer for thread pools (e.g. concurrent.futures.ThreadPoolExecutor) that sets the name of each
+    worker thread to Thread.name, e.g. ThreadPoolExecutor(thread_name_prefix='io',
+    initializer=ittapi.thread_naming_initializer()).
+    :param initializer: an initializer of the pool to call after the thread is named
+    :return: the initializer that accepts the same arguments as the given one
+    """
+    def _initializer(*args):
+        _thread_set_name(_threading.current_thread().name)
+        if initializer is not None:
+            initializer(*args)
+
+    return _initializer
+
+
+def _after_fork_in_child() -> None:
+    global _auto_thread_naming_lock  # pylint: disable=W0603
+    # The lock may have been held by another thread of the parent process at the moment of fork
+    _auto_thread_naming_lock = _threading.Lock()
+    if _original_bootstrap_inner is not None:
+        # The thread that has called fork() continues in the child process as a new thread
+        _thread_set_name(_threading.current_thread().name)
+
+
+if hasattr(_os, 'register_at_fork'):
+    _os.register_at_fork(after_in_child=_after_fork_in_child)
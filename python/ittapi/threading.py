@@ -0,0 +1,240 @@
+"""
+threading.py - Instrumented drop-in replacements for the synchronization primitives of the threading module
+
+The primitives report the attempts to acquire (prepare), the acquisitions (acquired or cancel) and the releases
+(releasing) through the ITT Synchronization API, so the collector can show where threads wait. An uncontended
+acquisition is detected with a non-blocking attempt and is reported without waiting on the primitive.
+"""
+import sys as _sys
+import threading as _threading
+from _thread import get_ident as _get_ident
+
+from .sync import sync as _sync
+
+
+class Lock:
+    """
+    An instrumented equivalent of threading.Lock.
+    """
+    __slots__ = ('_lock', '_sync', '__weakref__')
+
+    def __init__(self, name=None) -> None:
+        """
+        Creates a lock.
+        :param name: a name of the lock that is shown by the collector
+        """
+        self._lock = _threading.Lock()
+        self._sync = _sync(name, 'Lock')
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__module__}.{self.__class__.__name__} {repr(str(self._sync))} {self._lock!r}>'
+
+    def acquire(self, blocking=True, timeout=-1) -> bool:
+        """
+        Acquires the lock, see threading.Lock.acquire().
+        :return: True if the lock has been acquired, False otherwise
+        """
+        return _acquire(self._lock, self._sync, blocking, timeout)
+
+    __enter__ = acquire
+
+    def release(self) -> None:
+        """Releases the lock."""
+        # Any thread can release the lock, so the release is reported only when it has succeeded
+        self._lock.release()
+        self._sync.releasing()
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def locked(self) -> bool:
+        """Returns True if the lock is acquired."""
+        return self._lock.locked()
+
+    # The method that is used by threading.Condition
+    def _is_owned(self) -> bool:
+        return self._lock.locked()
+
+
+class RLock:
+    """
+    An instrumented equivalent of threading.RLock. Only the outermost acquisition and release are reported.
+    """
+    __slots__ = ('_lock', '_sync', '_owner', '_count', '__weakref__')
+
+    def __init__(self, name=None) -> None:
+        """
+        Creates a reentrant lock.
+        :param name: a name of the lock that is shown by the collector
+        """
+        self._lock = _threading.Lock()
+        self._sync = _sync(name, 'RLock')
+        self._owner = None
+        self._count = 0
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__module__}.{self.__class__.__name__} {repr(str(self._sync))}'
+                f' owner={self._owner!r} count={self._count}>')
+
+    def acquire(self, blocking=True, timeout=-1) -> bool:
+        """
+        Acquires the lock, see threading.RLock.acquire().
+        :return: True if the lock has been acquired, False otherwise
+        """
+        me = _get_ident()
+        if self._owner == me:
+            self._count += 1
+            return True
+
+        if not _acquire(self._lock, self._sync, blocking, timeout):
+            return False
+
+        self._owner = me
+        self._count = 1
+        return True
+
+    __enter__ = acquire
+
+    def release(self) -> None:
+        """Releases the lock."""
+        if self._owner != _get_ident():
+            raise RuntimeError('cannot release un-acquired lock')
+
+        self._count -= 1
+        if self._count == 0:
+            self._owner = None
+            self._sync.releasing()
+            self._lock.release()
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    # The methods that are used by threading.Condition
+    def _is_owned(self) -> bool:
+        return self._owner == _get_ident()
+
+    def _release_save(self):
+        if self._owner != _get_ident():
+            raise RuntimeError('cannot release un-acquired lock')
+
+        state = (self._count, self._owner)
+        self._count = 0
+        self._owner = None
+        self._sync.releasing()
+        self._lock.release()
+        return state
+
+    def _acquire_restore(self, state) -> None:
+        _acquire(self._lock, self._sync, True, -1)
+        self._count, self._owner = state
+
+
+class Condition(_threading.Condition):
+    """
+    An instrumented equivalent of threading.Condition.
+
+    In addition to the underlying lock, the waits for the condition are reported: a wait is an attempt to acquire
+    the condition that succeeds when the condition is notified and is cancelled on timeout.
+    """
+    def __init__(self, lock=None, name=None) -> None:
+        """
+        Creates a condition variable.
+        :param lock: an underlying lock. If it is None, a new instrumented RLock is created.
+        :param name: a name of the condition variable that is shown by the collector
+        """
+        super().__init__(RLock(name) if lock is None else lock)
+        self._sync = _sync(name, 'Condition')
+
+    def wait(self, timeout=None) -> bool:
+        """
+        Waits until notified or until a timeout occurs, see threading.Condition.wait().
+        :return: False if the timeout has expired, True otherwise
+        """
+        self._sync.prepare()
+        result = super().wait(timeout)
+        if result:
+            self._sync.acquired()
+        else:
+            self._sync.cancel()
+        return result
+
+    # threading.Condition.notify_all() is implemented with notify(), so it is reported here as well
+    def notify(self, n=1) -> None:
+        """Wakes up at most n threads that are waiting on the condition."""
+        if not self._is_owned():
+            raise RuntimeError('cannot notify on un-acquired lock')
+
+        self._sync.releasing()
+        super().notify(n)
+
+
+class Semaphore:
+    """
+    An instrumented equivalent of threading.Semaphore.
+    """
+    __slots__ = ('_semaphore', '_sync', '__weakref__')
+
+    def __init__(self, value=1, name=None) -> None:
+        """
+        Creates a semaphore.
+        :param value: an initial value of the internal counter
+        :param name: a name of the semaphore that is shown by the collector
+        """
+        self._semaphore = _threading.Semaphore(value)
+        self._sync = _sync(name, 'Semaphore')
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__module__}.{self.__class__.__name__} {repr(str(self._sync))}>'
+
+    def acquire(self, blocking=True, timeout=None) -> bool:
+        """
+        Acquires the semaphore, see threading.Semaphore.acquire().
+        :return: True if the semaphore has been acquired, False otherwise
+        """
+        return _acquire(self._semaphore, self._sync, blocking, timeout)
+
+    __enter__ = acquire
+
+    def release(self, n=1) -> None:
+        """Releases the semaphore, incrementing the internal counter by n."""
+        if n < 1:
+            raise ValueError('n must be one or more')
+
+        self._sync.releasing()
+        if n == 1:
+            self._semaphore.release()
+        elif _sys.version_info >= (3, 9):
+            self._semaphore.release(n)
+        else:
+            # The argument is supported since Python 3.9
+            for _ in range(n):
+                self._semaphore.release()
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+def _acquire(primitive, sync, blocking, timeout) -> bool:
+    """
+    Acquires the primitive and reports the acquisition.
+    :param primitive: a lock or a semaphore
+    :param sync: a synchronization object that represents the primitive
+    :param blocking: determines if the call waits for the primitive
+    :param timeout: a timeout in seconds in the form that is accepted by the primitive
+    :return: True if the primitive has been acquired, False otherwise
+    """
+    if primitive.acquire(False):
+        sync.prepare()
+        sync.acquired()
+        return True
+
+    if not blocking:
+        return False
+
+    sync.prepare()
+    if primitive.acquire(True, timeout):
+        sync.acquired()
+        return True
+
+    sync.cancel()
+    return False
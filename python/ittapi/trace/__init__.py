@@ -0,0 +1,16 @@
+"""
+trace - Reading and analysis of the traces written by the ITT API reference collector
+
+The module reads the text logs and the binary traces of the reference collector (src/ittnotify_refcol) without loading
+them into memory, rebuilds the tasks of each thread and calculates the statistics of the tasks with NumPy. A summary of
+a trace can be printed and a trace can be converted to Chrome Trace Event JSON or Perfetto protobuf with:
+
+    python -m ittapi.trace summary <file>
+    python -m ittapi.trace export <file> <output.json|output.pftrace>
+
+The calls of ITT API can also be collected in the process itself, without a collector library, with Collector.
+"""
+from .reader import open_trace, RecordType, TraceReader, RECORD_DTYPE
+from .analysis import iter_tasks, summarize, TaskStatistics, TraceSummary, TASK_DTYPE
+from .export import convert, export, ChromeTraceWriter, PerfettoTraceWriter, TraceWriter
+from .collector import Collector
@@ -0,0 +1,101 @@
+"""
+Command line interface of ittapi.trace:
+
+    python -m ittapi.trace summary <file> [--sort KEY] [--limit N] [--json]
+    python -m ittapi.trace export <file> <output> [--format chrome|perfetto]
+"""
+import json as _json
+import sys as _sys
+from argparse import ArgumentParser as _ArgumentParser
+
+from .analysis import summarize as _summarize
+from .export import export as _export
+
+
+_SORT_KEYS = {
+    'total': lambda task: -(task.total or 0),
+    'exclusive': lambda task: -(task.exclusive or 0),
+    'count': lambda task: -task.count,
+    'mean': lambda task: -(task.mean or 0),
+    'max': lambda task: -(task.max or 0),
+    'name': lambda task: (task.domain, task.name),
+}
+
+
+def _format_time(value) -> str:
+    return f'{value / 1000:.3f}' if value is not None else '-'
+
+
+def _print_table(summary, tasks, file) -> None:
+    duration = f', {_format_time(summary.duration)} us' if summary.duration is not None else ''
+    print(f'Trace format: {summary.format}, threads: {summary.threads}{duration}', file=file)
+    if summary.unmatched or summary.unfinished:
+        print(f'Tasks without a begin: {summary.unmatched}, tasks without an end: {summary.unfinished}', file=file)
+
+    percentiles = list(tasks[0].percentiles) if tasks else []
+    header = (['Domain', 'Task', 'Count', 'Total, us', 'Exclusive, us', 'Mean, us', 'Min, us']
+              + [f'p{percentile:g}, us' for percentile in percentiles] + ['Max, us'])
+    rows = [[task.domain, task.name, str(task.count), _format_time(task.total), _format_time(task.exclusive),
+             _format_time(task.mean), _format_time(task.min)]
+            + [_format_time(task.percentiles[percentile]) for percentile in percentiles] + [_format_time(task.max)]
+            for task in tasks]
+    widths = [max(len(row[column]) for row in [header] + rows) for column in range(len(header))]
+    for row in [header] + rows:
+        # Names are aligned to the left, numbers are aligned to the right
+        print('  '.join(value.ljust(width) if column < 2 else value.rjust(width)
+                        for column, (value, width) in enumerate(zip(row, widths))).rstrip(), file=file)
+
+
+def _summary(args) -> int:
+    summary = _summarize(args.file, percentiles=args.percentiles)
+    tasks = sorted(summary.tasks, key=_SORT_KEYS[args.sort])
+    tasks = tasks[:args.limit] if args.limit else tasks
+    if args.json:
+        result = summary._replace(tasks=[task._asdict() for task in tasks])._asdict()
+        _json.dump(result, _sys.stdout, indent=2)
+        print()
+    else:
+        _print_table(summary, tasks, _sys.stdout)
+    return 0
+
+
+def _export_trace(args) -> int:
+    _export(args.file, args.output, args.format)
+    return 0
+
+
+def main(argv=None) -> int:
+    """
+    Runs the command line interface.
+    :param argv: the arguments of the command line without the name of the program
+    :return: the exit code
+    """
+    parser = _ArgumentParser(prog='python -m ittapi.trace',
+                             description='Analysis of the traces written by the ITT API reference collector.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    summary = commands.add_parser('summary', help='print the statistics of the tasks per task name')
+    summary.add_argument('file', help='a text log, a binary trace or a memory-mapped trace')
+    summary.add_argument('--sort', choices=sorted(_SORT_KEYS), default='total', help='the order of the tasks')
+    summary.add_argument('--limit', type=int, default=0, help='the maximum number of the tasks to print')
+    summary.add_argument('--percentiles', type=float, nargs='+', default=[50, 90, 99],
+                         help='the percentiles of the durations')
+    summary.add_argument('--json', action='store_true', help='print the summary as JSON')
+    summary.set_defaults(handler=_summary)
+    export = commands.add_parser('export', help='convert a trace to Chrome Trace Event JSON or Perfetto protobuf')
+    export.add_argument('file', help='a binary trace or a memory-mapped trace')
+    export.add_argument('output', help='the output file, .json or .json.gz for Chrome JSON, .pftrace for Perfetto')
+    export.add_argument('--format', choices=['chrome', 'perfetto'],
+                        help='the output format, by default it is detected by the extension of the output file')
+    export.set_defaults(handler=_export_trace)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as error:
+        # A missing or unsupported trace and invalid arguments are reported as usage errors
+        parser.error(str(error))
+    return 2  # pragma: no cover
+
+
+if __name__ == '__main__':
+    _sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+analysis.py - Task trees and aggregates of the traces written by the reference collector
+"""
+from collections import namedtuple as _namedtuple
+
+import numpy as _np
+
+from .reader import open_trace as _open_trace, RecordType as _RecordType, TraceReader as _TraceReader
+
+
+# A task that has been rebuilt from the trace. `index` is the position of the begin record of the task in the trace
+# and identifies the task, `parent` is the index of the enclosing task of the same thread or -1.
+TASK_DTYPE = _np.dtype([('index', 'i8'), ('parent', 'i8'), ('tid', 'u4'), ('depth', 'u4'), ('overlapped', '?'),
+                        ('domain', 'u8'), ('name', 'u8'), ('begin', 'u8'), ('end', 'u8'), ('exclusive', 'u8')])
+
+# The fields of the records that are needed to match the tasks
+_COLUMNS = ('tid', 'domain', 'name', 'id', 'timestamp')
+
+TaskStatistics = _namedtuple('TaskStatistics', ['domain', 'name', 'count', 'total', 'exclusive', 'mean', 'min',
+                                                'max', 'percentiles'])
+TraceSummary = _namedtuple('TraceSummary', ['format', 'tasks', 'threads', 'duration', 'unmatched', 'unfinished'])
+
+
+def _group_starts(keys):
+    """Returns the mask of the elements of the sorted keys that start a new group."""
+    starts = _np.ones(len(keys), dtype=bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return starts
+
+
+def _group_cumsum(values, starts):
+    """Returns the cumulative sums of the values that restart at the start of each group."""
+    sums = _np.cumsum(values)
+    group_start = _np.maximum.accumulate(_np.where(starts, _np.arange(len(values)), 0))
+    return sums - (sums - values)[group_start]
+
+
+def _group_minimum(values, starts):
+    """Returns the running minimums of the values that restart at the start of each group."""
+    if not len(values):  # pylint: disable=C1802
+        return values
+    # Each group is shifted below all values of the previous groups, so the minimums do not leak between the groups
+    shift = (_np.cumsum(starts) - 1) * (2 * int(_np.abs(values).max()) + 1)
+    return _np.minimum.accumulate(values - shift) + shift
+
+
+def _take(columns, selection):
+    """Selects the elements of all columns."""
+    return {name: column[selection] for name, column in columns.items()}
+
+
+class _TaskMatcher:
+    """
+    A class that matches the begin and end records of tasks batch by batch. The tasks that have not ended are kept
+    until the next batch, so the matching does not depend on the boundaries of the batches. The records are processed
+    as separate columns, which is much faster than the selection of the records of the structured arrays.
+    """
+    def __init__(self) -> None:
+        self._position = 0
+        empty = {name: _np.zeros(0, dtype=_np.dtype(dtype)) for name, dtype in
+                 (('index', 'i8'), ('tid', 'u4'), ('domain', 'u8'), ('name', 'u8'), ('id', 'u8'), ('timestamp', 'u8'),
+                  ('children', 'i8'))}
+        self._open_nested = empty
+        self._open_overlapped = empty
+        self.unmatched = 0
+
+    @property
+    def unfinished(self) -> int:
+        """The number of tasks that have begun but have not ended yet."""
+        return len(self._open_nested['index']) + len(self._open_overlapped['index'])
+
+    def feed(self, records):
+        """
+        Matches the tasks of the next batch of records.
+        :param records: a NumPy array of RECORD_DTYPE
+        :return: a NumPy array of TASK_DTYPE with the tasks that have ended in the batch
+        """
+        indexes = _np.arange(self._position, self._position + len(records), dtype='i8')
+        self._position += len(records)
+        types = records['type']
+        nested = _np.flatnonzero((types == _RecordType.TASK_BEGIN) | (types == _RecordType.TASK_END))
+        overlapped = _np.flatnonzero((types == _RecordType.TASK_BEGIN_OVERLAPPED)
+                                     | (types == _RecordType.TASK_END_OVERLAPPED))
+        columns = {name: records[name] for name in _COLUMNS}
+        columns['index'] = indexes
+        return _np.concatenate([
+            self._match_nested(_take(columns, nested), types[nested] == _RecordType.TASK_BEGIN),
+            self._match_overlapped(_take(columns, overlapped), types[overlapped] == _RecordType.TASK_BEGIN_OVERLAPPED)])
+
+    @staticmethod
+    def _join_open(open_tasks, events, is_begin):
+        """Puts the tasks that are still open before the records of the batch."""
+        events['children'] = _np.zeros(len(is_begin), dtype='i8')
+        events = {name: _np.concatenate([open_tasks[name], column]) for name, column in events.items()}
+        is_begin = _np.concatenate([_np.ones(len(open_tasks['index']), dtype=bool), is_begin])
+        return events, is_begin
+
+    @staticmethod
+    def _tasks(events, begins, ends):
+        tasks = _np.zeros(len(begins), TASK_DTYPE)
+        for name in ('index', 'tid', 'domain', 'name'):
+            tasks[name] = events[name][begins]
+        tasks['begin'], tasks['end'] = events['timestamp'][begins], events['timestamp'][ends]
+        return tasks
+
+    def _match_nested(self, events, is_begin):
+        events, is_begin = self._join_open(self._open_nested, events, is_begin)
+
+        # The records of each thread are kept in their order
+        order = _np.argsort(events['tid'], kind='stable')
+        events, is_begin = _take(events, order), is_begin[order]
+        starts = _group_starts(events['tid'])
+        depth = _group_cumsum(_np.where(is_begin, 1, -1), starts)
+
+        # The ends that go below the first visible task of the thread have no begin, e.g. in a ring trace
+        previous_minimum = _np.zeros(len(is_begin), dtype='i8')
+        previous_minimum[1:] = _group_minimum(depth, starts)[:-1]
+        unmatched = ~is_begin & (depth < _np.minimum(_np.where(starts, 0, previous_minimum), 0))
+        if unmatched.any():
+            self.unmatched += int(unmatched.sum())
+            events, is_begin = _take(events, ~unmatched), is_begin[~unmatched]
+            starts = _group_starts(events['tid'])
+            depth = _group_cumsum(_np.where(is_begin, 1, -1), starts)
+
+        # A begin at the depth d is followed by an end at the same depth d in the same thread. After the stable sort
+        # by the thread and the depth, the begins and the ends that match each other are adjacent.
+        level = depth - is_begin
+        key = (_np.cumsum(starts) - 1) * (int(level.max(initial=0)) + 1) + level
+        order = _np.argsort(key, kind='stable')
+        is_pair = is_begin[order[:-1]] & ~is_begin[order[1:]] & (key[order[:-1]] == key[order[1:]])
+        begins, ends = order[:-1][is_pair], order[1:][is_pair]
+
+        # The parent is the latest begin of the same thread at the previous depth
+        all_begins = order[is_begin[order]]
+        composite = key[all_begins] * len(is_begin) + all_begins
+        nested = begins[level[begins] > 0]
+        position = _np.searchsorted(composite, (key[nested] - 1) * len(is_begin) + nested) - 1
+        parent = _np.full(len(is_begin), -1, dtype='i8')
+        parent[nested] = all_begins[position]
+
+        duration = events['timestamp'][ends].astype('i8') - events['timestamp'][begins].astype('i8')
+        children = events['children']
+        has_parent = parent[begins] >= 0
+        _np.add.at(children, parent[begins][has_parent], duration[has_parent])
+
+        tasks = self._tasks(events, begins, ends)
+        tasks['parent'] = _np.where(has_parent, events['index'][_np.maximum(parent[begins], 0)], -1)
+        tasks['depth'] = level[begins]
+        tasks['exclusive'] = _np.maximum(duration - children[begins], 0)
+
+        is_open = is_begin.copy()
+        is_open[begins] = False
+        self._open_nested = _take(events, is_open)
+        return tasks
+
+    def _match_overlapped(self, events, is_begin):
+        events, is_begin = self._join_open(self._open_overlapped, events, is_begin)
+
+        # The begins and the ends of the same task are adjacent after the sort by the domain, the id and the time
+        order = _np.lexsort((events['index'], events['timestamp'], events['id'], events['domain']))
+        events, is_begin = _take(events, order), is_begin[order]
+        same_task = (events['domain'][:-1] == events['domain'][1:]) & (events['id'][:-1] == events['id'][1:])
+        begins = _np.flatnonzero(is_begin[:-1] & ~is_begin[1:] & same_task)
+        ends = begins + 1
+
+        tasks = self._tasks(events, begins, ends)
+        tasks['parent'], tasks['overlapped'] = -1, True
+        tasks['exclusive'] = tasks['end'] - tasks['begin']
+
+        is_open = is_begin.copy()
+        is_open[begins] = False
+        self.unmatched += int((~is_begin).sum()) - len(begins)
+        self._open_overlapped = _take(events, is_open)
+        return tasks
+
+
+def iter_tasks(trace, batch_size=65536):
+    """
+    Rebuilds the tasks of the trace.
+
+    Nested tasks form a tree in each thread: a task ends the latest task of the thread that has not ended yet.
+    Overlapped tasks are matched by their domain and id, they have no parent and their exclusive time is equal to
+    their duration. Tasks are returned when they end. Ends without a begin (e.g. the begin has been overwritten in
+    a ring trace) are skipped, tasks that have not ended by the end of the trace are not returned.
+    :param trace: a path to the trace or a TraceReader
+    :param batch_size: a maximum number of records that are processed at once
+    :return: a generator of NumPy arrays of TASK_DTYPE
+    """
+    if not isinstance(trace, _TraceReader):
+        with _open_trace(trace) as reader:
+            yield from iter_tasks(reader, batch_size)
+        return
+
+    matcher = _TaskMatcher()
+    for records in trace.records(batch_size):
+        tasks = matcher.feed(records)
+        if tasks.size:
+            yield tasks
+
+
+def summarize(trace, percentiles=(50, 90, 99), batch_size=65536) -> TraceSummary:
+    """
+    Calculates the statistics of the tasks of the trace per task name. Only the durations of the tasks are kept in
+    memory, the records are processed in batches.
+    :param trace: a path to the trace or a TraceReader
+    :param percentiles: the percentiles of the durations to calculate, from 0 to 100
+    :param batch_size: a maximum number of records that are processed at once
+    :return: a TraceSummary with the list of TaskStatistics sorted by the total time. All times are in nanoseconds.
+             The times are None for text logs that have no timestamps.
+    :raise ValueError: if a percentile is out of the range
+    """
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError(f'The percentiles must be in the range [0, 100], got {percentile!r}.')
+    if isinstance(trace, _TraceReader):
+        return _summarize(trace, percentiles, batch_size)
+    with _open_trace(trace) as reader:
+        return _summarize(reader, percentiles, batch_size)
+
+
+def _group_ids(tasks, ids):
+    """Returns the ids of the (domain, name) pairs of the tasks, new pairs are added to the dictionary of the ids."""
+    domains, domain_indexes = _np.unique(tasks['domain'], return_inverse=True)
+    names, name_indexes = _np.unique(tasks['name'], return_inverse=True)
+    pairs, pair_indexes = _np.unique(domain_indexes.reshape(-1) * len(names) + name_indexes.reshape(-1),
+                                     return_inverse=True)
+    pair_ids = _np.array([ids.setdefault((int(domains[pair // len(names)]), int(names[pair % len(names)])), len(ids))
+                          for pair in pairs.tolist()], dtype='i8')
+    return pair_ids[pair_indexes.reshape(-1)]
+
+
+def _summarize(reader, percentiles, batch_size):  # pylint: disable=R0914
+    matcher = _TaskMatcher()
+    ids = {}
+    groups, durations, exclusives = [], [], []
+    threads = set()
+    first, last = None, None
+    for records in reader.records(batch_size):
+        threads.update(_np.unique(records['tid']).tolist())
+        timestamps = records['timestamp']
+        first = min(first, int(timestamps.min())) if first is not None else int(timestamps.min())
+        last = max(last, int(timestamps.max())) if last is not None else int(timestamps.max())
+
+        tasks = matcher.feed(records)
+        groups.append(_group_ids(tasks, ids))
+        durations.append(tasks['end'].astype('i8') - tasks['begin'].astype('i8'))
+        exclusives.append(tasks['exclusive'].astype('i8'))
+
+    groups = _np.concatenate(groups) if groups else _np.zeros(0, dtype='i8')
+    durations = _np.concatenate(durations) if durations else _np.zeros(0, dtype='i8')
+    exclusives = _np.concatenate(exclusives) if exclusives else _np.zeros(0, dtype='i8')
+
+    counts = _np.bincount(groups, minlength=len(ids))
+    totals = _np.bincount(groups, weights=durations, minlength=len(ids))
+    exclusive_totals = _np.bincount(groups, weights=exclusives, minlength=len(ids))
+
+    # Percentiles with the linear interpolation, as numpy.percentile calculates them, for all groups at once
+    sorted_durations = durations[_np.lexsort((durations, groups))].astype('f8')
+    starts = _np.cumsum(counts) - counts
+    values = {}
+    for percentile in percentiles:
+        position = starts + (counts - 1) * (percentile / 100)
+        lower, upper = _np.floor(position).astype('i8'), _np.ceil(position).astype('i8')
+        values[percentile] = (sorted_durations[lower]
+                              + (sorted_durations[upper] - sorted_durations[lower]) * (position - lower))
+
+    def time(value):
+        return float(value) if reader.has_timestamps else None
+
+    tasks = []
+    for (domain, name), group in ids.items():
+        tasks.append(TaskStatistics(
+            domain=reader.domains.get(domain, f'{domain:#x}'), name=reader.strings.get(name, f'{name:#x}'),
+            count=int(counts[group]), total=time(totals[group]), exclusive=time(exclusive_totals[group]),
+            mean=time(totals[group] / counts[group]), min=time(sorted_durations[starts[group]]),
+            max=time(sorted_durations[starts[group] + counts[group] - 1]),
+            percentiles={percentile: time(values[percentile][group]) for percentile in percentiles}))
+    tasks.sort(key=lambda task: (-(task.total or 0), -task.count, task.domain, task.name))
+
+    duration = last - first if reader.has_timestamps and first is not None else None
+    return TraceSummary(format=reader.format, tasks=tasks, threads=len(threads), duration=duration,
+                        unmatched=matcher.unmatched, unfinished=matcher.unfinished)
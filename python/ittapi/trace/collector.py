@@ -0,0 +1,200 @@
+"""
+collector.py - In-process collector of ITT API calls
+
+The collector of ittapi.native implements ITT API in the process itself, so the markup of the application (tasks,
+frames, events, counters) is collected without an external collector library. The calls are stored to buffers of
+the threads as records of the binary trace of the reference collector, and the records are taken from the buffers
+in batches: either periodically by a background thread that passes each batch to a callback, or on demand when
+the records are read. No Python code runs on the calls of ITT API.
+"""
+import atexit as _atexit
+import os as _os
+import sys as _sys
+import threading as _threading
+from collections import deque as _deque
+
+import numpy as _np
+
+from ittapi.native import collector_start as _collector_start, collector_stop as _collector_stop
+from ittapi.native import collector_drain as _collector_drain, collector_dropped as _collector_dropped
+from ittapi.native import get_timestamp as _get_timestamp
+
+from .reader import TraceReader, RECORD_DTYPE
+
+
+class Collector(TraceReader):
+    """
+    An in-process collector of ITT API calls.
+
+    The collector replaces the collector library (INTEL_LIBITTNOTIFY64), so it cannot be started if a library is
+    attached to the process, and only one collector can run at a time. Domains, string handles and counters created
+    before the start of the collector are inactive, so the collector should be started before the markup is created.
+
+    With a callback, the records are passed to the callback in batches every `interval` seconds and when
+    the collector is stopped or flushed. The callback is called in the background thread of the collector with
+    a NumPy array of RECORD_DTYPE, and the names of the records are in the dictionaries of the collector (domains,
+    strings, events, counters and thread_names). The batches are passed to the callback in the order they are taken,
+    and the callback may call flush() itself. An exception raised by the callback in the background thread is
+    reported with sys.excepthook and the collector keeps running. Without a callback, the batches are kept until they
+    are read with records(), so the collector can be passed to summarize(), iter_tasks() and export() like a trace.
+
+        with ittapi.trace.Collector() as collector:
+            run_workload()
+        print(ittapi.trace.summarize(collector))
+    """
+    format = 'inprocess'
+
+    def __init__(self, callback=None, interval=1.0, buffer_size=65536) -> None:
+        """
+        Creates the in-process collector.
+        :param callback: a function that is called with each batch of the records, or None to keep the batches
+        :param interval: a period of taking the records from the buffers in seconds, or None to take the records only
+                         when flush() is called, the collector is stopped or the records are read
+        :param buffer_size: the number of the records in the buffer of each thread. The records are dropped when
+                            the buffer of a thread is full, see `dropped`.
+        """
+        super().__init__(None)
+        self.pid = _os.getpid()
+        self._callback = callback
+        self._interval = interval
+        self._buffer_size = buffer_size
+        self._batches = _deque()
+        self._lock = _threading.Lock()
+        # The batches are taken and passed to the callback in the same order, the callback may flush again
+        self._callback_lock = _threading.RLock()
+        self._stop_event = _threading.Event()
+        self._thread = None
+        self._is_running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(callback={self._callback!r}, interval={self._interval!r})'
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True if the collector has been started and has not been stopped yet."""
+        return self._is_running
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of the records that have been dropped since the start because of full buffers."""
+        return _collector_dropped()
+
+    def start(self) -> None:
+        """Starts collecting the calls of ITT API."""
+        global _running_collector  # pylint: disable=W0603
+        with _running_collector_lock:
+            if _running_collector is not None:
+                raise RuntimeError('Another in-process collector is running.')
+            _collector_start(self._buffer_size)
+            _running_collector = self
+
+        self.start_time = _get_timestamp()
+        self._is_running = True
+        self._start_thread()
+
+    def stop(self) -> None:
+        """Stops collecting the calls of ITT API and takes the remaining records from the buffers."""
+        global _running_collector  # pylint: disable=W0603
+        with _running_collector_lock:
+            if _running_collector is not self:
+                return
+            _collector_stop()
+            _running_collector = None
+
+        self._is_running = False
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not _threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def close(self) -> None:
+        """Stops the collector."""
+        self.stop()
+
+    def flush(self) -> int:
+        """
+        Takes the records from the buffers of the threads immediately and passes them to the callback.
+        :return: the number of the taken records
+        :raise Exception: an exception raised by the callback
+        """
+        with self._callback_lock:
+            with self._lock:
+                data = _collector_drain()
+                records = _np.frombuffer(data, RECORD_DTYPE, len(data) // RECORD_DTYPE.itemsize)
+                batch, _ = self._split(records)
+                if not batch.size:
+                    return 0
+                if self._callback is None:
+                    self._batches.append(batch)
+                    return batch.size
+            # The callback is called without the lock of the records, so it can read them and flush again
+            self._callback(batch)
+            return batch.size
+
+    def records(self, batch_size=65536):
+        """
+        Returns the records that have been collected and have not been read yet. The records are not available if
+        the collector has a callback.
+        :param batch_size: a maximum number of records in a batch
+        :return: a generator of NumPy arrays of RECORD_DTYPE
+        """
+        if self._is_running:
+            self.flush()
+        while self._batches:
+            batch = self._batches.popleft()
+            for start in range(0, len(batch), batch_size):
+                yield batch[start:start + batch_size]
+
+    def restart_in_child(self) -> None:
+        """
+        Restarts the background thread in a forked child process. The records of the parent process are discarded,
+        the parent process takes them itself.
+        """
+        self.pid = _os.getpid()
+        self._lock = _threading.Lock()
+        self._callback_lock = _threading.RLock()
+        self._batches.clear()
+        self._start_thread()
+
+    def _start_thread(self) -> None:
+        if self._interval is None:
+            return
+        self._stop_event = _threading.Event()
+        self._thread = _threading.Thread(target=self._run, name='ittapi.trace.collector', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=W0703
+                # The batch is lost, but the records of the next batches are still taken
+                _sys.excepthook(*_sys.exc_info())
+
+
+_running_collector = None
+_running_collector_lock = _threading.Lock()
+
+
+def _stop_running_collector() -> None:
+    collector = _running_collector
+    if collector is not None:
+        collector.stop()
+
+
+def _after_fork_in_child() -> None:
+    global _running_collector_lock  # pylint: disable=W0603
+    # The lock may have been held by another thread of the parent process at the moment of fork
+    _running_collector_lock = _threading.Lock()
+    if _running_collector is not None:
+        _running_collector.restart_in_child()
+
+
+_atexit.register(_stop_running_collector)
+if hasattr(_os, 'register_at_fork'):
+    _os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,456 @@
+"""
+export.py - Conversion of the traces of the reference collector to Chrome Trace Event JSON and Perfetto protobuf
+
+The traces are converted record by record and the output is written while the trace is read, so traces of any size can
+be converted and opened in chrome://tracing or https://ui.perfetto.dev without Intel VTune Profiler.
+"""
+import gzip as _gzip
+import json as _json
+import math as _math
+import struct as _struct
+
+from .reader import open_trace as _open_trace, RecordType, TraceReader
+
+
+class TraceWriter:
+    """
+    A base class of the streaming trace writers. The writers receive the events of the timeline in the order of
+    the records of the trace and write them to the file immediately. Timestamps are in nanoseconds.
+    """
+    def __init__(self, file, pid=0) -> None:
+        """
+        Creates a writer.
+        :param file: an opened file object, the file is not closed by the writer
+        :param pid: the process id of the traced process
+        """
+        self.file = file
+        self.pid = pid
+
+    def slice_begin(self, timestamp, tid, category, name) -> None:
+        """Begins a slice that is nested into the current slice of the thread."""
+        raise NotImplementedError()
+
+    def slice_end(self, timestamp, tid) -> None:
+        """Ends the current slice of the thread."""
+        raise NotImplementedError()
+
+    def async_begin(self, timestamp, tid, track, category, name, key) -> None:
+        """
+        Begins an asynchronous slice that may overlap other slices.
+        :param track: the name of the group of the asynchronous slices
+        :param key: a string that identifies the slice among the slices that are not ended
+        """
+        raise NotImplementedError()
+
+    def async_end(self, timestamp, tid, track, category, name, key) -> None:
+        """Ends the asynchronous slice."""
+        raise NotImplementedError()
+
+    def instant(self, timestamp, tid, category, name) -> None:
+        """Writes an instant event of the process."""
+        raise NotImplementedError()
+
+    def counter(self, timestamp, tid, category, name, value) -> None:
+        """Writes a value of the counter."""
+        raise NotImplementedError()
+
+    def thread_name(self, tid, name) -> None:
+        """Names the thread, a thread may be named after its events have been written."""
+        raise NotImplementedError()
+
+    def finish(self) -> None:
+        """Completes the trace."""
+
+
+class ChromeTraceWriter(TraceWriter):
+    """A streaming writer of Chrome Trace Event JSON that is supported by chrome://tracing and Perfetto UI."""
+    _FLUSH_SIZE = 4096
+
+    def __init__(self, file, pid=0) -> None:
+        """
+        Creates a writer.
+        :param file: a text file object
+        :param pid: the process id of the traced process
+        """
+        super().__init__(file, pid)
+        self._events = []
+        self._strings = {}
+        self._separator = ''
+        self.file.write('{"displayTimeUnit":"ns","traceEvents":[\n')
+
+    def _string(self, value) -> str:
+        """Returns the value escaped for JSON, the names repeat in the trace, so they are escaped once."""
+        string = self._strings.get(value)
+        if string is None:
+            string = self._strings[value] = _json.dumps(value)
+        return string
+
+    def _write(self, event) -> None:
+        self._events.append(event)
+        if len(self._events) >= self._FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._events:
+            self.file.write(self._separator + ',\n'.join(self._events))
+            self._separator = ',\n'
+            self._events = []
+
+    def slice_begin(self, timestamp, tid, category, name) -> None:
+        self._write(f'{{"ph":"B","pid":{self.pid},"tid":{tid},"ts":{timestamp / 1000:.3f},'
+                    f'"cat":{self._string(category)},"name":{self._string(name)}}}')
+
+    def slice_end(self, timestamp, tid) -> None:
+        self._write(f'{{"ph":"E","pid":{self.pid},"tid":{tid},"ts":{timestamp / 1000:.3f}}}')
+
+    def async_begin(self, timestamp, tid, track, category, name, key) -> None:
+        self._write(f'{{"ph":"b","pid":{self.pid},"tid":{tid},"ts":{timestamp / 1000:.3f},'
+                    f'"cat":{self._string(category)},"name":{self._string(name)},"id":{self._string(key)}}}')
+
+    def async_end(self, timestamp, tid, track, category, name, key) -> None:
+        self._write(f'{{"ph":"e","pid":{self.pid},"tid":{tid},"ts":{timestamp / 1000:.3f},'
+                    f'"cat":{self._string(category)},"name":{self._string(name)},"id":{self._string(key)}}}')
+
+    def instant(self, timestamp, tid, category, name) -> None:
+        self._write(f'{{"ph":"i","s":"p","pid":{self.pid},"tid":{tid},"ts":{timestamp / 1000:.3f},'
+                    f'"cat":{self._string(category)},"name":{self._string(name)}}}')
+
+    def counter(self, timestamp, tid, category, name, value) -> None:
+        # JSON has no representation for infinities and NaN
+        value = repr(value) if _math.isfinite(value) else 'null'
+        self._write(f'{{"ph":"C","pid":{self.pid},"tid":{tid},"ts":{timestamp / 1000:.3f},'
+                    f'"cat":{self._string(category)},"name":{self._string(name)},"args":{{"value":{value}}}}}')
+
+    def thread_name(self, tid, name) -> None:
+        self._write(f'{{"ph":"M","pid":{self.pid},"tid":{tid},"name":"thread_name",'
+                    f'"args":{{"name":{self._string(name)}}}}}')
+
+    def finish(self) -> None:
+        self._flush()
+        self.file.write('\n]}\n')
+
+
+# Protobuf doubles are little-endian fixed64 fields
+_DOUBLE = _struct.Struct('<d')
+
+
+def _varint(value) -> bytes:
+    if value < 0x80:
+        return _SMALL_VARINTS[value]
+    data = bytearray()
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+_SMALL_VARINTS = [bytes((value,)) for value in range(0x80)]
+# Two 7-bit groups of a varint that is continued
+_LOW_VARINTS = [bytes((value & 0x7F | 0x80, value >> 7 | 0x80)) for value in range(1 << 14)]
+
+
+def _field(number, value) -> bytes:
+    """Encodes a field of a protobuf message, the value is an integer (varint) or bytes (length-delimited)."""
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value & 0xFFFFFFFFFFFFFFFF)
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+class PerfettoTraceWriter(TraceWriter):
+    """
+    A streaming writer of Perfetto protobuf traces (a Trace message of TracePackets with TrackEvents). Names and
+    categories of the events are interned. Asynchronous slices are placed on separate tracks of the process, a track
+    is reused when its slice ends, so overlapping slices never share a track.
+    """
+    _FLUSH_SIZE = 4096
+    _SEQUENCE_ID = 1
+
+    # Field numbers of perfetto/protos/perfetto/trace/trace_packet.proto and track_event/*.proto
+    _PACKET_TAG = _varint(1 << 3 | 2)
+    _TIMESTAMP_TAG = _varint(8 << 3)
+    _PACKET_SEQUENCE_ID = 10
+    _PACKET_TRACK_EVENT = 11
+    _PACKET_INTERNED_DATA = 12
+    _PACKET_SEQUENCE_FLAGS = 13
+    _PACKET_TRACK_DESCRIPTOR = 60
+    _SEQUENCE_INCREMENTAL_STATE_CLEARED = 1
+    _SEQUENCE_NEEDS_INCREMENTAL_STATE = 2
+    _EVENT_CATEGORY_IIDS = 3
+    _EVENT_TYPE = 9
+    _EVENT_NAME_IID = 10
+    _EVENT_TRACK_UUID = 11
+    _EVENT_DOUBLE_COUNTER_VALUE = 44
+    _TYPE_SLICE_BEGIN = 1
+    _TYPE_SLICE_END = 2
+    _TYPE_INSTANT = 3
+    _TYPE_COUNTER = 4
+    _INTERNED_EVENT_CATEGORIES = 1
+    _INTERNED_EVENT_NAMES = 2
+    _TRACK_UUID = 1
+    _TRACK_NAME = 2
+    _TRACK_PROCESS = 3
+    _TRACK_THREAD = 4
+    _TRACK_PARENT_UUID = 5
+    _TRACK_COUNTER = 8
+    _PROCESS_PID = 1
+    _THREAD_PID = 1
+    _THREAD_TID = 2
+    _THREAD_NAME = 5
+
+    def __init__(self, file, pid=0) -> None:
+        """
+        Creates a writer.
+        :param file: a binary file object
+        :param pid: the process id of the traced process
+        """
+        super().__init__(file, pid)
+        self._packets = []
+        self._names = {}
+        self._categories = {}
+        self._threads = {}
+        self._counters = {}
+        self._suffixes = {}
+        self._free_lanes = {}
+        self._open_lanes = {}
+        self._last_uuid = 0
+        self._high = self._high_varint = None
+        # The incremental state (interned names) is valid from the first packet of the sequence
+        self._process_uuid = self._track(_field(self._TRACK_PROCESS, _field(self._PROCESS_PID, pid)),
+                                         flags=self._SEQUENCE_INCREMENTAL_STATE_CLEARED)
+
+    def _write(self, packet) -> None:
+        self._packets.append(self._PACKET_TAG + _varint(len(packet)) + packet)
+        if len(self._packets) >= self._FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        self.file.write(b''.join(self._packets))
+        self._packets = []
+
+    def _track(self, descriptor, uuid=None, flags=0) -> int:
+        """Writes a track descriptor and returns the uuid of the track."""
+        if uuid is None:
+            self._last_uuid += 1
+            uuid = self._last_uuid
+        packet = (_field(self._PACKET_TRACK_DESCRIPTOR, _field(self._TRACK_UUID, uuid) + descriptor)
+                  + _field(self._PACKET_SEQUENCE_ID, self._SEQUENCE_ID))
+        self._write(packet + _field(self._PACKET_SEQUENCE_FLAGS, flags) if flags else packet)
+        return uuid
+
+    def _thread_track(self, tid, name=None) -> int:
+        uuid = self._threads.get(tid)
+        if uuid is None or name is not None:
+            thread = _field(self._THREAD_PID, self.pid) + _field(self._THREAD_TID, tid)
+            if name is not None:
+                thread += _field(self._THREAD_NAME, name.encode())
+            uuid = self._threads[tid] = self._track(_field(self._TRACK_PARENT_UUID, self._process_uuid)
+                                                    + _field(self._TRACK_THREAD, thread), uuid)
+        return uuid
+
+    def _timestamp(self, timestamp) -> bytes:
+        """Encodes the timestamp as a varint, the high bits of the timestamps of a trace change rarely."""
+        high = timestamp >> 28
+        if not high:
+            return _varint(timestamp)
+        if high != self._high:
+            self._high, self._high_varint = high, _varint(high)
+        return _LOW_VARINTS[timestamp & 0x3FFF] + _LOW_VARINTS[timestamp >> 14 & 0x3FFF] + self._high_varint
+
+    @staticmethod
+    def _intern(table, value, interned_data, field):
+        """Returns the iid of the value and adds the new values to the interned data of the packet."""
+        iid = table.get(value)
+        if iid is None:
+            iid = table[value] = len(table) + 1
+            interned_data.append(_field(field, _field(1, iid) + _field(2, value.encode())))
+        return iid
+
+    def _event(self, timestamp, uuid, event_type, category=None, name=None, fields=b'') -> None:
+        # Events differ mostly in timestamps, so the rest of the packet is encoded once for each track and name
+        key = (uuid, event_type, category, name)
+        suffix = self._suffixes.get(key) if not fields else None
+        interned_data = []
+        if suffix is None:
+            event = _field(self._EVENT_TYPE, event_type) + _field(self._EVENT_TRACK_UUID, uuid) + fields
+            if category is not None:
+                event += _field(self._EVENT_CATEGORY_IIDS, self._intern(self._categories, category, interned_data,
+                                                                       self._INTERNED_EVENT_CATEGORIES))
+            if name is not None:
+                event += _field(self._EVENT_NAME_IID, self._intern(self._names, name, interned_data,
+                                                                  self._INTERNED_EVENT_NAMES))
+            suffix = (_field(self._PACKET_TRACK_EVENT, event) + _field(self._PACKET_SEQUENCE_ID, self._SEQUENCE_ID)
+                      + _field(self._PACKET_SEQUENCE_FLAGS, self._SEQUENCE_NEEDS_INCREMENTAL_STATE))
+            if not fields:
+                self._suffixes[key] = suffix
+        packet = self._TIMESTAMP_TAG + self._timestamp(timestamp) + suffix
+        if interned_data:
+            packet += _field(self._PACKET_INTERNED_DATA, b''.join(interned_data))
+        self._write(packet)
+
+    def slice_begin(self, timestamp, tid, category, name) -> None:
+        self._event(timestamp, self._thread_track(tid), self._TYPE_SLICE_BEGIN, category, name)
+
+    def slice_end(self, timestamp, tid) -> None:
+        self._event(timestamp, self._thread_track(tid), self._TYPE_SLICE_END)
+
+    def async_begin(self, timestamp, tid, track, category, name, key) -> None:
+        free_lanes = self._free_lanes.setdefault(track, [])
+        if free_lanes:
+            uuid = free_lanes.pop()
+        else:
+            uuid = self._track(_field(self._TRACK_PARENT_UUID, self._process_uuid)
+                               + _field(self._TRACK_NAME, track.encode()))
+        self._open_lanes.setdefault(key, []).append(uuid)
+        self._event(timestamp, uuid, self._TYPE_SLICE_BEGIN, category, name)
+
+    def async_end(self, timestamp, tid, track, category, name, key) -> None:
+        lanes = self._open_lanes.get(key)
+        if not lanes:
+            return
+        uuid = lanes.pop()
+        if not lanes:
+            del self._open_lanes[key]
+        self._free_lanes[track].append(uuid)
+        self._event(timestamp, uuid, self._TYPE_SLICE_END)
+
+    def instant(self, timestamp, tid, category, name) -> None:
+        self._event(timestamp, self._process_uuid, self._TYPE_INSTANT, category, name)
+
+    def counter(self, timestamp, tid, category, name, value) -> None:
+        uuid = self._counters.get((category, name))
+        if uuid is None:
+            uuid = self._counters[(category, name)] = self._track(
+                _field(self._TRACK_PARENT_UUID, self._process_uuid) + _field(self._TRACK_NAME, name.encode())
+                + _field(self._TRACK_COUNTER, b''))
+        self._event(timestamp, uuid, self._TYPE_COUNTER,
+                    fields=_varint(self._EVENT_DOUBLE_COUNTER_VALUE << 3 | 1) + _DOUBLE.pack(value))
+
+    def thread_name(self, tid, name) -> None:
+        self._thread_track(tid, name)
+
+    def finish(self) -> None:
+        self._flush()
+
+
+_FORMATS = {'chrome': ChromeTraceWriter, 'perfetto': PerfettoTraceWriter}
+
+
+def _check_timestamps(reader) -> None:
+    if not reader.has_timestamps:
+        raise ValueError(f'Only binary and mmap traces can be exported, the {reader.format} trace has no timestamps.')
+
+
+def convert(reader: TraceReader, writer: TraceWriter, batch_size=65536) -> None:  # pylint: disable=R0912,R0914,R0915
+    """
+    Converts the records of the trace to the events of the writer.
+    :param reader: an opened trace
+    :param writer: a trace writer, the trace is not finished by the function
+    :param batch_size: a maximum number of records that are read at once
+    """
+    _check_timestamps(reader)
+    domains, strings, events, counters = reader.domains, reader.strings, reader.events, reader.counters
+    depths = {}
+    open_slices = {}
+    counter_values = {}
+    thread_names = {}
+    for batch in reader.records(batch_size):
+        columns = [batch[field].tolist() for field in ('timestamp', 'tid', 'type', 'domain', 'name', 'id', 'value')]
+        columns.append(batch['value'].view('=f8').tolist())
+        for timestamp, tid, record_type, domain, name, record_id, value, double in zip(*columns):
+            if record_type == RecordType.TASK_BEGIN:
+                depths[tid] = depths.get(tid, 0) + 1
+                writer.slice_begin(timestamp, tid, domains.get(domain, ''), strings.get(name, ''))
+            elif record_type == RecordType.TASK_END:
+                # The beginning of the task may have been overwritten in the ring
+                if depths.get(tid):
+                    depths[tid] -= 1
+                    writer.slice_end(timestamp, tid)
+            elif record_type in (RecordType.COUNTER_VALUE, RecordType.COUNTER_INC, RecordType.COUNTER_DEC):
+                if record_type == RecordType.COUNTER_VALUE:
+                    counter_values[record_id] = double
+                else:
+                    delta = value if record_type == RecordType.COUNTER_INC else -value
+                    counter_values[record_id] = counter_values.get(record_id, 0) + delta
+                category, name = counters.get(record_id, ('', ''))
+                writer.counter(timestamp, tid, category, name, float(counter_values[record_id]))
+            elif record_type in (RecordType.PAUSE, RecordType.RESUME, RecordType.DETACH):
+                writer.instant(timestamp, tid, 'collection', RecordType(record_type).name.lower())
+            else:
+                category = domains.get(domain, '')
+                if record_type in (RecordType.TASK_BEGIN_OVERLAPPED, RecordType.TASK_END_OVERLAPPED):
+                    track, key, label = category, f'task:{domain:x}:{record_id:x}', strings.get(name, '')
+                elif record_type in (RecordType.REGION_BEGIN, RecordType.REGION_END):
+                    track, key, label = f'{category} regions', f'region:{domain:x}:{record_id:x}', strings.get(name, '')
+                elif record_type in (RecordType.FRAME_BEGIN, RecordType.FRAME_END, RecordType.FRAME_SUBMIT):
+                    track, key, label = f'{category} frames', f'frame:{domain:x}:{record_id:x}', 'frame'
+                elif record_type in (RecordType.EVENT_START, RecordType.EVENT_END):
+                    category, label = 'event', events.get(record_id, '')
+                    track, key = 'events', f'event:{tid}:{record_id:x}'
+                else:
+                    continue
+
+                if record_type == RecordType.FRAME_SUBMIT:
+                    # The frame has been recorded beforehand, its timestamps are in the name and the value
+                    writer.async_begin(name, tid, track, category, label, key)
+                    writer.async_end(value, tid, track, category, label, key)
+                elif record_type in (RecordType.TASK_BEGIN_OVERLAPPED, RecordType.REGION_BEGIN,
+                                     RecordType.FRAME_BEGIN, RecordType.EVENT_START):
+                    open_slices.setdefault(key, []).append(label)
+                    writer.async_begin(timestamp, tid, track, category, label, key)
+                else:
+                    # The ends refer to the slices by ids, the names are taken from the beginnings
+                    labels = open_slices.get(key)
+                    if not labels:
+                        continue
+                    label = labels.pop()
+                    if not labels:
+                        del open_slices[key]
+                    writer.async_end(timestamp, tid, track, category, label, key)
+
+        for tid, name in reader.thread_names.items():
+            if thread_names.get(tid) != name:
+                thread_names[tid] = name
+                writer.thread_name(tid, name)
+
+
+def export(trace, path, format=None, batch_size=65536) -> None:  # pylint: disable=W0622
+    """
+    Converts a binary or memory-mapped trace of the reference collector to Chrome Trace Event JSON or Perfetto
+    protobuf. The output is written while the trace is read.
+    :param trace: a path to the trace or an opened trace reader
+    :param path: a path to the output file, Chrome JSON is compressed with gzip if the path ends with '.gz'
+    :param format: 'chrome' or 'perfetto', by default it is detected by the extension of the path ('.json' or
+                   '.json.gz' for Chrome JSON, '.pftrace', '.perfetto-trace' or '.pb' for Perfetto protobuf)
+    :param batch_size: a maximum number of records that are read at once
+    """
+    path = str(path)
+    if format is None:
+        if path.endswith(('.json', '.json.gz')):
+            format = 'chrome'
+        elif path.endswith(('.pftrace', '.perfetto-trace', '.pb')):
+            format = 'perfetto'
+        else:
+            raise ValueError(f'Cannot detect the output format by the name of {path!r}, specify the format.')
+    writer_type = _FORMATS.get(format)
+    if writer_type is None:
+        raise ValueError(f'Unknown output format: {format!r}, expected one of {sorted(_FORMATS)}.')
+
+    reader = _open_trace(trace) if not isinstance(trace, TraceReader) else trace
+    try:
+        # The output is not created for the traces that cannot be converted
+        _check_timestamps(reader)
+        if writer_type is PerfettoTraceWriter:
+            file = open(path, 'wb')  # pylint: disable=R1732
+        elif path.endswith('.gz'):
+            # The default compression level is several times slower and gains little on the repetitive JSON
+            file = _gzip.open(path, 'wt', compresslevel=6, encoding='utf-8')
+        else:
+            file = open(path, 'w', encoding='utf-8')  # pylint: disable=R1732
+        with file:
+            writer = writer_type(file, reader.pid or 0)
+            convert(reader, writer, batch_size)
+            writer.finish()
+    finally:
+        if reader is not trace:
+            reader.close()
@@ -0,0 +1,363 @@
+"""
+reader.py - Stream readers of the traces written by the reference collector
+
+The reference collector (src/ittnotify_refcol) writes a text log, a binary trace or a memory-mapped ring trace depending
+on INTEL_LIBITTNOTIFY_LOG_FORMAT (text, binary or mmap). The readers return the records of the timeline in batches of
+NumPy structured arrays of RECORD_DTYPE, so a trace of any size is processed without loading it into memory.
+"""
+import re as _re
+import struct as _struct
+from enum import IntEnum as _IntEnum
+
+import numpy as _np
+
+
+class RecordType(_IntEnum):
+    """Types of the trace records, see itt_refcol_trace.h."""
+    DOMAIN = 1
+    STRING_HANDLE = 2
+    COUNTER = 3
+    EVENT = 4
+    THREAD_NAME = 5
+    CHUNK = 8
+    TASK_BEGIN = 16
+    TASK_END = 17
+    TASK_BEGIN_OVERLAPPED = 18
+    TASK_END_OVERLAPPED = 19
+    REGION_BEGIN = 20
+    REGION_END = 21
+    FRAME_BEGIN = 22
+    FRAME_END = 23
+    FRAME_SUBMIT = 24
+    EVENT_START = 25
+    EVENT_END = 26
+    COUNTER_VALUE = 27
+    COUNTER_INC = 28
+    COUNTER_DEC = 29
+    PAUSE = 30
+    RESUME = 31
+    DETACH = 32
+
+
+# The layout of itt_refcol_record, integers are stored in the byte order of the traced machine
+RECORD_DTYPE = _np.dtype([('timestamp', '=u8'), ('tid', '=u4'), ('type', '=u2'), ('size', '=u2'),
+                          ('domain', '=u8'), ('name', '=u8'), ('id', '=u8'), ('value', '=u8')])
+
+_MAGIC = b'ITTTRACE'
+_VERSION = 1
+_FLAG_RING = 0x1
+_HEADER = _struct.Struct('=8sIIIIQQQ16x')
+_RING_HEADER = _struct.Struct('=8Q')
+
+
+class TraceReader:
+    """
+    A base class of the trace readers.
+
+    The names of domains, string handles, events, counters and threads are collected into the dictionaries of
+    the reader while the records are read. A record refers only to the definitions that precede it in the trace, so
+    its names are known when the batch that contains it is returned.
+    """
+    format = None
+    has_timestamps = True
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self.pid = None
+        self.start_time = None
+        self.start_realtime = None
+        self.domains = {}
+        self.strings = {}
+        self.events = {}
+        self.counters = {}
+        self.thread_names = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.path!r})'
+
+    def close(self) -> None:
+        """Closes the trace file."""
+
+    def records(self, batch_size=65536):
+        """
+        Reads the records of the timeline. Records of each thread are returned in the order of their timestamps, but
+        the records of different threads may be interleaved in any order.
+        :param batch_size: a maximum number of records in a batch
+        :return: a generator of NumPy arrays of RECORD_DTYPE
+        """
+        raise NotImplementedError()
+
+    def _define(self, record, name: bytes) -> None:
+        record_type, record_id = int(record['type']), int(record['id'])
+        if record_type == RecordType.COUNTER:
+            domain, _, name = name.partition(b'\0')
+            self.counters[record_id] = (domain.decode(errors='replace'), name.decode(errors='replace'))
+            return
+
+        name = name.decode(errors='replace')
+        if record_type == RecordType.DOMAIN:
+            self.domains[record_id] = name
+        elif record_type == RecordType.STRING_HANDLE:
+            self.strings[record_id] = name
+        elif record_type == RecordType.EVENT:
+            self.events[record_id] = name
+        elif record_type == RecordType.THREAD_NAME:
+            self.thread_names[int(record['tid'])] = name
+
+    def _split(self, records):
+        """
+        Separates the definitions from the records of the timeline.
+        :return: the records of the timeline and the number of the consumed records
+        """
+        record_size = RECORD_DTYPE.itemsize
+        types = records['type']
+        definitions = _np.flatnonzero((types > 0) & (types < RecordType.TASK_BEGIN))
+        parts = []
+        position = 0
+        # The names that follow the definitions may look like any records, so they are skipped one by one
+        next_definition = _np.searchsorted(definitions, position)
+        while next_definition < len(definitions):
+            index = int(definitions[next_definition])
+            size = int(records['size'][index])
+            end = index + 1 + (size + record_size - 1) // record_size
+            parts.append(records[position:index])
+            if end > len(records):
+                position = index
+                break
+            self._define(records[index], records[index + 1:end].tobytes()[:size])
+            position = end
+            next_definition = _np.searchsorted(definitions, position)
+        else:
+            parts.append(records[position:])
+            position = len(records)
+
+        batch = _np.concatenate(parts) if len(parts) != 1 else parts[0]
+        if len(batch) and int(batch['type'].min()) < RecordType.TASK_BEGIN:
+            batch = batch[batch['type'] >= RecordType.TASK_BEGIN]
+        return batch, position
+
+
+class _BinaryTraceReader(TraceReader):
+    """A reader of the traces written with INTEL_LIBITTNOTIFY_LOG_FORMAT=binary."""
+    format = 'binary'
+
+    def __init__(self, path, header_size) -> None:
+        super().__init__(path)
+        self._file = open(path, 'rb')  # pylint: disable=R1732
+        self._file.seek(header_size)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def records(self, batch_size=65536):
+        record_size = RECORD_DTYPE.itemsize
+        pending = b''
+        while True:
+            data = self._file.read(batch_size * record_size)
+            if not data:
+                return
+            data = pending + data
+            records = _np.frombuffer(data, RECORD_DTYPE, len(data) // record_size)
+            batch, consumed = self._split(records)
+            # The rest is a definition that continues in the next block
+            pending = data[consumed * record_size:]
+            if batch.size:
+                yield batch
+
+
+class _RingTraceReader(_BinaryTraceReader):
+    """
+    A reader of the traces written with INTEL_LIBITTNOTIFY_LOG_FORMAT=mmap. The trace may be read while the traced
+    process is running or after it has crashed.
+    """
+    format = 'mmap'
+
+    def __init__(self, path, header_size) -> None:
+        super().__init__(path, header_size)
+        (definitions_offset, definitions_size, definitions_used, self.dropped_definitions, records_offset,
+         records_size, chunk_size, self.head) = _RING_HEADER.unpack(self._file.read(_RING_HEADER.size))
+
+        self._file.seek(definitions_offset)
+        definitions = self._file.read(min(definitions_used, definitions_size))
+        definitions = _np.frombuffer(definitions, RECORD_DTYPE, len(definitions) // RECORD_DTYPE.itemsize)
+        self._split(definitions)
+
+        self._records_per_chunk = chunk_size // RECORD_DTYPE.itemsize
+        self._records = _np.memmap(path, RECORD_DTYPE, 'r', records_offset,
+                                   (records_size // RECORD_DTYPE.itemsize,)) if records_size else None
+
+    def close(self) -> None:
+        self._records = None
+        super().close()
+
+    def records(self, batch_size=65536):
+        if self._records is None:
+            return
+        chunks = self._records.reshape(-1, self._records_per_chunk)
+        headers = chunks[:, 0]
+        valid = _np.flatnonzero(headers['type'] == RecordType.CHUNK)
+        # The chunks are reserved one after another, the oldest ones have been overwritten after wrap-around
+        order = valid[_np.argsort(headers['id'][valid], kind='stable')]
+        step = max(1, batch_size // self._records_per_chunk)
+        for start in range(0, len(order), step):
+            batch = chunks[order[start:start + step], 1:].reshape(-1)
+            # The unused records at the end of a chunk are zeroed
+            batch = batch[batch['type'] >= RecordType.TASK_BEGIN]
+            if batch.size:
+                yield batch
+
+
+class _TextTraceReader(TraceReader):
+    """
+    A reader of the text logs of the reference collector. The log has neither timestamps nor thread ids, so all
+    records have zero timestamps and belong to thread 0. Domains, string handles and counters get synthetic ids.
+    """
+    format = 'text'
+    has_timestamps = False
+
+    _LINE = _re.compile(r'\[\w+\] (\w+)\(\.\.\.\) - (?:function args: )?(.*)$')
+    _DEFINITION = _re.compile(r'name=(.*) \([^()]*\)$')
+    _COUNTER = _re.compile(r'name=(.*), domain=(.*), type=\d+ \([^()]*\)$')
+    _EVENT = _re.compile(r'name=(.*) event=(-?\d+)$')
+    _NAME = _re.compile(r'name=(.*)$')
+    _BEGIN = _re.compile(r'domain=(.*?) name=(.*) (?:task)?id=(\d+),\d+,\d+ parentid=(\d+),\d+,\d+$')
+    _DOMAIN = _re.compile(r'domain=(.*?)(?:, time_begin=(\d+), time_end=(\d+))?$')
+    _END = _re.compile(r'domain=(.*) (?:task)?id=(\d+),\d+,\d+$')
+    _EVENT_CALL = _re.compile(r'event=(-?\d+)$')
+    _COUNTER_VALUE = _re.compile(r'counter_name=(.*) (?:counter_value|delta)=(\S+)$')
+
+    _TYPES = {
+        '__itt_task_begin': RecordType.TASK_BEGIN, '__itt_task_end': RecordType.TASK_END,
+        '__itt_task_begin_overlapped': RecordType.TASK_BEGIN_OVERLAPPED,
+        '__itt_task_end_overlapped': RecordType.TASK_END_OVERLAPPED,
+        '__itt_region_begin': RecordType.REGION_BEGIN, '__itt_region_end': RecordType.REGION_END,
+        '__itt_frame_begin_v3': RecordType.FRAME_BEGIN, '__itt_frame_end_v3': RecordType.FRAME_END,
+        '__itt_frame_submit_v3': RecordType.FRAME_SUBMIT,
+        '__itt_event_start': RecordType.EVENT_START, '__itt_event_end': RecordType.EVENT_END,
+        '__itt_counter_set_value': RecordType.COUNTER_VALUE, '__itt_counter_set_value_v3': RecordType.COUNTER_VALUE,
+        '__itt_counter_inc_delta': RecordType.COUNTER_INC, '__itt_counter_dec_delta': RecordType.COUNTER_DEC,
+        '__itt_pause': RecordType.PAUSE, '__itt_pause_scoped': RecordType.PAUSE,
+        '__itt_resume': RecordType.RESUME, '__itt_resume_scoped': RecordType.RESUME,
+        '__itt_detach': RecordType.DETACH,
+    }
+
+    def __init__(self, path) -> None:
+        super().__init__(path)
+        self._file = open(path, 'r', encoding='utf-8', errors='replace')  # pylint: disable=R1732
+        self._ids = {}
+        self._counter_names = {}
+
+    def close(self) -> None:
+        self._file.close()
+
+    def records(self, batch_size=65536):
+        batch = []
+        for line in self._file:
+            match = self._LINE.match(line.rstrip('\n'))
+            record = self._parse(match.group(1), match.group(2)) if match else None
+            if record is not None:
+                batch.append(record)
+                if len(batch) == batch_size:
+                    yield _np.array(batch, RECORD_DTYPE)
+                    batch = []
+        if batch:
+            yield _np.array(batch, RECORD_DTYPE)
+
+    def _id(self, table, name):
+        """Returns the synthetic id of the name and adds it to the table."""
+        key = (id(table), name)
+        value = self._ids.get(key)
+        if value is None:
+            value = self._ids[key] = len(self._ids) + 1
+            table[value] = name
+        return value
+
+    def _parse(self, function, args):  # pylint: disable=R0911,R0912
+        """Parses the arguments of the call and returns the record or None."""
+        if function in ('__itt_domain_create', '__itt_string_handle_create'):
+            match = self._DEFINITION.match(args)
+            if match:
+                self._id(self.domains if function == '__itt_domain_create' else self.strings, match.group(1))
+            return None
+        if function == '__itt_counter_create_typed':
+            match = self._COUNTER.match(args)
+            if match:
+                counter_id = self._id(self._counter_names, match.group(1))
+                self.counters[counter_id] = (match.group(2), match.group(1))
+            return None
+        if function == '__itt_event_create':
+            match = self._EVENT.match(args)
+            if match:
+                self.events[int(match.group(2))] = match.group(1)
+            return None
+        if function == '__itt_thread_set_name':
+            match = self._NAME.match(args)
+            if match:
+                self.thread_names[0] = match.group(1)
+            return None
+
+        record_type = self._TYPES.get(function)
+        if record_type is None:
+            return None
+        domain = name = record_id = value = 0
+        if record_type in (RecordType.TASK_BEGIN, RecordType.TASK_BEGIN_OVERLAPPED, RecordType.REGION_BEGIN):
+            match = self._BEGIN.match(args)
+            if not match:
+                return None
+            domain, name = self._id(self.domains, match.group(1)), self._id(self.strings, match.group(2))
+            record_id, value = int(match.group(3)), int(match.group(4))
+        elif record_type in (RecordType.TASK_END_OVERLAPPED, RecordType.REGION_END):
+            match = self._END.match(args)
+            if not match:
+                return None
+            domain, record_id = self._id(self.domains, match.group(1)), int(match.group(2))
+        elif record_type in (RecordType.TASK_END, RecordType.FRAME_BEGIN, RecordType.FRAME_END,
+                             RecordType.FRAME_SUBMIT):
+            match = self._DOMAIN.match(args)
+            if not match:
+                return None
+            domain = self._id(self.domains, match.group(1))
+            if record_type == RecordType.FRAME_SUBMIT:
+                name, value = int(match.group(2) or 0), int(match.group(3) or 0)
+        elif record_type in (RecordType.EVENT_START, RecordType.EVENT_END):
+            match = self._EVENT_CALL.match(args)
+            if not match:
+                return None
+            record_id = int(match.group(1)) & 0xFFFFFFFFFFFFFFFF
+        elif record_type in (RecordType.COUNTER_VALUE, RecordType.COUNTER_INC, RecordType.COUNTER_DEC):
+            match = self._COUNTER_VALUE.match(args)
+            if not match:
+                return None
+            record_id = self._id(self._counter_names, match.group(1))
+            number = float(match.group(2))
+            value = (_struct.unpack('=Q', _struct.pack('=d', number))[0] if record_type == RecordType.COUNTER_VALUE
+                     else int(number))
+        return 0, 0, record_type, 0, domain, name, record_id, value
+
+
+def open_trace(path) -> TraceReader:
+    """
+    Opens a trace or a log written by the reference collector. The format is detected by the content of the file.
+    :param path: a path to the file
+    :return: a reader of the trace
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+
+    if len(header) < _HEADER.size or not header.startswith(_MAGIC):
+        return _TextTraceReader(path)
+
+    _, version, header_size, record_size, flags, pid, start_time, start_realtime = _HEADER.unpack(header)
+    if version > _VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f'Unsupported trace format: version {version}, record size {record_size}.')
+
+    reader_type = _RingTraceReader if flags & _FLAG_RING else _BinaryTraceReader
+    reader = reader_type(path, header_size)
+    reader.pid, reader.start_time, reader.start_realtime = pid, start_time, start_realtime
+    return reader
@@ -41,8 +41,10 @@ if itt_dir == ITT_DEFAULT_DIR and not len(os.listdir(itt_dir)):
 build_itt_with_ipt_support = get_environment_flag('ITTAPI_BUILD_WITH_ITT_API_IPT_SUPPORT')
 build_itt_with_ipt_support = build_itt_with_ipt_support if build_itt_with_ipt_support is not None else True
 
-itt_source = [os.path.join(itt_dir, 'src', 'ittnotify', 'ittnotify_static.c')]
-itt_include_dirs = [os.path.join(itt_dir, 'include')]
+itt_source = [os.path.join(itt_dir, 'src', 'ittnotify', 'ittnotify_static.c'),
+              os.path.join(itt_dir, 'src', 'ittnotify', 'jitprofiling.c')]
+itt_include_dirs = [os.path.join(itt_dir, 'include'), os.path.join(itt_dir, 'src', 'ittnotify'),
+                    os.path.join(itt_dir, 'src', 'ittnotify_refcol')]
 itt_license_files = []
 if itt_dir == ITT_DEFAULT_DIR:
     itt_license_files = [os.path.join(itt_dir, 'LICENSES', 'BSD-3-Clause.txt'),
@@ -62,11 +64,20 @@ else:
 ittapi_license_files = []
 ittapi_native_sources = ['ittapi.native/extensions/python.cpp',
                         'ittapi.native/extensions/string.cpp',
+                        'ittapi.native/activator.cpp',
                         'ittapi.native/collection_control.cpp',
+                        'ittapi.native/collector.cpp',
+                        'ittapi.native/counter.cpp',
                         'ittapi.native/domain.cpp',
                         'ittapi.native/event.cpp',
+                        'ittapi.native/fork.cpp',
+                        'ittapi.native/frame.cpp',
+                        'ittapi.native/histogram.cpp',
                         'ittapi.native/id.cpp',
+                        'ittapi.native/jit.cpp',
+                        'ittapi.native/metadata.cpp',
                         'ittapi.native/string_handle.cpp',
+                        'ittapi.native/sync.cpp',
                         'ittapi.native/task.cpp',
                         'ittapi.native/thread_naming.cpp',
                         'ittapi.native/pt_region.cpp',
@@ -133,7 +144,7 @@ class NativeBuildExtension(build_ext):  # pylint: disable=R0903
 setup(name='ittapi',
       version='1.2.1',
       description='ITT API bindings for Python',
-      packages=['ittapi', 'ittapi/compat'],
+      packages=['ittapi', 'ittapi/compat', 'ittapi/trace'],
       ext_modules=[ittapi_native],
       license_files=ittapi_license_files + itt_license_files,
       cmdclass={'build_ext': NativeBuildExtension} if build_itt_with_ipt_support else {},
@@ -1,3 +1,4 @@
+from contextvars import ContextVar as _ContextVar
 from types import ModuleType as _ModuleType
 from unittest.mock import MagicMock as _MagicMock
 
@@ -8,18 +9,49 @@ class IttapiNativeMock(_ModuleType):
     def __init__(self):
         super().__init__(ITTAPI_NATIVE_MODULE_NAME)
         self.attrs = {
+            'active_region_begin': _MagicMock(),
+            'active_region_end': _MagicMock(),
+            'async_task_ids': _ContextVar('ittapi.async_task_ids'),
+            'collector_drain': _MagicMock(),
+            'collector_dropped': _MagicMock(),
+            'collector_start': _MagicMock(),
+            'collector_stop': _MagicMock(),
+            'counter_set_many': _MagicMock(),
             'detach': _MagicMock(),
+            'duty_cycle_activator': _MagicMock(),
+            'every_nth_activator': _MagicMock(),
+            'first_k_activator': _MagicMock(),
+            'frame_begin': _MagicMock(),
+            'frame_end': _MagicMock(),
+            'frame_submit': _MagicMock(),
+            'get_timestamp': _MagicMock(),
+            'is_collector_attached': _MagicMock(),
+            'jit_is_profiling_active': _MagicMock(),
+            'jit_load_method': _MagicMock(),
+            'jit_shutdown': _MagicMock(),
+            'metadata_add': _MagicMock(),
             'pause': _MagicMock(),
+            'paused_region_begin': _MagicMock(),
+            'paused_region_end': _MagicMock(),
+            'rate_activator': _MagicMock(),
             'resume': _MagicMock(),
             'task_begin': _MagicMock(),
             'task_end': _MagicMock(),
             'task_begin_overlapped': _MagicMock(),
             'task_end_overlapped': _MagicMock(),
             'thread_set_name': _MagicMock(),
+            'string_handle_cache_clear': _MagicMock(),
+            'string_handle_cache_info': _MagicMock(),
+            'string_handle_cache_limit': _MagicMock(),
+            'Counter': _MagicMock(),
             'Domain': _MagicMock(),
             'Event': _MagicMock(),
+            'Histogram': _MagicMock(),
             'Id': _MagicMock(),
+            'NO_ID': object(),
             'StringHandle': _MagicMock(),
+            'Sync': _MagicMock(),
+            'Task': _MagicMock(),
             # ittapi.compat
             'PT_Region': _MagicMock(),
             'pt_region_begin': _MagicMock(),
@@ -0,0 +1,121 @@
+"""
+ittapi_native_real.py - Loader of the built ittapi.native extension for the tests of the native code
+
+The ittapi.native module is replaced with the mock for the tests (see ittapi_native_mock), therefore the built
+extension is loaded from the ittapi package on sys.path (e.g. installed with pip) under its own name without
+registering it in sys.modules.
+
+The records of the in-process collector of the extension are decoded without NumPy, so the tests of the native code
+do not depend on the trace extra.
+"""
+from collections import namedtuple
+from enum import IntEnum
+from importlib.machinery import EXTENSION_SUFFIXES
+from importlib.util import module_from_spec, spec_from_file_location
+from os import getcwd
+from os.path import isfile, join
+from struct import Struct
+from sys import path as sys_path
+from unittest import SkipTest
+
+
+class RecordType(IntEnum):
+    """Types of the timeline records, see ittapi.trace.RecordType."""
+    TASK_BEGIN = 16
+    TASK_END = 17
+    TASK_BEGIN_OVERLAPPED = 18
+    TASK_END_OVERLAPPED = 19
+    REGION_BEGIN = 20
+    REGION_END = 21
+    FRAME_BEGIN = 22
+    FRAME_END = 23
+    FRAME_SUBMIT = 24
+    EVENT_START = 25
+    EVENT_END = 26
+    COUNTER_VALUE = 27
+    COUNTER_INC = 28
+    COUNTER_DEC = 29
+    PAUSE = 30
+    RESUME = 31
+    DETACH = 32
+
+
+# The layout of itt_refcol_record, see ittapi.trace.RECORD_DTYPE
+_RECORD = Struct('=QIHHQQQQ')
+
+TraceRecord = namedtuple('TraceRecord', ['timestamp', 'tid', 'type', 'domain', 'name', 'id', 'value'])
+
+_native_module = None
+
+
+def find_native_module():
+    """
+    Finds the built ittapi.native extension on sys.path.
+    :return: the path of the extension, or None if the extension is not built
+    """
+    for entry in sys_path:
+        for suffix in EXTENSION_SUFFIXES:
+            filename = join(entry or getcwd(), 'ittapi', 'native' + suffix)
+            if isfile(filename):
+                return filename
+    return None
+
+
+def load_native_module():
+    """
+    Loads the built ittapi.native extension once per process.
+    :return: the extension module
+    :raise SkipTest: if the extension is not built
+    """
+    global _native_module  # pylint: disable=W0603
+    if _native_module is None:
+        filename = find_native_module()
+        if filename is None:
+            raise SkipTest('ittapi.native extension is not built')
+        spec = spec_from_file_location('ittapi.native', filename)
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _native_module = module
+    return _native_module
+
+
+def collect(callback, buffer_size=4096):
+    """
+    Runs the callback with the in-process collector of the built extension.
+    :param callback: a function that is called with the extension module while the collector runs
+    :param buffer_size: the number of the records in the buffer of each thread
+    :return: a list of TraceRecord for the timeline and a dictionary of the defined names by their ids
+    :raise SkipTest: if the extension is not built or a collector library is attached to the process
+    """
+    native = load_native_module()
+    try:
+        native.collector_start(buffer_size)
+    except RuntimeError as error:
+        raise SkipTest(str(error)) from error
+    try:
+        callback(native)
+        data = native.collector_drain()
+    finally:
+        native.collector_stop()
+    return parse_records(data)
+
+
+def parse_records(data):
+    """
+    Parses the records drained from the in-process collector.
+    :param data: the bytes returned by collector_drain()
+    :return: a list of TraceRecord for the timeline and a dictionary of the defined names by their ids
+    """
+    records = []
+    names = {}
+    offset = 0
+    while offset < len(data):
+        timestamp, tid, record_type, size, domain, name, record_id, value = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        if record_type < RecordType.TASK_BEGIN:
+            # A definition is followed by its name padded to the size of the records
+            names[record_id] = data[offset:offset + size].decode()
+            offset += (size + _RECORD.size - 1) // _RECORD.size * _RECORD.size
+        else:
+            records.append(TraceRecord(timestamp, tid, RecordType(record_type), domain, name, record_id, value))
+    return records, names
@@ -0,0 +1,161 @@
+import gc
+import sys
+from unittest import main as unittest_main, skipUnless, TestCase
+from unittest.mock import call
+
+from ittapi_native_mock import patch as ittapi_native_patch
+import ittapi
+from ittapi.autotrace import _Selector
+
+
+def traced_function():
+    return nested_function() + 1
+
+
+def nested_function():
+    return 1
+
+
+def failing_function():
+    raise ValueError()
+
+
+class SelectorTests(TestCase):
+    @ittapi_native_patch('StringHandle')
+    def test_selection_of_package_and_its_members(self, string_handle_mock):
+        selector = _Selector(include='myapp')
+        self.assertIsNotNone(selector.select(traced_function.__code__, 'myapp'))
+        self.assertIsNotNone(selector.select(nested_function.__code__, 'myapp.handlers'))
+        self.assertIsNone(selector.select(failing_function.__code__, 'myapplication'))
+        string_handle_mock.assert_has_calls([call('myapp.traced_function'), call('myapp.handlers.nested_function')])
+
+    @ittapi_native_patch('StringHandle')
+    def test_selection_with_glob_and_exclude_patterns(self, string_handle_mock):
+        selector = _Selector(include=['myapp.*.traced_*'], exclude=['myapp.internal'])
+        self.assertIsNotNone(selector.select(traced_function.__code__, 'myapp.handlers'))
+        self.assertIsNone(selector.select(traced_function.__code__, 'myapp.internal'))
+        self.assertIsNone(selector.select(nested_function.__code__, 'myapp.handlers'))
+        string_handle_mock.assert_called_once_with('myapp.handlers.traced_function')
+
+    @ittapi_native_patch('StringHandle')
+    def test_selection_excludes_ittapi(self, string_handle_mock):
+        selector = _Selector()
+        self.assertIsNone(selector.select(traced_function.__code__, 'ittapi.task'))
+        string_handle_mock.assert_not_called()
+
+    @ittapi_native_patch('StringHandle')
+    def test_selection_is_cached(self, string_handle_mock):
+        selector = _Selector(include='myapp')
+        self.assertIsNone(selector.handle(traced_function.__code__))
+        handle = selector.select(traced_function.__code__, 'myapp')
+        self.assertIs(selector.handle(traced_function.__code__), handle)
+
+    @ittapi_native_patch('StringHandle')
+    def test_selection_cache_does_not_keep_code_objects(self, string_handle_mock):
+        selector = _Selector(include='myapp')
+        code = compile('pass', 'myapp.py', 'exec')
+        selector.select(code, 'myapp')
+        selector.select(compile('pass', 'other.py', 'exec'), 'other')
+        self.assertEqual(len(selector), 1)
+        self.assertEqual(selector.unselected(), [])
+
+        del code
+        gc.collect()
+        self.assertEqual(len(selector), 0)
+
+
+class AutotraceTests(TestCase):
+    def tearDown(self):
+        ittapi.autotrace.disable()
+
+    @ittapi_native_patch('is_collector_attached')
+    def test_enable_without_collector(self, is_collector_attached_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+        self.assertFalse(ittapi.autotrace.enable())
+        self.assertFalse(ittapi.autotrace.is_enabled())
+
+    @ittapi_native_patch('Domain')
+    def test_enable_twice(self, domain_mock):
+        self.assertTrue(ittapi.autotrace.enable(include=__name__))
+        self.assertTrue(ittapi.autotrace.is_enabled())
+        with self.assertRaises(RuntimeError):
+            ittapi.autotrace.enable(include=__name__)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin')
+    @ittapi_native_patch('task_end')
+    def test_tracing_of_selected_functions(self, domain_mock, string_handle_mock, task_begin_mock, task_end_mock):
+        ittapi.autotrace.enable(include=f'{__name__}.traced_function', domain='my domain')
+        traced_function()
+        ittapi.autotrace.disable()
+        self.assertFalse(ittapi.autotrace.is_enabled())
+
+        domain_mock.assert_called_once_with('my domain')
+        string_handle_mock.assert_called_once_with(f'{__name__}.traced_function')
+        task_begin_mock.assert_called_once_with(domain_mock.return_value, string_handle_mock.return_value)
+        task_end_mock.assert_called_once_with(domain_mock.return_value)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin')
+    @ittapi_native_patch('task_end')
+    def test_tracing_of_function_that_raises_exception(self, domain_mock, string_handle_mock, task_begin_mock,
+                                                       task_end_mock):
+        ittapi.autotrace.enable(include=f'{__name__}.failing_function')
+        with self.assertRaises(ValueError):
+            failing_function()
+        ittapi.autotrace.disable()
+
+        string_handle_mock.assert_called_once_with(f'{__name__}.failing_function')
+        task_begin_mock.assert_called_once_with(domain_mock.return_value, string_handle_mock.return_value)
+        task_end_mock.assert_called_once_with(domain_mock.return_value)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin')
+    @ittapi_native_patch('task_end')
+    def test_tracing_of_function_that_was_not_selected_before(self, domain_mock, string_handle_mock, task_begin_mock,
+                                                             task_end_mock):
+        ittapi.autotrace.enable(include=f'{__name__}.traced_function')
+        traced_function()
+        ittapi.autotrace.disable()
+        ittapi.autotrace.enable(include=f'{__name__}.nested_function')
+        traced_function()
+        ittapi.autotrace.disable()
+
+        string_handle_mock.assert_has_calls([call(f'{__name__}.traced_function'),
+                                             call(f'{__name__}.nested_function')])
+        self.assertEqual(task_begin_mock.call_count, 2)
+        self.assertEqual(task_end_mock.call_count, 2)
+
+    @skipUnless(hasattr(sys, 'monitoring'), 'sys.monitoring is not available')
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    def test_restart_keeps_events_disabled_by_other_tools(self, domain_mock, string_handle_mock):
+        monitoring = sys.monitoring
+        tool_id = monitoring.DEBUGGER_ID
+        calls = []
+
+        def on_start(code, instruction_offset):
+            calls.append(code)
+            return monitoring.DISABLE
+
+        monitoring.use_tool_id(tool_id, 'test')
+        self.addCleanup(monitoring.free_tool_id, tool_id)
+        self.addCleanup(monitoring.set_events, tool_id, 0)
+        monitoring.register_callback(tool_id, monitoring.events.PY_START, on_start)
+        monitoring.set_events(tool_id, monitoring.events.PY_START)
+
+        nested_function()
+        ittapi.autotrace.enable(include=f'{__name__}.traced_function')
+        nested_function()
+        ittapi.autotrace.disable()
+        ittapi.autotrace.enable(include=f'{__name__}.traced_function')
+        nested_function()
+
+        self.assertEqual(calls.count(nested_function.__code__), 1)
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
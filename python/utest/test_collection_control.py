@@ -1,6 +1,11 @@
+import asyncio
+from threading import Barrier, Thread
+from time import sleep
 from unittest import main as unittest_main, TestCase
+from unittest.mock import MagicMock
 
 from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import collect, load_native_module, RecordType
 import ittapi
 
 
@@ -22,127 +27,403 @@ class DirectCollectionControlTests(TestCase):
 
 
 class ActiveRegionTests(TestCase):
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_active_region_as_decorator(self, pause_mock, resume_mock):
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_active_region_as_decorator(self, active_region_end_mock, active_region_begin_mock):
         @ittapi.active_region
         def my_function():
             return 42
 
         self.assertEqual(my_function(), 42)
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_active_region_as_context_manager(self, pause_mock, resume_mock):
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_active_region_as_context_manager(self, active_region_end_mock, active_region_begin_mock):
         with ittapi.active_region():
             pass
 
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_active_region_with_manual_activation(self, pause_mock, resume_mock):
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_active_region_with_manual_activation(self, active_region_end_mock, active_region_begin_mock):
         region = ittapi.active_region()
 
         region.activator.deactivate()
         with region:
             pass
 
-        resume_mock.assert_not_called()
-        pause_mock.assert_not_called()
+        active_region_begin_mock.assert_not_called()
+        active_region_end_mock.assert_not_called()
 
         region.activator.activate()
         with region:
             pass
 
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_active_region_with_custom_activator(self, pause_mock, resume_mock):
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_active_region_with_custom_activator(self, active_region_end_mock, active_region_begin_mock):
         for i in range(4):
             with ittapi.active_region(activator=lambda: i % 2):  # pylint: disable=W0640
                 pass
 
-        self.assertEqual(resume_mock.call_count, 2)
-        self.assertEqual(pause_mock.call_count, 2)
+        self.assertEqual(active_region_begin_mock.call_count, 2)
+        self.assertEqual(active_region_end_mock.call_count, 2)
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_active_region_as_decorator_without_activator(self, pause_mock, resume_mock):
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_active_region_as_decorator_without_activator(self, active_region_end_mock, active_region_begin_mock):
         @ittapi.active_region(activator=None)
         def my_function():
             return 42
 
         self.assertEqual(my_function(), 42)
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
 
 
 class PausedRegionTests(TestCase):
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_paused_region_as_decorator(self, pause_mock, resume_mock):
+    @ittapi_native_patch('paused_region_begin')
+    @ittapi_native_patch('paused_region_end')
+    def test_paused_region_as_decorator(self, paused_region_begin_mock, paused_region_end_mock):
         @ittapi.paused_region
         def my_function():
             return 42
 
         self.assertEqual(my_function(), 42)
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        paused_region_end_mock.assert_called_once()
+        paused_region_begin_mock.assert_called_once()
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_paused_region_as_context_manager(self, pause_mock, resume_mock):
+    @ittapi_native_patch('paused_region_begin')
+    @ittapi_native_patch('paused_region_end')
+    def test_paused_region_as_context_manager(self, paused_region_begin_mock, paused_region_end_mock):
         with ittapi.paused_region():
             pass
 
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        paused_region_end_mock.assert_called_once()
+        paused_region_begin_mock.assert_called_once()
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_paused_region_with_manual_activation(self, pause_mock, resume_mock):
+    @ittapi_native_patch('paused_region_begin')
+    @ittapi_native_patch('paused_region_end')
+    def test_paused_region_with_manual_activation(self, paused_region_begin_mock, paused_region_end_mock):
         region = ittapi.paused_region()
 
         region.activator.deactivate()
         with region:
             pass
 
-        resume_mock.assert_not_called()
-        pause_mock.assert_not_called()
+        paused_region_end_mock.assert_not_called()
+        paused_region_begin_mock.assert_not_called()
 
         region.activator.activate()
         with region:
             pass
 
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        paused_region_end_mock.assert_called_once()
+        paused_region_begin_mock.assert_called_once()
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_paused_region_with_custom_activator(self, pause_mock, resume_mock):
+    @ittapi_native_patch('paused_region_begin')
+    @ittapi_native_patch('paused_region_end')
+    def test_paused_region_with_custom_activator(self, paused_region_begin_mock, paused_region_end_mock):
         for i in range(4):
             with ittapi.paused_region(activator=lambda: i % 2):  # pylint: disable=W0640
                 pass
 
-        self.assertEqual(resume_mock.call_count, 2)
-        self.assertEqual(pause_mock.call_count, 2)
+        self.assertEqual(paused_region_end_mock.call_count, 2)
+        self.assertEqual(paused_region_begin_mock.call_count, 2)
 
-    @ittapi_native_patch('pause')
-    @ittapi_native_patch('resume')
-    def test_paused_region_as_decorator_without_activator(self, pause_mock, resume_mock):
+    @ittapi_native_patch('paused_region_begin')
+    @ittapi_native_patch('paused_region_end')
+    def test_paused_region_as_decorator_without_activator(self, paused_region_begin_mock, paused_region_end_mock):
         @ittapi.paused_region(activator=None)
         def my_function():
             return 42
 
         self.assertEqual(my_function(), 42)
-        resume_mock.assert_called_once()
-        pause_mock.assert_called_once()
+        paused_region_end_mock.assert_called_once()
+        paused_region_begin_mock.assert_called_once()
+
+
+
+class CollectionRegionPairingTests(TestCase):
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_nested_region_with_inactive_inner_entry(self, active_region_end_mock, active_region_begin_mock):
+        activator = MagicMock(side_effect=[True, False])
+        region = ittapi.active_region(activator=activator)
+        with region:
+            with region:
+                pass
+            active_region_end_mock.assert_not_called()
+
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
+
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_region_in_concurrent_threads(self, active_region_end_mock, active_region_begin_mock):
+        activator = MagicMock(side_effect=[True, False])
+        region = ittapi.active_region(activator=activator)
+        entered = Barrier(2)
+
+        def run():
+            with region:
+                entered.wait()
+
+        threads = [Thread(target=run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
+
+    @ittapi_native_patch('paused_region_end')
+    @ittapi_native_patch('paused_region_begin')
+    def test_region_in_concurrent_asyncio_tasks(self, paused_region_end_mock, paused_region_begin_mock):
+        region = ittapi.paused_region()
+
+        async def run(delay):
+            async with region:
+                await asyncio.sleep(delay)
+
+        async def main():
+            await asyncio.gather(run(0.01), run(0))
+
+        asyncio.run(main())
+        self.assertEqual(paused_region_begin_mock.call_count, 2)
+        self.assertEqual(paused_region_end_mock.call_count, 2)
+
+    @ittapi_native_patch('active_region_end')
+    def test_region_end_without_begin(self, active_region_end_mock):
+        ittapi.active_region().end()
+        active_region_end_mock.assert_not_called()
+
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_regions_ended_out_of_order(self, active_region_end_mock, active_region_begin_mock):
+        outer_region = ittapi.active_region()
+        inner_region = ittapi.active_region(activator=MagicMock(return_value=False))
+        outer_region.begin()
+        inner_region.begin()
+        outer_region.end()
+        self.assertEqual(active_region_end_mock.call_count, 1)
+
+        inner_region.end()
+        outer_region.end()
+        inner_region.end()
+        active_region_begin_mock.assert_called_once()
+        active_region_end_mock.assert_called_once()
+
+
+class NativeCollectionRegionTests(TestCase):
+    @staticmethod
+    def collection_state_changes(run):
+        records, _ = collect(run)
+        return [record.type for record in sorted(records, key=lambda record: record.timestamp)
+                if record.type in (RecordType.PAUSE, RecordType.RESUME)]
+
+    def test_nested_active_regions(self):
+        def run(native):
+            native.active_region_begin()
+            native.active_region_begin()
+            native.active_region_end()
+            native.active_region_end()
+            native.active_region_end()
+
+        self.assertEqual(self.collection_state_changes(run), [RecordType.RESUME, RecordType.PAUSE])
+
+    def test_active_region_in_paused_region(self):
+        def run(native):
+            native.paused_region_begin()
+            native.active_region_begin()
+            native.paused_region_end()
+            native.active_region_end()
+
+        self.assertEqual(self.collection_state_changes(run), [RecordType.PAUSE, RecordType.RESUME, RecordType.PAUSE])
+
+    def test_regions_of_different_threads(self):
+        def in_thread(func):
+            thread = Thread(target=func)
+            thread.start()
+            thread.join()
+
+        def run(native):
+            in_thread(native.active_region_begin)
+            in_thread(native.paused_region_begin)
+            in_thread(native.active_region_end)
+            in_thread(native.paused_region_end)
+
+        self.assertEqual(self.collection_state_changes(run), [RecordType.RESUME, RecordType.PAUSE, RecordType.RESUME])
+
+    def test_concurrent_regions(self):
+        thread_count = 8
+        started = Barrier(thread_count)
+
+        def run_regions(native):
+            started.wait()
+            for i in range(500):
+                native.active_region_begin()
+                if i % 2:
+                    native.paused_region_begin()
+                    native.paused_region_end()
+                native.active_region_end()
+
+        def run(native):
+            threads = [Thread(target=run_regions, args=(native,)) for _ in range(thread_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        changes = self.collection_state_changes(run)
+        self.assertTrue(changes)
+        self.assertEqual(changes[0], RecordType.RESUME)
+        self.assertEqual(changes[-1], RecordType.PAUSE)
+        self.assertTrue(all(previous != change for previous, change in zip(changes, changes[1:])))
+
+
+class SamplingActivatorTests(TestCase):
+    @ittapi_native_patch('every_nth_activator')
+    def test_every_nth_activator(self, every_nth_activator_mock):
+        activator = ittapi.collection_control.every_nth_activator(100)
+        every_nth_activator_mock.assert_called_once_with(100)
+        self.assertIs(activator, every_nth_activator_mock.return_value)
+
+    @ittapi_native_patch('rate_activator')
+    def test_rate_activator(self, rate_activator_mock):
+        ittapi.collection_control.rate_activator(0.01)
+        ittapi.collection_control.rate_activator(0.5, seed=42)
+        self.assertEqual(rate_activator_mock.call_count, 2)
+        rate_activator_mock.assert_any_call(0.01, None)
+        rate_activator_mock.assert_called_with(0.5, 42)
+
+    @ittapi_native_patch('duty_cycle_activator')
+    def test_duty_cycle_activator(self, duty_cycle_activator_mock):
+        ittapi.collection_control.duty_cycle_activator(1, 60)
+        duty_cycle_activator_mock.assert_called_once_with(1, 60)
+
+    @ittapi_native_patch('first_k_activator')
+    def test_first_k_activator(self, first_k_activator_mock):
+        ittapi.collection_control.first_k_activator(10)
+        first_k_activator_mock.assert_called_once_with(10)
+
+    @ittapi_native_patch('every_nth_activator')
+    @ittapi_native_patch('active_region_end')
+    @ittapi_native_patch('active_region_begin')
+    def test_active_region_with_sampling_activator(self, every_nth_activator_mock, active_region_end_mock, active_region_begin_mock):
+        every_nth_activator_mock.return_value.side_effect = [True, False, False, True]
+        try:
+            region = ittapi.active_region(activator=ittapi.collection_control.every_nth_activator(3))
+            for _ in range(4):
+                with region:
+                    pass
+        finally:
+            # The patch resets the side effect of the mock itself only, not of the activator it returns
+            every_nth_activator_mock.return_value.side_effect = None
+
+        self.assertEqual(active_region_begin_mock.call_count, 2)
+        self.assertEqual(active_region_end_mock.call_count, 2)
+
+
+class NativeSamplingActivatorTests(TestCase):
+    def setUp(self):
+        self.native = load_native_module()
+
+    def test_every_nth_activator(self):
+        activator = self.native.every_nth_activator(3)
+        self.assertEqual([activator() for _ in range(7)], [True, False, False, True, False, False, True])
+        self.assertEqual(activator.calls, 7)
+        self.assertEqual(activator.activations, 3)
+
+        self.assertEqual([self.native.every_nth_activator(1)() for _ in range(3)], [True, True, True])
+        with self.assertRaises(ValueError):
+            self.native.every_nth_activator(0)
+
+    def test_first_k_activator(self):
+        activator = self.native.first_k_activator(2)
+        self.assertEqual([activator() for _ in range(4)], [True, True, False, False])
+        self.assertEqual(activator.calls, 4)
+        self.assertEqual(activator.activations, 2)
+
+        activator = self.native.first_k_activator(0)
+        self.assertFalse(any(activator() for _ in range(3)))
+        with self.assertRaises(ValueError):
+            self.native.first_k_activator(-1)
+
+    def test_rate_activator_with_seed(self):
+        activator = self.native.rate_activator(0.5, 42)
+        results = [activator() for _ in range(10000)]
+        other = self.native.rate_activator(0.5, 42)
+        self.assertEqual([other() for _ in range(10000)], results)
+        self.assertNotEqual([self.native.rate_activator(0.5, 43)() for _ in range(10000)], results)
+
+        self.assertEqual(activator.calls, 10000)
+        self.assertEqual(activator.activations, sum(results))
+        self.assertTrue(4500 < activator.activations < 5500)
+
+    def test_rate_activator_bounds(self):
+        never = self.native.rate_activator(0.0, 1)
+        always = self.native.rate_activator(1.0, 1)
+        self.assertFalse(any(never() for _ in range(1000)))
+        self.assertTrue(all(always() for _ in range(1000)))
+        with self.assertRaises(ValueError):
+            self.native.rate_activator(1.5)
+
+    def test_duty_cycle_activator(self):
+        activator = self.native.duty_cycle_activator(0.1, 60)
+        self.assertTrue(activator())
+        sleep(0.2)
+        self.assertFalse(activator())
+        self.assertEqual(activator.calls, 2)
+        self.assertEqual(activator.activations, 1)
+
+        self.assertFalse(self.native.duty_cycle_activator(0, 60)())
+        with self.assertRaises(ValueError):
+            self.native.duty_cycle_activator(1, 0)
+        with self.assertRaises(ValueError):
+            self.native.duty_cycle_activator(-1, 60)
+
+    def test_activator_takes_no_arguments(self):
+        with self.assertRaises(TypeError):
+            self.native.every_nth_activator(2)(1)
+
+
+class CollectorAttachmentTests(TestCase):
+    @ittapi_native_patch('is_collector_attached')
+    def test_is_collector_attached_call(self, is_collector_attached_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+        self.assertFalse(ittapi.is_collector_attached())
+        is_collector_attached_mock.assert_called_once()
+
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('active_region_begin')
+    @ittapi_native_patch('paused_region_begin')
+    def test_collection_regions_without_collector(self, is_collector_attached_mock, active_region_begin_mock,
+                                                  paused_region_begin_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        def my_function():
+            return 42  # pragma: no cover
+
+        with ittapi.active_region():
+            pass
+
+        with ittapi.paused_region():
+            pass
+
+        self.assertIs(ittapi.active_region(), ittapi.paused_region())
+        self.assertIs(ittapi.active_region(my_function), my_function)
+        self.assertIs(ittapi.paused_region(my_function), my_function)
+        active_region_begin_mock.assert_not_called()
+        paused_region_begin_mock.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,90 @@
+from struct import pack, unpack
+from unittest import main as unittest_main, TestCase
+
+from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import collect, RecordType
+import ittapi
+
+
+class CounterTests(TestCase):
+    @ittapi_native_patch('Counter')
+    def test_counter_call_with_name(self, counter_mock):
+        name = 'my counter'
+        ittapi.counter(name)
+        counter_mock.assert_called_once_with(name, None, 'u64')
+
+    @ittapi_native_patch('Counter')
+    def test_counter_call_with_name_domain_and_type(self, counter_mock):
+        name = 'my counter'
+        domain = 'my domain'
+        ittapi.counter(name, domain, type='double')
+        counter_mock.assert_called_once_with(name, domain, 'double')
+
+    @ittapi_native_patch('Counter')
+    def test_counter_updates(self, counter_mock):
+        counter = ittapi.counter('my counter')
+        counter.inc()
+        counter.dec(2)
+        counter.add(-3)
+        counter.set(4)
+
+        counter_mock.return_value.inc.assert_called_once_with()
+        counter_mock.return_value.dec.assert_called_once_with(2)
+        counter_mock.return_value.add.assert_called_once_with(-3)
+        counter_mock.return_value.set.assert_called_once_with(4)
+
+    @ittapi_native_patch('counter_set_many')
+    def test_counter_set_many_call(self, counter_set_many_mock):
+        values = {'counter 1': 1, 'counter 2': 2}
+        ittapi.counter_set_many(values)
+        counter_set_many_mock.assert_called_once_with(values)
+
+
+class NativeCounterTests(TestCase):
+    def test_counter_updates(self):
+        counters = []
+
+        def update_counters(native):
+            counter = native.Counter('my counter', 'my domain', 'u64')
+            counter.inc()
+            counter.dec(2)
+            counter.add(-3)
+            counter.add(5)
+            counter.set(4)
+            double_counter = native.Counter('my double counter', 'my domain', 'double')
+            double_counter.set(2.5)
+            counters.extend([counter, double_counter])
+
+        records, names = collect(update_counters)
+        counter_ids = {name: id for id, name in names.items()}
+        counter_id = counter_ids['my domain\0my counter']
+        double_counter_id = counter_ids['my domain\0my double counter']
+
+        self.assertEqual([(record.type, record.id, record.value) for record in records], [
+            (RecordType.COUNTER_INC, counter_id, 1),
+            (RecordType.COUNTER_DEC, counter_id, 2),
+            (RecordType.COUNTER_DEC, counter_id, 3),
+            (RecordType.COUNTER_INC, counter_id, 5),
+            (RecordType.COUNTER_VALUE, counter_id, unpack('=Q', pack('=d', 4.0))[0]),
+            (RecordType.COUNTER_VALUE, double_counter_id, unpack('=Q', pack('=d', 2.5))[0]),
+        ])
+
+    def test_counter_objects_share_value(self):
+        def update_counters(native):
+            first_counter = native.Counter('my shared counter', 'my domain', 's64')
+            second_counter = native.Counter('my shared counter', 'my domain', 's64')
+            first_counter.add(2)
+            second_counter.add(3)
+            del first_counter
+            second_counter.dec()
+
+        records, names = collect(update_counters)
+        counter_id = {name: id for id, name in names.items()}['my domain\0my shared counter']
+
+        self.assertEqual([(record.type, record.id, record.value) for record in records], [
+            (RecordType.COUNTER_VALUE, counter_id, unpack('=Q', pack('=d', value))[0]) for value in (2.0, 5.0, 4.0)
+        ])
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
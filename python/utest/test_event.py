@@ -419,5 +419,24 @@ class EventExecutionTests(TestCase):
         event_mock.assert_has_calls(expected_calls)
 
 
+
+class DetachedEventTests(TestCase):
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('Event')
+    def test_event_without_collector(self, is_collector_attached_mock, event_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        def my_function():
+            return 42  # pragma: no cover
+
+        with ittapi.event('my event'):
+            pass
+
+        self.assertIs(ittapi.event(), ittapi.event('my event'))
+        self.assertIs(ittapi.event(my_function), my_function)
+        self.assertIs(ittapi.event('my event')(my_function), my_function)
+        event_mock.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest_main()  # pragma: no cover
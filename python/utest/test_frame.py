@@ -0,0 +1,119 @@
+from unittest import main as unittest_main, TestCase
+from unittest.mock import call
+
+from ittapi_native_mock import patch as ittapi_native_patch
+import ittapi
+
+
+class FrameCreationTests(TestCase):
+    @ittapi_native_patch('Domain')
+    def test_frame_creation_with_default_constructor(self, domain_mock):
+        frame = ittapi.frame()
+
+        domain_mock.assert_called_once_with(None)
+        self.assertEqual(frame.domain(), domain_mock.return_value)
+        self.assertIsNone(frame.id())
+
+    @ittapi_native_patch('Domain')
+    def test_frame_creation_with_domain_name(self, domain_mock):
+        ittapi.frame('my domain')
+        domain_mock.assert_called_once_with('my domain')
+
+    @ittapi_native_patch('Domain')
+    def test_frame_creation_with_domain_and_id(self, domain_mock):
+        domain = 'my domain'
+        frame_id = 'my id'
+        frame = ittapi.frame(domain, frame_id)
+
+        domain_mock.assert_called_once_with(domain)
+        self.assertEqual(frame.domain(), domain_mock.return_value)
+        self.assertEqual(frame.id(), frame_id)
+
+
+class FrameExecutionTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('frame_begin')
+    @ittapi_native_patch('frame_end')
+    def test_frame_as_context_manager(self, domain_mock, frame_begin_mock, frame_end_mock):
+        with ittapi.frame():
+            frame_begin_mock.assert_called_once_with(domain_mock.return_value, None)
+            frame_end_mock.assert_not_called()
+
+        frame_end_mock.assert_called_once_with(domain_mock.return_value, None)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('frame_begin')
+    @ittapi_native_patch('frame_end')
+    def test_frame_as_decorator(self, domain_mock, frame_begin_mock, frame_end_mock):
+        @ittapi.frame
+        def my_function():
+            return 42
+
+        frame_begin_mock.assert_not_called()
+
+        self.assertEqual(my_function(), 42)
+        self.assertEqual(my_function(), 42)
+
+        expected_calls = [call(domain_mock.return_value, None), call(domain_mock.return_value, None)]
+        self.assertEqual(frame_begin_mock.call_args_list, expected_calls)
+        self.assertEqual(frame_end_mock.call_args_list, expected_calls)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('frame_begin')
+    @ittapi_native_patch('frame_end')
+    def test_frame_as_decorator_with_domain(self, domain_mock, frame_begin_mock, frame_end_mock):
+        @ittapi.frame('my domain', 'my id')
+        def my_function():
+            raise ValueError('my error')
+
+        with self.assertRaises(ValueError):
+            my_function()
+
+        domain_mock.assert_called_once_with('my domain')
+        frame_begin_mock.assert_called_once_with(domain_mock.return_value, 'my id')
+        frame_end_mock.assert_called_once_with(domain_mock.return_value, 'my id')
+
+
+class FrameSubmitTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('frame_submit')
+    @ittapi_native_patch('get_timestamp')
+    def test_frame_submit(self, domain_mock, frame_submit_mock, get_timestamp_mock):
+        get_timestamp_mock.side_effect = [100, 200]
+
+        begin = ittapi.get_timestamp()
+        end = ittapi.get_timestamp()
+        ittapi.frame_submit('my domain', begin, end)
+
+        domain_mock.assert_called_once_with('my domain')
+        frame_submit_mock.assert_called_once_with(domain_mock.return_value, 100, 200, None)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('frame_submit')
+    def test_frame_submit_without_end(self, domain_mock, frame_submit_mock):
+        domain = domain_mock('my domain')
+        ittapi.frame_submit(domain, 100, id='my id')
+
+        frame_submit_mock.assert_called_once_with(domain, 100, None, 'my id')
+
+
+class DetachedFrameTests(TestCase):
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('frame_begin')
+    def test_frame_without_collector(self, is_collector_attached_mock, frame_begin_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        def my_function():
+            return 42  # pragma: no cover
+
+        with ittapi.frame():
+            pass
+
+        self.assertIs(ittapi.frame(), ittapi.frame('my domain'))
+        self.assertIs(ittapi.frame(my_function), my_function)
+        self.assertIs(ittapi.frame('my domain')(my_function), my_function)
+        frame_begin_mock.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
@@ -0,0 +1,121 @@
+from array import array
+import sys
+import threading
+from unittest import main as unittest_main, TestCase
+
+from ittapi_native_mock import patch as ittapi_native_patch
+import ittapi
+
+
+class HistogramTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_creation(self, domain_mock, histogram_mock):
+        ittapi.histogram('my domain', 'my histogram')
+
+        domain_mock.assert_called_once_with('my domain')
+        histogram_mock.assert_called_once_with(domain_mock.return_value, 'my histogram', 'u64', 'u64')
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_creation_with_types(self, domain_mock, histogram_mock):
+        ittapi.histogram(None, 'my histogram', None, 'double')
+
+        domain_mock.assert_called_once_with(None)
+        histogram_mock.assert_called_once_with(domain_mock.return_value, 'my histogram', None, 'double')
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_creation_with_wrong_bins(self, domain_mock, histogram_mock):
+        with self.assertRaises(ValueError):
+            ittapi.histogram('my domain', 'my histogram', bins=[])
+
+        with self.assertRaises(ValueError):
+            ittapi.histogram('my domain', 'my histogram', x_type=None, bins=[10])
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_submit(self, domain_mock, histogram_mock):
+        x = array('Q', [1, 2])
+        y = array('Q', [3, 4])
+        ittapi.histogram('my domain', 'my histogram').submit(x, y)
+
+        histogram_mock.return_value.submit.assert_called_once_with(x, y)
+
+
+class HistogramAccumulatorTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_observations_with_bins(self, domain_mock, histogram_mock):
+        histogram = ittapi.histogram('my domain', 'my histogram', bins=[10, 20, 50])
+        for value in (1, 10, 12, 70, 49):
+            histogram.observe(value)
+        histogram.observe(15, 3)
+
+        histogram_mock.return_value.submit.assert_not_called()
+
+        histogram.flush()
+        histogram.flush()
+
+        histogram_mock.return_value.submit.assert_called_once_with(array('Q', [10, 20, 50]), array('Q', [2, 4, 2]))
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_observations_without_bins(self, domain_mock, histogram_mock):
+        histogram = ittapi.histogram('my domain', 'my histogram', 'double', 's32')
+        histogram.observe(0.5)
+        histogram.observe(0.25, 3)
+        histogram.flush()
+
+        histogram_mock.return_value.submit.assert_called_once_with(array('d', [0.25, 0.5]), array('i', [3, 1]))
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_observations_without_x_axis(self, domain_mock, histogram_mock):
+        histogram = ittapi.histogram('my domain', 'my histogram', None, 'double')
+        histogram.observe(1.5)
+        histogram.observe(0.5, 2)
+        histogram.flush()
+        histogram.flush()
+
+        histogram_mock.return_value.submit.assert_called_once_with(None, array('d', [1.5, 0.5, 0.5]))
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_observations_from_threads(self, domain_mock, histogram_mock):
+        histogram = ittapi.histogram('my domain', 'my histogram')
+
+        def observe():
+            for _ in range(20000):
+                histogram.observe(7)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=observe) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        histogram.flush()
+
+        histogram_mock.return_value.submit.assert_called_once_with(array('Q', [7]), array('Q', [80000]))
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Histogram')
+    def test_histogram_flush_with_wrong_observations(self, domain_mock, histogram_mock):
+        histogram = ittapi.histogram('my domain', 'my histogram', 'u16', 'u64')
+        histogram.observe(1)
+        histogram.observe(2**16)
+
+        with self.assertRaises(OverflowError):
+            histogram.flush()
+        with self.assertRaises(OverflowError):
+            histogram.flush()
+        histogram_mock.return_value.submit.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
@@ -12,5 +12,48 @@ class IdTests(TestCase):
         id_mock.assert_called_once_with(domain)
 
 
+class IdPoolTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    def test_id_pool_creation(self, domain_mock, id_mock):
+        pool = ittapi.id_pool('my domain', capacity=2)
+
+        domain_mock.assert_called_once_with('my domain')
+        id_mock.assert_not_called()
+        self.assertEqual(pool.domain(), domain_mock.return_value)
+        self.assertEqual(pool.capacity(), 2)
+        self.assertEqual(len(pool), 0)
+
+    def test_id_pool_creation_with_negative_capacity(self):
+        with self.assertRaises(ValueError):
+            ittapi.id_pool('my domain', capacity=-1)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    def test_id_pool_reuses_released_ids(self, domain_mock, id_mock):
+        id_mock.side_effect = [1, 2, 3]
+        pool = ittapi.IdPool('my domain')
+
+        first_id = pool.acquire()
+        second_id = pool.acquire()
+        pool.release(first_id)
+
+        self.assertEqual((first_id, second_id), (1, 2))
+        self.assertEqual(pool.acquire(), first_id)
+        self.assertEqual(id_mock.call_count, 2)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    def test_id_pool_drops_ids_over_capacity(self, domain_mock, id_mock):
+        id_mock.side_effect = [1, 2]
+        pool = ittapi.id_pool('my domain', capacity=1)
+
+        ids = [pool.acquire(), pool.acquire()]
+        for identifier in ids:
+            pool.release(identifier)
+
+        self.assertEqual(len(pool), 1)
+
+
 if __name__ == '__main__':
     unittest_main()  # pragma: no cover
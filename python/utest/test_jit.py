@@ -0,0 +1,98 @@
+import os
+import sys
+from tempfile import TemporaryDirectory
+from unittest import main as unittest_main, skipIf, TestCase
+from unittest.mock import call
+
+from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import load_native_module
+import ittapi
+from ittapi.jit import _PerfMapReporter
+
+
+class JitTests(TestCase):
+    @ittapi_native_patch('jit_is_profiling_active')
+    def test_is_profiling_active(self, jit_is_profiling_active_mock):
+        jit_is_profiling_active_mock.return_value = True
+        self.assertTrue(ittapi.jit.is_profiling_active())
+
+    @ittapi_native_patch('jit_load_method')
+    def test_load_method(self, jit_load_method_mock):
+        jit_load_method_mock.return_value = 1
+        self.assertEqual(ittapi.jit.load_method('my method', 0x1000, 16, 'my_file.py'), 1)
+        jit_load_method_mock.assert_called_once_with('my method', 0x1000, 16, 'my_file.py')
+
+    @ittapi_native_patch('jit_shutdown')
+    def test_shutdown(self, jit_shutdown_mock):
+        ittapi.jit.shutdown()
+        jit_shutdown_mock.assert_called_once_with()
+
+    @ittapi_native_patch('jit_is_profiling_active')
+    def test_enable_without_profiling_agent(self, jit_is_profiling_active_mock):
+        jit_is_profiling_active_mock.return_value = False
+        self.assertFalse(ittapi.jit.enable())
+        self.assertFalse(ittapi.jit.is_enabled())
+        self.assertEqual(ittapi.jit.flush(), 0)
+
+    @skipIf(hasattr(sys, 'activate_stack_trampoline'), 'The perf trampoline is supported')
+    @ittapi_native_patch('jit_is_profiling_active')
+    def test_enable_without_perf_trampoline_support(self, jit_is_profiling_active_mock):
+        jit_is_profiling_active_mock.return_value = True
+        with self.assertRaises(RuntimeError):
+            ittapi.jit.enable()
+        self.assertFalse(ittapi.jit.is_enabled())
+
+
+class PerfMapReporterTests(TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=R1732
+        self._path = os.path.join(self._temp_dir.name, 'perf-1.map')
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write(self, data):
+        with open(self._path, 'a', encoding='utf-8') as perf_map:
+            perf_map.write(data)
+
+    @ittapi_native_patch('jit_load_method')
+    def test_poll_of_missing_file(self, jit_load_method_mock):
+        self.assertEqual(_PerfMapReporter(self._path).poll(), 0)
+        jit_load_method_mock.assert_not_called()
+
+    @ittapi_native_patch('jit_load_method')
+    def test_poll_of_python_and_native_entries(self, jit_load_method_mock):
+        self._write('7f0000001000 1b py::outer.<locals>.inner:/app/module.py\n'
+                    '7f0000002000 20 native_stub\n'
+                    'invalid entry\n')
+
+        self.assertEqual(_PerfMapReporter(self._path).poll(), 2)
+        jit_load_method_mock.assert_has_calls([call('outer.<locals>.inner', 0x7f0000001000, 0x1b, '/app/module.py'),
+                                               call('native_stub', 0x7f0000002000, 0x20, None)])
+
+    @ittapi_native_patch('jit_load_method')
+    def test_poll_reports_new_complete_entries_only(self, jit_load_method_mock):
+        reporter = _PerfMapReporter(self._path)
+        self._write('7f0000001000 10 py::f:/app/mod')
+        self.assertEqual(reporter.poll(), 0)
+
+        self._write('ule.py\n7f0000002000 10 py::g:/app/module.py\n')
+        self.assertEqual(reporter.poll(), 2)
+        self.assertEqual(reporter.poll(), 0)
+
+        jit_load_method_mock.assert_has_calls([call('f', 0x7f0000001000, 0x10, '/app/module.py'),
+                                               call('g', 0x7f0000002000, 0x10, '/app/module.py')])
+
+
+class NativeJitTests(TestCase):
+    def test_load_method_with_size_out_of_range(self):
+        native = load_native_module()
+        for size in (0, 2**32, 2**40):
+            with self.assertRaises(ValueError):
+                native.jit_load_method('my method', 0x7f0000001000, size)
+
+        self.assertIsInstance(native.jit_load_method('my method', 0x7f0000001000, 2**32 - 1), int)
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
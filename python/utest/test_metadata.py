@@ -0,0 +1,108 @@
+from array import array
+from ctypes import CDLL, CFUNCTYPE, Structure, c_int, c_size_t, c_ulonglong, c_void_p, string_at
+from struct import calcsize, unpack
+from unittest import main as unittest_main, SkipTest, TestCase
+
+from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import collect, load_native_module
+import ittapi
+
+
+class _IttId(Structure):
+    _fields_ = [('d1', c_ulonglong), ('d2', c_ulonglong), ('d3', c_ulonglong)]
+
+
+_METADATA_ADD = CFUNCTYPE(None, c_void_p, _IttId, c_void_p, c_int, c_size_t, c_void_p)
+# The formats of the metadata items by __itt_metadata_type
+_METADATA_FORMATS = {1: 'Q', 2: 'q', 3: 'I', 4: 'i', 5: 'H', 6: 'h', 7: 'f', 8: 'd'}
+
+
+class MetadataTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('metadata_add')
+    def test_metadata_add_with_domain_name(self, domain_mock, metadata_add_mock):
+        ittapi.metadata_add('my domain', None, 'batch size', 32)
+
+        domain_mock.assert_called_once_with('my domain')
+        metadata_add_mock.assert_called_once_with(domain_mock.return_value, None, 'batch size', 32)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('metadata_add')
+    def test_metadata_add_with_buffer(self, domain_mock, id_mock, metadata_add_mock):
+        domain = ittapi.domain('my domain')
+        task_id = ittapi.id(domain)
+        shape = array('q', [2, 3, 4])
+        ittapi.metadata_add(domain, task_id, 'shape', shape)
+
+        metadata_add_mock.assert_called_once_with(domain_mock.return_value, id_mock.return_value, 'shape', shape)
+
+
+class NativeMetadataTests(TestCase):
+    def setUp(self):
+        native = load_native_module()
+        try:
+            self.metadata_add_ptr = c_void_p.in_dll(CDLL(native.__file__), '__itt_metadata_add_ptr__3_0')
+        except (OSError, ValueError) as error:
+            raise SkipTest('__itt_metadata_add_ptr is not exported by ittapi.native') from error
+
+    def metadata_add(self, add):
+        """
+        Calls the function with the extension module and a domain while __itt_metadata_add() is replaced.
+        :return: a list of (id, type, values) passed to __itt_metadata_add()
+        """
+        calls = []
+
+        def hook(domain, id, key, type, count, data):  # pylint: disable=W0613,W0622
+            item_format = _METADATA_FORMATS[type]
+            calls.append((id.d1, type, unpack(f'={count}{item_format}', string_at(data, count * calcsize(item_format)))))
+
+        def run(native):
+            domain = native.Domain('my domain')
+            original_metadata_add = self.metadata_add_ptr.value
+            metadata_add_hook = _METADATA_ADD(hook)
+            self.metadata_add_ptr.value = c_void_p.from_buffer(metadata_add_hook).value
+            try:
+                add(native, domain)
+            finally:
+                self.metadata_add_ptr.value = original_metadata_add
+
+        collect(run)
+        return calls
+
+    def test_metadata_add_numbers(self):
+        calls = self.metadata_add(lambda native, domain: [
+            native.metadata_add(domain, None, 'signed', -32),
+            native.metadata_add(domain, None, 'unsigned', 2**63),
+            native.metadata_add(domain, None, 'double', 2.5),
+        ])
+        self.assertEqual(calls, [(0, 2, (-32,)), (0, 1, (2**63,)), (0, 8, (2.5,))])
+
+    def test_metadata_add_buffers(self):
+        calls = self.metadata_add(lambda native, domain: [
+            native.metadata_add(domain, None, 'shorts', array('h', [1, -2, 3])),
+            native.metadata_add(domain, None, 'floats', memoryview(array('f', [0.5, 1.5]))),
+            native.metadata_add(domain, None, 'unsigned ints', array('I', [7])),
+        ])
+        self.assertEqual(calls, [(0, 6, (1, -2, 3)), (0, 7, (0.5, 1.5)), (0, 3, (7,))])
+
+    def test_task_add_metadata(self):
+        tasks = []
+
+        def add(native, domain):
+            task = native.Task('my task', domain)
+            task.add_metadata('shape', array('q', [2, 3]))
+            tasks.append(task)
+
+        calls = self.metadata_add(add)
+        self.assertEqual(len(calls), 1)
+        self.assertNotEqual(calls[0][0], 0)
+        self.assertEqual(calls[0][1:], (2, (2, 3)))
+
+    def test_metadata_add_with_wrong_value(self):
+        with self.assertRaises(TypeError):
+            self.metadata_add(lambda native, domain: native.metadata_add(domain, None, 'shape', (2, 3)))
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
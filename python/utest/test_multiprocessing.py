@@ -0,0 +1,98 @@
+import os
+import pickle
+import threading
+import time
+from multiprocessing import current_process
+from unittest import main as unittest_main, skipUnless, TestCase
+from unittest.mock import call
+
+from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import load_native_module
+import ittapi
+
+
+def initializer_function(*args):
+    initializer_function.args = args
+
+
+class ProcessNamingInitializerTests(TestCase):
+    def tearDown(self):
+        ittapi.auto_thread_naming(False)
+
+    @ittapi_native_patch('thread_set_name')
+    def test_process_naming_initializer(self, thread_set_name_mock):
+        ittapi.process_naming_initializer(initializer_function)(1, 2)
+
+        self.assertEqual(thread_set_name_mock.mock_calls, [call('MainThread'), call(current_process().name)])
+        self.assertTrue(ittapi.auto_thread_naming())
+        self.assertEqual(initializer_function.args, (1, 2))
+
+    @ittapi_native_patch('thread_set_name')
+    def test_process_naming_initializer_without_auto_thread_naming(self, thread_set_name_mock):
+        ittapi.process_naming_initializer(auto_thread_naming=False)()
+
+        thread_set_name_mock.assert_called_once_with(current_process().name)
+
+    @ittapi_native_patch('thread_set_name')
+    def test_process_naming_initializer_is_picklable(self, thread_set_name_mock):
+        initializer = pickle.loads(pickle.dumps(ittapi.process_naming_initializer(initializer_function, False)))
+        initializer(3)
+
+        thread_set_name_mock.assert_called_once_with(current_process().name)
+        self.assertEqual(initializer_function.args, (3,))
+
+
+@skipUnless(hasattr(os, 'fork'), 'os.fork() is not available')
+class NativeForkTests(TestCase):
+    CHILD_TIMEOUT = 10
+
+    def setUp(self):
+        self.native = load_native_module()
+
+    def wait_child(self, pid):
+        deadline = time.monotonic() + self.CHILD_TIMEOUT
+        while time.monotonic() < deadline:
+            waited_pid, status = os.waitpid(pid, os.WNOHANG)
+            if waited_pid == pid:
+                return os.waitstatus_to_exitcode(status) if hasattr(os, 'waitstatus_to_exitcode') else status >> 8
+            time.sleep(0.01)
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+        self.fail(f'The child process has not exited in {self.CHILD_TIMEOUT} seconds.')
+        return None  # pragma: no cover
+
+    def test_itt_calls_in_forked_child_while_parent_thread_creates_handles(self):
+        native = self.native
+        stop_event = threading.Event()
+
+        def create_handles():
+            i = 0
+            while not stop_event.is_set():
+                native.Domain(f'parent domain {i}')
+                native.StringHandle(f'parent string {i}')
+                i += 1
+
+        thread = threading.Thread(target=create_handles)
+        thread.start()
+        try:
+            for i in range(20):
+                pid = os.fork()
+                if pid == 0:  # pragma: no cover
+                    exit_code = 1
+                    try:
+                        domain = native.Domain(f'child domain {i}')
+                        name = native.StringHandle(f'child string {i}')
+                        native.thread_set_name(f'child thread {i}')
+                        native.task_begin(domain, name, None, None)
+                        native.task_end(domain)
+                        exit_code = 0
+                    finally:
+                        os._exit(exit_code)  # pylint: disable=W0212
+                self.assertEqual(self.wait_child(pid), 0)
+        finally:
+            stop_event.set()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
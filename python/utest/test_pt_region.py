@@ -42,5 +42,26 @@ class PT_RegionTests(TestCase):
         pt_region_begin_mock.assert_called_once_with(ptRegion.get_pt_region())
         pt_region_end_mock.assert_called_once_with(ptRegion.get_pt_region())
 
+
+class DetachedPT_RegionTests(TestCase):
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('PT_Region')
+    @ittapi_native_patch('pt_region_begin')
+    def test_pt_region_without_collector(self, is_collector_attached_mock, pt_region_mock, pt_region_begin_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        def my_function():
+            return 42  # pragma: no cover
+
+        with ittapi.pt_region('my region') as region:
+            pass
+
+        self.assertIsNone(region)
+        self.assertIsNone(ittapi.pt_region().get_pt_region())
+        self.assertIs(ittapi.pt_region(my_function), my_function)
+        pt_region_mock.assert_not_called()
+        pt_region_begin_mock.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest_main() # pragma: no cover
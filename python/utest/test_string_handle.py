@@ -1,6 +1,7 @@
 from unittest import main as unittest_main, TestCase
 
 from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import load_native_module
 import ittapi
 
 
@@ -11,6 +12,87 @@ class StringHandleTests(TestCase):
         ittapi.string_handle(s)
         string_handle_mock.assert_called_once_with(s)
 
+    @ittapi_native_patch('string_handle_cache_info')
+    def test_string_handle_cache_info_call(self, string_handle_cache_info_mock):
+        string_handle_cache_info_mock.return_value = (3, 2, 0, 2)
+        info = ittapi.string_handle_cache_info()
+        string_handle_cache_info_mock.assert_called_once_with()
+        self.assertEqual(info, (3, 2, 0, 2))
+        self.assertEqual(info.hits, 3)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.maxsize, 0)
+        self.assertEqual(info.currsize, 2)
+
+    @ittapi_native_patch('string_handle_cache_clear')
+    def test_string_handle_cache_clear_call(self, string_handle_cache_clear_mock):
+        ittapi.string_handle_cache_clear()
+        string_handle_cache_clear_mock.assert_called_once_with()
+
+    @ittapi_native_patch('string_handle_cache_limit')
+    def test_string_handle_cache_limit_call(self, string_handle_cache_limit_mock):
+        ittapi.string_handle_cache_limit(1024)
+        string_handle_cache_limit_mock.assert_called_once_with(1024)
+
+
+class NativeStringHandleCacheTests(TestCase):
+    def setUp(self):
+        self.native = load_native_module()
+        self.native.string_handle_cache_clear()
+        self.addCleanup(self.native.string_handle_cache_clear)
+        self.addCleanup(self.native.string_handle_cache_limit, None)
+
+    def test_string_handle_interning(self):
+        s = 'my string'
+        handle = self.native.StringHandle(s)
+
+        self.assertIs(self.native.StringHandle(''.join(['my ', 'string'])), handle)
+        self.assertIsNot(self.native.StringHandle('other string'), handle)
+        self.assertEqual(str(handle), s)
+        self.assertEqual(self.native.string_handle_cache_info(), (1, 2, 0, 2))
+
+    def test_string_handle_cache_clear(self):
+        handle = self.native.StringHandle('my string')
+        self.native.string_handle_cache_clear()
+
+        self.assertEqual(self.native.string_handle_cache_info(), (0, 0, 0, 0))
+        self.assertIsNot(self.native.StringHandle('my string'), handle)
+
+    def test_string_handle_cache_limit(self):
+        self.native.string_handle_cache_limit(2)
+        first = self.native.StringHandle('first')
+        second = self.native.StringHandle('second')
+        third = self.native.StringHandle('third')
+
+        self.assertEqual(self.native.string_handle_cache_info(), (0, 3, 2, 2))
+        self.assertIs(self.native.StringHandle('third'), third)
+        self.assertIs(self.native.StringHandle('second'), second)
+
+        evicted_first = self.native.StringHandle('first')
+        self.assertIsNot(evicted_first, first)
+        self.assertEqual(str(evicted_first), 'first')
+        self.assertEqual(self.native.string_handle_cache_info(), (2, 4, 2, 2))
+
+    def test_string_handle_cache_limit_shrinks_cache(self):
+        handles = [self.native.StringHandle(f'string {i}') for i in range(4)]
+        self.native.string_handle_cache_limit(1)
+
+        self.assertEqual(self.native.string_handle_cache_info()[3], 1)
+        self.assertIs(self.native.StringHandle('string 3'), handles[3])
+        self.assertIsNot(self.native.StringHandle('string 0'), handles[0])
+
+    def test_string_handle_cache_evicts_oldest_after_many_evictions(self):
+        self.native.string_handle_cache_limit(100)
+        handles = [self.native.StringHandle(f'string {i}') for i in range(10000)]
+
+        self.assertEqual(self.native.string_handle_cache_info(), (0, 10000, 100, 100))
+        self.assertTrue(all(self.native.StringHandle(f'string {i}') is handles[i] for i in range(9900, 10000)))
+        self.assertIsNot(self.native.StringHandle('string 9899'), handles[9899])
+        self.assertIsNot(self.native.StringHandle('string 9900'), handles[9900])
+
+    def test_string_handle_cache_limit_with_wrong_size(self):
+        with self.assertRaises(ValueError):
+            self.native.string_handle_cache_limit(-1)
+
 
 if __name__ == '__main__':
     unittest_main()  # pragma: no cover
@@ -0,0 +1,215 @@
+from ctypes import CDLL, CFUNCTYPE, c_void_p
+from threading import Lock as _Lock
+from unittest import main as unittest_main, SkipTest, TestCase
+from unittest.mock import call, Mock
+
+from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import load_native_module
+import ittapi
+
+
+_SYNC_DESTROY = CFUNCTYPE(None, c_void_p)
+
+
+class SyncTests(TestCase):
+    @ittapi_native_patch('Sync')
+    def test_sync_call_without_arguments(self, sync_mock):
+        ittapi.sync()
+        sync_mock.assert_called_once_with(None, None, False)
+
+    @ittapi_native_patch('Sync')
+    def test_sync_call_with_name_type_and_barrier(self, sync_mock):
+        ittapi.sync('my barrier', 'Barrier', barrier=True)
+        sync_mock.assert_called_once_with('my barrier', 'Barrier', True)
+
+
+class LockTests(TestCase):
+    @ittapi_native_patch('Sync')
+    def test_lock_creation(self, sync_mock):
+        ittapi.threading.Lock('my lock')
+        sync_mock.assert_called_once_with('my lock', 'Lock', False)
+
+    @ittapi_native_patch('Sync')
+    def test_lock_as_context_manager(self, sync_mock):
+        lock = ittapi.threading.Lock()
+        with lock:
+            self.assertTrue(lock.locked())
+        self.assertFalse(lock.locked())
+
+        self.assertEqual(sync_mock.return_value.mock_calls, [call.prepare(), call.acquired(), call.releasing()])
+
+    @ittapi_native_patch('Sync')
+    def test_lock_failed_non_blocking_acquire(self, sync_mock):
+        lock = ittapi.threading.Lock()
+        self.assertTrue(lock.acquire())
+        self.assertFalse(lock.acquire(False))
+        lock.release()
+
+        self.assertEqual(sync_mock.return_value.mock_calls, [call.prepare(), call.acquired(), call.releasing()])
+
+    @ittapi_native_patch('Sync')
+    def test_lock_acquire_with_timeout(self, sync_mock):
+        lock = ittapi.threading.Lock()
+        self.assertTrue(lock.acquire())
+        self.assertFalse(lock.acquire(timeout=0.01))
+        lock.release()
+
+        self.assertEqual(sync_mock.return_value.mock_calls,
+                         [call.prepare(), call.acquired(), call.prepare(), call.cancel(), call.releasing()])
+
+    @ittapi_native_patch('Sync')
+    def test_lock_release_of_unlocked_lock(self, sync_mock):
+        lock = ittapi.threading.Lock()
+        with self.assertRaises(RuntimeError):
+            lock.release()
+        sync_mock.return_value.releasing.assert_not_called()
+
+    @ittapi_native_patch('Sync')
+    def test_lock_release_of_lock_released_by_another_thread(self, sync_mock):
+        lock = ittapi.threading.Lock()
+        # The lock looks acquired, but another thread releases it before this release
+        lock._lock = Mock(**{'locked.return_value': True, 'release.side_effect': RuntimeError})  # pylint: disable=W0212
+        with self.assertRaises(RuntimeError):
+            lock.release()
+        sync_mock.return_value.releasing.assert_not_called()
+
+
+class RLockTests(TestCase):
+    @ittapi_native_patch('Sync')
+    def test_rlock_creation(self, sync_mock):
+        ittapi.threading.RLock('my lock')
+        sync_mock.assert_called_once_with('my lock', 'RLock', False)
+
+    @ittapi_native_patch('Sync')
+    def test_rlock_recursion_is_reported_once(self, sync_mock):
+        lock = ittapi.threading.RLock()
+        with lock:
+            with lock:
+                pass
+            self.assertEqual(sync_mock.return_value.mock_calls, [call.prepare(), call.acquired()])
+
+        self.assertEqual(sync_mock.return_value.mock_calls, [call.prepare(), call.acquired(), call.releasing()])
+
+    @ittapi_native_patch('Sync')
+    def test_rlock_release_of_unacquired_lock(self, sync_mock):
+        lock = ittapi.threading.RLock()
+        with self.assertRaises(RuntimeError):
+            lock.release()
+        sync_mock.return_value.releasing.assert_not_called()
+
+
+class ConditionTests(TestCase):
+    @ittapi_native_patch('Sync')
+    def test_condition_creation_with_default_lock(self, sync_mock):
+        ittapi.threading.Condition(name='my condition')
+        sync_mock.assert_has_calls([call('my condition', 'RLock', False), call('my condition', 'Condition', False)])
+
+    @ittapi_native_patch('Sync')
+    def test_condition_wait_timeout(self, sync_mock):
+        condition = ittapi.threading.Condition(_Lock())
+        with condition:
+            self.assertFalse(condition.wait(0.01))
+
+        self.assertEqual(sync_mock.return_value.mock_calls, [call.prepare(), call.cancel()])
+
+    @ittapi_native_patch('Sync')
+    def test_condition_notify(self, sync_mock):
+        condition = ittapi.threading.Condition(_Lock())
+        with condition:
+            condition.notify()
+            condition.notify_all()
+
+        self.assertEqual(sync_mock.return_value.mock_calls, [call.releasing(), call.releasing()])
+
+    @ittapi_native_patch('Sync')
+    def test_condition_notify_without_lock(self, sync_mock):
+        condition = ittapi.threading.Condition(_Lock())
+        with self.assertRaises(RuntimeError):
+            condition.notify()
+        sync_mock.return_value.releasing.assert_not_called()
+
+
+class SemaphoreTests(TestCase):
+    @ittapi_native_patch('Sync')
+    def test_semaphore_creation(self, sync_mock):
+        ittapi.threading.Semaphore(2, 'my semaphore')
+        sync_mock.assert_called_once_with('my semaphore', 'Semaphore', False)
+
+    @ittapi_native_patch('Sync')
+    def test_semaphore_acquire_and_release(self, sync_mock):
+        semaphore = ittapi.threading.Semaphore(2)
+        self.assertTrue(semaphore.acquire())
+        self.assertTrue(semaphore.acquire())
+        self.assertFalse(semaphore.acquire(False))
+        semaphore.release()
+        semaphore.release()
+
+        self.assertEqual(sync_mock.return_value.mock_calls,
+                         [call.prepare(), call.acquired(), call.prepare(), call.acquired(), call.releasing(),
+                          call.releasing()])
+
+    @ittapi_native_patch('Sync')
+    def test_semaphore_release_with_count(self, sync_mock):
+        semaphore = ittapi.threading.Semaphore(0)
+        semaphore.release(3)
+        for _ in range(3):
+            self.assertTrue(semaphore.acquire(False))
+        self.assertFalse(semaphore.acquire(False))
+
+        self.assertEqual(sync_mock.return_value.mock_calls,
+                         [call.releasing(), call.prepare(), call.acquired(), call.prepare(), call.acquired(),
+                          call.prepare(), call.acquired()])
+
+    @ittapi_native_patch('Sync')
+    def test_semaphore_release_with_wrong_count(self, sync_mock):
+        semaphore = ittapi.threading.Semaphore()
+        with self.assertRaises(ValueError):
+            semaphore.release(0)
+        sync_mock.return_value.releasing.assert_not_called()
+
+
+class NativeSyncTests(TestCase):
+    def setUp(self):
+        self.native = load_native_module()
+        try:
+            self.sync_destroy_ptr = c_void_p.in_dll(CDLL(self.native.__file__), '__itt_sync_destroy_ptr__3_0')
+        except (OSError, ValueError) as error:
+            raise SkipTest('__itt_sync_destroy_ptr is not exported by ittapi.native') from error
+
+        # Initialize ITT API, so the replaced pointer is not reset by the initialization
+        self.native.Sync('initialization')
+
+    def sync_destroy_calls(self, create):
+        """
+        Calls the function while __itt_sync_destroy() is replaced.
+        :return: a list of the addresses passed to __itt_sync_destroy()
+        """
+        calls = []
+        sync_destroy_hook = _SYNC_DESTROY(calls.append)
+        original_sync_destroy = self.sync_destroy_ptr.value
+        self.sync_destroy_ptr.value = c_void_p.from_buffer(sync_destroy_hook).value
+        try:
+            create()
+        finally:
+            self.sync_destroy_ptr.value = original_sync_destroy
+        return calls
+
+    def test_sync_destroy(self):
+        addresses = []
+
+        def create():
+            sync = self.native.Sync('my lock', 'Lock')
+            addresses.append(id(sync))
+
+        self.assertEqual(self.sync_destroy_calls(create), addresses)
+
+    def test_sync_destroy_after_failed_creation(self):
+        def create():
+            with self.assertRaises(UnicodeEncodeError):
+                self.native.Sync('\ud800', 'Lock')
+
+        self.assertEqual(self.sync_destroy_calls(create), [])
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
@@ -1,10 +1,13 @@
-from inspect import stack
+from array import array
+import asyncio
+from inspect import iscoroutinefunction, stack
 from os.path import basename
-from sys import version_info
+from sys import getrefcount, version_info
 from unittest import main as unittest_main, TestCase
 from unittest.mock import call
 
 from ittapi_native_mock import patch as ittapi_native_patch
+from ittapi_native_real import collect, load_native_module, RecordType
 import ittapi
 
 
@@ -29,6 +32,29 @@ class TaskCreationTests(TestCase):
         self.assertEqual(task.id(), id_mock.return_value)
         self.assertIsNone(task.parent_id())
 
+    @ittapi_native_patch('StringHandle')
+    def test_task_creation_with_default_constructor_reuses_call_site_name(self, string_handle_mock):
+        string_handle_mock.side_effect = lambda x: x
+
+        tasks = [ittapi.task() for _ in range(3)]
+        caller = stack()[0]
+        expected_name = f'{basename(caller.filename)}:{caller.lineno-1}'
+
+        string_handle_mock.assert_called_once_with(expected_name)
+        self.assertTrue(all(task.name() == expected_name for task in tasks))
+
+    @ittapi_native_patch('StringHandle')
+    def test_task_creation_with_default_constructor_bounds_call_site_name_cache(self, string_handle_mock):
+        string_handle_mock.side_effect = lambda x: x
+
+        call_site_count = ittapi.region._CallSite.NameCacheSize + 1  # pylint: disable=W0212
+        for i in range(call_site_count):
+            exec(compile('ittapi.task()', f'call_site_{i}.py', 'exec'), {'ittapi': ittapi})  # pylint: disable=W0122
+        exec(compile('ittapi.task()', 'call_site_0.py', 'exec'), {'ittapi': ittapi})  # pylint: disable=W0122
+
+        self.assertEqual(string_handle_mock.call_count, call_site_count + 1)
+        string_handle_mock.assert_called_with('call_site_0.py:1')
+
     @ittapi_native_patch('StringHandle')
     def test_task_creation_as_decorator_for_function(self, string_handle_mock):
         @ittapi.task
@@ -45,13 +71,16 @@ class TaskCreationTests(TestCase):
 
         string_handle_mock.assert_called_with(my_function.__qualname__)
 
-    @ittapi_native_patch('StringHandle')
-    def test_task_creation_as_decorator_with_name_for_function(self, string_handle_mock):
-        @ittapi.task('my function')
+    @ittapi_native_patch('Task')
+    def test_task_creation_as_decorator_with_name_for_function(self, task_mock):
         def my_function():
             pass  # pragma: no cover
 
-        string_handle_mock.assert_called_once_with('my function')
+        wrapper = ittapi.task('my function')(my_function)
+
+        task_mock.assert_called_once_with('my function', None, None, None, False)
+        task_mock.return_value.assert_called_once_with(my_function)
+        self.assertEqual(wrapper, task_mock.return_value.return_value)
 
     @ittapi_native_patch('Domain')
     def test_task_creation_as_decorator_with_domain_for_function(self, domain_mock):
@@ -64,7 +93,7 @@ class TaskCreationTests(TestCase):
     @ittapi_native_patch('StringHandle')
     def test_task_creation_as_decorator_with_empty_args_and_name_for_function(self, string_handle_mock):
         @ittapi.task
-        @ittapi.task('my function')
+        @ittapi.nested_task('my function')
         def my_function():
             pass  # pragma: no cover
 
@@ -85,12 +114,46 @@ class TaskCreationTests(TestCase):
     @ittapi_native_patch('Domain')
     @ittapi_native_patch('StringHandle')
     def test_task_creation_with_name_and_domain_as_context_manager(self, domain_mock, string_handle_mock):
-        with ittapi.task('my task', 'my domain'):
+        with ittapi.nested_task('my task', 'my domain'):
             pass
 
         string_handle_mock.assert_called_once_with('my task')
         domain_mock.assert_called_once_with('my domain')
 
+    @ittapi_native_patch('Task')
+    def test_task_creation_with_name_as_context_manager(self, task_mock):
+        with ittapi.task('my task', 'my domain'):
+            pass
+
+        task_mock.assert_called_once_with('my task', 'my domain', None, None, False)
+        task_mock.return_value.__enter__.assert_called_once_with()
+        task_mock.return_value.__exit__.assert_called_once_with(None, None, None)
+
+    @ittapi_native_patch('Task')
+    def test_task_creation_with_name_and_all_arguments(self, task_mock):
+        task = ittapi.task('my task', domain='my domain', id='my id', parent='parent id', overlapped=True)
+
+        task_mock.assert_called_once_with('my task', 'my domain', 'my id', 'parent id', True)
+        self.assertEqual(task, task_mock.return_value)
+
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('Task')
+    def test_task_creation_with_name_and_parent_task(self, id_mock, string_handle_mock, task_mock):
+        parent = ittapi.nested_task('parent task')
+        ittapi.task('my task', parent=parent)
+
+        task_mock.assert_called_once_with('my task', None, None, id_mock.return_value, False)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('Task')
+    def test_task_creation_with_id_pool_is_not_native(self, domain_mock, string_handle_mock, task_mock):
+        task = ittapi.task('my task', id=ittapi.id_pool())
+
+        task_mock.assert_not_called()
+        self.assertIsInstance(task, ittapi.NestedTask)
+
     @ittapi_native_patch('Domain')
     @ittapi_native_patch('Id')
     @ittapi_native_patch('StringHandle')
@@ -220,7 +283,7 @@ class TaskExecutionTests(TestCase):
         id_mock.return_value = 'id_handle'
 
         @ittapi.task
-        @ittapi.task('my function')
+        @ittapi.nested_task('my function')
         def my_function():
             return 42
 
@@ -249,7 +312,7 @@ class TaskExecutionTests(TestCase):
         id_mock.return_value = 'id_handle'
 
         region_name = 'my region'
-        with ittapi.task(region_name):
+        with ittapi.nested_task(region_name):
             pass
 
         domain_mock.assert_called_once_with(None)
@@ -326,6 +389,25 @@ class TaskExecutionTests(TestCase):
                                                 id_mock.return_value, None)
         task_end_mock.assert_called_once_with(domain_mock.return_value)
 
+    def test_task_for_method_binds_same_wrapper(self):
+        class MyClass:
+            @ittapi.task
+            def my_method(self):
+                """my method"""
+                return self
+
+        my_object = MyClass()
+        bound_method = my_object.my_method
+
+        self.assertIs(bound_method.__self__, my_object)
+        self.assertIs(bound_method.__func__, my_object.my_method.__func__)
+        self.assertIs(bound_method.__func__, MyClass.my_method)
+        self.assertEqual(bound_method.__qualname__, 'TaskExecutionTests.test_task_for_method_binds_same_wrapper.'
+                                                    '<locals>.MyClass.my_method')
+        self.assertEqual(bound_method.__doc__, 'my method')
+        self.assertIs(bound_method(), my_object)
+        self.assertIs(MyClass.my_method(my_object), my_object)
+
     @ittapi_native_patch('Domain')
     @ittapi_native_patch('Id')
     @ittapi_native_patch('StringHandle')
@@ -529,10 +611,10 @@ class TaskExecutionTests(TestCase):
         overlapped_task_1_name = 'overlapped task 1'
         overlapped_task_2_name = 'overlapped task 2'
 
-        overlapped_task_1 = ittapi.task(overlapped_task_1_name, overlapped=True)
+        overlapped_task_1 = ittapi.overlapped_task(overlapped_task_1_name)
         overlapped_task_1.begin()
 
-        overlapped_task_2 = ittapi.task(overlapped_task_2_name, overlapped=True)
+        overlapped_task_2 = ittapi.overlapped_task(overlapped_task_2_name)
         overlapped_task_2.begin()
 
         overlapped_task_1.end()
@@ -557,6 +639,130 @@ class TaskExecutionTests(TestCase):
         task_end_overlapped_mock.assert_has_calls(expected_calls)
 
 
+class TaskIdTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin')
+    @ittapi_native_patch('task_end')
+    def test_task_without_id(self, domain_mock, id_mock, string_handle_mock, task_begin_mock, task_end_mock):
+        string_handle_mock.side_effect = lambda x: x
+
+        with ittapi.nested_task('my task', id=ittapi.NO_ID):
+            pass
+
+        id_mock.assert_not_called()
+        task_begin_mock.assert_called_once_with(domain_mock.return_value, 'my task', None, None)
+        task_end_mock.assert_called_once_with(domain_mock.return_value)
+
+    @ittapi_native_patch('Task')
+    def test_native_task_without_id(self, task_mock):
+        ittapi.task('my task', id=ittapi.NO_ID)
+        task_mock.assert_called_once_with('my task', None, ittapi.NO_ID, None, False)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    def test_overlapped_task_without_id(self, domain_mock, string_handle_mock):
+        with self.assertRaises(ValueError):
+            ittapi.overlapped_task('my task', id=ittapi.NO_ID)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin')
+    @ittapi_native_patch('task_end')
+    def test_task_with_id_pool(self, domain_mock, id_mock, string_handle_mock, task_begin_mock, task_end_mock):
+        string_handle_mock.side_effect = lambda x: x
+        id_mock.side_effect = [1, 2]
+
+        pool = ittapi.id_pool()
+        for _ in range(3):
+            with ittapi.task('my task', id=pool):
+                pass
+
+        id_mock.assert_called_once_with(domain_mock.return_value)
+        task_begin_mock.assert_has_calls([call(domain_mock.return_value, 'my task', 1, None)] * 3)
+        self.assertEqual(len(pool), 1)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin_overlapped')
+    @ittapi_native_patch('task_end_overlapped')
+    def test_overlapped_tasks_with_id_pool(self, domain_mock, id_mock, string_handle_mock,
+                                           task_begin_overlapped_mock, task_end_overlapped_mock):
+        string_handle_mock.side_effect = lambda x: x
+        id_mock.side_effect = [1, 2]
+
+        pool = ittapi.id_pool()
+        task_1 = ittapi.task('task 1', id=pool, overlapped=True)
+        task_2 = ittapi.task('task 2', id=pool, overlapped=True)
+
+        self.assertIsNone(task_1.id())
+
+        task_1.begin()
+        task_2.begin()
+        self.assertEqual(task_1.id(), 1)
+        self.assertEqual(task_2.id(), 2)
+        task_1.end()
+        task_2.end()
+
+        task_end_overlapped_mock.assert_has_calls([call(domain_mock.return_value, 1),
+                                                   call(domain_mock.return_value, 2)])
+        self.assertIsNone(task_1.id())
+        self.assertEqual(len(pool), 2)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin')
+    @ittapi_native_patch('task_end')
+    def test_recursive_task_with_id_pool(self, domain_mock, id_mock, string_handle_mock, task_begin_mock,
+                                         task_end_mock):
+        id_mock.side_effect = [1, 2]
+        pool = ittapi.id_pool()
+
+        @ittapi.task('my function', id=pool)
+        def my_function(depth):
+            return my_function(depth - 1) if depth else 0
+
+        my_function(2)
+
+        id_mock.assert_called_once_with(domain_mock.return_value)
+        task_begin_mock.assert_has_calls([call(domain_mock.return_value, string_handle_mock.return_value, 1, None)] * 3)
+        self.assertEqual(task_end_mock.call_count, 3)
+        self.assertEqual(len(pool), 1)
+
+
+class TaskMetadataTests(TestCase):
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('metadata_add')
+    def test_task_add_metadata(self, domain_mock, id_mock, string_handle_mock, metadata_add_mock):
+        string_handle_mock.side_effect = lambda x: x
+
+        task = ittapi.nested_task('my task')
+        task.add_metadata('batch size', 32)
+
+        metadata_add_mock.assert_called_once_with(domain_mock.return_value, id_mock.return_value, 'batch size', 32)
+
+    @ittapi_native_patch('Task')
+    def test_native_task_add_metadata(self, task_mock):
+        shape = array('q', [2, 3])
+        task = ittapi.task('my task')
+        task.add_metadata('shape', shape)
+        task_mock.return_value.add_metadata.assert_called_once_with('shape', shape)
+
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('metadata_add')
+    def test_task_add_metadata_without_collector(self, is_collector_attached_mock, metadata_add_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        ittapi.task('my task').add_metadata('batch size', 32)
+        metadata_add_mock.assert_not_called()
+
+
 class NestedTaskCreationTests(TestCase):
     @ittapi_native_patch('Domain')
     @ittapi_native_patch('StringHandle')
@@ -577,5 +783,235 @@ class OverlappedTaskCreationTests(TestCase):
         domain_mock.assert_called_once_with(None)
 
 
+
+class TaskAsyncTests(TestCase):
+    @staticmethod
+    def _id_generator():
+        id_value = 0
+
+        def id_generator(*args, **kwargs):  # pylint: disable=W0613
+            nonlocal id_value
+            id_value += 1
+            return id_value
+
+        return id_generator
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin_overlapped')
+    @ittapi_native_patch('task_end_overlapped')
+    def test_task_for_coroutine_function(self, domain_mock, id_mock, string_handle_mock,
+                                         task_begin_overlapped_mock, task_end_overlapped_mock):
+        domain_mock.return_value = 'domain_handle'
+        string_handle_mock.side_effect = lambda x: x
+        id_mock.side_effect = self._id_generator()
+
+        @ittapi.nested_task('my task')
+        async def my_coroutine_function():
+            await asyncio.sleep(0)
+            return 42
+
+        self.assertTrue(iscoroutinefunction(my_coroutine_function))
+        self.assertEqual(asyncio.run(my_coroutine_function()), 42)
+
+        task_begin_overlapped_mock.assert_called_once_with(domain_mock.return_value, 'my task', 2, None)
+        task_end_overlapped_mock.assert_called_once_with(domain_mock.return_value, 2)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin_overlapped')
+    @ittapi_native_patch('task_end_overlapped')
+    def test_concurrent_tasks_as_async_context_manager(self, domain_mock, id_mock, string_handle_mock,
+                                                       task_begin_overlapped_mock, task_end_overlapped_mock):
+        domain_mock.return_value = 'domain_handle'
+        string_handle_mock.side_effect = lambda x: x
+        id_mock.side_effect = self._id_generator()
+
+        inner_task = ittapi.nested_task('inner task')
+
+        async def inner():
+            async with inner_task:
+                await asyncio.sleep(0)
+
+        async def outer():
+            async with ittapi.nested_task('outer task'):
+                await asyncio.gather(inner(), inner())
+
+        asyncio.run(outer())
+
+        # Ids 1 and 2 are the ids of the task objects, every activation gets its own id
+        expected_calls = [
+            call(domain_mock.return_value, 'outer task', 3, None),
+            call(domain_mock.return_value, 'inner task', 4, 3),
+            call(domain_mock.return_value, 'inner task', 5, 3),
+        ]
+        self.assertEqual(task_begin_overlapped_mock.mock_calls, expected_calls)
+
+        expected_calls = [
+            call(domain_mock.return_value, 4),
+            call(domain_mock.return_value, 5),
+            call(domain_mock.return_value, 3),
+        ]
+        self.assertEqual(task_end_overlapped_mock.mock_calls, expected_calls)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('Id')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('task_begin_overlapped')
+    @ittapi_native_patch('task_end_overlapped')
+    def test_interleaved_tasks_as_async_context_manager(self, domain_mock, id_mock, string_handle_mock,
+                                                        task_begin_overlapped_mock, task_end_overlapped_mock):
+        domain_mock.return_value = 'domain_handle'
+        string_handle_mock.side_effect = lambda x: x
+        id_mock.side_effect = self._id_generator()
+
+        first_task = ittapi.nested_task('first task')
+        second_task = ittapi.nested_task('second task')
+
+        async def interleaved():
+            await first_task.__aenter__()
+            await second_task.__aenter__()
+            await first_task.__aexit__(None, None, None)
+            async with ittapi.nested_task('third task'):
+                pass
+            await second_task.__aexit__(None, None, None)
+            with self.assertRaises(RuntimeError):
+                await first_task.__aexit__(None, None, None)
+
+        asyncio.run(interleaved())
+
+        # Ids 1, 2 and 5 are the ids of the task objects, every activation gets its own id
+        expected_calls = [
+            call(domain_mock.return_value, 'first task', 3, None),
+            call(domain_mock.return_value, 'second task', 4, 3),
+            call(domain_mock.return_value, 'third task', 6, 4),
+        ]
+        self.assertEqual(task_begin_overlapped_mock.mock_calls, expected_calls)
+
+        expected_calls = [
+            call(domain_mock.return_value, 3),
+            call(domain_mock.return_value, 6),
+            call(domain_mock.return_value, 4),
+        ]
+        self.assertEqual(task_end_overlapped_mock.mock_calls, expected_calls)
+
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    def test_task_async_exit_without_enter(self, domain_mock, string_handle_mock):
+        task = ittapi.nested_task('my task')
+        with self.assertRaises(RuntimeError):
+            asyncio.run(task.__aexit__(None, None, None))
+
+    @ittapi_native_patch('is_collector_attached')
+    def test_task_as_async_context_manager_without_collector(self, is_collector_attached_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        async def my_coroutine_function():
+            async with ittapi.task('my task'):
+                return 42
+
+        self.assertEqual(asyncio.run(my_coroutine_function()), 42)
+
+
+class DetachedTaskTests(TestCase):
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('Domain')
+    @ittapi_native_patch('StringHandle')
+    @ittapi_native_patch('Task')
+    @ittapi_native_patch('task_begin')
+    def test_task_without_collector(self, is_collector_attached_mock, domain_mock, string_handle_mock, task_mock,
+                                    task_begin_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        tasks = [ittapi.task(), ittapi.task('my task'), ittapi.nested_task('my task', domain='my domain'),
+                 ittapi.overlapped_task()]
+        for task in tasks:
+            with task:
+                pass
+
+        self.assertTrue(all(task is tasks[0] for task in tasks))
+        self.assertIsNone(tasks[0].id())
+        domain_mock.assert_not_called()
+        string_handle_mock.assert_not_called()
+        task_mock.assert_not_called()
+        task_begin_mock.assert_not_called()
+
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('StringHandle')
+    def test_task_decorators_without_collector(self, is_collector_attached_mock, string_handle_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+
+        def my_function():
+            return 42  # pragma: no cover
+
+        self.assertIs(ittapi.task(my_function), my_function)
+        self.assertIs(ittapi.task()(my_function), my_function)
+        self.assertIs(ittapi.task('my task')(my_function), my_function)
+        self.assertIs(ittapi.overlapped_task(my_function), my_function)
+        string_handle_mock.assert_not_called()
+
+
+class NativeTaskIdTests(TestCase):
+    def setUp(self):
+        self.native = load_native_module()
+
+    def test_native_task_without_id(self):
+        task = self.native.Task('my task', None, self.native.NO_ID)
+        self.assertIsNone(task.id())
+
+    def test_native_task_with_false_id(self):
+        with self.assertRaises(TypeError):
+            self.native.Task('my task', None, False)
+
+    def test_native_overlapped_task_without_id(self):
+        with self.assertRaises(ValueError):
+            self.native.Task('my task', None, self.native.NO_ID, None, True)
+
+    def test_native_task_ids_are_not_reused(self):
+        ids = [self.native.Task('my task').id() for _ in range(100)]
+        self.assertEqual(len({str(task_id) for task_id in ids}), len(ids))
+
+
+class NativeTaskAsyncTests(TestCase):
+    def test_interleaved_tasks_as_async_context_manager(self):
+        def run_tasks(native):
+            first_task = native.Task('first task')
+            second_task = native.Task('second task')
+
+            async def interleaved():
+                await first_task.__aenter__()
+                await second_task.__aenter__()
+                await first_task.__aexit__(None, None, None)
+                async with native.Task('third task'):
+                    pass
+                await second_task.__aexit__(None, None, None)
+                with self.assertRaises(RuntimeError):
+                    await first_task.__aexit__(None, None, None)
+
+            asyncio.run(interleaved())
+
+        records, names = collect(run_tasks)
+        begins = {names[record.name]: record for record in records if record.type == RecordType.TASK_BEGIN_OVERLAPPED}
+        ends = [record.id for record in records if record.type == RecordType.TASK_END_OVERLAPPED]
+
+        self.assertEqual(sorted(begins), ['first task', 'second task', 'third task'])
+        self.assertEqual(begins['second task'].value, begins['first task'].id)
+        self.assertEqual(begins['third task'].value, begins['second task'].id)
+        self.assertEqual(ends, [begins['first task'].id, begins['third task'].id, begins['second task'].id])
+
+
+class NativeTaskWrapperTests(TestCase):
+    def test_wrapped_function_call_does_not_leak_none(self):
+        native = load_native_module()
+        wrapped = native.Task('my task')(lambda: 1)
+        wrapped()
+        none_refcount = getrefcount(None)
+        for _ in range(1000):
+            wrapped()
+        self.assertLess(getrefcount(None) - none_refcount, 1000)
+
+
 if __name__ == '__main__':
     unittest_main()  # pragma: no cover
@@ -1,4 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import current_thread, Thread
 from unittest import main as unittest_main, TestCase
+from unittest.mock import call, MagicMock
 
 from ittapi_native_mock import patch as ittapi_native_patch
 import ittapi
@@ -12,5 +15,64 @@ class ThreadNamingTests(TestCase):
         thread_set_name_mock.assert_called_once_with(name)
 
 
+class AutoThreadNamingTests(TestCase):
+    def tearDown(self):
+        ittapi.auto_thread_naming(False)
+
+    @ittapi_native_patch('thread_set_name')
+    def test_auto_thread_naming_for_threads(self, thread_set_name_mock):
+        self.assertTrue(ittapi.auto_thread_naming())
+        thread_set_name_mock.assert_called_once_with(current_thread().name)
+
+        thread = Thread(target=lambda: None, name='my thread')
+        thread.start()
+        thread.join()
+        thread_set_name_mock.assert_called_with('my thread')
+
+    @ittapi_native_patch('thread_set_name')
+    def test_auto_thread_naming_for_thread_pool(self, thread_set_name_mock):
+        ittapi.auto_thread_naming()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='my pool') as executor:
+            executor.submit(lambda: None).result()
+        thread_set_name_mock.assert_called_with('my pool_0')
+
+    @ittapi_native_patch('thread_set_name')
+    def test_auto_thread_naming_disable(self, thread_set_name_mock):
+        ittapi.auto_thread_naming()
+        self.assertFalse(ittapi.auto_thread_naming(False))
+        thread_set_name_mock.reset_mock()
+
+        thread = Thread(target=lambda: None, name='my thread')
+        thread.start()
+        thread.join()
+        thread_set_name_mock.assert_not_called()
+
+    @ittapi_native_patch('is_collector_attached')
+    @ittapi_native_patch('thread_set_name')
+    def test_auto_thread_naming_without_collector(self, is_collector_attached_mock, thread_set_name_mock):
+        is_collector_attached_mock.side_effect = lambda: False
+        self.assertFalse(ittapi.auto_thread_naming())
+        thread_set_name_mock.assert_not_called()
+
+    @ittapi_native_patch('thread_set_name')
+    def test_auto_thread_naming_after_fork(self, thread_set_name_mock):
+        ittapi.auto_thread_naming()
+        thread_set_name_mock.reset_mock()
+
+        ittapi.thread_naming._after_fork_in_child()  # pylint: disable=W0212
+        thread_set_name_mock.assert_called_once_with(current_thread().name)
+
+    @ittapi_native_patch('thread_set_name')
+    def test_thread_naming_initializer(self, thread_set_name_mock):
+        initializer_mock = MagicMock()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='my pool',
+                                initializer=ittapi.thread_naming_initializer(initializer_mock),
+                                initargs=(1, 2)) as executor:
+            executor.submit(lambda: None).result()
+
+        self.assertEqual(thread_set_name_mock.mock_calls, [call('my pool_0')])
+        initializer_mock.assert_called_once_with(1, 2)
+
+
 if __name__ == '__main__':
     unittest_main()  # pragma: no cover
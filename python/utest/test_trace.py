@@ -0,0 +1,661 @@
+import gzip
+import json
+import os
+import struct
+import subprocess
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import main as unittest_main, SkipTest, TestCase
+from unittest.mock import patch
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    raise SkipTest('NumPy is not installed') from None
+
+import ittapi_native_mock  # pylint: disable=W0611
+from ittapi_native_real import find_native_module, load_native_module, parse_records
+from ittapi import trace
+from ittapi.trace import RecordType
+from ittapi.trace.__main__ import main as trace_main
+
+
+RECORD = struct.Struct('=QIHHQQQQ')
+HEADER = struct.Struct('=8sIIIIQQQ16x')
+RING_HEADER = struct.Struct('=8Q')
+
+
+def record(record_type, timestamp=0, tid=1, domain=0, name=0, record_id=0, value=0, size=0):
+    return RECORD.pack(timestamp, tid, record_type, size, domain, name, record_id, value)
+
+
+def definition(record_type, record_id, name, tid=1):
+    data = name.encode()
+    return record(record_type, tid=tid, record_id=record_id, size=len(data)) + data + b'\0' * (-len(data) % RECORD.size)
+
+
+def header(flags=0):
+    return HEADER.pack(b'ITTTRACE', 1, HEADER.size, RECORD.size, flags, 1234, 0, 0)
+
+
+def ring(definitions, chunks, chunk_records=4):
+    """Builds a ring trace, chunks are (sequence number, tid, records) or None for the unused chunks."""
+    chunk_size = chunk_records * RECORD.size
+    definitions = b''.join(definitions)
+    definitions_offset = HEADER.size + RING_HEADER.size
+    definitions_size = len(definitions) + RECORD.size
+    records_offset = definitions_offset + definitions_size
+    data = [header(flags=1),
+            RING_HEADER.pack(definitions_offset, definitions_size, len(definitions), 0, records_offset,
+                             len(chunks) * chunk_size, chunk_size, 0),
+            definitions, b'\0' * RECORD.size]
+    for chunk in chunks:
+        chunk_data = b''
+        if chunk is not None:
+            sequence, tid, records = chunk
+            chunk_data = record(RecordType.CHUNK, tid=tid, record_id=sequence) + b''.join(records)
+        data.append(chunk_data + b'\0' * (chunk_size - len(chunk_data)))
+    return b''.join(data)
+
+
+def task_begin(timestamp, name, tid=1, domain=1, task_id=0):
+    return record(RecordType.TASK_BEGIN, timestamp, tid, domain, name, task_id)
+
+
+def task_end(timestamp, tid=1, domain=1):
+    return record(RecordType.TASK_END, timestamp, tid, domain)
+
+
+def counter_value(timestamp, counter, value):
+    value = struct.unpack('=Q', struct.pack('=d', value))[0]
+    return record(RecordType.COUNTER_VALUE, timestamp, record_id=counter, value=value)
+
+
+class TraceTestCase(TestCase):
+    def setUp(self):
+        self._directory = TemporaryDirectory()  # pylint: disable=R1732
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def write(self, data, name='trace.itt'):
+        path = os.path.join(self._directory.name, name)
+        with open(path, 'wb' if isinstance(data, bytes) else 'w') as file:
+            file.write(data)
+        return path
+
+
+class ReaderTests(TraceTestCase):
+    def test_binary_trace(self):
+        path = self.write(header() + definition(RecordType.DOMAIN, 1, 'my domain')
+                          + definition(RecordType.STRING_HANDLE, 2, 'a name that is longer than one record ' * 2)
+                          + task_begin(10, 2) + definition(RecordType.THREAD_NAME, 0, 'main') + task_end(20)
+                          + definition(RecordType.COUNTER, 3, 'my domain\0my counter'))
+        with trace.open_trace(path) as reader:
+            self.assertEqual(reader.format, 'binary')
+            self.assertEqual(reader.pid, 1234)
+            # The definitions that cross the boundaries of the batches are read completely
+            records = numpy.concatenate(list(reader.records(batch_size=2)))
+
+            self.assertEqual(records['type'].tolist(), [RecordType.TASK_BEGIN, RecordType.TASK_END])
+            self.assertEqual(records['timestamp'].tolist(), [10, 20])
+            self.assertEqual(reader.domains, {1: 'my domain'})
+            self.assertEqual(reader.strings, {2: 'a name that is longer than one record ' * 2})
+            self.assertEqual(reader.thread_names, {1: 'main'})
+            self.assertEqual(reader.counters, {3: ('my domain', 'my counter')})
+
+    def test_ring_trace_is_read_in_order_of_chunks(self):
+        path = self.write(ring([definition(RecordType.STRING_HANDLE, 2, 'task')],
+                               [(7, 1, [task_end(30)]), None, (5, 1, [task_begin(10, 2), task_end(20)]),
+                                (6, 2, [task_begin(25, 2, tid=2)])]))
+        with trace.open_trace(path) as reader:
+            self.assertEqual(reader.format, 'mmap')
+            self.assertEqual(reader.strings, {2: 'task'})
+            records = numpy.concatenate(list(reader.records(batch_size=4)))
+            self.assertEqual(records['timestamp'].tolist(), [10, 20, 25, 30])
+
+    def test_text_log(self):
+        path = self.write('[INFO] __itt_domain_create(...) - function args: name=my domain (created new domain)\n'
+                          '[INFO] __itt_string_handle_create(...) - function args: name=task (created new string'
+                          ' handle)\n'
+                          '[INFO] __itt_thread_set_name(...) - function args: name=main\n'
+                          '[INFO] __itt_task_begin(...) - function args: domain=my domain name=task'
+                          ' taskid=5,0,0 parentid=0,0,0\n'
+                          '[INFO] __itt_metadata_add(...) - function args: domain=my domain metadata_size=1\n'
+                          '[INFO] __itt_task_end(...) - function args: domain=my domain\n'
+                          '[INFO] __itt_counter_set_value(...) - function args: counter_name=depth'
+                          ' counter_value=1.500000\n', 'trace.log')
+        with trace.open_trace(path) as reader:
+            self.assertEqual(reader.format, 'text')
+            self.assertFalse(reader.has_timestamps)
+            records = numpy.concatenate(list(reader.records()))
+
+            self.assertEqual(records['type'].tolist(),
+                             [RecordType.TASK_BEGIN, RecordType.TASK_END, RecordType.COUNTER_VALUE])
+            self.assertEqual(reader.domains[records['domain'][0]], 'my domain')
+            self.assertEqual(reader.strings[records['name'][0]], 'task')
+            self.assertEqual(records['id'][0], 5)
+            self.assertEqual(records['value'][2:].view('f8').tolist(), [1.5])
+            self.assertEqual(reader.thread_names, {0: 'main'})
+
+    def test_unsupported_version(self):
+        path = self.write(HEADER.pack(b'ITTTRACE', 2, HEADER.size, RECORD.size, 0, 0, 0, 0))
+        with self.assertRaises(ValueError):
+            trace.open_trace(path)
+
+
+class TaskTests(TraceTestCase):
+    def test_task_tree(self):
+        path = self.write(header() + task_begin(0, 1) + task_begin(0, 1, tid=2) + task_begin(10, 2)
+                          + task_end(40) + task_begin(50, 3) + task_end(55) + task_end(100) + task_end(7, tid=2))
+        tasks = numpy.concatenate(list(trace.iter_tasks(path, batch_size=3)))
+        tasks = tasks[numpy.argsort(tasks['index'])]
+
+        self.assertEqual(tasks['index'].tolist(), [0, 1, 2, 4])
+        self.assertEqual(tasks['parent'].tolist(), [-1, -1, 0, 0])
+        self.assertEqual(tasks['tid'].tolist(), [1, 2, 1, 1])
+        self.assertEqual(tasks['depth'].tolist(), [0, 0, 1, 1])
+        self.assertEqual((tasks['end'] - tasks['begin']).tolist(), [100, 7, 30, 5])
+        self.assertEqual(tasks['exclusive'].tolist(), [65, 7, 30, 5])
+
+    def test_tasks_without_begin_or_end(self):
+        path = self.write(header() + task_end(5) + task_begin(10, 1) + task_end(20) + task_begin(30, 1))
+        summary = trace.summarize(path)
+
+        self.assertEqual(summary.unmatched, 1)
+        self.assertEqual(summary.unfinished, 1)
+        self.assertEqual(summary.tasks[0].count, 1)
+
+    def test_overlapped_tasks(self):
+        path = self.write(header()
+                          + record(RecordType.TASK_BEGIN_OVERLAPPED, 10, domain=1, name=1, record_id=7)
+                          + record(RecordType.TASK_BEGIN_OVERLAPPED, 20, domain=1, name=1, record_id=8)
+                          + record(RecordType.TASK_END_OVERLAPPED, 30, domain=1, record_id=7)
+                          + record(RecordType.TASK_END_OVERLAPPED, 60, domain=1, record_id=8))
+        tasks = numpy.concatenate(list(trace.iter_tasks(path, batch_size=2)))
+        tasks = tasks[numpy.argsort(tasks['index'])]
+
+        self.assertTrue(tasks['overlapped'].all())
+        self.assertEqual((tasks['end'] - tasks['begin']).tolist(), [20, 40])
+        self.assertEqual(tasks['exclusive'].tolist(), [20, 40])
+
+
+class SummaryTests(TraceTestCase):
+    def test_summary(self):
+        durations = [5, 1, 8, 3, 100, 13]
+        records = [definition(RecordType.DOMAIN, 1, 'my domain'), definition(RecordType.STRING_HANDLE, 2, 'a'),
+                   definition(RecordType.STRING_HANDLE, 3, 'b')]
+        timestamp = 0
+        for duration in durations:
+            records += [task_begin(timestamp, 2), task_begin(timestamp, 3), task_end(timestamp + 1),
+                        task_end(timestamp + duration)]
+            timestamp += 1000
+        summary = trace.summarize(self.write(header() + b''.join(records)), percentiles=(50, 90))
+
+        self.assertEqual(summary.threads, 1)
+        self.assertEqual([(task.domain, task.name, task.count) for task in summary.tasks],
+                         [('my domain', 'a', 6), ('my domain', 'b', 6)])
+        task = summary.tasks[0]
+        self.assertEqual(task.total, sum(durations))
+        self.assertEqual(task.exclusive, sum(durations) - len(durations))
+        self.assertEqual((task.min, task.max, task.mean), (1, 100, sum(durations) / len(durations)))
+        self.assertEqual(task.percentiles, {percentile: numpy.percentile(durations, percentile)
+                                            for percentile in (50, 90)})
+
+    def test_summary_of_text_log(self):
+        path = self.write('[INFO] __itt_task_begin(...) - function args: domain=d name=task taskid=1,0,0'
+                          ' parentid=0,0,0\n[INFO] __itt_task_end(...) - function args: domain=d\n', 'trace.log')
+        summary = trace.summarize(path)
+
+        self.assertEqual(summary.format, 'text')
+        self.assertIsNone(summary.duration)
+        self.assertEqual(summary.tasks, [trace.TaskStatistics('d', 'task', 1, None, None, None, None, None,
+                                                              {50: None, 90: None, 99: None})])
+
+    def test_summary_command(self):
+        path = self.write(header() + definition(RecordType.STRING_HANDLE, 2, 'my task') + task_begin(0, 2)
+                          + task_end(2000))
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(trace_main(['summary', path]), 0)
+        self.assertIn('my task', output.getvalue())
+        self.assertIn('2.000', output.getvalue())
+
+        output = StringIO()
+        with redirect_stdout(output):
+            trace_main(['summary', path, '--json'])
+        result = json.loads(output.getvalue())
+        self.assertEqual(result['tasks'][0]['name'], 'my task')
+        self.assertEqual(result['tasks'][0]['total'], 2000)
+
+    def test_summary_with_invalid_percentiles(self):
+        path = self.write(header() + task_begin(0, 2) + task_end(2000))
+        for percentile in (-1, 100.5):
+            with self.assertRaises(ValueError):
+                trace.summarize(path, percentiles=(50, percentile))
+
+    def test_summary_command_errors(self):
+        path = self.write(header() + task_begin(0, 2) + task_end(2000))
+        for args in (['summary', os.path.join(self._directory.name, 'missing.itt')],
+                     ['summary', path, '--percentiles', '50', '101'],
+                     ['summary', self.write(HEADER.pack(b'ITTTRACE', 99, HEADER.size, RECORD.size, 0, 1234, 0, 0),
+                                            'unsupported.itt')]):
+            error = StringIO()
+            with redirect_stderr(error), self.assertRaises(SystemExit) as context:
+                trace_main(args)
+            self.assertEqual(context.exception.code, 2)
+            self.assertIn('error:', error.getvalue())
+
+
+def decode(data):
+    """Decodes a protobuf message into a list of (field number, value) pairs, nested messages are left as bytes."""
+    fields = []
+    position = 0
+    while position < len(data):
+        key, position = decode_varint(data, position)
+        if key & 7 == 0:
+            value, position = decode_varint(data, position)
+        elif key & 7 == 1:
+            value, position = struct.unpack_from('<d', data, position)[0], position + 8
+        else:
+            size, position = decode_varint(data, position)
+            value, position = data[position:position + size], position + size
+        fields.append((key >> 3, value))
+    return fields
+
+
+def decode_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        position += 1
+        if byte < 0x80:
+            return value, position
+
+
+class ExportTests(TraceTestCase):
+    def trace(self):
+        return self.write(header() + definition(RecordType.DOMAIN, 1, 'my domain')
+                          + definition(RecordType.STRING_HANDLE, 2, 'my "task"')
+                          + definition(RecordType.STRING_HANDLE, 3, 'async task')
+                          + definition(RecordType.COUNTER, 4, 'my domain\0my counter')
+                          + definition(RecordType.THREAD_NAME, 0, 'main')
+                          + task_end(1) + task_begin(1000, 2) + task_begin(2000, 2)
+                          + record(RecordType.TASK_BEGIN_OVERLAPPED, 2500, domain=1, name=3, record_id=7)
+                          + record(RecordType.TASK_BEGIN_OVERLAPPED, 2600, domain=1, name=3, record_id=8)
+                          + counter_value(2700, 4, 0.5) + record(RecordType.COUNTER_INC, 2800, record_id=4, value=2)
+                          + record(RecordType.TASK_END_OVERLAPPED, 3000, domain=1, record_id=7)
+                          + record(RecordType.TASK_END_OVERLAPPED, 3100, domain=1, record_id=8)
+                          + record(RecordType.FRAME_SUBMIT, 3200, domain=1, name=100, value=200)
+                          + task_end(4000) + task_end(5000))
+
+    def test_chrome_export(self):
+        output = os.path.join(self._directory.name, 'trace.json')
+        trace.export(self.trace(), output, batch_size=3)
+        with open(output, encoding='utf-8') as file:
+            events = json.load(file)['traceEvents']
+
+        # The end without a beginning is skipped
+        self.assertEqual([(event['ph'], event['ts']) for event in events if event['ph'] in 'BE'],
+                         [('B', 1.0), ('B', 2.0), ('E', 4.0), ('E', 5.0)])
+        self.assertEqual(events[0], {'ph': 'B', 'pid': 1234, 'tid': 1, 'ts': 1.0, 'cat': 'my domain',
+                                     'name': 'my "task"'})
+        self.assertEqual([(event['ph'], event['name'], event['id']) for event in events if event['ph'] in 'be'],
+                         [('b', 'async task', 'task:1:7'), ('b', 'async task', 'task:1:8'),
+                          ('e', 'async task', 'task:1:7'), ('e', 'async task', 'task:1:8'),
+                          ('b', 'frame', 'frame:1:0'), ('e', 'frame', 'frame:1:0')])
+        self.assertEqual([(event['name'], event['args']['value']) for event in events if event['ph'] == 'C'],
+                         [('my counter', 0.5), ('my counter', 2.5)])
+        self.assertIn({'ph': 'M', 'pid': 1234, 'tid': 1, 'name': 'thread_name', 'args': {'name': 'main'}}, events)
+
+    def test_chrome_export_with_compression(self):
+        output = os.path.join(self._directory.name, 'trace.json.gz')
+        trace.export(self.trace(), output)
+        with gzip.open(output, 'rt', encoding='utf-8') as file:
+            self.assertEqual(len(json.load(file)['traceEvents']), 13)
+
+    def test_perfetto_export(self):
+        output = os.path.join(self._directory.name, 'trace.pftrace')
+        trace.export(self.trace(), output, batch_size=3)
+        with open(output, 'rb') as file:
+            packets = [dict(decode(packet)) for _, packet in decode(file.read())]
+
+        self.assertEqual(packets[0][13], 1)
+        tracks = {fields[1]: fields for fields in (dict(decode(packet[60])) for packet in packets if 60 in packet)}
+        names = {}
+        slices = []
+        for packet in packets:
+            for field, value in decode(packet.get(12, b'')):
+                interned = dict(decode(value))
+                if field == 2:
+                    names[interned[1]] = interned[2].decode()
+            if 11 in packet:
+                event = dict(decode(packet[11]))
+                slices.append((packet[8], event[9], names.get(event.get(10)), event.get(44)))
+
+        self.assertEqual(slices, [(1000, 1, 'my "task"', None), (2000, 1, 'my "task"', None),
+                                  (2500, 1, 'async task', None), (2600, 1, 'async task', None),
+                                  (2700, 4, None, 0.5), (2800, 4, None, 2.5), (3000, 2, None, None),
+                                  (3100, 2, None, None), (100, 1, 'frame', None), (200, 2, None, None),
+                                  (4000, 2, None, None), (5000, 2, None, None)])
+        # Overlapping asynchronous tasks are placed on different tracks
+        self.assertEqual(len([track for track in tracks.values() if track.get(2) == b'my domain']), 2)
+        thread = dict(decode(next(track for track in reversed(list(tracks.values())) if 4 in track)[4]))
+        self.assertEqual(thread, {1: 1234, 2: 1, 5: b'main'})
+
+    def test_export_errors(self):
+        text_log = self.write('[INFO] __itt_task_end(...) - function args: domain=d\n', 'trace.log')
+        output = os.path.join(self._directory.name, 'trace.json')
+        with self.assertRaises(ValueError):
+            trace.export(text_log, output)
+        self.assertFalse(os.path.exists(output))
+        with self.assertRaises(ValueError):
+            trace.export(self.trace(), os.path.join(self._directory.name, 'trace.txt'))
+        with self.assertRaises(ValueError):
+            trace.export(self.trace(), output, format='svg')
+
+    def test_export_command(self):
+        output = os.path.join(self._directory.name, 'trace.out')
+        self.assertEqual(trace_main(['export', self.trace(), output, '--format', 'chrome']), 0)
+        with open(output, encoding='utf-8') as file:
+            self.assertEqual(len(json.load(file)['traceEvents']), 13)
+
+    def test_export_command_with_text_log(self):
+        text_log = self.write('[INFO] __itt_task_end(...) - function args: domain=d\n', 'trace.log')
+        output = os.path.join(self._directory.name, 'trace.json')
+        error = StringIO()
+        with redirect_stderr(error), self.assertRaises(SystemExit) as context:
+            trace_main(['export', text_log, output])
+        self.assertEqual(context.exception.code, 2)
+        self.assertIn('Only binary and mmap traces can be exported', error.getvalue())
+        self.assertFalse(os.path.exists(output))
+
+
+class CollectorTests(TestCase):
+    def setUp(self):
+        self.data = (definition(RecordType.DOMAIN, 1, 'my domain') + definition(RecordType.STRING_HANDLE, 2, 'a')
+                     + task_begin(10, 2) + task_end(25))
+        self.start = patch('ittapi.trace.collector._collector_start').start()
+        self.stop = patch('ittapi.trace.collector._collector_stop').start()
+        batches = iter([self.data])
+        self.drain = patch('ittapi.trace.collector._collector_drain', side_effect=lambda: next(batches, b'')).start()
+        self.addCleanup(patch.stopall)
+
+    def test_callback_is_called_with_batches(self):
+        batches = []
+        collector = trace.Collector(batches.append, interval=None, buffer_size=128)
+        collector.start()
+        self.start.assert_called_once_with(128)
+        self.assertTrue(collector.is_running)
+        collector.stop()
+        self.stop.assert_called_once_with()
+        self.assertFalse(collector.is_running)
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0]['type'].tolist(), [RecordType.TASK_BEGIN, RecordType.TASK_END])
+        self.assertEqual(collector.domains, {1: 'my domain'})
+        self.assertEqual(collector.strings, {2: 'a'})
+        # The callback takes the records, they are not kept
+        self.assertEqual(list(collector.records()), [])
+
+    def test_callback_is_called_in_background(self):
+        called = threading.Event()
+        with trace.Collector(lambda batch: called.set(), interval=0.01):
+            self.assertTrue(called.wait(10))
+
+    def test_summary_of_collected_records(self):
+        with trace.Collector(interval=None) as collector:
+            pass
+        summary = trace.summarize(collector)
+
+        self.assertEqual(summary.format, 'inprocess')
+        self.assertEqual([(task.domain, task.name, task.count, task.total) for task in summary.tasks],
+                         [('my domain', 'a', 1, 15)])
+
+    def test_only_one_collector_runs(self):
+        with trace.Collector(interval=None):
+            with self.assertRaises(RuntimeError):
+                trace.Collector(interval=None).start()
+        self.start.assert_called_once()
+
+    def test_callback_exception_in_background(self):
+        batches = iter([self.data, self.data])
+        self.drain.side_effect = lambda: next(batches, b'')
+        called = threading.Event()
+
+        def callback(batch):
+            if not called.is_set():
+                called.set()
+                raise RuntimeError('callback error')
+            calls.append(batch)
+
+        calls = []
+        with patch('ittapi.trace.collector._sys.excepthook') as excepthook_mock:
+            with trace.Collector(callback, interval=0.01):
+                self.assertTrue(called.wait(10))
+        # The background thread has survived the exception and the next batch has been passed to the callback
+        excepthook_mock.assert_called_once()
+        self.assertIs(excepthook_mock.call_args[0][0], RuntimeError)
+        self.assertEqual(len(calls), 1)
+
+    def test_callback_exception_in_flush(self):
+        def callback(batch):
+            raise RuntimeError('callback error')
+
+        collector = trace.Collector(callback, interval=None)
+        collector.start()
+        with self.assertRaises(RuntimeError):
+            collector.flush()
+        collector.stop()
+        self.assertFalse(collector.is_running)
+
+    def test_callback_flushes_again(self):
+        batches = iter([self.data, self.data])
+        self.drain.side_effect = lambda: next(batches, b'')
+        calls = []
+
+        def callback(batch):
+            calls.append(batch)
+            collector.flush()
+
+        collector = trace.Collector(callback, interval=None)
+        collector.start()
+        # The thread does not block the exit of the tests if the flush deadlocks
+        thread = threading.Thread(target=collector.stop, daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(calls), 2)
+
+
+class NativeCollectorTests(TestCase):
+    def setUp(self):
+        self.native = load_native_module()
+        for name in ('collector_start', 'collector_stop', 'collector_drain', 'collector_dropped', 'get_timestamp'):
+            patch(f'ittapi.trace.collector._{name}', getattr(self.native, name)).start()
+        self.addCleanup(patch.stopall)
+        if self.native.is_collector_attached():
+            raise SkipTest('A collector library is attached to the process')
+
+    def test_collected_records(self):
+        native = self.native
+        with trace.Collector(interval=None) as collector:
+            domain = native.Domain('collector domain')
+            native.task_begin(domain, native.StringHandle('collector task'), None, None)
+            counter = native.Counter('collector counter', 'collector domain')
+            counter.inc()
+            counter.add(5)
+            event = native.Event('collector event')
+            event.begin()
+            event.end()
+            native.task_end(domain)
+            self.assertEqual(collector.dropped, 0)
+
+        records = numpy.concatenate(list(collector.records()))
+        self.assertEqual(records['type'].tolist(), [RecordType.TASK_BEGIN, RecordType.COUNTER_INC,
+                                                    RecordType.COUNTER_INC, RecordType.EVENT_START,
+                                                    RecordType.EVENT_END, RecordType.TASK_END])
+        self.assertEqual(collector.domains[int(records['domain'][0])], 'collector domain')
+        self.assertEqual(collector.strings[int(records['name'][0])], 'collector task')
+        self.assertEqual(collector.counters[int(records['id'][1])], ('collector domain', 'collector counter'))
+        self.assertEqual(records['value'][1:3].tolist(), [1, 5])
+        self.assertEqual(collector.events[int(records['id'][3])], 'collector event')
+        self.assertTrue((numpy.diff(records['timestamp'].astype(numpy.int64)) >= 0).all())
+        self.assertEqual(list(collector.records()), [])
+
+    def test_dropped_records(self):
+        native = self.native
+        with trace.Collector(interval=None, buffer_size=16) as collector:
+            domain = native.Domain('collector dropping domain')
+            name = native.StringHandle('collector dropping task')
+            for _ in range(50):
+                native.task_begin(domain, name, None, None)
+                native.task_end(domain)
+            self.assertEqual(collector.dropped, 100 - 16)
+
+        records = numpy.concatenate(list(collector.records()))
+        self.assertEqual(len(records), 16)
+        self.assertEqual(records['type'][:2].tolist(), [RecordType.TASK_BEGIN, RecordType.TASK_END])
+
+    def test_callback_in_background(self):
+        native = self.native
+        batches = []
+        threads = set()
+        called = threading.Event()
+
+        def callback(batch):
+            batches.append(batch)
+            threads.add(threading.current_thread().name)
+            called.set()
+
+        with trace.Collector(callback, interval=0.01):
+            domain = native.Domain('collector background domain')
+            name = native.StringHandle('collector background task')
+            for _ in range(10):
+                native.task_begin(domain, name, None, None)
+                native.task_end(domain)
+            self.assertTrue(called.wait(10))
+        self.assertEqual(threads, {'ittapi.trace.collector'})
+        self.assertEqual(sum(len(batch) for batch in batches), 20)
+
+    def test_restart_discards_records_of_previous_start(self):
+        native = self.native
+        recorded = threading.Event()
+        restarted = threading.Event()
+
+        def record_across_restart():
+            domain = native.Domain('collector restart domain')
+            native.task_begin(domain, native.StringHandle('collector restart task'), None, None)
+            recorded.set()
+            restarted.wait(10)
+            native.task_end(domain)
+
+        native.collector_start(16)
+        try:
+            thread = threading.Thread(target=record_across_restart)
+            thread.start()
+            self.assertTrue(recorded.wait(10))
+            native.collector_stop()
+            native.collector_start(16)
+            first_records, _ = parse_records(native.collector_drain())
+            restarted.set()
+            thread.join()
+            second_records, _ = parse_records(native.collector_drain())
+        finally:
+            native.collector_stop()
+
+        self.assertEqual(first_records, [])
+        self.assertEqual([record.type for record in second_records], [RecordType.TASK_END])
+
+
+class ReferenceCollectorTests(TraceTestCase):
+    """
+    Traces a process with the reference collector library and reads the trace. The library is built with make in
+    src/ittnotify_refcol, or its path is given in the ITTAPI_REFCOL_LIBRARY environment variable.
+    """
+    THREADS = 4
+    TASKS = 3000
+    SCRIPT = '''
+import threading
+import ittapi
+
+domain = ittapi.domain('refcol domain')
+
+def run():
+    for _ in range({tasks}):
+        with ittapi.task('refcol task', domain=domain):
+            pass
+
+threads = [threading.Thread(target=run) for _ in range({threads})]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+'''
+
+    def setUp(self):
+        super().setUp()
+        library = os.environ.get('ITTAPI_REFCOL_LIBRARY', os.path.join(
+            os.path.dirname(__file__), '..', '..', 'src', 'ittnotify_refcol', 'libittnotify_refcol.so'))
+        if not os.path.isfile(library):
+            raise SkipTest('The reference collector library is not built')
+        native_module = find_native_module()
+        if native_module is None:
+            raise SkipTest('ittapi.native extension is not built')
+
+        self.env = dict(os.environ, INTEL_LIBITTNOTIFY64=os.path.abspath(library),
+                        INTEL_LIBITTNOTIFY_LOG_DIR=self._directory.name,
+                        # The built package is imported instead of the sources
+                        PYTHONPATH=os.path.dirname(os.path.dirname(native_module)))
+
+    def trace_script(self, log_format, tasks=TASKS):
+        script = self.SCRIPT.format(tasks=tasks, threads=self.THREADS)
+        subprocess.run([sys.executable, '-c', script], check=True, timeout=60, cwd=self._directory.name,
+                       env=dict(self.env, INTEL_LIBITTNOTIFY_LOG_FORMAT=log_format))
+        paths = [os.path.join(self._directory.name, name) for name in os.listdir(self._directory.name)
+                 if name.endswith('.itt')]
+        self.assertEqual(len(paths), 1)
+        return paths[0]
+
+    def check_summary(self, path, log_format):
+        summary = trace.summarize(path)
+
+        self.assertEqual(summary.format, log_format)
+        self.assertEqual(summary.threads, self.THREADS)
+        self.assertEqual(summary.unmatched, 0)
+        self.assertEqual(summary.unfinished, 0)
+        self.assertEqual([(task.domain, task.name, task.count) for task in summary.tasks],
+                         [('refcol domain', 'refcol task', self.THREADS * self.TASKS)])
+
+    def test_binary_trace(self):
+        self.check_summary(self.trace_script('binary'), 'binary')
+
+    def test_ring_trace(self):
+        self.check_summary(self.trace_script('mmap'), 'mmap')
+
+    def test_ring_trace_after_wrap_around(self):
+        # The ring of 1 MB is overwritten several times, the chunks must not be shared by threads
+        self.env['INTEL_LIBITTNOTIFY_LOG_SIZE'] = '1'
+        path = self.trace_script('mmap', tasks=10 * self.TASKS)
+        with open(path, 'rb') as file:
+            data = file.read()
+        _, _, _, _, records_offset, records_size, chunk_size, head = RING_HEADER.unpack_from(data, HEADER.size)
+        self.assertGreater(head, 2 * records_size)
+
+        chunks = numpy.frombuffer(data, trace.RECORD_DTYPE, records_size // RECORD.size, records_offset)
+        chunks = chunks.reshape(-1, chunk_size // RECORD.size)
+        self.assertTrue((chunks[:, 0]['type'] == RecordType.CHUNK).all())
+        for chunk in chunks:
+            records = chunk[1:][chunk[1:]['type'] != 0]
+            self.assertTrue((records['tid'] == chunk[0]['tid']).all())
+            self.assertTrue(numpy.isin(records['type'], [RecordType.TASK_BEGIN, RecordType.TASK_END]).all())
+            self.assertTrue((numpy.diff(records['timestamp'].astype(numpy.int64)) >= 0).all())
+
+
+if __name__ == '__main__':
+    unittest_main()  # pragma: no cover
@@ -20,6 +20,7 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <stdarg.h>
+#include <stddef.h>
 #include <string.h>
 
 #include "ittnotify.h"
@@ -339,16 +340,348 @@ static int __itt_is_collector_available(void);
 #endif
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 
+/* ========================================================================= */
+/* Hash index over the domain, string handle, counter and histogram lists.
+ *
+ * The lists in __itt_global are shared with collectors, therefore they are
+ * kept as is and the index is maintained alongside them. New elements are
+ * added to the index under the global mutex. Lookups of already registered
+ * elements are lock-free and write no shared memory: the tables are published
+ * with release semantics and are never freed, the replaced and the reset
+ * tables are kept for the life of the process, so a reader always sees a
+ * consistent (possibly outdated) table. A miss on the lock-free path falls
+ * back to the locked lookup.
+ */
+
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+static PVOID __itt_atomic_load_ptr_win(PVOID volatile* p)
+{
+    PVOID v = *p;
+    MemoryBarrier();
+    return v;
+}
+
+static LONG __itt_atomic_load_long_win(LONG volatile* p)
+{
+    LONG v = *p;
+    MemoryBarrier();
+    return v;
+}
+
+#define __itt_atomic_load_ptr(p)        __itt_atomic_load_ptr_win((PVOID volatile*)(p))
+#define __itt_atomic_store_ptr(p, v)    InterlockedExchangePointer((PVOID volatile*)(p), (PVOID)(v))
+#define __itt_atomic_exchange_ptr(p, v) InterlockedExchangePointer((PVOID volatile*)(p), (PVOID)(v))
+#define __itt_atomic_load_long(p)       __itt_atomic_load_long_win((LONG volatile*)(p))
+#define __itt_atomic_exchange_long(p, v) InterlockedExchange((LONG volatile*)(p), (LONG)(v))
+#define __itt_atomic_add_long(p, v)     InterlockedExchangeAdd((LONG volatile*)(p), (LONG)(v))
+#else  /* ITT_PLATFORM!=ITT_PLATFORM_WIN */
+#define __itt_atomic_load_ptr(p)        __atomic_load_n((p), __ATOMIC_SEQ_CST)
+#define __itt_atomic_store_ptr(p, v)    __atomic_store_n((p), (v), __ATOMIC_RELEASE)
+#define __itt_atomic_exchange_ptr(p, v) __atomic_exchange_n((p), (v), __ATOMIC_SEQ_CST)
+#define __itt_atomic_load_long(p)       __atomic_load_n((p), __ATOMIC_SEQ_CST)
+#define __itt_atomic_exchange_long(p, v) __atomic_exchange_n((p), (v), __ATOMIC_SEQ_CST)
+#define __itt_atomic_add_long(p, v)     __atomic_fetch_add((p), (v), __ATOMIC_SEQ_CST)
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+
+#define ITT_INDEX_MIN_SIZE 64
+
+typedef struct ___itt_index_table
+{
+    size_t size;                        /* number of slots, power of two */
+    size_t count;                       /* number of occupied slots */
+    size_t* hashes;
+    void** items;
+    struct ___itt_index_table* prev;    /* replaced tables are kept for lock-free readers */
+} __itt_index_table;
+
+typedef struct ___itt_index
+{
+    __itt_index_table* table;
+    void* tail;                         /* the last known element of the indexed list */
+    size_t next_offset;                 /* offset of the 'next' field of the list element */
+    int broken;                         /* the index failed to grow, lookups walk the list */
+    volatile long is_read;              /* a lock-free lookup has been made, set once and never cleared */
+    __itt_index_table* retired;         /* the reset tables that lock-free lookups might still read */
+} __itt_index;
+
+typedef struct ___itt_index_key
+{
+    const void* name;                   /* char* or wchar_t* depending on the API flavor */
+    const void* domain;                 /* domain name for counters, __itt_domain* for histograms */
+    int type;
+} __itt_index_key;
+
+typedef int (__itt_index_match_t)(const void* item, const __itt_index_key* key);
+
+static __itt_index domain_index    = { NULL, NULL, offsetof(__itt_domain, next), 0, 0, NULL };
+static __itt_index string_index    = { NULL, NULL, offsetof(__itt_string_handle, next), 0, 0, NULL };
+static __itt_index counter_index   = { NULL, NULL, offsetof(__itt_counter_info_t, next), 0, 0, NULL };
+static __itt_index histogram_index = { NULL, NULL, offsetof(__itt_histogram, next), 0, 0, NULL };
+
+#define ITT_LIST_NEXT(index, item) (*(void**)((char*)(item) + (index)->next_offset))
+
+static size_t __itt_index_hashA(const char* s, size_t seed)
+{
+    size_t h = seed ^ (size_t)2166136261u;
+    for (; *s; s++)
+    {
+        h = (h ^ (unsigned char)*s) * (size_t)16777619u;
+    }
+    return h ^ (h >> 16);
+}
+
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+static size_t __itt_index_hashW(const wchar_t* s, size_t seed)
+{
+    size_t h = seed ^ (size_t)2166136261u;
+    for (; *s; s++)
+    {
+        h = (h ^ (size_t)*s) * (size_t)16777619u;
+    }
+    return h ^ (h >> 16);
+}
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+
+static void* __itt_index_find(__itt_index* index, size_t hash, __itt_index_match_t* match, const __itt_index_key* key)
+{
+    size_t i, mask;
+    void* item;
+    void* found = NULL;
+    __itt_index_table* table;
+
+    /* The flag is stored before the table is loaded, so __itt_index_reset() either sees it or detaches the table
+     * before this lookup starts. It is stored once, so the lookups do not write the shared cache line. */
+    if (!__itt_atomic_load_long(&index->is_read))
+    {
+        __itt_atomic_exchange_long(&index->is_read, 1);
+    }
+    table = (__itt_index_table*)__itt_atomic_load_ptr(&index->table);
+    if (table != NULL)
+    {
+        /* The load factor is kept below 1/2, so there is always an empty slot to stop at */
+        mask = table->size - 1;
+        for (i = hash & mask; (item = (void*)__itt_atomic_load_ptr(&table->items[i])) != NULL; i = (i + 1) & mask)
+        {
+            if (table->hashes[i] == hash && match(item, key))
+            {
+                found = item;
+                break;
+            }
+        }
+    }
+    return found;
+}
+
+/* !!! this function should be called under mutex lock !!! */
+static void* __itt_index_find_locked(__itt_index* index, void* head, size_t hash, __itt_index_match_t* match, const __itt_index_key* key)
+{
+    if (index->broken)
+    {
+        for (; head != NULL; head = ITT_LIST_NEXT(index, head))
+        {
+            if (match(head, key)) return head;
+        }
+        return NULL;
+    }
+    return __itt_index_find(index, hash, match, key);
+}
+
+/* !!! this function should be called under mutex lock !!! */
+static void* __itt_index_list_tail(__itt_index* index, void* head)
+{
+    void* tail = (index->tail != NULL) ? index->tail : head;
+    if (tail != NULL)
+    {
+        while (ITT_LIST_NEXT(index, tail) != NULL)
+        {
+            tail = ITT_LIST_NEXT(index, tail);
+        }
+    }
+    return tail;
+}
+
+static void __itt_index_table_put(__itt_index_table* table, size_t hash, void* item)
+{
+    size_t mask = table->size - 1;
+    size_t i = hash & mask;
+    while (table->items[i] != NULL)
+    {
+        i = (i + 1) & mask;
+    }
+    table->hashes[i] = hash;
+    __itt_atomic_store_ptr(&table->items[i], item);
+    table->count++;
+}
+
+/* !!! this function should be called under mutex lock !!! */
+static void __itt_index_add(__itt_index* index, size_t hash, void* item)
+{
+    size_t i;
+    __itt_index_table* table = index->table;
+
+    if (item == NULL)
+    {
+        return;
+    }
+
+    index->tail = item;
+    if (index->broken)
+    {
+        return;
+    }
+
+    if (table == NULL || (table->count + 1) * 2 > table->size)
+    {
+        __itt_index_table* new_table = (__itt_index_table*)malloc(sizeof(__itt_index_table));
+        if (new_table != NULL)
+        {
+            new_table->size   = (table == NULL) ? ITT_INDEX_MIN_SIZE : table->size * 2;
+            new_table->count  = 0;
+            new_table->hashes = (size_t*)calloc(new_table->size, sizeof(size_t));
+            new_table->items  = (void**)calloc(new_table->size, sizeof(void*));
+            new_table->prev   = table;
+        }
+        if (new_table == NULL || new_table->hashes == NULL || new_table->items == NULL)
+        {
+            if (new_table != NULL)
+            {
+                free(new_table->hashes);
+                free((void*)new_table->items);
+                free(new_table);
+            }
+            /* Keep the lookups correct: the elements that are not indexed are found by walking the list */
+            index->broken = 1;
+            return;
+        }
+        for (i = 0; table != NULL && i < table->size; i++)
+        {
+            if (table->items[i] != NULL)
+            {
+                __itt_index_table_put(new_table, table->hashes[i], table->items[i]);
+            }
+        }
+        __itt_atomic_store_ptr(&index->table, new_table);
+        table = new_table;
+    }
+    __itt_index_table_put(table, hash, item);
+}
+
+/* !!! this function should be called under mutex lock !!!
+ * Detaches the tables from the index and keeps them for the lock-free lookups that might still read them. Returns 0
+ * if a lock-free lookup has ever been made, the indexed items might be read then and should not be freed either.
+ */
+static int __itt_index_reset(__itt_index* index)
+{
+    __itt_index_table* table = (__itt_index_table*)__itt_atomic_exchange_ptr(&index->table, NULL);
+    index->tail = NULL;
+    index->broken = 0;
+    if (table != NULL)
+    {
+        __itt_index_table* last = table;
+        while (last->prev != NULL)
+        {
+            last = last->prev;
+        }
+        last->prev = index->retired;
+        index->retired = table;
+    }
+    return !__itt_atomic_load_long(&index->is_read);
+}
+
+static int __itt_domain_matchA(const void* item, const __itt_index_key* key)
+{
+    const __itt_domain* h = (const __itt_domain*)item;
+    return h->nameA != NULL && !__itt_fstrcmp(h->nameA, (const char*)key->name);
+}
+
+static int __itt_string_handle_matchA(const void* item, const __itt_index_key* key)
+{
+    const __itt_string_handle* h = (const __itt_string_handle*)item;
+    return h->strA != NULL && !__itt_fstrcmp(h->strA, (const char*)key->name);
+}
+
+static int __itt_counter_matchA(const void* item, const __itt_index_key* key)
+{
+    const __itt_counter_info_t* h = (const __itt_counter_info_t*)item;
+    const char* domain = (const char*)key->domain;
+    return h->nameA != NULL && h->type == key->type && !__itt_fstrcmp(h->nameA, (const char*)key->name) &&
+        ((h->domainA == NULL && domain == NULL) || (h->domainA != NULL && domain != NULL && !__itt_fstrcmp(h->domainA, domain)));
+}
+
+static int __itt_histogram_matchA(const void* item, const __itt_index_key* key)
+{
+    const __itt_histogram* h = (const __itt_histogram*)item;
+    return h->domain != NULL && h->domain == (const __itt_domain*)key->domain &&
+        h->nameA != NULL && !__itt_fstrcmp(h->nameA, (const char*)key->name);
+}
+
+static size_t __itt_counter_hashA(const char* name, const char* domain, int type)
+{
+    size_t hash = __itt_index_hashA(name, (size_t)type);
+    return domain != NULL ? __itt_index_hashA(domain, hash) : hash;
+}
+
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+static int __itt_domain_matchW(const void* item, const __itt_index_key* key)
+{
+    const __itt_domain* h = (const __itt_domain*)item;
+    return h->nameW != NULL && !wcscmp(h->nameW, (const wchar_t*)key->name);
+}
+
+static int __itt_string_handle_matchW(const void* item, const __itt_index_key* key)
+{
+    const __itt_string_handle* h = (const __itt_string_handle*)item;
+    return h->strW != NULL && !wcscmp(h->strW, (const wchar_t*)key->name);
+}
+
+static int __itt_counter_matchW(const void* item, const __itt_index_key* key)
+{
+    const __itt_counter_info_t* h = (const __itt_counter_info_t*)item;
+    const wchar_t* domain = (const wchar_t*)key->domain;
+    return h->nameW != NULL && h->type == key->type && !wcscmp(h->nameW, (const wchar_t*)key->name) &&
+        ((h->domainW == NULL && domain == NULL) || (h->domainW != NULL && domain != NULL && !wcscmp(h->domainW, domain)));
+}
+
+static int __itt_histogram_matchW(const void* item, const __itt_index_key* key)
+{
+    const __itt_histogram* h = (const __itt_histogram*)item;
+    return h->domain != NULL && h->domain == (const __itt_domain*)key->domain &&
+        h->nameW != NULL && !wcscmp(h->nameW, (const wchar_t*)key->name);
+}
+
+static size_t __itt_counter_hashW(const wchar_t* name, const wchar_t* domain, int type)
+{
+    size_t hash = __itt_index_hashW(name, (size_t)type);
+    return domain != NULL ? __itt_index_hashW(domain, hash) : hash;
+}
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+
 #if ITT_PLATFORM==ITT_PLATFORM_WIN
 static __itt_domain* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(domain_createW),_init))(const wchar_t* name)
 {
     __itt_domain *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = NULL;
+    key.type = 0;
+    hash = __itt_index_hashW(name, 0);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered domains */
+        h = (__itt_domain*)__itt_index_find(&domain_index, hash, __itt_domain_matchW, &key);
+        if (h != NULL)
+        {
+            return h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -365,13 +698,12 @@ static __itt_domain* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(domain_createW),_init))(
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).domain_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameW != NULL && !wcscmp(h->nameW, name)) break;
-        }
+        h = (__itt_domain*)__itt_index_find_locked(&domain_index, _N_(_ittapi_global).domain_list, hash, __itt_domain_matchW, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_domain*)__itt_index_list_tail(&domain_index, _N_(_ittapi_global).domain_list);
             NEW_DOMAIN_W(&_N_(_ittapi_global), h, h_tail, name);
+            __itt_index_add(&domain_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -384,12 +716,28 @@ static __itt_domain* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(domain_create),_init))(c
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 {
     __itt_domain *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = NULL;
+    key.type = 0;
+    hash = __itt_index_hashA(name, 0);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered domains */
+        h = (__itt_domain*)__itt_index_find(&domain_index, hash, __itt_domain_matchA, &key);
+        if (h != NULL)
+        {
+            return h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -418,13 +766,12 @@ static __itt_domain* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(domain_create),_init))(c
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).domain_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameA != NULL && !__itt_fstrcmp(h->nameA, name)) break;
-        }
+        h = (__itt_domain*)__itt_index_find_locked(&domain_index, _N_(_ittapi_global).domain_list, hash, __itt_domain_matchA, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_domain*)__itt_index_list_tail(&domain_index, _N_(_ittapi_global).domain_list);
             NEW_DOMAIN_A(&_N_(_ittapi_global), h, h_tail, name);
+            __itt_index_add(&domain_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -467,12 +814,28 @@ static void ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(module_unload_with_sections),_ini
 static __itt_string_handle* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(string_handle_createW),_init))(const wchar_t* name)
 {
     __itt_string_handle *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = NULL;
+    key.type = 0;
+    hash = __itt_index_hashW(name, 0);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered string handles */
+        h = (__itt_string_handle*)__itt_index_find(&string_index, hash, __itt_string_handle_matchW, &key);
+        if (h != NULL)
+        {
+            return h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -489,13 +852,12 @@ static __itt_string_handle* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(string_handle_cre
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).string_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->strW != NULL && !wcscmp(h->strW, name)) break;
-        }
+        h = (__itt_string_handle*)__itt_index_find_locked(&string_index, _N_(_ittapi_global).string_list, hash, __itt_string_handle_matchW, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_string_handle*)__itt_index_list_tail(&string_index, _N_(_ittapi_global).string_list);
             NEW_STRING_HANDLE_W(&_N_(_ittapi_global), h, h_tail, name);
+            __itt_index_add(&string_index, hash, h);
         }
     }
     __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -508,12 +870,28 @@ static __itt_string_handle* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(string_handle_cre
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 {
     __itt_string_handle *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = NULL;
+    key.type = 0;
+    hash = __itt_index_hashA(name, 0);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered string handles */
+        h = (__itt_string_handle*)__itt_index_find(&string_index, hash, __itt_string_handle_matchA, &key);
+        if (h != NULL)
+        {
+            return h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -542,13 +920,12 @@ static __itt_string_handle* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(string_handle_cre
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).string_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->strA != NULL && !__itt_fstrcmp(h->strA, name)) break;
-        }
+        h = (__itt_string_handle*)__itt_index_find_locked(&string_index, _N_(_ittapi_global).string_list, hash, __itt_string_handle_matchA, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_string_handle*)__itt_index_list_tail(&string_index, _N_(_ittapi_global).string_list);
             NEW_STRING_HANDLE_A(&_N_(_ittapi_global), h, h_tail, name);
+            __itt_index_add(&string_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -559,6 +936,8 @@ static __itt_string_handle* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(string_handle_cre
 static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_createW),_init))(const wchar_t *name, const wchar_t *domain)
 {
     __itt_counter_info_t *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
     __itt_metadata_type type = __itt_metadata_u64;
 
     if (name == NULL)
@@ -566,6 +945,20 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_createW),_init))
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain;
+    key.type = (int)type;
+    hash = __itt_counter_hashW(name, domain, (int)type);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered counters */
+        h = (__itt_counter_info_t*)__itt_index_find(&counter_index, hash, __itt_counter_matchW, &key);
+        if (h != NULL)
+        {
+            return (__itt_counter)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -582,15 +975,12 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_createW),_init))
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).counter_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameW != NULL && h->type == (int)type && !wcscmp(h->nameW, name) && ((h->domainW == NULL && domain == NULL) ||
-                (h->domainW != NULL && domain != NULL && !wcscmp(h->domainW, domain)))) break;
-
-        }
+        h = (__itt_counter_info_t*)__itt_index_find_locked(&counter_index, _N_(_ittapi_global).counter_list, hash, __itt_counter_matchW, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_counter_info_t*)__itt_index_list_tail(&counter_index, _N_(_ittapi_global).counter_list);
             NEW_COUNTER_W(&_N_(_ittapi_global), h, h_tail, name, domain, type);
+            __itt_index_add(&counter_index, hash, h);
         }
     }
     __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -603,6 +993,8 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create),_init))(
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 {
     __itt_counter_info_t *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
     __itt_metadata_type type = __itt_metadata_u64;
 
     if (name == NULL)
@@ -610,6 +1002,20 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create),_init))(
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain;
+    key.type = (int)type;
+    hash = __itt_counter_hashA(name, domain, (int)type);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered counters */
+        h = (__itt_counter_info_t*)__itt_index_find(&counter_index, hash, __itt_counter_matchA, &key);
+        if (h != NULL)
+        {
+            return (__itt_counter)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -638,14 +1044,12 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create),_init))(
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).counter_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameA != NULL && h->type == (int)type && !__itt_fstrcmp(h->nameA, name) && ((h->domainA == NULL && domain == NULL) ||
-                (h->domainA != NULL && domain != NULL && !__itt_fstrcmp(h->domainA, domain)))) break;
-        }
+        h = (__itt_counter_info_t*)__itt_index_find_locked(&counter_index, _N_(_ittapi_global).counter_list, hash, __itt_counter_matchA, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_counter_info_t*)__itt_index_list_tail(&counter_index, _N_(_ittapi_global).counter_list);
             NEW_COUNTER_A(&_N_(_ittapi_global), h, h_tail, name, domain, type);
+            __itt_index_add(&counter_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -656,12 +1060,28 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create),_init))(
 static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_typedW),_init))(const wchar_t *name, const wchar_t *domain, __itt_metadata_type type)
 {
     __itt_counter_info_t *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain;
+    key.type = (int)type;
+    hash = __itt_counter_hashW(name, domain, (int)type);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered counters */
+        h = (__itt_counter_info_t*)__itt_index_find(&counter_index, hash, __itt_counter_matchW, &key);
+        if (h != NULL)
+        {
+            return (__itt_counter)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -678,15 +1098,12 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_typedW),_
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).counter_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameW != NULL && h->type == (int)type && !wcscmp(h->nameW, name) && ((h->domainW == NULL && domain == NULL) ||
-                (h->domainW != NULL && domain != NULL && !wcscmp(h->domainW, domain)))) break;
-
-        }
+        h = (__itt_counter_info_t*)__itt_index_find_locked(&counter_index, _N_(_ittapi_global).counter_list, hash, __itt_counter_matchW, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_counter_info_t*)__itt_index_list_tail(&counter_index, _N_(_ittapi_global).counter_list);
             NEW_COUNTER_W(&_N_(_ittapi_global), h, h_tail, name, domain, type);
+            __itt_index_add(&counter_index, hash, h);
         }
     }
     __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -699,12 +1116,28 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_typed),_i
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 {
     __itt_counter_info_t *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain;
+    key.type = (int)type;
+    hash = __itt_counter_hashA(name, domain, (int)type);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered counters */
+        h = (__itt_counter_info_t*)__itt_index_find(&counter_index, hash, __itt_counter_matchA, &key);
+        if (h != NULL)
+        {
+            return (__itt_counter)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -733,14 +1166,12 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_typed),_i
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).counter_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameA != NULL && h->type == (int)type && !__itt_fstrcmp(h->nameA, name) && ((h->domainA == NULL && domain == NULL) ||
-                (h->domainA != NULL && domain != NULL && !__itt_fstrcmp(h->domainA, domain)))) break;
-        }
+        h = (__itt_counter_info_t*)__itt_index_find_locked(&counter_index, _N_(_ittapi_global).counter_list, hash, __itt_counter_matchA, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_counter_info_t*)__itt_index_list_tail(&counter_index, _N_(_ittapi_global).counter_list);
             NEW_COUNTER_A(&_N_(_ittapi_global), h, h_tail, name, domain, type);
+            __itt_index_add(&counter_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -751,12 +1182,28 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_typed),_i
 static __itt_histogram* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(histogram_createW),_init))(const __itt_domain* domain, const wchar_t* name, __itt_metadata_type x_type, __itt_metadata_type y_type)
 {
     __itt_histogram *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (domain == NULL || name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain;
+    key.type = 0;
+    hash = __itt_index_hashW(name, (size_t)domain);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered histograms */
+        h = (__itt_histogram*)__itt_index_find(&histogram_index, hash, __itt_histogram_matchW, &key);
+        if (h != NULL)
+        {
+            return (__itt_histogram*)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -773,14 +1220,12 @@ static __itt_histogram* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(histogram_createW),_i
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).histogram_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->domain == NULL) continue;
-            else if (h->domain == domain && h->nameW != NULL && !wcscmp(h->nameW, name)) break;
-        }
+        h = (__itt_histogram*)__itt_index_find_locked(&histogram_index, _N_(_ittapi_global).histogram_list, hash, __itt_histogram_matchW, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_histogram*)__itt_index_list_tail(&histogram_index, _N_(_ittapi_global).histogram_list);
             NEW_HISTOGRAM_W(&_N_(_ittapi_global), h, h_tail, domain, name, x_type, y_type);
+            __itt_index_add(&histogram_index, hash, h);
         }
     }
     __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -793,12 +1238,28 @@ static __itt_histogram* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(histogram_create),_in
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 {
     __itt_histogram *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (domain == NULL || name == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain;
+    key.type = 0;
+    hash = __itt_index_hashA(name, (size_t)domain);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered histograms */
+        h = (__itt_histogram*)__itt_index_find(&histogram_index, hash, __itt_histogram_matchA, &key);
+        if (h != NULL)
+        {
+            return (__itt_histogram*)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -827,14 +1288,12 @@ static __itt_histogram* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(histogram_create),_in
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).histogram_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->domain == NULL) continue;
-            else if (h->domain == domain && h->nameA != NULL && !__itt_fstrcmp(h->nameA, name)) break;
-        }
+        h = (__itt_histogram*)__itt_index_find_locked(&histogram_index, _N_(_ittapi_global).histogram_list, hash, __itt_histogram_matchA, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_histogram*)__itt_index_list_tail(&histogram_index, _N_(_ittapi_global).histogram_list);
             NEW_HISTOGRAM_A(&_N_(_ittapi_global), h, h_tail, domain, name, x_type, y_type);
+            __itt_index_add(&histogram_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -845,12 +1304,28 @@ static __itt_histogram* ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(histogram_create),_in
 static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_createW_v3),_init))(const __itt_domain* domain, const wchar_t* name, __itt_metadata_type type)
 {
     __itt_counter_info_t *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL || domain == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain->nameW;
+    key.type = (int)type;
+    hash = __itt_counter_hashW(name, domain->nameW, (int)type);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered counters */
+        h = (__itt_counter_info_t*)__itt_index_find(&counter_index, hash, __itt_counter_matchW, &key);
+        if (h != NULL)
+        {
+            return (__itt_counter)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -867,15 +1342,12 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_createW_v3),_ini
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).counter_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameW != NULL  && h->type == (int)type && !wcscmp(h->nameW, name) && ((h->domainW == NULL && domain->nameW == NULL) ||
-                (h->domainW != NULL && domain->nameW != NULL && !wcscmp(h->domainW, domain->nameW)))) break;
-
-        }
+        h = (__itt_counter_info_t*)__itt_index_find_locked(&counter_index, _N_(_ittapi_global).counter_list, hash, __itt_counter_matchW, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_counter_info_t*)__itt_index_list_tail(&counter_index, _N_(_ittapi_global).counter_list);
             NEW_COUNTER_W(&_N_(_ittapi_global),h,h_tail,name,domain->nameW,type);
+            __itt_index_add(&counter_index, hash, h);
         }
     }
     __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -888,12 +1360,28 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_v3),_init
 #endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
 {
     __itt_counter_info_t *h_tail = NULL, *h = NULL;
+    __itt_index_key key;
+    size_t hash;
 
     if (name == NULL || domain == NULL)
     {
         return NULL;
     }
 
+    key.name = name;
+    key.domain = domain->nameA;
+    key.type = (int)type;
+    hash = __itt_counter_hashA(name, domain->nameA, (int)type);
+    if (!_N_(_ittapi_global).api_initialized)
+    {
+        /* Lock-free lookup of the already registered counters */
+        h = (__itt_counter_info_t*)__itt_index_find(&counter_index, hash, __itt_counter_matchA, &key);
+        if (h != NULL)
+        {
+            return (__itt_counter)h;
+        }
+    }
+
     ITT_MUTEX_INIT_AND_LOCK(_N_(_ittapi_global));
     if (_N_(_ittapi_global).api_initialized)
     {
@@ -922,14 +1410,12 @@ static __itt_counter ITTAPI ITT_VERSIONIZE(ITT_JOIN(_N_(counter_create_v3),_init
     }
     if (__itt_is_collector_available())
     {
-        for (h_tail = NULL, h = _N_(_ittapi_global).counter_list; h != NULL; h_tail = h, h = h->next)
-        {
-            if (h->nameA != NULL  && h->type == (int)type && !__itt_fstrcmp(h->nameA, name) && ((h->domainA == NULL && domain->nameA == NULL) ||
-                (h->domainA != NULL && domain->nameA != NULL && !__itt_fstrcmp(h->domainA, domain->nameA)))) break;
-        }
+        h = (__itt_counter_info_t*)__itt_index_find_locked(&counter_index, _N_(_ittapi_global).counter_list, hash, __itt_counter_matchA, &key);
         if (h == NULL)
         {
+            h_tail = (__itt_counter_info_t*)__itt_index_list_tail(&counter_index, _N_(_ittapi_global).counter_list);
             NEW_COUNTER_A(&_N_(_ittapi_global),h,h_tail,name,domain->nameA,type);
+            __itt_index_add(&counter_index, hash, h);
         }
     }
     if (PTHREAD_SYMBOLS) __itt_mutex_unlock(&_N_(_ittapi_global).mutex);
@@ -1404,6 +1890,24 @@ ITT_EXTERN_C void _N_(fini_ittlib)(void)
 /* !!! this function should be called under mutex lock !!! */
 static void __itt_free_allocated_resources(void)
 {
+    /* The lock-free lookups may still read the indexed items, so they are leaked */
+    if (!__itt_index_reset(&string_index))
+    {
+        _N_(_ittapi_global).string_list = NULL;
+    }
+    if (!__itt_index_reset(&domain_index))
+    {
+        _N_(_ittapi_global).domain_list = NULL;
+    }
+    if (!__itt_index_reset(&counter_index))
+    {
+        _N_(_ittapi_global).counter_list = NULL;
+    }
+    if (!__itt_index_reset(&histogram_index))
+    {
+        _N_(_ittapi_global).histogram_list = NULL;
+    }
+
     __itt_string_handle* current_string = _N_(_ittapi_global).string_list;
     while (current_string != NULL)
     {
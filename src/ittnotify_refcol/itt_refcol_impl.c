@@ -4,6 +4,7 @@
   SPDX-License-Identifier: GPL-2.0-only OR BSD-3-Clause
 */
 
+#include <errno.h>
 #include <stdio.h>
 #include <stdarg.h>
 #include <stdlib.h>
@@ -14,12 +15,33 @@
 #define INTEL_ITTNOTIFY_API_PRIVATE
 #include "ittnotify.h"
 #include "ittnotify_config.h"
+#include "itt_refcol_trace.h"
+
+#if ITT_PLATFORM!=ITT_PLATFORM_WIN
+#include <fcntl.h>
+#include <pthread.h>
+#include <sched.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#ifdef __linux__
+#include <sys/syscall.h>
+#endif
+#endif
 
 #define LOG_BUFFER_MAX_SIZE 256
+#define TRACE_RING_DEFAULT_SIZE_MB 64
 
 static const char* env_log_dir = "INTEL_LIBITTNOTIFY_LOG_DIR";
+static const char* env_log_format = "INTEL_LIBITTNOTIFY_LOG_FORMAT";
+static const char* env_log_size = "INTEL_LIBITTNOTIFY_LOG_SIZE";
 static const char* log_level_str[] = {"INFO", "WARN", "ERROR", "FATAL_ERROR"};
 
+enum {
+    LOG_FORMAT_TEXT,
+    LOG_FORMAT_BINARY,
+    LOG_FORMAT_MMAP
+};
+
 enum {
     LOG_LVL_INFO,
     LOG_LVL_WARN,
@@ -30,7 +52,9 @@ enum {
 static struct ref_collector_logger {
     FILE* log_fp;
     uint8_t init_state;
-} g_ref_collector_logger = {NULL, 0};
+    uint8_t format;
+    int trace_fd;
+} g_ref_collector_logger = {NULL, 0, LOG_FORMAT_TEXT, -1};
 
 // Collector maintains its own object lists instead of relying on __itt_global*,
 // because traced apps may contain multiple static ITT parts, each with its own __itt_global*.
@@ -45,19 +69,531 @@ static struct ref_collector_global {
     __itt_histogram*       histogram_list;
 } g_ref_collector_global = {MUTEX_INITIALIZER, 0, NULL, NULL, NULL, NULL};
 
-static char* log_file_name_generate()
+static char* log_file_name_generate(uint8_t format)
 {
     time_t time_now = time(NULL);
     struct tm* time_info = localtime(&time_now);
     char* log_file_name = malloc(sizeof(char) * (LOG_BUFFER_MAX_SIZE/2));
 
-    sprintf(log_file_name,"libittnotify_refcol_%d%d%d%d%d%d.log",
-            time_info->tm_year+1900, time_info->tm_mon+1, time_info->tm_mday,
-            time_info->tm_hour, time_info->tm_min, time_info->tm_sec);
+    int length = sprintf(log_file_name,"libittnotify_refcol_%d%d%d%d%d%d",
+                         time_info->tm_year+1900, time_info->tm_mon+1, time_info->tm_mday,
+                         time_info->tm_hour, time_info->tm_min, time_info->tm_sec);
 
+#if ITT_PLATFORM!=ITT_PLATFORM_WIN
+    if (format != LOG_FORMAT_TEXT)
+    {
+        // Binary traces are not appended to, so traces of processes started at the same second must not collide
+        sprintf(log_file_name + length, "_%d.itt", (int)getpid());
+        return log_file_name;
+    }
+#endif
+
+    (void)format;
+    sprintf(log_file_name + length, ".log");
     return log_file_name;
 }
 
+#if ITT_PLATFORM!=ITT_PLATFORM_WIN
+
+// Binary trace. Each thread appends fixed-size records to its own buffer without any locking, and a full buffer is
+// written to the trace file with a single write() call, so the cost of a traced call is a timestamp and a store.
+// The file is opened with O_APPEND, so the blocks of different threads never overlap. Definitions (domains,
+// string handles, etc.) are written immediately, so they always precede the records that refer to them.
+// A thread marks its buffer as being written while it appends a record, and the buffers are flushed at the end only
+// after they have been marked as closed, so a buffer is never written by its thread and the closing one at once.
+
+//
+// Memory-mapped trace (flight recorder). The file of a fixed size is allocated and mapped at the start. Each thread
+// reserves chunks of the ring with an atomic bump pointer and stores the records directly to the mapping, so there are
+// no system calls on the hot path, and the records that have been stored survive a crash of the process. When the ring
+// is full, new chunks overwrite the oldest ones. A thread owns its chunk until the chunk is full or the thread exits,
+// and the chunk is taken with a compare-and-swap of its first record, so a chunk that is still written by a thread is
+// skipped after wrap-around instead of being overwritten. Definitions are appended to a separate area and are never
+// overwritten.
+
+#define TRACE_BUFFER_RECORDS 2048
+#define TRACE_NAME_MAX_RECORDS 21
+#define TRACE_CHUNK_RECORDS 64
+
+enum {
+    TRACE_BUFFER_IDLE,
+    TRACE_BUFFER_WRITING,
+    TRACE_BUFFER_CLOSED
+};
+
+typedef struct trace_thread_buffer
+{
+    struct trace_thread_buffer* next;
+    struct trace_thread_buffer* prev;
+    volatile long state;
+    uint32_t tid;
+    uint32_t used;
+    itt_refcol_record records[TRACE_BUFFER_RECORDS];
+} trace_thread_buffer;
+
+typedef struct trace_ring_chunk
+{
+    itt_refcol_record* header;
+    itt_refcol_record* next;
+    itt_refcol_record* end;
+    uint32_t tid;
+} trace_ring_chunk;
+
+static struct ref_collector_trace {
+    mutex_t                 mutex;
+    trace_thread_buffer*    buffers;
+    int                     closed;
+    pthread_key_t           buffer_key;
+    char*                   map;
+    itt_refcol_trace_ring*  ring;
+} g_ref_collector_trace = {MUTEX_INITIALIZER, NULL, 0, 0, NULL, NULL};
+
+static __thread trace_thread_buffer* t_trace_buffer = NULL;
+static __thread trace_ring_chunk t_trace_chunk = {NULL, NULL, NULL, 0};
+
+static uint64_t trace_timestamp(clockid_t clock_id)
+{
+    struct timespec time_now;
+    clock_gettime(clock_id, &time_now);
+    return (uint64_t)time_now.tv_sec * 1000000000ull + (uint64_t)time_now.tv_nsec;
+}
+
+static uint32_t trace_thread_id()
+{
+#ifdef __linux__
+    return (uint32_t)syscall(SYS_gettid);
+#else
+    static volatile long next_thread_id = 0;
+    return (uint32_t)__itt_interlocked_increment(&next_thread_id);
+#endif
+}
+
+static void trace_write(const void* data, size_t size)
+{
+    const char* ptr = (const char*)data;
+    while (size > 0 && g_ref_collector_logger.trace_fd >= 0)
+    {
+        ssize_t written = write(g_ref_collector_logger.trace_fd, ptr, size);
+        if (written < 0)
+        {
+            if (errno == EINTR) continue;
+            printf("ERROR: Failed to write trace data\n");
+            return;
+        }
+        ptr += written;
+        size -= (size_t)written;
+    }
+}
+
+static void trace_thread_buffer_flush(trace_thread_buffer* buffer)
+{
+    if (buffer->used > 0)
+    {
+        trace_write(buffer->records, buffer->used * sizeof(itt_refcol_record));
+        buffer->used = 0;
+    }
+}
+
+// Destructor of the thread buffer, called at thread exit
+static void trace_thread_buffer_release(void* data)
+{
+    trace_thread_buffer* buffer = (trace_thread_buffer*)data;
+
+    __itt_mutex_lock(&g_ref_collector_trace.mutex);
+    trace_thread_buffer_flush(buffer);
+    if (buffer->prev) buffer->prev->next = buffer->next;
+    else g_ref_collector_trace.buffers = buffer->next;
+    if (buffer->next) buffer->next->prev = buffer->prev;
+    __itt_mutex_unlock(&g_ref_collector_trace.mutex);
+
+    t_trace_buffer = NULL;
+    free(buffer);
+}
+
+static trace_thread_buffer* trace_thread_buffer_get()
+{
+    trace_thread_buffer* buffer = t_trace_buffer;
+    if (buffer != NULL) return buffer;
+
+    buffer = (trace_thread_buffer*)malloc(sizeof(trace_thread_buffer));
+    if (buffer == NULL) return NULL;
+
+    buffer->tid = trace_thread_id();
+    buffer->used = 0;
+    buffer->prev = NULL;
+
+    __itt_mutex_lock(&g_ref_collector_trace.mutex);
+    buffer->state = g_ref_collector_trace.closed ? TRACE_BUFFER_CLOSED : TRACE_BUFFER_IDLE;
+    buffer->next = g_ref_collector_trace.buffers;
+    if (buffer->next) buffer->next->prev = buffer;
+    g_ref_collector_trace.buffers = buffer;
+    __itt_mutex_unlock(&g_ref_collector_trace.mutex);
+
+    pthread_setspecific(g_ref_collector_trace.buffer_key, buffer);
+    t_trace_buffer = buffer;
+    return buffer;
+}
+
+// Gives the chunk of the current thread back to the ring, so it can be reserved again after wrap-around
+static void trace_ring_chunk_release(void* data)
+{
+    trace_ring_chunk* chunk = (trace_ring_chunk*)data;
+    if (chunk->header != NULL)
+    {
+        __atomic_store_n(&chunk->header->value, 0, __ATOMIC_RELEASE);
+    }
+    chunk->header = chunk->next = chunk->end = NULL;
+}
+
+// Reserves the next free chunk of the ring for the current thread. The first record of a chunk has a non-zero value
+// while the chunk is owned by a thread, and the chunks that are still owned are skipped. If all chunks are owned, e.g.
+// there are more threads than chunks, no chunk is reserved and the records are dropped.
+static void trace_ring_chunk_reserve(trace_ring_chunk* chunk)
+{
+    itt_refcol_trace_ring* ring = g_ref_collector_trace.ring;
+    if (chunk->header == NULL)
+    {
+        // The chunk is released at the exit of the thread
+        pthread_setspecific(g_ref_collector_trace.buffer_key, chunk);
+    }
+    trace_ring_chunk_release(chunk);
+
+    if (chunk->tid == 0) chunk->tid = trace_thread_id();
+    for (uint64_t attempt = 0; attempt < ring->records_size / ring->chunk_size; attempt++)
+    {
+        uint64_t start = __sync_fetch_and_add(&ring->head, ring->chunk_size);
+        itt_refcol_record* records =
+            (itt_refcol_record*)(g_ref_collector_trace.map + ring->records_offset + start % ring->records_size);
+        if (!__sync_bool_compare_and_swap(&records->value, 0, 1))
+        {
+            continue;
+        }
+
+        // The records of the previous lap are cleared, so the reader stops at the end of the records of this thread
+        __atomic_store_n(&records->type, 0, __ATOMIC_RELEASE);
+        memset(records + 1, 0, ring->chunk_size - sizeof(itt_refcol_record));
+        records->timestamp = trace_timestamp(CLOCK_MONOTONIC);
+        records->tid = chunk->tid;
+        records->size = 0;
+        records->domain = 0;
+        records->name = 0;
+        records->id = start / ring->chunk_size;
+        __atomic_store_n(&records->type, ITT_REFCOL_RECORD_CHUNK, __ATOMIC_RELEASE);
+
+        chunk->header = records;
+        chunk->next = records + 1;
+        chunk->end = records + ring->chunk_size / sizeof(itt_refcol_record);
+        return;
+    }
+}
+
+static itt_refcol_record* trace_ring_next(uint32_t* tid)
+{
+    trace_ring_chunk* chunk = &t_trace_chunk;
+    if (chunk->next == chunk->end)
+    {
+        trace_ring_chunk_reserve(chunk);
+        if (chunk->next == NULL) return NULL;
+    }
+    *tid = chunk->tid;
+    return chunk->next++;
+}
+
+static void trace_record(uint16_t type, const __itt_domain* domain, uint64_t name, uint64_t id, uint64_t value)
+{
+    trace_thread_buffer* buffer = NULL;
+    itt_refcol_record* record;
+    uint32_t tid;
+
+    if (g_ref_collector_logger.format == LOG_FORMAT_BINARY)
+    {
+        buffer = trace_thread_buffer_get();
+        // The buffer is not written after the trace has been closed
+        if (buffer == NULL ||
+            !__sync_bool_compare_and_swap(&buffer->state, TRACE_BUFFER_IDLE, TRACE_BUFFER_WRITING))
+        {
+            return;
+        }
+
+        if (buffer->used == TRACE_BUFFER_RECORDS)
+        {
+            trace_thread_buffer_flush(buffer);
+        }
+        record = &buffer->records[buffer->used++];
+        tid = buffer->tid;
+    }
+    else if (g_ref_collector_logger.format == LOG_FORMAT_MMAP)
+    {
+        record = trace_ring_next(&tid);
+        if (record == NULL) return;
+    }
+    else
+    {
+        return;
+    }
+
+    record->timestamp = trace_timestamp(CLOCK_MONOTONIC);
+    record->tid = tid;
+    record->size = 0;
+    record->domain = (uint64_t)(uintptr_t)domain;
+    record->name = name;
+    record->id = id;
+    record->value = value;
+    // The type is stored last, so a reader of the mapped trace never sees a record that is written partially
+    __atomic_store_n(&record->type, type, __ATOMIC_RELEASE);
+
+    if (buffer != NULL)
+    {
+        __atomic_store_n(&buffer->state, TRACE_BUFFER_IDLE, __ATOMIC_RELEASE);
+    }
+}
+
+static void trace_ring_write(const void* data, size_t size)
+{
+    itt_refcol_trace_ring* ring = g_ref_collector_trace.ring;
+    uint64_t offset = __sync_fetch_and_add(&ring->definitions_used, size);
+    if (offset + size > ring->definitions_size)
+    {
+        __sync_fetch_and_add(&ring->definitions_dropped, 1);
+        return;
+    }
+    memcpy(g_ref_collector_trace.map + ring->definitions_offset + offset, data, size);
+}
+
+// Writes a definition record followed by the name, long names are truncated
+static void trace_definition(uint16_t type, uint64_t id, uint64_t value, const char* name, size_t name_size)
+{
+    struct {
+        itt_refcol_record record;
+        char name[TRACE_NAME_MAX_RECORDS * sizeof(itt_refcol_record)];
+    } definition;
+
+    uint32_t tid;
+    if (g_ref_collector_logger.format == LOG_FORMAT_BINARY)
+    {
+        trace_thread_buffer* buffer = trace_thread_buffer_get();
+        tid = buffer != NULL ? buffer->tid : trace_thread_id();
+    }
+    else if (g_ref_collector_logger.format == LOG_FORMAT_MMAP)
+    {
+        if (t_trace_chunk.tid == 0) t_trace_chunk.tid = trace_thread_id();
+        tid = t_trace_chunk.tid;
+    }
+    else
+    {
+        return;
+    }
+
+    memset(&definition, 0, sizeof(definition));
+    name_size = name_size < sizeof(definition.name) ? name_size : sizeof(definition.name);
+    memcpy(definition.name, name, name_size);
+
+    definition.record.timestamp = trace_timestamp(CLOCK_MONOTONIC);
+    definition.record.tid = tid;
+    definition.record.type = type;
+    definition.record.size = (uint16_t)name_size;
+    definition.record.id = id;
+    definition.record.value = value;
+
+    size_t padded_size = (name_size + sizeof(itt_refcol_record) - 1) / sizeof(itt_refcol_record);
+    size_t size = (1 + padded_size) * sizeof(itt_refcol_record);
+    if (g_ref_collector_logger.format == LOG_FORMAT_BINARY)
+    {
+        // The trace file is not closed while the definition is written
+        __itt_mutex_lock(&g_ref_collector_trace.mutex);
+        trace_write(&definition, size);
+        __itt_mutex_unlock(&g_ref_collector_trace.mutex);
+    }
+    else
+    {
+        trace_ring_write(&definition, size);
+    }
+}
+
+// The buffers of the parent process are flushed by the parent, the child must not write them again. The threads that
+// have been writing their buffers at the moment of fork do not exist in the child. The child shares the mapped ring
+// with the parent, but it must not continue or release the chunk that the parent is writing.
+static void trace_after_fork_in_child()
+{
+    for (trace_thread_buffer* buffer = g_ref_collector_trace.buffers; buffer != NULL; buffer = buffer->next)
+    {
+        buffer->used = 0;
+        if (buffer->state == TRACE_BUFFER_WRITING)
+        {
+            buffer->state = TRACE_BUFFER_IDLE;
+        }
+    }
+    if (t_trace_buffer != NULL)
+    {
+        t_trace_buffer->tid = trace_thread_id();
+    }
+    memset(&t_trace_chunk, 0, sizeof(t_trace_chunk));
+}
+
+static void trace_header_init(itt_refcol_trace_header* header, uint32_t flags)
+{
+    memset(header, 0, sizeof(*header));
+    memcpy(header->magic, ITT_REFCOL_TRACE_MAGIC, sizeof(header->magic));
+    header->version = ITT_REFCOL_TRACE_VERSION;
+    header->header_size = sizeof(itt_refcol_trace_header);
+    header->record_size = sizeof(itt_refcol_record);
+    header->flags = flags;
+    header->pid = (uint64_t)getpid();
+    header->start_time = trace_timestamp(CLOCK_MONOTONIC);
+    header->start_realtime = trace_timestamp(CLOCK_REALTIME);
+}
+
+static int trace_open(const char* file_name)
+{
+    int fd = open(file_name, O_WRONLY | O_CREAT | O_TRUNC | O_APPEND, 0644);
+    if (fd < 0) return 0;
+
+    itt_refcol_trace_header header;
+    trace_header_init(&header, 0);
+
+    g_ref_collector_logger.trace_fd = fd;
+    trace_write(&header, sizeof(header));
+
+    pthread_key_create(&g_ref_collector_trace.buffer_key, trace_thread_buffer_release);
+    pthread_atfork(NULL, NULL, trace_after_fork_in_child);
+    return 1;
+}
+
+// Creates the trace file of the given size and maps it. One eighth of the file is given to the definitions.
+static int trace_ring_open(const char* file_name, size_t size)
+{
+    size_t page_size = (size_t)sysconf(_SC_PAGESIZE);
+    size_t chunk_size = TRACE_CHUNK_RECORDS * sizeof(itt_refcol_record);
+    size_t definitions_offset = sizeof(itt_refcol_trace_header) + sizeof(itt_refcol_trace_ring);
+    size_t records_offset = (definitions_offset + size / 8 + page_size - 1) / page_size * page_size;
+    if (size < records_offset + chunk_size)
+    {
+        return 0;
+    }
+    size_t records_size = (size - records_offset) / chunk_size * chunk_size;
+    size = records_offset + records_size;
+
+    int fd = open(file_name, O_RDWR | O_CREAT | O_TRUNC, 0644);
+    if (fd < 0) return 0;
+
+    // The blocks of the file are allocated beforehand, so the stores to the mapping do not fail on a full disk
+#ifdef __linux__
+    int result = posix_fallocate(fd, 0, (off_t)size);
+#else
+    int result = ftruncate(fd, (off_t)size);
+#endif
+    int flags = MAP_SHARED;
+#ifdef MAP_POPULATE
+    // The pages are mapped at the start instead of on the first store of each page on the hot path
+    flags |= MAP_POPULATE;
+#endif
+    char* map = result == 0 ? (char*)mmap(NULL, size, PROT_READ | PROT_WRITE, flags, fd, 0) : (char*)MAP_FAILED;
+    close(fd);
+    if (map == (char*)MAP_FAILED)
+    {
+        unlink(file_name);
+        return 0;
+    }
+
+    itt_refcol_trace_ring* ring = (itt_refcol_trace_ring*)(map + sizeof(itt_refcol_trace_header));
+    ring->definitions_offset = definitions_offset;
+    ring->definitions_size = records_offset - definitions_offset;
+    ring->records_offset = records_offset;
+    ring->records_size = records_size;
+    ring->chunk_size = chunk_size;
+    trace_header_init((itt_refcol_trace_header*)map, ITT_REFCOL_TRACE_FLAG_RING);
+
+    g_ref_collector_trace.map = map;
+    g_ref_collector_trace.ring = ring;
+    pthread_key_create(&g_ref_collector_trace.buffer_key, trace_ring_chunk_release);
+    pthread_atfork(NULL, NULL, trace_after_fork_in_child);
+    return 1;
+}
+
+// Flushes the buffers of all threads. Threads that are still running lose the records they make afterwards.
+static void trace_close()
+{
+    __itt_mutex_lock(&g_ref_collector_trace.mutex);
+    g_ref_collector_trace.closed = 1;
+    for (trace_thread_buffer* buffer = g_ref_collector_trace.buffers; buffer != NULL; buffer = buffer->next)
+    {
+        // Waits for the thread to finish the record it is appending
+        while (!__sync_bool_compare_and_swap(&buffer->state, TRACE_BUFFER_IDLE, TRACE_BUFFER_CLOSED))
+        {
+            sched_yield();
+        }
+        trace_thread_buffer_flush(buffer);
+    }
+    close(g_ref_collector_logger.trace_fd);
+    g_ref_collector_logger.trace_fd = -1;
+    __itt_mutex_unlock(&g_ref_collector_trace.mutex);
+}
+
+#else
+
+// The binary trace is not supported on Windows, the collector falls back to the text log
+static void trace_record(uint16_t type, const __itt_domain* domain, uint64_t name, uint64_t id, uint64_t value)
+{
+    (void)type; (void)domain; (void)name; (void)id; (void)value;
+}
+
+static void trace_definition(uint16_t type, uint64_t id, uint64_t value, const char* name, size_t name_size)
+{
+    (void)type; (void)id; (void)value; (void)name; (void)name_size;
+}
+
+static int trace_open(const char* file_name)
+{
+    (void)file_name;
+    printf("WARNING: Binary trace is not supported on this platform, text log is used\n");
+    return 0;
+}
+
+static int trace_ring_open(const char* file_name, size_t size)
+{
+    (void)file_name; (void)size;
+    printf("WARNING: Memory-mapped trace is not supported on this platform, text log is used\n");
+    return 0;
+}
+
+static void trace_close()
+{
+}
+
+#endif
+
+static double counter_value_to_double(int type, const void* value_ptr)
+{
+    switch (type)
+    {
+    case __itt_metadata_s64:    return (double)*(const int64_t*)value_ptr;
+    case __itt_metadata_u32:    return (double)*(const uint32_t*)value_ptr;
+    case __itt_metadata_s32:    return (double)*(const int32_t*)value_ptr;
+    case __itt_metadata_u16:    return (double)*(const uint16_t*)value_ptr;
+    case __itt_metadata_s16:    return (double)*(const int16_t*)value_ptr;
+    case __itt_metadata_float:  return (double)*(const float*)value_ptr;
+    case __itt_metadata_double: return *(const double*)value_ptr;
+    default:                    return (double)*(const uint64_t*)value_ptr;
+    }
+}
+
+// Counter definitions carry the domain and the name of the counter separated by '\0'
+static void trace_counter_definition(const __itt_counter_info_t* counter)
+{
+    char counter_name[LOG_BUFFER_MAX_SIZE*2];
+    int size = snprintf(counter_name, sizeof(counter_name), "%s%c%s",
+                        counter->domainA != NULL ? counter->domainA : "", '\0', counter->nameA);
+    size = size < (int)sizeof(counter_name) ? size : (int)sizeof(counter_name) - 1;
+    trace_definition(ITT_REFCOL_RECORD_COUNTER, (uint64_t)(uintptr_t)counter, (uint64_t)counter->type,
+                     counter_name, (size_t)size);
+}
+
+static void trace_counter_value(const __itt_counter_info_t* counter, const void* value_ptr)
+{
+    union { double value; uint64_t bits; } value = { counter_value_to_double(counter->type, value_ptr) };
+    trace_record(ITT_REFCOL_RECORD_COUNTER_VALUE, NULL, 0, (uint64_t)(uintptr_t)counter, value.bits);
+}
+
 // This reference implementation opens a log file for recording ITT API calls.
 // Custom collectors can replace this with their own initialization logic
 // (e.g., opening trace files, connecting to profiler backends, allocating buffers).
@@ -67,7 +603,17 @@ static void ref_collector_init()
     {
         static char file_name_buffer[LOG_BUFFER_MAX_SIZE*2];
         char* log_dir = getenv(env_log_dir);
-        char* log_file = log_file_name_generate();
+        char* log_format = getenv(env_log_format);
+        uint8_t format = LOG_FORMAT_TEXT;
+        if (log_format != NULL && !strcmp(log_format, "binary"))
+        {
+            format = LOG_FORMAT_BINARY;
+        }
+        else if (log_format != NULL && !strcmp(log_format, "mmap"))
+        {
+            format = LOG_FORMAT_MMAP;
+        }
+        char* log_file = log_file_name_generate(format);
 
         if (log_dir != NULL)
         {
@@ -91,6 +637,26 @@ static void ref_collector_init()
         }
         free(log_file);
 
+        if (format != LOG_FORMAT_TEXT)
+        {
+            char* log_size = getenv(env_log_size);
+            size_t size_mb = log_size != NULL ? strtoul(log_size, NULL, 10) : 0;
+            size_mb = size_mb > 0 ? size_mb : TRACE_RING_DEFAULT_SIZE_MB;
+
+            if (format == LOG_FORMAT_BINARY ? trace_open(file_name_buffer)
+                                            : trace_ring_open(file_name_buffer, size_mb << 20))
+            {
+                g_ref_collector_logger.format = format;
+                g_ref_collector_logger.init_state = 1;
+                return;
+            }
+
+            printf("ERROR: Cannot open trace file: %s\n", file_name_buffer);
+            // The text log is opened instead
+            file_name_buffer[strlen(file_name_buffer) - strlen(".itt")] = '\0';
+            strcat(file_name_buffer, ".log");
+        }
+
         g_ref_collector_logger.log_fp = fopen(file_name_buffer, "a");
         if (!g_ref_collector_logger.log_fp)
         {
@@ -134,6 +700,11 @@ static void ref_collector_release()
         g_ref_collector_logger.log_fp = NULL;
     }
 
+    if (g_ref_collector_logger.format == LOG_FORMAT_BINARY)
+    {
+        trace_close();
+    }
+
     if (!g_ref_collector_global.mutex_initialized) return;
 
     __itt_mutex_lock(&g_ref_collector_global.mutex);
@@ -205,19 +776,24 @@ static void spill_static_part_lists(__itt_global* p)
 {
     __itt_mutex_lock(&p->mutex);
 
+    // The objects of the static part are used by the application as they are, so the binary trace also defines them
+    // under their own addresses
     for (__itt_domain *d = p->domain_list; d != NULL; d = d->next)
     {
         (void)__itt_domain_create(d->nameA);
+        trace_definition(ITT_REFCOL_RECORD_DOMAIN, (uint64_t)(uintptr_t)d, 0, d->nameA, strlen(d->nameA));
     }
 
     for (__itt_string_handle *sh = p->string_list; sh != NULL; sh = sh->next)
     {
         (void)__itt_string_handle_create(sh->strA);
+        trace_definition(ITT_REFCOL_RECORD_STRING_HANDLE, (uint64_t)(uintptr_t)sh, 0, sh->strA, strlen(sh->strA));
     }
 
     for (__itt_counter_info_t *c = p->counter_list; c != NULL; c = c->next)
     {
         (void)__itt_counter_create_typed(c->nameA, c->domainA, c->type);
+        trace_counter_definition(c);
     }
 
     for (__itt_histogram *h = p->histogram_list; h != NULL; h = h->next)
@@ -251,6 +827,12 @@ ITT_EXTERN_C void ITTAPI __itt_api_init(__itt_global* p, __itt_group_id init_gro
 
 static void log_func_call(uint8_t log_level, const char* function_name, const char* message_format, ...)
 {
+    // Calls that have no binary records are not logged in the binary and mmap modes
+    if (g_ref_collector_logger.format != LOG_FORMAT_TEXT)
+    {
+        return;
+    }
+
     if (!g_ref_collector_logger.init_state || !g_ref_collector_logger.log_fp)
     {
         printf("ERROR: Failed to log function call\n");
@@ -384,6 +966,7 @@ ITT_EXTERN_C __itt_domain* ITTAPI __itt_domain_create(const char *name)
     if (h == NULL)
     {
         NEW_DOMAIN_A(&g_ref_collector_global, h, h_tail, name);
+        trace_definition(ITT_REFCOL_RECORD_DOMAIN, (uint64_t)(uintptr_t)h, 0, name, strlen(name));
         LOG_FUNC_CALL_INFO("function args: name=%s (created new domain)", name);
     }
     else
@@ -416,6 +999,7 @@ ITT_EXTERN_C __itt_string_handle* ITTAPI __itt_string_handle_create(const char*
     if (h == NULL)
     {
         NEW_STRING_HANDLE_A(&g_ref_collector_global, h, h_tail, name);
+        trace_definition(ITT_REFCOL_RECORD_STRING_HANDLE, (uint64_t)(uintptr_t)h, 0, name, strlen(name));
         LOG_FUNC_CALL_INFO("function args: name=%s (created new string handle)", name);
     }
     else
@@ -464,6 +1048,7 @@ ITT_EXTERN_C __itt_counter ITTAPI __itt_counter_create_typed(
     if (h == NULL)
     {
         NEW_COUNTER_A(&g_ref_collector_global, h, h_tail, name, domain, type);
+        trace_counter_definition(h);
         LOG_FUNC_CALL_INFO("function args: name=%s, domain=%s, type=%d (created new counter)",
                             name, domain, (int)type);
     }
@@ -515,26 +1100,31 @@ ITT_EXTERN_C __itt_histogram* ITTAPI __itt_histogram_create(
 
 ITT_EXTERN_C void ITTAPI __itt_pause(void)
 {
+    trace_record(ITT_REFCOL_RECORD_PAUSE, NULL, 0, 0, 0);
     LOG_FUNC_CALL_INFO("function call");
 }
 
 ITT_EXTERN_C void ITTAPI __itt_pause_scoped(__itt_collection_scope scope)
 {
+    trace_record(ITT_REFCOL_RECORD_PAUSE, NULL, 0, 0, (uint64_t)scope);
     LOG_FUNC_CALL_INFO("function args: scope=%d", scope);
 }
 
 ITT_EXTERN_C void ITTAPI __itt_resume(void)
 {
+    trace_record(ITT_REFCOL_RECORD_RESUME, NULL, 0, 0, 0);
     LOG_FUNC_CALL_INFO("function call");
 }
 
 ITT_EXTERN_C void ITTAPI __itt_resume_scoped(__itt_collection_scope scope)
 {
+    trace_record(ITT_REFCOL_RECORD_RESUME, NULL, 0, 0, (uint64_t)scope);
     LOG_FUNC_CALL_INFO("function args: scope=%d", scope);
 }
 
 ITT_EXTERN_C void ITTAPI __itt_detach(void)
 {
+    trace_record(ITT_REFCOL_RECORD_DETACH, NULL, 0, 0, 0);
     LOG_FUNC_CALL_INFO("function call");
 }
 
@@ -542,7 +1132,7 @@ ITT_EXTERN_C void ITTAPI __itt_frame_begin_v3(const __itt_domain *domain, __itt_
 {
     if (domain != NULL)
     {
-        (void)id;
+        trace_record(ITT_REFCOL_RECORD_FRAME_BEGIN, domain, 0, id != NULL ? id->d1 : 0, 0);
         LOG_FUNC_CALL_INFO("function args: domain=%s", domain->nameA);
     }
     else
@@ -555,7 +1145,7 @@ ITT_EXTERN_C void ITTAPI __itt_frame_end_v3(const __itt_domain *domain, __itt_id
 {
     if (domain != NULL)
     {
-        (void)id;
+        trace_record(ITT_REFCOL_RECORD_FRAME_END, domain, 0, id != NULL ? id->d1 : 0, 0);
         LOG_FUNC_CALL_INFO("function args: domain=%s", domain->nameA);
     }
     else
@@ -569,7 +1159,7 @@ ITT_EXTERN_C void ITTAPI __itt_frame_submit_v3(const __itt_domain *domain, __itt
 {
     if (domain != NULL)
     {
-        (void)id;
+        trace_record(ITT_REFCOL_RECORD_FRAME_SUBMIT, domain, begin, id != NULL ? id->d1 : 0, end);
         LOG_FUNC_CALL_INFO("function args: domain=%s, time_begin=%llu, time_end=%llu",
                         domain->nameA, begin, end);
     }
@@ -584,6 +1174,7 @@ ITT_EXTERN_C void ITTAPI __itt_task_begin(
 {
     if (domain != NULL && name != NULL)
     {
+        trace_record(ITT_REFCOL_RECORD_TASK_BEGIN, domain, (uint64_t)(uintptr_t)name, taskid.d1, parentid.d1);
         LOG_FUNC_CALL_INFO("function args: domain=%s name=%s taskid=%llu,%llu,%llu parentid=%llu,%llu,%llu",
                             domain->nameA, name->strA,
                             taskid.d1, taskid.d2, taskid.d3,
@@ -599,6 +1190,7 @@ ITT_EXTERN_C void ITTAPI __itt_task_end(const __itt_domain *domain)
 {
     if (domain != NULL)
     {
+        trace_record(ITT_REFCOL_RECORD_TASK_END, domain, 0, 0, 0);
         LOG_FUNC_CALL_INFO("function args: domain=%s", domain->nameA);
     }
     else
@@ -612,6 +1204,7 @@ ITT_EXTERN_C void ITTAPI __itt_region_begin(
 {
     if (domain != NULL && name != NULL)
     {
+        trace_record(ITT_REFCOL_RECORD_REGION_BEGIN, domain, (uint64_t)(uintptr_t)name, id.d1, parentid.d1);
         LOG_FUNC_CALL_INFO("function args: domain=%s name=%s id=%llu,%llu,%llu parentid=%llu,%llu,%llu",
                             domain->nameA, name->strA,
                             id.d1, id.d2, id.d3,
@@ -627,6 +1220,7 @@ ITT_EXTERN_C void ITTAPI __itt_region_end(const __itt_domain *domain, __itt_id i
 {
     if (domain != NULL)
     {
+        trace_record(ITT_REFCOL_RECORD_REGION_END, domain, 0, id.d1, 0);
         LOG_FUNC_CALL_INFO("function args: domain=%s id=%llu,%llu,%llu",
                             domain->nameA, id.d1, id.d2, id.d3);
     }
@@ -738,6 +1332,7 @@ ITT_EXTERN_C void __itt_counter_set_value_v3(__itt_counter counter, void* value_
     {
         __itt_counter_info_t* counter_info = (__itt_counter_info_t*)counter;
         uint64_t value = *(uint64_t*)value_ptr;
+        trace_counter_value(counter_info, value_ptr);
         LOG_FUNC_CALL_INFO("function args: counter_name=%s counter_value=%lu",
                             counter_info->nameA, value);
     }
@@ -746,3 +1341,131 @@ ITT_EXTERN_C void __itt_counter_set_value_v3(__itt_counter counter, void* value_
         LOG_FUNC_CALL_WARN("Incorrect function call");
     }
 }
+
+ITT_EXTERN_C void ITTAPI __itt_counter_set_value(__itt_counter counter, void* value_ptr)
+{
+    if (counter != NULL && value_ptr != NULL)
+    {
+        __itt_counter_info_t* counter_info = (__itt_counter_info_t*)counter;
+        trace_counter_value(counter_info, value_ptr);
+        LOG_FUNC_CALL_INFO("function args: counter_name=%s counter_value=%lf",
+                            counter_info->nameA, counter_value_to_double(counter_info->type, value_ptr));
+    }
+    else
+    {
+        LOG_FUNC_CALL_WARN("Incorrect function call");
+    }
+}
+
+ITT_EXTERN_C void ITTAPI __itt_counter_inc_delta(__itt_counter counter, unsigned long long value)
+{
+    if (counter != NULL)
+    {
+        trace_record(ITT_REFCOL_RECORD_COUNTER_INC, NULL, 0, (uint64_t)(uintptr_t)counter, value);
+        LOG_FUNC_CALL_INFO("function args: counter_name=%s delta=%llu",
+                            ((__itt_counter_info_t*)counter)->nameA, value);
+    }
+    else
+    {
+        LOG_FUNC_CALL_WARN("Incorrect function call");
+    }
+}
+
+ITT_EXTERN_C void ITTAPI __itt_counter_inc(__itt_counter counter)
+{
+    __itt_counter_inc_delta(counter, 1);
+}
+
+ITT_EXTERN_C void ITTAPI __itt_counter_dec_delta(__itt_counter counter, unsigned long long value)
+{
+    if (counter != NULL)
+    {
+        trace_record(ITT_REFCOL_RECORD_COUNTER_DEC, NULL, 0, (uint64_t)(uintptr_t)counter, value);
+        LOG_FUNC_CALL_INFO("function args: counter_name=%s delta=%llu",
+                            ((__itt_counter_info_t*)counter)->nameA, value);
+    }
+    else
+    {
+        LOG_FUNC_CALL_WARN("Incorrect function call");
+    }
+}
+
+ITT_EXTERN_C void ITTAPI __itt_counter_dec(__itt_counter counter)
+{
+    __itt_counter_dec_delta(counter, 1);
+}
+
+ITT_EXTERN_C void ITTAPI __itt_task_begin_overlapped(
+    const __itt_domain *domain, __itt_id taskid, __itt_id parentid, __itt_string_handle *name)
+{
+    if (domain != NULL && name != NULL)
+    {
+        trace_record(ITT_REFCOL_RECORD_TASK_BEGIN_OVERLAPPED, domain, (uint64_t)(uintptr_t)name,
+                     taskid.d1, parentid.d1);
+        LOG_FUNC_CALL_INFO("function args: domain=%s name=%s taskid=%llu,%llu,%llu parentid=%llu,%llu,%llu",
+                            domain->nameA, name->strA,
+                            taskid.d1, taskid.d2, taskid.d3,
+                            parentid.d1, parentid.d2, parentid.d3);
+    }
+    else
+    {
+        LOG_FUNC_CALL_WARN("Incorrect function call");
+    }
+}
+
+ITT_EXTERN_C void ITTAPI __itt_task_end_overlapped(const __itt_domain *domain, __itt_id taskid)
+{
+    if (domain != NULL)
+    {
+        trace_record(ITT_REFCOL_RECORD_TASK_END_OVERLAPPED, domain, 0, taskid.d1, 0);
+        LOG_FUNC_CALL_INFO("function args: domain=%s taskid=%llu,%llu,%llu",
+                            domain->nameA, taskid.d1, taskid.d2, taskid.d3);
+    }
+    else
+    {
+        LOG_FUNC_CALL_WARN("Incorrect function call");
+    }
+}
+
+ITT_EXTERN_C __itt_event LIBITTAPI __itt_event_create(const char *name, int namelen)
+{
+    static volatile long next_event = 0;
+
+    if (name == NULL || namelen < 0)
+    {
+        LOG_FUNC_CALL_WARN("Cannot create event object");
+        return 0;
+    }
+
+    __itt_event event = (__itt_event)__itt_interlocked_increment(&next_event);
+    trace_definition(ITT_REFCOL_RECORD_EVENT, (uint64_t)event, 0, name, (size_t)namelen);
+    LOG_FUNC_CALL_INFO("function args: name=%.*s event=%d", namelen, name, event);
+    return event;
+}
+
+ITT_EXTERN_C int LIBITTAPI __itt_event_start(__itt_event event)
+{
+    trace_record(ITT_REFCOL_RECORD_EVENT_START, NULL, 0, (uint64_t)event, 0);
+    LOG_FUNC_CALL_INFO("function args: event=%d", event);
+    return 0;
+}
+
+ITT_EXTERN_C int LIBITTAPI __itt_event_end(__itt_event event)
+{
+    trace_record(ITT_REFCOL_RECORD_EVENT_END, NULL, 0, (uint64_t)event, 0);
+    LOG_FUNC_CALL_INFO("function args: event=%d", event);
+    return 0;
+}
+
+ITT_EXTERN_C void ITTAPI __itt_thread_set_name(const char *name)
+{
+    if (name != NULL)
+    {
+        trace_definition(ITT_REFCOL_RECORD_THREAD_NAME, 0, 0, name, strlen(name));
+        LOG_FUNC_CALL_INFO("function args: name=%s", name);
+    }
+    else
+    {
+        LOG_FUNC_CALL_WARN("Incorrect function call");
+    }
+}
@@ -0,0 +1,103 @@
+/*
+  Copyright (C) 2025 Intel Corporation
+
+  SPDX-License-Identifier: GPL-2.0-only OR BSD-3-Clause
+*/
+
+#ifndef _ITT_REFCOL_TRACE_H_
+#define _ITT_REFCOL_TRACE_H_
+
+#include <stdint.h>
+
+// Binary trace format of the reference collector.
+//
+// A trace file starts with itt_refcol_trace_header that is followed by fixed-size records (itt_refcol_record).
+// Definition records (domains, string handles, counters, events and thread names) are followed by `size` bytes of
+// the name, padded with zeros to a multiple of the record size. Other records refer to the definitions by their ids.
+// All integers are stored in the byte order of the traced machine, timestamps are CLOCK_MONOTONIC nanoseconds.
+//
+// A trace with ITT_REFCOL_TRACE_FLAG_RING in the header flags is a flight recorder of a fixed size that is written
+// via mmap. The header is followed by itt_refcol_trace_ring that describes two areas of the file: the definitions
+// that are appended until the area is full, and a ring of chunks of records that are reserved by threads one after
+// another and overwritten after wrap-around, except the chunks that are still written by their threads. Each chunk
+// starts with ITT_REFCOL_RECORD_CHUNK that gives the sequence number of the chunk, the records of the thread follow it
+// up to the first record with zero type.
+
+#define ITT_REFCOL_TRACE_MAGIC   "ITTTRACE"
+#define ITT_REFCOL_TRACE_VERSION 1
+
+#define ITT_REFCOL_TRACE_FLAG_RING 0x1
+
+typedef struct itt_refcol_trace_header
+{
+    char     magic[8];
+    uint32_t version;
+    uint32_t header_size;
+    uint32_t record_size;
+    uint32_t flags;
+    uint64_t pid;
+    uint64_t start_time;      // CLOCK_MONOTONIC timestamp when the trace was opened
+    uint64_t start_realtime;  // CLOCK_REALTIME timestamp at the same moment
+    uint64_t reserved[2];
+} itt_refcol_trace_header;
+
+// Offsets are counted from the start of the file, sizes are in bytes
+typedef struct itt_refcol_trace_ring
+{
+    uint64_t definitions_offset;
+    uint64_t definitions_size;
+    uint64_t definitions_used;      // may exceed definitions_size if some definitions have been dropped
+    uint64_t definitions_dropped;   // the number of definitions that have not fit into the area
+    uint64_t records_offset;
+    uint64_t records_size;          // a multiple of chunk_size
+    uint64_t chunk_size;
+    uint64_t head;                  // the bytes reserved since the start, the next chunk is at head % records_size
+} itt_refcol_trace_ring;
+
+typedef enum
+{
+    // Definitions, the name follows the record
+    ITT_REFCOL_RECORD_DOMAIN                = 1,   // id: domain
+    ITT_REFCOL_RECORD_STRING_HANDLE         = 2,   // id: string handle
+    ITT_REFCOL_RECORD_COUNTER               = 3,   // id: counter, value: __itt_metadata_type, name: "domain\0name"
+    ITT_REFCOL_RECORD_EVENT                 = 4,   // id: event
+    ITT_REFCOL_RECORD_THREAD_NAME           = 5,   // the name of the thread `tid`
+
+    // Ring
+    ITT_REFCOL_RECORD_CHUNK                 = 8,   // the first record of a chunk, id: sequence number of the chunk,
+                                                   // value: non-zero while the chunk is owned by a thread
+
+    // Timeline
+    ITT_REFCOL_RECORD_TASK_BEGIN            = 16,  // domain, name, id, value: parent id
+    ITT_REFCOL_RECORD_TASK_END              = 17,  // domain
+    ITT_REFCOL_RECORD_TASK_BEGIN_OVERLAPPED = 18,  // domain, name, id, value: parent id
+    ITT_REFCOL_RECORD_TASK_END_OVERLAPPED   = 19,  // domain, id
+    ITT_REFCOL_RECORD_REGION_BEGIN          = 20,  // domain, name, id, value: parent id
+    ITT_REFCOL_RECORD_REGION_END            = 21,  // domain, id
+    ITT_REFCOL_RECORD_FRAME_BEGIN           = 22,  // domain, id
+    ITT_REFCOL_RECORD_FRAME_END             = 23,  // domain, id
+    ITT_REFCOL_RECORD_FRAME_SUBMIT          = 24,  // domain, id, name: begin timestamp, value: end timestamp
+    ITT_REFCOL_RECORD_EVENT_START           = 25,  // id: event
+    ITT_REFCOL_RECORD_EVENT_END             = 26,  // id: event
+    ITT_REFCOL_RECORD_COUNTER_VALUE         = 27,  // id: counter, value: the bits of the value converted to double
+    ITT_REFCOL_RECORD_COUNTER_INC           = 28,  // id: counter, value: delta
+    ITT_REFCOL_RECORD_COUNTER_DEC           = 29,  // id: counter, value: delta
+    ITT_REFCOL_RECORD_PAUSE                 = 30,
+    ITT_REFCOL_RECORD_RESUME                = 31,
+    ITT_REFCOL_RECORD_DETACH                = 32
+} itt_refcol_record_type;
+
+// Ids of ITT objects (__itt_id) are stored as their first part (d1)
+typedef struct itt_refcol_record
+{
+    uint64_t timestamp;
+    uint32_t tid;
+    uint16_t type;
+    uint16_t size;            // the size of the name that follows a definition record
+    uint64_t domain;
+    uint64_t name;
+    uint64_t id;
+    uint64_t value;
+} itt_refcol_record;
+
+#endif // _ITT_REFCOL_TRACE_H_
@@ -0,0 +1,204 @@
+/*
+  Copyright (C) 2025 Intel Corporation
+
+  SPDX-License-Identifier: GPL-2.0-only OR BSD-3-Clause
+*/
+
+/*
+ * The tests of the binary and the memory-mapped traces of the reference collector with concurrent writers.
+ * The collector is included to access its internal functions.
+ */
+#include "itt_refcol_impl.c"
+
+#define RING_SIZE      (64 * 1024)
+#define RING_LAPS      10
+#define WRITER_COUNT   4
+#define WRITER_RECORDS 100000
+
+static volatile long step = 0;
+
+static void wait_step(long value)
+{
+    while (__atomic_load_n(&step, __ATOMIC_ACQUIRE) < value)
+    {
+        sched_yield();
+    }
+}
+
+static void set_step(long value)
+{
+    __atomic_store_n(&step, value, __ATOMIC_RELEASE);
+}
+
+/* Begins a chunk, waits for the main thread to go round the ring and fills the rest of the chunk */
+static void* ring_owner_thread(void* arg)
+{
+    uint32_t* tid = (uint32_t*)arg;
+    size_t i;
+
+    trace_record(ITT_REFCOL_RECORD_TASK_BEGIN, NULL, 1, 0, 0);
+    *tid = t_trace_chunk.tid;
+    set_step(1);
+    wait_step(2);
+    for (i = 2; i < TRACE_CHUNK_RECORDS; i++)
+    {
+        trace_record(ITT_REFCOL_RECORD_TASK_BEGIN, NULL, 1, i - 1, 0);
+    }
+    return NULL;
+}
+
+static int test_ring_chunk_is_not_overwritten_while_owned(const char* file_name)
+{
+    itt_refcol_trace_ring* ring;
+    itt_refcol_record* chunk;
+    pthread_t owner;
+    uint32_t owner_tid = 0;
+    size_t chunk_records, chunk_count, i, j;
+
+    if (!trace_ring_open(file_name, RING_SIZE))
+    {
+        printf("FAILED: cannot open the ring trace %s\n", file_name);
+        return 1;
+    }
+    g_ref_collector_logger.format = LOG_FORMAT_MMAP;
+    ring = g_ref_collector_trace.ring;
+    chunk_records = ring->chunk_size / sizeof(itt_refcol_record);
+    chunk_count = ring->records_size / ring->chunk_size;
+
+    pthread_create(&owner, NULL, ring_owner_thread, &owner_tid);
+    wait_step(1);
+    for (i = 0; i < RING_LAPS * chunk_count * chunk_records; i++)
+    {
+        trace_record(ITT_REFCOL_RECORD_TASK_END, NULL, 0, 0, 0);
+    }
+    set_step(2);
+    pthread_join(owner, NULL);
+
+    /* The chunk of the owner is the first one, its records are in the order they have been written */
+    chunk = (itt_refcol_record*)(g_ref_collector_trace.map + ring->records_offset);
+    if (chunk->type != ITT_REFCOL_RECORD_CHUNK || chunk->tid != owner_tid || chunk->id != 0)
+    {
+        printf("FAILED: the chunk of the thread has been reserved by another thread\n");
+        return 1;
+    }
+    for (i = 0; i < chunk_count; i++)
+    {
+        chunk = (itt_refcol_record*)(g_ref_collector_trace.map + ring->records_offset + i * ring->chunk_size);
+        for (j = 1; j < chunk_records; j++)
+        {
+            /* The unused records at the end of the last chunk of a thread are zeroed */
+            if ((chunk[j].type != 0 && chunk[j].tid != chunk->tid) ||
+                (chunk->tid == owner_tid && (chunk[j].type != ITT_REFCOL_RECORD_TASK_BEGIN || chunk[j].id != j - 1)))
+            {
+                printf("FAILED: the record %d of the chunk %d has been written by another thread\n", (int)j, (int)i);
+                return 1;
+            }
+        }
+    }
+    return 0;
+}
+
+/* Appends numbered records until the trace is closed */
+static void* binary_writer_thread(void* arg)
+{
+    uint64_t i;
+
+    (void)arg;
+    __atomic_add_fetch(&step, 1, __ATOMIC_ACQ_REL);
+    for (i = 0; i < WRITER_RECORDS; i++)
+    {
+        trace_record(ITT_REFCOL_RECORD_TASK_BEGIN, NULL, 1, i, 0);
+    }
+    return NULL;
+}
+
+static int test_binary_trace_is_closed_while_threads_append(const char* file_name)
+{
+    pthread_t writers[WRITER_COUNT];
+    uint64_t next_ids[WRITER_COUNT];
+    uint32_t tids[WRITER_COUNT];
+    itt_refcol_trace_header header;
+    itt_refcol_record record;
+    FILE* file;
+    int i, count = 0;
+
+    if (!trace_open(file_name))
+    {
+        printf("FAILED: cannot open the binary trace %s\n", file_name);
+        return 1;
+    }
+    g_ref_collector_logger.format = LOG_FORMAT_BINARY;
+
+    set_step(0);
+    for (i = 0; i < WRITER_COUNT; i++)
+    {
+        pthread_create(&writers[i], NULL, binary_writer_thread, NULL);
+    }
+    wait_step(WRITER_COUNT);
+    trace_close();
+    for (i = 0; i < WRITER_COUNT; i++)
+    {
+        pthread_join(writers[i], NULL);
+    }
+
+    /* Each record is written once, so the records of each thread are numbered without repetitions or gaps */
+    file = fopen(file_name, "rb");
+    if (file == NULL || fread(&header, sizeof(header), 1, file) != 1)
+    {
+        printf("FAILED: cannot read the binary trace %s\n", file_name);
+        return 1;
+    }
+    while (fread(&record, sizeof(record), 1, file) == 1)
+    {
+        for (i = 0; i < count && tids[i] != record.tid; i++);
+        if (i == count)
+        {
+            if (count == WRITER_COUNT)
+            {
+                printf("FAILED: the record of an unknown thread %u\n", record.tid);
+                return 1;
+            }
+            tids[count] = record.tid;
+            next_ids[count++] = 0;
+        }
+        if (record.type != ITT_REFCOL_RECORD_TASK_BEGIN || record.id != next_ids[i])
+        {
+            printf("FAILED: the record %d of the thread %u is written out of order\n", (int)record.id, record.tid);
+            return 1;
+        }
+        next_ids[i]++;
+    }
+    fclose(file);
+    return 0;
+}
+
+int main(void)
+{
+    char ring_file_name[] = "/tmp/itt_refcol_ring_XXXXXX";
+    char binary_file_name[] = "/tmp/itt_refcol_binary_XXXXXX";
+    int ring_fd = mkstemp(ring_file_name);
+    int binary_fd = mkstemp(binary_file_name);
+    int result = 1;
+
+    if (ring_fd >= 0 && binary_fd >= 0)
+    {
+        result = test_ring_chunk_is_not_overwritten_while_owned(ring_file_name) ||
+                 test_binary_trace_is_closed_while_threads_append(binary_file_name);
+    }
+    if (ring_fd >= 0)
+    {
+        close(ring_fd);
+        unlink(ring_file_name);
+    }
+    if (binary_fd >= 0)
+    {
+        close(binary_fd);
+        unlink(binary_file_name);
+    }
+
+    if (result == 0)
+    {
+        printf("PASSED\n");
+    }
+    return result;
+}
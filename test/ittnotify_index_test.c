@@ -0,0 +1,190 @@
+/*
+  Copyright (C) 2005-2019 Intel Corporation
+
+  SPDX-License-Identifier: GPL-2.0-only OR BSD-3-Clause
+*/
+
+/*
+ * The test of the lock-free lookups in the name index of the static part running concurrently with the reset of
+ * the index. The items are freed only when the reset reports that no lock-free lookup could read them. The static
+ * part is included to access its internal functions.
+ */
+#include "ittnotify_static.c"
+
+#define ITEM_COUNT   256
+#define ROUND_COUNT  2000
+#define READER_COUNT 4
+
+static char names[ITEM_COUNT][16];
+static volatile long is_done = 0;
+static volatile long errors = 0;
+static volatile long hits = 0;
+static __itt_string_handle* kept_items = NULL;
+
+static void* make_item(const char* name)
+{
+    __itt_string_handle* item = (__itt_string_handle*)malloc(sizeof(__itt_string_handle));
+    if (item != NULL)
+    {
+        char* name_copy = NULL;
+        __itt_fstrdup(name, name_copy);
+        item->strA = name_copy;
+        item->strW = NULL;
+        item->extra1 = 0;
+        item->extra2 = NULL;
+        item->next = NULL;
+    }
+    return item;
+}
+
+static void add_items(__itt_string_handle** items)
+{
+    int i;
+    for (i = 0; i < ITEM_COUNT; i++)
+    {
+        items[i] = (__itt_string_handle*)make_item(names[i]);
+        __itt_index_add(&string_index, __itt_index_hashA(names[i], 0), items[i]);
+    }
+}
+
+static void free_item(__itt_string_handle* item)
+{
+    /* Spoil the freed item, so a reader that still sees it does not match it */
+    memset((void*)item->strA, 0, strlen(item->strA));
+    free((char*)item->strA);
+    item->strA = NULL;
+    free(item);
+}
+
+static int match_item(const void* item, const __itt_index_key* key)
+{
+    if (((const __itt_string_handle*)item)->strA == NULL)
+    {
+        __itt_atomic_add_long(&errors, 1);
+        return 0;
+    }
+    return __itt_string_handle_matchA(item, key);
+}
+
+static void read_index(void)
+{
+    size_t i = 0;
+    while (!__itt_atomic_add_long(&is_done, 0))
+    {
+        __itt_index_key key;
+        __itt_string_handle* item;
+
+        key.name = names[i % ITEM_COUNT];
+        key.domain = NULL;
+        key.type = 0;
+        item = (__itt_string_handle*)__itt_index_find(&string_index, __itt_index_hashA(names[i % ITEM_COUNT], 0),
+                                                      match_item, &key);
+        if (item != NULL)
+        {
+            /* The item may be freed after the lookup, so only the lookups access it */
+            __itt_atomic_add_long(&hits, 1);
+        }
+        i++;
+    }
+}
+
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+static DWORD WINAPI reader_thread(LPVOID arg)
+{
+    (void)arg;
+    read_index();
+    return 0;
+}
+#else  /* ITT_PLATFORM!=ITT_PLATFORM_WIN */
+static void* reader_thread(void* arg)
+{
+    (void)arg;
+    read_index();
+    return NULL;
+}
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+
+int main(void)
+{
+    int i, round, kept_rounds = 0;
+    __itt_string_handle* items[ITEM_COUNT];
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+    HANDLE readers[READER_COUNT];
+#else  /* ITT_PLATFORM!=ITT_PLATFORM_WIN */
+    pthread_t readers[READER_COUNT];
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+
+    for (i = 0; i < ITEM_COUNT; i++)
+    {
+        snprintf(names[i], sizeof(names[i]), "name%d", i);
+    }
+
+    /* The only writer, so the index is not guarded by the mutex */
+    add_items(items);
+    if (!__itt_index_reset(&string_index))
+    {
+        printf("FAILED: the items are kept without the lock-free lookups\n");
+        return 1;
+    }
+    for (i = 0; i < ITEM_COUNT; i++)
+    {
+        free_item(items[i]);
+    }
+
+    for (i = 0; i < READER_COUNT; i++)
+    {
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+        readers[i] = CreateThread(NULL, 0, reader_thread, NULL, 0, NULL);
+#else  /* ITT_PLATFORM!=ITT_PLATFORM_WIN */
+        pthread_create(&readers[i], NULL, reader_thread, NULL);
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+    }
+
+    for (round = 0; round < ROUND_COUNT; round++)
+    {
+        int is_reset;
+
+        add_items(items);
+        is_reset = __itt_index_reset(&string_index);
+        for (i = 0; i < ITEM_COUNT; i++)
+        {
+            if (is_reset)
+            {
+                free_item(items[i]);
+            }
+            else
+            {
+                /* The lookups might still read the items, so they are freed after the readers are finished */
+                items[i]->next = kept_items;
+                kept_items = items[i];
+            }
+        }
+        kept_rounds += !is_reset;
+    }
+
+    __itt_atomic_add_long(&is_done, 1);
+    for (i = 0; i < READER_COUNT; i++)
+    {
+#if ITT_PLATFORM==ITT_PLATFORM_WIN
+        WaitForSingleObject(readers[i], INFINITE);
+        CloseHandle(readers[i]);
+#else  /* ITT_PLATFORM!=ITT_PLATFORM_WIN */
+        pthread_join(readers[i], NULL);
+#endif /* ITT_PLATFORM==ITT_PLATFORM_WIN */
+    }
+
+    while (kept_items != NULL)
+    {
+        __itt_string_handle* next = kept_items->next;
+        free_item(kept_items);
+        kept_items = next;
+    }
+
+    if (errors != 0 || kept_rounds == 0)
+    {
+        printf("FAILED: %ld wrong lookups, the items are kept in %d rounds\n", errors, kept_rounds);
+        return 1;
+    }
+    printf("PASSED: %ld lookups found the items\n", hits);
+    return 0;
+}